@@ -1,74 +1,449 @@
 import os
 import numpy as np
 import random
-import multiprocessing
-import gensim
 import configparser
-import nltk
+import hashlib
+import json
 
-from utils.directory_utils import get_path
+from utils.directory_utils import get_base_algorithm, get_path, get_variant_name
 from utils.exceptions import (
     FileException,
     ModelException,
 )
+from utils.lazy_import import lazy_import
 
-nltk.download("punkt")
-
+from models.corpus_model import get_corpus, tokenize_lines
 from models.extract_model import load_multi_input_files
-from models.embed_model import isModelExist, save_embedding, save_model
+from models.embed_model import (
+    isModelCurrent,
+    isModelExist,
+    load_previous_model,
+    migrate_model,
+    save_embedding,
+    save_model,
+    save_model_meta,
+    save_training_curve,
+)
+from models.knowledge_graph_model import get_knowledge_graph
+from models.ontology_model import get_ontology_hash, list_ontology
+from models.walk_model import (
+    evict_walk_corpora,
+    get_walk_corpus_key,
+    load_walk_corpus,
+    save_walk_corpus,
+)
+from controllers.resource_controller import get_allocated_cores
+from controllers.training_controller import (
+    REVISION_FILES,
+    affected_walk_roots,
+    continue_training,
+    diff_revisions,
+    get_validation_probe,
+    train_epochs,
+)
 from owl2vec_star.RDF2Vec_Embed import get_rdf2vec_walks, get_rdf2vec_embed
-from owl2vec_star.Label import pre_process_words, URI_parse
+from owl2vec_star.Label import URI_parse
+
+gensim = lazy_import("gensim")
+
+CONFIG_FILE = os.path.join("controllers", "default.cfg")
+
+# sections of the configuration read by each algorithm
+ALGORITHM_SECTIONS = {
+    "owl2vec-star": ["BASIC", "DOCUMENT_OWL2VECSTAR", "MODEL_OWL2VECSTAR"],
+    "rdf2vec": ["BASIC", "MODEL_RDF2VEC"],
+    "opa2vec": ["BASIC", "MODEL_OPA2VEC_ONTO2VEC"],
+    "onto2vec": ["BASIC", "MODEL_OPA2VEC_ONTO2VEC"],
+}
+
+_OPA2VEC_ONTO2VEC = ("opa2vec", "onto2vec")
+
+
+def _positive_int(value):
+    value = int(value)
+    if value <= 0:
+        raise ValueError("must be a positive integer")
+    return str(value)
+
+
+def _non_negative_int(value):
+    value = int(value)
+    if value < 0:
+        raise ValueError("must be a non-negative integer")
+    return str(value)
+
+
+def _walk_count(value):
+    value = float(value)
+    if value <= 0 or (value != float("inf") and not value.is_integer()):
+        raise ValueError("must be a positive integer or inf")
+    return "inf" if value == float("inf") else str(int(value))
+
+
+def _choice(*choices):
+    def check(value):
+        if value not in choices:
+            raise ValueError(f"must be one of {', '.join(choices)}")
+        return value
+
+    return check
+
+
+# hyperparameters an embed request may override: name -> (check, {algorithm: (section, option)})
+EMBED_PARAMETERS = {
+    "embed_size": (
+        _positive_int,
+        {algorithm: ("BASIC", "embed_size") for algorithm in ALGORITHM_SECTIONS},
+    ),
+    "walker": (
+        _choice("random", "wl"),
+        {
+            "owl2vec-star": ("DOCUMENT_OWL2VECSTAR", "walker"),
+            "rdf2vec": ("MODEL_RDF2VEC", "walker"),
+        },
+    ),
+    "walk_depth": (
+        _positive_int,
+        {
+            "owl2vec-star": ("DOCUMENT_OWL2VECSTAR", "walk_depth"),
+            "rdf2vec": ("MODEL_RDF2VEC", "walk_depth"),
+        },
+    ),
+    "walks_per_entity": (
+        _walk_count,
+        {
+            "owl2vec-star": ("DOCUMENT_OWL2VECSTAR", "walks_per_entity"),
+            "rdf2vec": ("MODEL_RDF2VEC", "walks_per_entity"),
+        },
+    ),
+    "window": (
+        _positive_int,
+        {
+            "owl2vec-star": ("MODEL_OWL2VECSTAR", "window"),
+            **{a: ("MODEL_OPA2VEC_ONTO2VEC", "windsize") for a in _OPA2VEC_ONTO2VEC},
+        },
+    ),
+    "min_count": (
+        _non_negative_int,
+        {
+            "owl2vec-star": ("MODEL_OWL2VECSTAR", "min_count"),
+            **{a: ("MODEL_OPA2VEC_ONTO2VEC", "mincount") for a in _OPA2VEC_ONTO2VEC},
+        },
+    ),
+    "negative": (
+        _non_negative_int,
+        {"owl2vec-star": ("MODEL_OWL2VECSTAR", "negative")},
+    ),
+    "iteration": (_positive_int, {"owl2vec-star": ("MODEL_OWL2VECSTAR", "iteration")}),
+    "seed": (
+        _non_negative_int,
+        {
+            "owl2vec-star": ("MODEL_OWL2VECSTAR", "seed"),
+            "rdf2vec": ("MODEL_RDF2VEC", "seed"),
+        },
+    ),
+    "model": (
+        _choice("sg", "cbow"),
+        {a: ("MODEL_OPA2VEC_ONTO2VEC", "model") for a in _OPA2VEC_ONTO2VEC},
+    ),
+}
+
+
+def get_embed_config(config_file, algorithm, overrides=None):
+    """Read the configuration and apply the hyperparameter overrides of an embed request
+
+    Args:
+        config_file (str): The path to the configuration file
+        algorithm (str): The name of the algorithm
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+    Returns:
+        configparser.ConfigParser: The effective configuration
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+
+    for name, value in (overrides or {}).items():
+        if name not in EMBED_PARAMETERS:
+            raise ModelException(f"Unknown embedding parameter: {name}", 400)
+        check, options = EMBED_PARAMETERS[name]
+        if algorithm not in options:
+            raise ModelException(f"{algorithm} has no {name} parameter", 400)
+        try:
+            value = check(str(value).strip())
+        except ValueError as e:
+            raise ModelException(f"Invalid {name} {value!r}: {str(e)}", 400)
+        section, option = options[algorithm]
+        config[section][option] = value
+    return config
+
+
+def get_config_hash(config, algorithm):
+    """Hash the sections of the configuration read by the algorithm
+
+    Args:
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+    Returns:
+        str: The hex SHA-256 of the sections
+    """
+    sections = {
+        section: dict(config[section]) for section in ALGORITHM_SECTIONS[algorithm]
+    }
+    return hashlib.sha256(
+        json.dumps(sections, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def get_embed_variant(algorithm, overrides=None, config_file=CONFIG_FILE):
+    """Resolve the model variant trained by an embed request
+
+    The default configuration keeps the plain algorithm folder, any other effective
+    configuration gets a folder of its own so that variants are cached side by side.
+
+    Args:
+        algorithm (str): The name of the algorithm
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+        config_file (str): The path to the configuration file
+    Returns:
+        tuple: The folder name of the variant, the effective configuration and its hash
+    """
+    if algorithm not in ALGORITHM_SECTIONS:
+        raise ModelException(f"Unsupported algorithm: {algorithm}", 400)
+    config = get_embed_config(config_file, algorithm, overrides)
+    config_hash = get_config_hash(config, algorithm)
+    default_hash = get_config_hash(get_embed_config(config_file, algorithm), algorithm)
+    variant = get_variant_name(
+        algorithm, None if config_hash == default_hash else config_hash
+    )
+    return variant, config, config_hash
+
+
+def get_walk_corpus(
+    ontology_name,
+    walker_type,
+    walk_depth,
+    entities,
+    walks_per_entity=float("inf"),
+    seed=None,
+    max_cache_mb=1024,
+):
+    """Return the walks of the entities, reusing a cached corpus built with the same parameters
+
+    Args:
+        ontology_name (str): The name of the ontology
+        walker_type (str): The walker type (random or wl)
+        walk_depth (int): The depth of the walks
+        entities (list): The seed entities of the walks
+        walks_per_entity (float): The maximum number of walks per entity
+        seed (int): The seed used to sample walks
+        max_cache_mb (int): The total size allowed for cached walk corpora
+    Returns:
+        list: The walks, each a list of str
+    """
+    try:
+        key = get_walk_corpus_key(
+            get_ontology_hash(ontology_name),
+            walker_type,
+            walk_depth,
+            walks_per_entity,
+            seed,
+            entities,
+        )
+        walks = load_walk_corpus(ontology_name, key)
+        if walks is not None:
+            print("Reuse cached walk corpus of %d walks" % len(walks))
+            return walks
+
+        walks = get_rdf2vec_walks(
+            onto_file=get_path(ontology_name, ontology_name + ".owl"),
+            walker_type=walker_type,
+            walk_depth=walk_depth,
+            classes=entities,
+            kg=get_knowledge_graph(ontology_name),
+            walks_per_graph=walks_per_entity,
+            seed=seed,
+        )
+        save_walk_corpus(ontology_name, key, walks)
+        evict_walk_corpora(max_cache_mb * 1024 * 1024)
+        return walks
+
+    except Exception as e:
+        raise ModelException(f"Error in get_walk_corpus: {str(e)}")
+
+
+def get_word2vec_documents(ontology_name, config, algorithm, entities):
+    """Build the training documents of OWL2Vec-Star, OPA2Vec or Onto2Vec
+
+    Args:
+        ontology_name (str): The name of the ontology
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+        entities (list): The classes and individuals of the ontology
+    Returns:
+        list: The sentences, each a list of str
+    """
+    if algorithm == "owl2vec-star":
+        return owl2vec_star_documents(
+            ontology_name=ontology_name,
+            config=config,
+            entities=entities,
+            label_sentences=get_corpus(ontology_name, "label_words"),
+            axiom_sentences=get_corpus(ontology_name, "axioms"),
+            annotations=get_corpus(ontology_name, "annotation_words"),
+        )
+
+    # check opa2vec or onto2vec
+    corpora = ["axioms"]
+    if algorithm == "opa2vec":
+        corpora += ["annotations", "uri_labels"]
+
+    sentences = list()
+    for corpus in corpora:
+        sentences += get_corpus(ontology_name, corpus, lower=True)
+    return sentences
+
+
+def get_word2vec_params(config, algorithm):
+    """Return the Word2Vec hyperparameters of OWL2Vec-Star, OPA2Vec or Onto2Vec
+
+    Args:
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+    Returns:
+        dict: The keyword arguments of gensim.models.Word2Vec, without the workers
+    """
+    if algorithm == "owl2vec-star":
+        return {
+            "vector_size": int(config["BASIC"]["embed_size"]),
+            "window": int(config["MODEL_OWL2VECSTAR"]["window"]),
+            "sg": 1,
+            "epochs": int(config["MODEL_OWL2VECSTAR"]["iteration"]),
+            "negative": int(config["MODEL_OWL2VECSTAR"]["negative"]),
+            "min_count": int(config["MODEL_OWL2VECSTAR"]["min_count"]),
+            "seed": int(config["MODEL_OWL2VECSTAR"]["seed"]),
+        }
+    return {
+        "sg": 1 if config["MODEL_OPA2VEC_ONTO2VEC"]["model"] == "sg" else 0,
+        "min_count": int(config["MODEL_OPA2VEC_ONTO2VEC"]["mincount"]),
+        "vector_size": int(config["BASIC"]["embed_size"]),
+        "window": int(config["MODEL_OPA2VEC_ONTO2VEC"]["windsize"]),
+    }
+
+
+def get_probe_key(algorithm):
+    """Return how an algorithm names an entity in its Word2Vec vocabulary
+
+    Args:
+        algorithm (str): The name of the algorithm
+    Returns:
+        function: Maps an entity to its word
+    """
+    return str.lower if algorithm in _OPA2VEC_ONTO2VEC else str
+
+
+def fit_word2vec(ontology_name, config, algorithm, sentences):
+    """Train the Word2Vec model of OWL2Vec-Star, OPA2Vec or Onto2Vec epoch by epoch
+
+    Args:
+        ontology_name (str): The name of the ontology
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+        sentences (list): The sentences, each a list of str
+    Returns:
+        tuple: The model and its training curve, see train_epochs
+    """
+    model = gensim.models.Word2Vec(
+        workers=get_allocated_cores(), **get_word2vec_params(config, algorithm)
+    )
+    model.build_vocab(sentences)
+    curve = train_epochs(
+        model,
+        sentences,
+        config,
+        probe=get_validation_probe(ontology_name, config),
+        key=get_probe_key(algorithm),
+    )
+    return model, curve
+
+
+def get_model_meta(ontology_name, algorithm, config, config_hash, incremental=False):
+    """Build the metadata saved next to a trained model
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        config (configparser.ConfigParser): The effective configuration
+        config_hash (str): The hash of the effective configuration
+        incremental (bool): Whether the model was updated incrementally
+    Returns:
+        dict: The metadata
+    """
+    return {
+        "ontology_hash": get_ontology_hash(ontology_name),
+        "incremental": incremental,
+        "algorithm": algorithm,
+        "config_hash": config_hash,
+        "config": {
+            section: dict(config[section]) for section in ALGORITHM_SECTIONS[algorithm]
+        },
+    }
+
 
 ## Refactor code from https://github.com/KRR-Oxford/OWL2Vec-Star/tree/master/case_studies  ##
 #############################################################################################
 
 
-def opa2vec_or_onto2vec(ontology_name, config_file, algorithm):
+def opa2vec_or_onto2vec(ontology_name, config_file, algorithm, overrides=None):
     """Embedding function for OPA2Vec and Onto2Vec
 
     Args:
         ontology_name (str): The name of the ontology
         config_file (str): The path to the configuration file
-        algorithm (str): The name of the algorithm
+        algorithm (str): The name of the algorithm, or of the model variant
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
     Returns:
         str: The result of the embedding process
     """
     try:
         # get config
-        config = configparser.ConfigParser()
-        config.read(config_file)
+        config = get_embed_config(config_file, get_base_algorithm(algorithm), overrides)
 
         # retrieve file
-        files_list = ["axioms", "classes", "individuals", "uri_labels", "annotations"]
-        files = load_multi_input_files(ontology_name, files_list)
-
-        # check opa2vec or onto2vec
-        if algorithm == "opa2vec":
-            lines = files["axioms"] + files["annotations"] + files["uri_labels"]
-        else:
-            lines = files["axioms"]
-
-        sentences = [
-            [item.strip().lower() for item in line.strip().split()] for line in lines
-        ]
+        files = load_multi_input_files(ontology_name, ["classes", "individuals"])
+
+        base_algorithm = get_base_algorithm(algorithm)
+        sentences = get_word2vec_documents(
+            ontology_name,
+            config,
+            base_algorithm,
+            files["classes"] + files["individuals"],
+        )
 
         # model word2vec
-        sg_v = 1 if config["MODEL_OPA2VEC_ONTO2VEC"]["model"] == "sg" else 0
-        w2v_model = gensim.models.Word2Vec(
-            sentences,
-            sg=sg_v,
-            min_count=int(config["MODEL_OPA2VEC_ONTO2VEC"]["mincount"]),
-            vector_size=int(config["BASIC"]["embed_size"]),
-            window=int(config["MODEL_OPA2VEC_ONTO2VEC"]["windsize"]),
-            workers=multiprocessing.cpu_count(),
+        w2v_model, curve = fit_word2vec(
+            ontology_name, config, base_algorithm, sentences
         )
 
         embeddings_value = retrieval_embed_opa2vec_onto2vec(
             w2v_model, files["classes"] + files["individuals"]
         )
 
-        save_model(ontology_name, algorithm, w2v_model)
-        save_embedding(ontology_name, algorithm, embeddings_value)
+        save_model(
+            ontology_name,
+            algorithm,
+            w2v_model,
+            model_format=config["STORAGE"]["model_format"],
+            keep_walks=config["STORAGE"]["keep_walks"] == "yes",
+        )
+        save_training_curve(ontology_name, algorithm, curve)
+        save_embedding(
+            ontology_name,
+            algorithm,
+            embeddings_value,
+            classes=files["classes"],
+            individuals=files["individuals"],
+            dtype=config["STORAGE"]["embedding_dtype"],
+        )
 
         return f"{algorithm} embedded success!!"
 
@@ -81,60 +456,54 @@ def opa2vec_or_onto2vec(ontology_name, config_file, algorithm):
         raise ModelException(f"Internal server error in opa2vec_or_onto2vec: {str(e)}")
 
 
-def owl2vec_star(ontology_name, config_file, algorithm):
-    """Embedding function for OWL2Vec-Star
+def owl2vec_star_documents(
+    ontology_name, config, entities, label_sentences, axiom_sentences, annotations
+):
+    """Build the shuffled OWL2Vec-Star corpus (URI, literal and mixture documents)
 
     Args:
         ontology_name (str): The name of the ontology
-        config_file (str): The path to the configuration file
-        algorithm (str): The name of the algorithm
+        config (configparser.ConfigParser): The configuration
+        entities (list): The seed entities of the walks
+        label_sentences (list): The label_words corpus, each entity followed by the words
+            of its label
+        axiom_sentences (list): The tokenized axioms
+        annotations (list): The tokenized annotations, each entity followed by the words of
+            the annotation, see the annotation_words corpus
     Returns:
-        str: The result of the embedding process
+        list: The sentences, each a list of str
     """
-
     try:
-        # get config
-        config = configparser.ConfigParser()
-        config.read(config_file)
-
-        # retrieve file
-        files_list = ["axioms", "classes", "individuals", "uri_labels", "annotations"]
-        files = load_multi_input_files(ontology_name, files_list)
-
-        entities = files["classes"] + files["individuals"]
-
-        uri_label, annotations = dict(), list()
-
-        for line in files["uri_labels"]:
-            tmp = line.strip().split()
-            uri_label[tmp[0]] = pre_process_words(tmp[1:])
-        for line in files["annotations"]:
-            tmp = line.strip().split()
-            annotations.append(tmp)
+        uri_label = {sentence[0]: sentence[1:] for sentence in label_sentences}
 
         # structural doc
-        walk_sentences, axiom_sentences, URI_Doc = list(), list(), list()
+        walk_sentences, URI_Doc = list(), list()
         if (
             "URI_Doc" in config["DOCUMENT_OWL2VECSTAR"]
             and config["DOCUMENT_OWL2VECSTAR"]["URI_Doc"] == "yes"
         ):
             print("\nGenerate URI document ...")
-            walks_ = get_rdf2vec_walks(
-                onto_file=get_path(ontology_name, ontology_name + ".owl"),
+            walks_ = get_walk_corpus(
+                ontology_name=ontology_name,
                 walker_type=config["DOCUMENT_OWL2VECSTAR"]["walker"],
                 walk_depth=int(config["DOCUMENT_OWL2VECSTAR"]["walk_depth"]),
-                classes=entities,
+                entities=entities,
+                walks_per_entity=float(
+                    config["DOCUMENT_OWL2VECSTAR"]["walks_per_entity"]
+                ),
+                seed=int(config["MODEL_OWL2VECSTAR"]["seed"]),
+                max_cache_mb=int(config["CACHE"]["walk_cache_size_mb"]),
             )
             print(
                 "Extracted %d walks for %d seed entities" % (len(walks_), len(entities))
             )
-            walk_sentences += [list(map(str, x)) for x in walks_]
+            walk_sentences += walks_
 
-            for line in files["axioms"]:
-                axiom_sentence = [item for item in line.strip().split()]
-                axiom_sentences.append(axiom_sentence)
             print("Extracted %d axiom sentences" % len(axiom_sentences))
             URI_Doc = walk_sentences + axiom_sentences
+        else:
+            # the axioms only feed the literal and mixture documents along with the URI one
+            axiom_sentences = list()
 
         def label_item(item):
             if item in uri_label:
@@ -154,9 +523,8 @@ def owl2vec_star(ontology_name, config_file, algorithm):
         ):
             print("\nGenerate literal document ...")
             for annotation in annotations:
-                processed_words = pre_process_words(annotation[1:])
-                if len(processed_words) > 0:
-                    Lit_Doc.append(label_item(item=annotation[0]) + processed_words)
+                if len(annotation) > 1:
+                    Lit_Doc.append(label_item(item=annotation[0]) + annotation[1:])
             print("Extracted %d annotation sentences" % len(Lit_Doc))
 
             for sentence in walk_sentences:
@@ -205,26 +573,61 @@ def owl2vec_star(ontology_name, config_file, algorithm):
 
         random.shuffle(all_doc)
 
+        return all_doc
+
+    except Exception as e:
+        raise ModelException(f"Error in owl2vec_star_documents: {str(e)}")
+
+
+def owl2vec_star(ontology_name, config_file, algorithm, overrides=None):
+    """Embedding function for OWL2Vec-Star
+
+    Args:
+        ontology_name (str): The name of the ontology
+        config_file (str): The path to the configuration file
+        algorithm (str): The name of the algorithm, or of the model variant
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+    Returns:
+        str: The result of the embedding process
+    """
+
+    try:
+        # get config
+        config = get_embed_config(config_file, get_base_algorithm(algorithm), overrides)
+
+        # retrieve file
+        files = load_multi_input_files(ontology_name, ["classes", "individuals"])
+
+        entities = files["classes"] + files["individuals"]
+
+        all_doc = get_word2vec_documents(
+            ontology_name, config, "owl2vec-star", entities
+        )
+
         # word2vec model
         print("\nTrain the embedding model ...")
-        model_ = gensim.models.Word2Vec(
-            all_doc,
-            vector_size=int(config["BASIC"]["embed_size"]),
-            window=int(config["MODEL_OWL2VECSTAR"]["window"]),
-            workers=multiprocessing.cpu_count(),
-            sg=1,
-            epochs=int(config["MODEL_OWL2VECSTAR"]["iteration"]),
-            negative=int(config["MODEL_OWL2VECSTAR"]["negative"]),
-            min_count=int(config["MODEL_OWL2VECSTAR"]["min_count"]),
-            seed=int(config["MODEL_OWL2VECSTAR"]["seed"]),
-        )
+        model_, curve = fit_word2vec(ontology_name, config, "owl2vec-star", all_doc)
 
         embeddings = retrieval_embed_owl2vec(
             model_, files["classes"] + files["individuals"]
         )
 
-        save_model(ontology_name, algorithm, model_)
-        save_embedding(ontology_name, algorithm, embeddings)
+        save_model(
+            ontology_name,
+            algorithm,
+            model_,
+            model_format=config["STORAGE"]["model_format"],
+            keep_walks=config["STORAGE"]["keep_walks"] == "yes",
+        )
+        save_training_curve(ontology_name, algorithm, curve)
+        save_embedding(
+            ontology_name,
+            algorithm,
+            embeddings,
+            classes=files["classes"],
+            individuals=files["individuals"],
+            dtype=config["STORAGE"]["embedding_dtype"],
+        )
         return f"{algorithm} embedded success!!"
 
     except FileNotFoundError:
@@ -234,20 +637,20 @@ def owl2vec_star(ontology_name, config_file, algorithm):
         raise ModelException(f"Internal server error in owl2vec_star: {str(e)}")
 
 
-def rdf2vec(ontology_name, config_file, algorithm):
+def rdf2vec(ontology_name, config_file, algorithm, overrides=None):
     """Embedding function for RDF2Vec
 
     Args:
         ontology_name (str): The name of the ontology
         config_file (str): The path to the configuration file
-        algorithm (str): The name of the algorithm
+        algorithm (str): The name of the algorithm, or of the model variant
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
     Returns:
         str: The result of the embedding process
     """
     try:
         # get config
-        config = configparser.ConfigParser()
-        config.read(config_file)
+        config = get_embed_config(config_file, get_base_algorithm(algorithm), overrides)
 
         # retrieve file
         files_list = ["classes", "individuals"]
@@ -255,16 +658,48 @@ def rdf2vec(ontology_name, config_file, algorithm):
 
         entities = files["classes"] + files["individuals"]
 
+        walks = get_walk_corpus(
+            ontology_name=ontology_name,
+            walker_type=config["MODEL_RDF2VEC"]["walker"],
+            walk_depth=int(config["MODEL_RDF2VEC"]["walk_depth"]),
+            entities=entities,
+            walks_per_entity=float(config["MODEL_RDF2VEC"]["walks_per_entity"]),
+            seed=int(config["MODEL_RDF2VEC"]["seed"]),
+            max_cache_mb=int(config["CACHE"]["walk_cache_size_mb"]),
+        )
+
         embeddings, model_rdf2vec = get_rdf2vec_embed(
             onto_file=get_path(ontology_name, ontology_name + ".owl"),
             walker_type=config["MODEL_RDF2VEC"]["walker"],
             walk_depth=int(config["MODEL_RDF2VEC"]["walk_depth"]),
             embed_size=int(config["BASIC"]["embed_size"]),
             classes=entities,
+            walks=walks,
+            n_jobs=get_allocated_cores(),
+            trainer=lambda model, sentences: train_epochs(
+                model, sentences, config, get_validation_probe(ontology_name, config)
+            ),
         )
 
-        save_model(ontology_name, algorithm, model_rdf2vec)
-        save_embedding(ontology_name, algorithm, embeddings)
+        save_model(
+            ontology_name,
+            algorithm,
+            model_rdf2vec,
+            model_format=config["STORAGE"]["model_format"],
+            keep_walks=config["STORAGE"]["keep_walks"] == "yes",
+            walks=walks,
+        )
+        curve = getattr(model_rdf2vec, "training_curve_", None)
+        if curve is not None:
+            save_training_curve(ontology_name, algorithm, curve)
+        save_embedding(
+            ontology_name,
+            algorithm,
+            embeddings,
+            classes=files["classes"],
+            individuals=files["individuals"],
+            dtype=config["STORAGE"]["embedding_dtype"],
+        )
         return f"{algorithm} embedded success!!"
 
     except FileNotFoundError as e:
@@ -278,24 +713,152 @@ def rdf2vec(ontology_name, config_file, algorithm):
 #############################################################################################
 
 
-def embed_func(ontology_name, algorithm):
+def incremental_embed(ontology_name, config_file, algorithm, overrides=None):
+    """Update the model of the previously uploaded revision with the changes of the new one
+
+    Only the sentences and walks touched by the diff between the revisions are generated,
+    then the saved model continues training on them with an updated vocabulary.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        config_file (str): The path to the configuration file
+        algorithm (str): The name of the algorithm, or of the model variant
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+    Returns:
+        str: The result of the embedding process, or None if a full training is needed
+    """
+    try:
+        # get config
+        config = get_embed_config(config_file, get_base_algorithm(algorithm), overrides)
+
+        if config["INCREMENTAL"]["enabled"] != "yes":
+            return None
+
+        model = load_previous_model(ontology_name, algorithm)
+        if model is None:
+            return None
+
+        diff = diff_revisions(ontology_name)
+        if diff is None or diff["changed_ratio"] > float(
+            config["INCREMENTAL"]["max_changed_ratio"]
+        ):
+            return None
+
+        print(
+            "\nIncremental update of %s: %d changed entities (%.1f%% of lines)"
+            % (algorithm, len(diff["entities"]), 100 * diff["changed_ratio"])
+        )
+        epochs = int(config["INCREMENTAL"]["epochs"])
+        files = load_multi_input_files(ontology_name, REVISION_FILES)
+        instances = files["classes"] + files["individuals"]
+
+        base_algorithm = get_base_algorithm(algorithm)
+        # the walks RDF2Vec continues training on, written with the model by keep_walks
+        walks = None
+        if base_algorithm in ("opa2vec", "onto2vec"):
+            lines = diff["axioms"]["added"]
+            if base_algorithm == "opa2vec":
+                lines = (
+                    lines + diff["annotations"]["added"] + diff["uri_labels"]["added"]
+                )
+            sentences = [
+                [item.lower() for item in sentence]
+                for sentence in tokenize_lines(lines, "split")
+            ]
+            continue_training(model, sentences, epochs, workers=get_allocated_cores())
+            embeddings = retrieval_embed_opa2vec_onto2vec(model, instances)
+
+        elif base_algorithm == "owl2vec-star":
+            roots = affected_walk_roots(
+                ontology_name,
+                diff,
+                walker_type=config["DOCUMENT_OWL2VECSTAR"]["walker"],
+                walk_depth=int(config["DOCUMENT_OWL2VECSTAR"]["walk_depth"]),
+                instances=instances,
+            )
+            sentences = owl2vec_star_documents(
+                ontology_name=ontology_name,
+                config=config,
+                entities=roots,
+                label_sentences=get_corpus(ontology_name, "label_words"),
+                axiom_sentences=tokenize_lines(diff["axioms"]["added"], "split"),
+                annotations=tokenize_lines(diff["annotations"]["added"], "words"),
+            )
+            continue_training(model, sentences, epochs, workers=get_allocated_cores())
+            embeddings = retrieval_embed_owl2vec(model, instances)
+
+        else:
+            roots = affected_walk_roots(
+                ontology_name,
+                diff,
+                walker_type=config["MODEL_RDF2VEC"]["walker"],
+                walk_depth=int(config["MODEL_RDF2VEC"]["walk_depth"]),
+                instances=instances,
+            )
+            walks = get_walk_corpus(
+                ontology_name=ontology_name,
+                walker_type=config["MODEL_RDF2VEC"]["walker"],
+                walk_depth=int(config["MODEL_RDF2VEC"]["walk_depth"]),
+                entities=roots,
+                walks_per_entity=float(config["MODEL_RDF2VEC"]["walks_per_entity"]),
+                seed=int(config["MODEL_RDF2VEC"]["seed"]),
+                max_cache_mb=int(config["CACHE"]["walk_cache_size_mb"]),
+            )
+            continue_training(
+                model.model_, walks, epochs, workers=get_allocated_cores()
+            )
+            embeddings = np.array(model.transform(instances))
+
+        save_model(
+            ontology_name,
+            algorithm,
+            model,
+            model_format=config["STORAGE"]["model_format"],
+            keep_walks=config["STORAGE"]["keep_walks"] == "yes",
+            walks=walks,
+        )
+        save_embedding(
+            ontology_name,
+            algorithm,
+            embeddings,
+            classes=files["classes"],
+            individuals=files["individuals"],
+            dtype=config["STORAGE"]["embedding_dtype"],
+        )
+        return f"{algorithm} embedded incrementally success!!"
+
+    except FileNotFoundError as e:
+        raise FileException(f"File not found error in incremental_embed: {str(e)}", 404)
+
+    except Exception as e:
+        raise ModelException(f"Internal server error in incremental_embed: {str(e)}")
+
+
+def embed_func(ontology_name, algorithm, overrides=None):
     """Embedding function for the given algorithm and ontology
 
+    Models trained with hyperparameter overrides are stored as variants next to the default
+    model, see get_embed_variant.
+
     Args:
         ontology_name (str): The name of the ontology
         algorithm (str): The name of the algorithm
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
     Returns:
         str: The result of the embedding process
     """
+    # get config file, unsupported algorithms and invalid overrides are rejected here
+    config_file = CONFIG_FILE
+    variant, config, config_hash = get_embed_variant(algorithm, overrides, config_file)
+
     try:
         # check if system have ontology file and algorithm so that it can directly return the result
-        if isModelExist(ontology_name, algorithm):
-            result = f"{algorithm} model already exists for {ontology_name} ontology"
+        if isModelExist(ontology_name, variant) and isModelCurrent(
+            ontology_name, variant, config_hash
+        ):
+            result = f"{variant} model already exists for {ontology_name} ontology"
             return result
 
-        # get config file
-        config_file = os.path.join("controllers", "default.cfg")
-
         # embedding algorithms
         algorithms = {
             "owl2vec-star": owl2vec_star,
@@ -304,18 +867,26 @@ def embed_func(ontology_name, algorithm):
             "onto2vec": opa2vec_or_onto2vec,
         }
 
-        if algorithm in algorithms:
+        result = incremental_embed(
+            ontology_name=ontology_name,
+            config_file=config_file,
+            algorithm=variant,
+            overrides=overrides,
+        )
+        incremental = result is not None
+        if not incremental:
             result = algorithms[algorithm](
                 ontology_name=ontology_name,
                 config_file=config_file,
-                algorithm=algorithm,
+                algorithm=variant,
+                overrides=overrides,
             )
-            return result
-        else:
-            raise ValueError(f"Unsupported algorithm: {algorithm}")
-
-    except ValueError as e:
-        raise ModelException(str(e))
+        save_model_meta(
+            ontology_name,
+            variant,
+            get_model_meta(ontology_name, algorithm, config, config_hash, incremental),
+        )
+        return result
 
     except FileNotFoundError as e:
         raise FileException(f"File not found error in embed_func: {str(e)}", 404)
@@ -324,7 +895,51 @@ def embed_func(ontology_name, algorithm):
         raise ModelException(f"Internal server error in embed_func: {str(e)}")
 
 
-def retrieval_embed_owl2vec(model: gensim.models.Word2Vec, instances):
+def migrate_model_artifacts(ontology_name=None, model_format=None):
+    """Rewrite the saved models of every algorithm folder in the configured format
+
+    Models saved before the [STORAGE] options existed keep the trainable weights and, for
+    RDF2Vec, every walk. Migrating drops the walks and, in slim format, the weights.
+
+    Args:
+        ontology_name (str): Only migrate the models of this ontology
+        model_format (str): The format to rewrite the models in, [STORAGE] model_format by default
+    Returns:
+        list: For every migrated model the ontology, the algorithm and the size in bytes
+            of its files before and after
+    """
+    try:
+        config = configparser.ConfigParser()
+        config.read(CONFIG_FILE)
+        model_format = model_format or config["STORAGE"]["model_format"]
+        keep_walks = config["STORAGE"]["keep_walks"] == "yes"
+
+        migrated = list()
+        ontologies = [ontology_name] if ontology_name else list_ontology()
+        for ontology in ontologies:
+            for folder in sorted(os.listdir(get_path(ontology))):
+                if get_base_algorithm(folder) not in ALGORITHM_SECTIONS:
+                    continue
+                sizes = migrate_model(ontology, folder, model_format, keep_walks)
+                if sizes is not None:
+                    print(
+                        f"Migrated {ontology}/{folder}: {sizes[0]} -> {sizes[1]} bytes"
+                    )
+                    migrated.append(
+                        {
+                            "ontology": ontology,
+                            "algorithm": folder,
+                            "before": sizes[0],
+                            "after": sizes[1],
+                        }
+                    )
+        return migrated
+
+    except Exception as e:
+        raise ModelException(f"Error in migrate_model_artifacts: {str(e)}")
+
+
+def retrieval_embed_owl2vec(model: "gensim.models.Word2Vec", instances):
     """Embed instances using the given model
 
     Args:
@@ -350,7 +965,7 @@ def retrieval_embed_owl2vec(model: gensim.models.Word2Vec, instances):
         raise ModelException(f"Error in retrieval_embed_owl2vec {str(e)}") from e
 
 
-def retrieval_embed_opa2vec_onto2vec(model: gensim.models.Word2Vec, instances):
+def retrieval_embed_opa2vec_onto2vec(model: "gensim.models.Word2Vec", instances):
     """Embed instances using the given model
 
     Args:
@@ -0,0 +1,740 @@
+import configparser
+import math
+import os
+
+import numpy as np
+
+from controllers.embed_controller import (
+    get_embed_config,
+    get_embed_variant,
+    get_word2vec_params,
+)
+from controllers.resource_controller import get_resource_config
+from models.corpus_model import get_corpus
+from models.embed_model import load_model_meta
+from models.extract_model import load_multi_input_files
+from models.manifest_model import get_manifest
+from models.knowledge_graph_model import get_knowledge_graph
+from owl2vec_star.rdf2vec.walkers.weisfeiler_lehman import WeisfeilerLehmanWalker
+from utils.directory_utils import get_base_algorithm, get_path
+from utils.exceptions import ModelException
+
+CONFIG_FILE = os.path.join("controllers", "default.cfg")
+
+# limits of [LIMITS] checked against the estimate of each operation
+EMBED_LIMITS = ("max_sentences", "max_tokens", "max_train_seconds", "max_rss_mb")
+EVALUATE_LIMITS = ("max_evaluate_seconds", "max_rss_mb")
+
+# Word2Vec hyperparameters of RDF2VecTransformer, which the configuration does not set
+RDF2VEC_PARAMS = {"window": 5, "sg": 1, "epochs": 10, "negative": 25}
+
+# gensim defaults of the hyperparameters get_word2vec_params may leave out
+WORD2VEC_DEFAULTS = {"window": 5, "sg": 0, "epochs": 5, "negative": 5}
+
+# memory of the Python objects held while training: a list slot per token, a list per
+# sentence, and a string, a vocabulary entry and the counts of gensim per distinct word
+BYTES_PER_TOKEN = 8
+BYTES_PER_SENTENCE = 72
+BYTES_PER_WORD = 300
+
+# arithmetic of the classifiers, as functions of the training samples n and the features d:
+# (operations to fit, operations to score one candidate row, bytes of the fitted model)
+CLASSIFIER_COSTS = {
+    # up to 100 L-BFGS iterations
+    "logistic-regression": (
+        lambda n, d: 200 * n * d,
+        lambda n, d: d,
+        lambda n, d: 8 * d,
+    ),
+    # a few epochs of stochastic gradient descent after scaling the features
+    "sgd-log": (
+        lambda n, d: 20 * n * d,
+        lambda n, d: 3 * d,
+        lambda n, d: 24 * d,
+    ),
+    # five calibrated linear SVMs of cross-validation
+    "linear-svc": (
+        lambda n, d: 100 * n * d,
+        lambda n, d: 5 * d,
+        lambda n, d: 40 * d,
+    ),
+    # an RBF SVM, fitted again five times for its probabilities, on about half the samples
+    # as support vectors
+    "svm": (
+        lambda n, d: 6 * n * n * d,
+        lambda n, d: n * d / 2,
+        lambda n, d: 4 * n * d + 200 * 1024 * 1024,
+    ),
+    "decision-tree": (
+        lambda n, d: n * max(1, math.log2(n)) * d,
+        lambda n, d: max(1, math.log2(n)),
+        lambda n, d: 200 * n,
+    ),
+    # 200 trees on the square root of the features
+    "random-forest": (
+        lambda n, d: 200 * n * max(1, math.log2(n)) * math.sqrt(d),
+        lambda n, d: 200 * max(1, math.log2(n)),
+        lambda n, d: 200 * 200 * n,
+    ),
+    # 200 hidden units, stopping after about 200 of its 1000 iterations
+    "mlp": (
+        lambda n, d: 200 * 2 * n * d * 200,
+        lambda n, d: 200 * d,
+        lambda n, d: 3 * 8 * 200 * d,
+    ),
+}
+
+
+def get_estimate_config(config_file=CONFIG_FILE):
+    """Read the [LIMITS] section of the configuration
+
+    Args:
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The "limits" of the operations (0 for no limit) and the throughput the
+            estimates are calibrated with
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    section = config["LIMITS"]
+    return {
+        "limits": {
+            name: float(section[name])
+            for name in sorted(set(EMBED_LIMITS + EVALUATE_LIMITS))
+        },
+        "train_words_per_second": float(section["train_words_per_second"]),
+        "evaluate_ops_per_second": float(section["evaluate_ops_per_second"]),
+        "evaluate_ranks_per_second": float(section["evaluate_ranks_per_second"]),
+        "base_rss_mb": float(section["base_rss_mb"]),
+    }
+
+
+def walk_statistics(kg, entities, walk_depth):
+    """Count the exhaustive walks of every entity without extracting them
+
+    A walk alternates vertices and edges, like the walks of RandomWalker: starting from the
+    root, every step extends it with one outgoing edge of its last vertex or with the object
+    of its last edge, and a walk ending on a vertex without outgoing edges stops early. A walk
+    ending on an edge only shows its predicate, so the edges of a vertex sharing a predicate
+    end a single walk. The walks are counted backwards over the CSR arrays, one step at a time.
+
+    Args:
+        kg (CSRKnowledgeGraph): The knowledge graph
+        entities (list): The seed entities of the walks
+        walk_depth (int): The depth of the walks
+    Returns:
+        dict: For every entity, the number of its walks ("walks"), of their tokens ("tokens")
+            and the sum of the squares of their lengths ("squares"), as float arrays, with
+            whether it has a walk going past its first edge ("deep")
+    """
+    n_vertices = kg.n_vertices
+    indptr = np.asarray(kg.indptr)
+    objects = np.asarray(kg.objects)
+    leaf = np.diff(indptr) == 0
+    subjects = kg.subjects()
+    _, duplicates, shared = np.unique(
+        subjects.astype(np.int64) * n_vertices + np.asarray(kg.predicates),
+        return_inverse=True,
+        return_counts=True,
+    )
+
+    # walks, tokens and squared lengths of the walks that start on every vertex and edge
+    # with the remaining steps, prepending a hop adds one token to every walk
+    vertex = [np.ones(n_vertices) for _ in range(3)]
+    edge = [1.0 / shared[duplicates] for _ in range(3)]
+    for _ in range(int(walk_depth)):
+        count, tokens, squares = (
+            np.bincount(subjects, weights=values, minlength=n_vertices)
+            for values in (edge[0], edge[0] + edge[1], edge[2] + 2 * edge[1] + edge[0])
+        )
+        previous = [values[objects] for values in vertex]
+        vertex = [np.where(leaf, 1.0, values) for values in (count, tokens, squares)]
+        edge = [
+            previous[0],
+            previous[0] + previous[1],
+            previous[2] + 2 * previous[1] + previous[0],
+        ]
+
+    # entities absent from the graph have the single walk of their root
+    roots = np.array([kg.vertex_id(str(entity)) for entity in entities], dtype=np.int64)
+    present = roots >= 0
+    statistics = dict()
+    for name, values in zip(("walks", "tokens", "squares"), vertex):
+        per_entity = np.ones(len(roots))
+        per_entity[present] = values[roots[present]]
+        statistics[name] = per_entity
+    statistics["deep"] = np.zeros(len(roots), dtype=bool)
+    if int(walk_depth) > 1:
+        statistics["deep"][present] = ~leaf[roots[present]]
+    return statistics
+
+
+def count_walks(statistics, walks_per_entity=float("inf"), wl_iterations=0):
+    """Total the walks of the entities, as sampled by the walkers
+
+    Args:
+        statistics (dict): The walks of every entity, see walk_statistics
+        walks_per_entity (float): The maximum number of walks per entity
+        wl_iterations (int): The Weisfeiler-Lehman iterations of the walker, every walk
+            going past its first edge is relabelled once per iteration
+    Returns:
+        dict: The number of walks, their tokens and the sum of the squares of their lengths,
+            at most those of the walkers when walks are sampled
+    """
+    walks = statistics["walks"]
+    kept = np.minimum(walks, walks_per_entity)
+    # sampled walks have the average length of the walks of their entity
+    ratio = kept / walks
+    repeats = np.where(statistics["deep"], wl_iterations + 1, 1)
+    return {
+        "walks": float(np.sum(kept * repeats)),
+        "tokens": float(np.sum(statistics["tokens"] * ratio * repeats)),
+        "squares": float(np.sum(statistics["squares"] * ratio * repeats)),
+    }
+
+
+def sentence_statistics(sentences):
+    """Count the sentences of a corpus, their tokens and the squares of their lengths
+
+    Args:
+        sentences (list): The sentences, each a list of str
+    Returns:
+        dict: The number of sentences, tokens and the sum of the squares of their lengths
+    """
+    lengths = np.fromiter((len(sentence) for sentence in sentences), dtype=np.float64)
+    return {
+        "sentences": float(len(lengths)),
+        "tokens": float(lengths.sum()),
+        "squares": float(np.square(lengths).sum()),
+    }
+
+
+def get_wl_iterations(walker_type, walk_depth):
+    """Return the Weisfeiler-Lehman iterations of a walker
+
+    Args:
+        walker_type (str): The walker type (random or wl)
+        walk_depth (int): The depth of the walks
+    Returns:
+        int: The iterations, 0 for the random walker
+    """
+    if walker_type.lower() != "wl":
+        return 0
+    return WeisfeilerLehmanWalker(int(walk_depth), float("inf")).wl_iterations
+
+
+def get_walk_options(config, algorithm):
+    """Return the section configuring the walks of an algorithm
+
+    Args:
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+    Returns:
+        configparser.SectionProxy: The section, or None if the algorithm walks no graph
+    """
+    if algorithm == "rdf2vec":
+        return config["MODEL_RDF2VEC"]
+    if (
+        algorithm == "owl2vec-star"
+        and config["DOCUMENT_OWL2VECSTAR"].get("URI_Doc") == "yes"
+    ):
+        return config["DOCUMENT_OWL2VECSTAR"]
+    return None
+
+
+def get_corpus_statistics(ontology_name, algorithm, config):
+    """Measure the extracted artifacts the documents of an algorithm are built from
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        config (configparser.ConfigParser): The effective configuration
+    Returns:
+        dict: The statistics read by estimate_corpus
+    """
+    statistics = dict()
+    words = set()
+    walk_options = get_walk_options(config, algorithm)
+    if walk_options is not None:
+        files = load_multi_input_files(ontology_name, ["classes", "individuals"])
+        kg = get_knowledge_graph(ontology_name)
+        statistics["walks"] = walk_statistics(
+            kg,
+            files["classes"] + files["individuals"],
+            int(walk_options["walk_depth"]),
+        )
+        statistics["graph"] = {"vertices": kg.n_vertices, "edges": kg.n_edges}
+        words.update(kg.name_list())
+
+    if algorithm == "owl2vec-star":
+        labels = get_corpus(ontology_name, "label_words")
+        annotations = [
+            sentence
+            for sentence in get_corpus(ontology_name, "annotation_words")
+            if len(sentence) > 1
+        ]
+        axioms = get_corpus(ontology_name, "axioms")
+        statistics["axioms"] = sentence_statistics(axioms)
+        statistics["annotations"] = sentence_statistics(annotations)
+        # an entity without a label is written as the words of its URI
+        statistics["label_words"] = max(
+            1.0,
+            (
+                float(np.mean([len(sentence) - 1 for sentence in labels]))
+                if labels
+                else 1.0
+            ),
+        )
+        for corpus in (labels, annotations, axioms):
+            for sentence in corpus:
+                words.update(sentence)
+    elif algorithm in ("opa2vec", "onto2vec"):
+        corpora = ["axioms"]
+        if algorithm == "opa2vec":
+            corpora += ["annotations", "uri_labels"]
+        sentences = list()
+        for corpus in corpora:
+            sentences += get_corpus(ontology_name, corpus, lower=True)
+        statistics["corpus"] = sentence_statistics(sentences)
+        for sentence in sentences:
+            words.update(sentence)
+
+    statistics["words"] = len(words)
+    return statistics
+
+
+def estimate_corpus(statistics, algorithm, config):
+    """Estimate the size of the documents of an algorithm from the statistics of its artifacts
+
+    Args:
+        statistics (dict): The statistics, see get_corpus_statistics
+        algorithm (str): The name of the algorithm
+        config (configparser.ConfigParser): The effective configuration
+    Returns:
+        dict: The number of "sentences", "tokens", the "vocabulary" size and the sentences of
+            every document
+    """
+    walks = {"walks": 0.0, "tokens": 0.0, "squares": 0.0}
+    walk_options = get_walk_options(config, algorithm)
+    if walk_options is not None:
+        walks = count_walks(
+            statistics["walks"],
+            float(walk_options["walks_per_entity"]),
+            get_wl_iterations(walk_options["walker"], walk_options["walk_depth"]),
+        )
+
+    documents = dict()
+    if algorithm == "rdf2vec":
+        documents["walks"] = (walks["walks"], walks["tokens"])
+    elif algorithm == "owl2vec-star":
+        options = config["DOCUMENT_OWL2VECSTAR"]
+        label = statistics["label_words"]
+        # the axioms only feed the literal and mixture documents along with the URI one
+        structure = {"sentences": 0.0, "tokens": 0.0, "squares": 0.0}
+        if walk_options is not None:
+            structure = {
+                "sentences": walks["walks"] + statistics["axioms"]["sentences"],
+                "tokens": walks["tokens"] + statistics["axioms"]["tokens"],
+                "squares": walks["squares"] + statistics["axioms"]["squares"],
+            }
+            documents["URI_Doc"] = (structure["sentences"], structure["tokens"])
+        if options.get("Lit_Doc") == "yes":
+            annotations = statistics["annotations"]
+            documents["Lit_Doc"] = (
+                annotations["sentences"] + structure["sentences"],
+                annotations["tokens"]
+                + annotations["sentences"] * (label - 1)
+                + structure["tokens"] * label,
+            )
+        if options.get("Mix_Doc") == "yes":
+            if options["Mix_Type"] == "all":
+                # a sentence of every length L gives L sentences keeping one item each
+                documents["Mix_Doc"] = (
+                    structure["tokens"],
+                    structure["tokens"]
+                    + (structure["squares"] - structure["tokens"]) * label,
+                )
+            elif options["Mix_Type"] == "random":
+                documents["Mix_Doc"] = (
+                    structure["sentences"],
+                    structure["tokens"] * label - structure["sentences"] * (label - 1),
+                )
+    else:
+        documents["corpus"] = (
+            statistics["corpus"]["sentences"],
+            statistics["corpus"]["tokens"],
+        )
+
+    sentences = sum(sentences for sentences, _ in documents.values())
+    tokens = sum(tokens for _, tokens in documents.values())
+    vocabulary = statistics["words"]
+    if walk_options is not None and walk_options["walker"].lower() == "wl":
+        # every Weisfeiler-Lehman iteration relabels the vertices of the walks
+        iterations = get_wl_iterations(
+            walk_options["walker"], walk_options["walk_depth"]
+        )
+        vocabulary += statistics["graph"]["vertices"] * iterations
+    return {
+        "sentences": int(round(sentences)),
+        "tokens": int(round(tokens)),
+        "vocabulary": int(min(vocabulary, round(tokens))),
+        "documents": {name: int(round(size[0])) for name, size in documents.items()},
+    }
+
+
+def get_training_params(config, algorithm):
+    """Return the Word2Vec hyperparameters an algorithm trains with
+
+    Args:
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+    Returns:
+        dict: The vector_size, window, sg, epochs and negative of the model
+    """
+    if algorithm == "rdf2vec":
+        params = dict(RDF2VEC_PARAMS, vector_size=int(config["BASIC"]["embed_size"]))
+    else:
+        params = dict(WORD2VEC_DEFAULTS, **get_word2vec_params(config, algorithm))
+    return {
+        name: params[name]
+        for name in ("vector_size", "window", "sg", "epochs", "negative")
+    }
+
+
+def estimate_training(corpus, params, workers, estimate_config, statistics):
+    """Estimate the training time and the peak memory of a Word2Vec model
+
+    Args:
+        corpus (dict): The size of the documents, see estimate_corpus
+        params (dict): The hyperparameters, see get_training_params
+        workers (int): The worker threads of the training
+        estimate_config (dict): The [LIMITS] configuration, see get_estimate_config
+        statistics (dict): The statistics of the artifacts, see get_corpus_statistics
+    Returns:
+        dict: The "train_seconds" of the largest number of epochs and the "peak_rss_mb"
+    """
+    # skip-gram predicts every word of the window from the centre word, CBOW predicts the
+    # centre word once from their average; relative to skip-gram with window 5 and 5 negative
+    # samples, which train_words_per_second is measured with
+    negative = params["negative"] + 1
+    if params["sg"]:
+        work = (params["window"] + 1) * negative
+    else:
+        work = negative + params["window"] + 1
+    train_seconds = (
+        corpus["tokens"]
+        * params["epochs"]
+        * work
+        / 36
+        / (estimate_config["train_words_per_second"] * max(1, workers))
+    )
+
+    # the input and output weights of the vocabulary, in float32
+    model_bytes = corpus["vocabulary"] * params["vector_size"] * 4 * 2
+    corpus_bytes = (
+        corpus["tokens"] * BYTES_PER_TOKEN + corpus["sentences"] * BYTES_PER_SENTENCE
+    )
+    words_bytes = corpus["vocabulary"] * BYTES_PER_WORD
+    # the CSR arrays and the adjacency lists the walkers read
+    graph_bytes = 0
+    if "graph" in statistics:
+        graph = statistics["graph"]
+        graph_bytes = (graph["vertices"] + graph["edges"]) * (16 + 36)
+    rss_bytes = model_bytes + corpus_bytes + words_bytes + graph_bytes
+    return {
+        "train_seconds": round(train_seconds, 1),
+        "peak_rss_mb": round(estimate_config["base_rss_mb"] + rss_bytes / 2**20, 1),
+    }
+
+
+def exceeded_limits(estimate, names, limits):
+    """List the limits an estimate exceeds
+
+    Args:
+        estimate (dict): The values of the estimate checked by each limit
+        names (tuple): The names of the limits to check
+        limits (dict): The limits, 0 for no limit
+    Returns:
+        list: The names of the exceeded limits
+    """
+    return [
+        name for name in names if limits[name] > 0 and estimate[name] > limits[name]
+    ]
+
+
+def require_extraction(ontology_name):
+    """Check that the artifacts an estimate reads were extracted
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        None
+    """
+    if not os.path.exists(get_path(ontology_name, "classes.txt")):
+        raise ModelException(f"Extract {ontology_name} before estimating it", 404)
+
+
+def _embed_checks(corpus, training):
+    return {
+        "max_sentences": corpus["sentences"],
+        "max_tokens": corpus["tokens"],
+        "max_train_seconds": training["train_seconds"],
+        "max_rss_mb": training["peak_rss_mb"],
+    }
+
+
+def suggest_walks_per_entity(statistics, algorithm, config, estimate_config, workers):
+    """Find the largest walks_per_entity whose estimate is within the limits
+
+    Args:
+        statistics (dict): The statistics of the artifacts, see get_corpus_statistics
+        algorithm (str): The name of the algorithm
+        config (configparser.ConfigParser): The effective configuration
+        estimate_config (dict): The [LIMITS] configuration, see get_estimate_config
+        workers (int): The worker threads of the training
+    Returns:
+        int: The walks per entity, or None if even one walk per entity exceeds the limits
+    """
+    walk_options = get_walk_options(config, algorithm)
+    params = get_training_params(config, algorithm)
+    current = float(walk_options["walks_per_entity"])
+
+    def fits(walks_per_entity):
+        walk_options["walks_per_entity"] = str(walks_per_entity)
+        corpus = estimate_corpus(statistics, algorithm, config)
+        training = estimate_training(
+            corpus, params, workers, estimate_config, statistics
+        )
+        return not exceeded_limits(
+            _embed_checks(corpus, training), EMBED_LIMITS, estimate_config["limits"]
+        )
+
+    try:
+        low = 1
+        high = int(min(current - 1, statistics["walks"]["walks"].max()))
+        if high < low or not fits(low):
+            return None
+        while low < high:
+            middle = (low + high + 1) // 2
+            if fits(middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+    finally:
+        walk_options["walks_per_entity"] = (
+            "inf" if math.isinf(current) else str(int(current))
+        )
+
+
+def estimate_embed(ontology_name, algorithm, overrides=None, config_file=CONFIG_FILE):
+    """Estimate the documents, training time and peak memory of an embedding, without
+    building it
+
+    The walks are counted on the knowledge graph and the other documents are measured on the
+    tokenized corpora of the extraction. Times are calibrated with the throughput of
+    [LIMITS] and are upper bounds when early stopping ends the training sooner.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The estimate, the limits it exceeds, and the overrides suggested to fit them
+    """
+    variant, config, _ = get_embed_variant(algorithm, overrides, config_file)
+    estimate_config = get_estimate_config(config_file)
+    workers = get_resource_config(config_file)["cores"]["embed"]
+    require_extraction(ontology_name)
+
+    try:
+        statistics = get_corpus_statistics(ontology_name, algorithm, config)
+        corpus = estimate_corpus(statistics, algorithm, config)
+        params = get_training_params(config, algorithm)
+        training = estimate_training(
+            corpus, params, workers, estimate_config, statistics
+        )
+        exceeded = exceeded_limits(
+            _embed_checks(corpus, training), EMBED_LIMITS, estimate_config["limits"]
+        )
+
+        suggested = None
+        if exceeded and get_walk_options(config, algorithm) is not None:
+            walks_per_entity = suggest_walks_per_entity(
+                statistics, algorithm, config, estimate_config, workers
+            )
+            if walks_per_entity is not None:
+                suggested = dict(overrides or {}, walks_per_entity=walks_per_entity)
+
+        return {
+            "variant": variant,
+            "corpus": corpus,
+            "epochs": params["epochs"],
+            "workers": workers,
+            **training,
+            "exceeded_limits": exceeded,
+            "suggested_overrides": suggested,
+        }
+
+    except FileNotFoundError:
+        raise ModelException(f"Extract {ontology_name} before estimating it", 404)
+    except Exception as e:
+        raise ModelException(f"Internal server error in estimate_embed: {str(e)}")
+
+
+def count_lines(path):
+    """Count the lines of a file without decoding it
+
+    Args:
+        path (str): The path of the file
+    Returns:
+        int: The number of lines
+    """
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
+
+
+def get_embed_size(ontology_name, algorithm, overrides=None, config_file=CONFIG_FILE):
+    """Return the size of the vectors a model variant has or will have
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm or model variant
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+        config_file (str): The path of the configuration file
+    Returns:
+        int: The embedding size
+    """
+    meta = None if overrides else load_model_meta(ontology_name, algorithm)
+    if meta is not None and "BASIC" in meta.get("config", {}):
+        return int(meta["config"]["BASIC"]["embed_size"])
+    config = get_embed_config(config_file, get_base_algorithm(algorithm), overrides)
+    return int(config["BASIC"]["embed_size"])
+
+
+def estimate_evaluate(
+    ontology_name, algorithm, classifier=None, overrides=None, config_file=CONFIG_FILE
+):
+    """Estimate the time and peak memory of evaluating an embedding with each classifier
+
+    A classifier is fitted on the train samples, then every test sample ranks all the
+    classes, which scores one candidate row per class.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm or model variant
+        classifier (str): The name of the classifier, None for every classifier
+        overrides (dict): The hyperparameters to override, see EMBED_PARAMETERS
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The sample counts and the estimate of every classifier
+    """
+    if classifier is not None and classifier not in CLASSIFIER_COSTS:
+        raise ModelException(f"Unsupported classifier: {classifier}", 400)
+    estimate_config = get_estimate_config(config_file)
+    require_extraction(ontology_name)
+
+    try:
+        manifest = get_manifest(ontology_name)
+        n_train = count_lines(get_path(ontology_name, "train-infer-0.csv"))
+        n_test = count_lines(get_path(ontology_name, "test.csv"))
+        n_classes = manifest["no_class"]
+        embed_size = get_embed_size(ontology_name, algorithm, overrides, config_file)
+        features = 2 * embed_size
+        rows = n_test * n_classes
+
+        # the embeddings in float32, the train samples and the candidate rows in float64
+        data_bytes = (
+            (n_classes + manifest["no_individual"]) * embed_size * 4
+            + n_train * features * 8
+            + n_classes * features * 8
+        )
+
+        classifiers = dict()
+        for name in [classifier] if classifier else sorted(CLASSIFIER_COSTS):
+            fit, score, size = CLASSIFIER_COSTS[name]
+            seconds = (fit(n_train, features) + rows * score(n_train, features)) / (
+                estimate_config["evaluate_ops_per_second"]
+            ) + rows / estimate_config["evaluate_ranks_per_second"]
+            rss_bytes = data_bytes + size(n_train, features)
+            estimate = {
+                "evaluate_seconds": round(seconds, 1),
+                "peak_rss_mb": round(
+                    estimate_config["base_rss_mb"] + rss_bytes / 2**20, 1
+                ),
+            }
+            estimate["exceeded_limits"] = exceeded_limits(
+                {
+                    "max_evaluate_seconds": estimate["evaluate_seconds"],
+                    "max_rss_mb": estimate["peak_rss_mb"],
+                },
+                EVALUATE_LIMITS,
+                estimate_config["limits"],
+            )
+            classifiers[name] = estimate
+
+        return {
+            "train_samples": n_train,
+            "test_samples": n_test,
+            "classes": n_classes,
+            "features": features,
+            "classifiers": classifiers,
+        }
+
+    except FileNotFoundError:
+        raise ModelException(f"Extract {ontology_name} before estimating it", 404)
+    except Exception as e:
+        raise ModelException(f"Internal server error in estimate_evaluate: {str(e)}")
+
+
+def check_limits(
+    operation,
+    ontology_name,
+    algorithm,
+    classifier=None,
+    overrides=None,
+    config_file=CONFIG_FILE,
+):
+    """Reject an embed or evaluate run whose estimate exceeds the limits of [LIMITS]
+
+    Nothing is estimated while the limits of the operation are all 0.
+
+    Args:
+        operation (str): The name of the operation (embed or evaluate)
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm or model variant
+        classifier (str): The name of the classifier (evaluate)
+        overrides (dict): The hyperparameters to override (embed)
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The estimate, or None if it was not needed
+    """
+    names = {"embed": EMBED_LIMITS, "evaluate": EVALUATE_LIMITS}.get(operation)
+    limits = get_estimate_config(config_file)["limits"]
+    if names is None or not any(limits[name] > 0 for name in names):
+        return None
+
+    if operation == "embed":
+        estimate = estimate_embed(ontology_name, algorithm, overrides, config_file)
+        exceeded = estimate["exceeded_limits"]
+        hint = ""
+        if estimate["suggested_overrides"]:
+            hint = f", try the parameters {estimate['suggested_overrides']}"
+    else:
+        estimate = estimate_evaluate(
+            ontology_name, algorithm, classifier, config_file=config_file
+        )
+        exceeded = estimate["classifiers"][classifier]["exceeded_limits"]
+        hint = ""
+    if exceeded:
+        raise ModelException(
+            f"The {operation} of {ontology_name} with {algorithm} is estimated to exceed "
+            f"{', '.join(exceeded)}{hint}",
+            413,
+        )
+    return estimate
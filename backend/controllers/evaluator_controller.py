@@ -7,8 +7,9 @@ from tqdm import tqdm
 from models.extract_model import (
     load_multi_input_files,
     load_train_test_validation,
-    coverage_class,
 )
+from models.hierarchy_model import get_hierarchy
+from models.manifest_model import get_manifest
 from controllers.graph_controller import create_graph
 from models.evaluator_model import write_garbage_metrics, write_evaluate
 from models.embed_model import load_embedding_value
@@ -254,14 +255,14 @@ def predict_func(
     """
     try:
         # retrieve file
-        files_list = ["classes", "individuals", "inferred_ancestors"]
+        files_list = ["classes", "individuals"]
         files = load_multi_input_files(ontology_name, files_list)
 
         # load classes file
         print(f"load {ontology_name} classes")
 
-        coverage_class_percentage = coverage_class(ontology_name)
-        onto_type = "abox" if coverage_class_percentage > 10 else "tbox"
+        # the samples were generated for the type recorded by the extraction
+        onto_type = get_manifest(ontology_name)["onto_type"]
 
         # Embed classes with model
         print(f"load embedded vector of {ontology_name} classes")
@@ -290,14 +291,18 @@ def predict_func(
         train_X, train_y = np.array(train_x_list), np.array(train_y_list)
         print("train_X: %s, train_y: %s" % (str(train_X.shape), str(train_y.shape)))
 
-        # Load inferred ancestors
+        # Load inferred ancestors from the closure of the reasoned hierarchy
+        hierarchy = get_hierarchy(ontology_name)
         inferred_ancestors = {}
-        for line in files["inferred_ancestors"]:
-            all_infer_classes = line.split(",")
-            cls = all_infer_classes[0]
-            inferred_ancestors[cls] = (
-                all_infer_classes if onto_type == "tbox" else all_infer_classes[1:]
-            )
+        for sub in {s[0] for s in valid_samples + test_samples}:
+            i = hierarchy.index(sub)
+            inferred = set()
+            if i is not None:
+                inferred.update(hierarchy.iris[a] for a in hierarchy.inferred(i))
+            # a class is not ranked against itself
+            if onto_type == "tbox":
+                inferred.add(sub)
+            inferred_ancestors[sub] = inferred
 
         # Evaluate
         evaluate = InclusionEvaluator(
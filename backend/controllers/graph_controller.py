@@ -1,13 +1,10 @@
-import networkx as nx
-import pandas as pd
 import os
-import matplotlib.pyplot as plt
-import pydot
 from models.graph_model import load_graph
 from utils.directory_utils import get_path, replace_or_create_folder
+from utils.lazy_import import lazy_import
 from models.evaluator_model import read_garbage_metrics_pd
-from models.extract_model import load_multi_input_files, coverage_class
-from owlready2 import *
+from models.hierarchy_model import get_hierarchy
+from models.manifest_model import get_manifest
 
 from utils.exceptions import (
     FileException,
@@ -17,6 +14,11 @@ from utils.exceptions import (
     GraphException,
 )
 
+nx = lazy_import("networkx")
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+pydot = lazy_import("pydot")
+
 ## Refactor code from https://github.com/realearn-jaist/kbc-ops/blob/main/app.py  ###########
 #############################################################################################
 
@@ -45,12 +47,12 @@ def extract_garbage_value(onto_data):
         raise GraphException(f"Error extracting garbage metrics: {str(e)}")
 
 
-def find_parents_with_relations(cls, splitter, relation_list=None):
+def find_parents_with_relations(hierarchy, entity, relation_list=None):
     """Find the parents of a class and its relations
 
     Args:
-        cls (owlready2.entity.ThingClass): The class/ind to find the parents of
-        splitter (str): The string used to split class names
+        hierarchy (Hierarchy): The reasoned hierarchy of the ontology
+        entity (int): The number of the class/ind to find the parents of
         relation_list (list, optional): The list of relations to append to. Defaults to None.
 
     Returns:
@@ -62,26 +64,12 @@ def find_parents_with_relations(cls, splitter, relation_list=None):
 
     try:
         # Find parents and add to relation_list
-        parents = cls.is_a
-        for parent in parents:
-            if parent != owl.Thing:
-                relation_list.append(
-                    [
-                        str(cls).split(splitter)[-1].split(")")[0],
-                        "subclassOf",
-                        str(parent).split(splitter)[-1].split(")")[0],
-                    ]
-                )
-                # Recursively find parents' relations
-                relation_list.extend(find_parents_with_relations(parent, splitter))
-            else:
-                relation_list.append(
-                    [
-                        str(cls).split(splitter)[-1].split(")")[0],
-                        "subclassOf",
-                        str(parent).split(splitter)[-1].split(")")[0],
-                    ]
-                )
+        for parent in hierarchy.parents(entity):
+            relation_list.append(
+                [hierarchy.name(entity), "subclassOf", hierarchy.name(parent)]
+            )
+            # Recursively find parents' relations
+            relation_list.extend(find_parents_with_relations(hierarchy, parent))
 
         return relation_list
 
@@ -89,25 +77,10 @@ def find_parents_with_relations(cls, splitter, relation_list=None):
         raise GraphException(f"Error in finding parents with relations: {str(e)}")
 
 
-def get_prefix(value):
-    """Get the prefix of the value because in ontology the class and individual id are separated by # or /
-
-    Args:
-        value (str): The value to get the prefix of
-    Returns:
-        prefix (str): The prefix of the value
-    """
-    # Get the delimiter # or /
-    delimiter = "#" if "#" in value else "/"
-    prefix = value.rsplit(delimiter, 1)[0] + delimiter
-    return prefix
-
-
 def graph_maker(
     onto_type,
-    onto_file,
+    hierarchy,
     entity_prefix,
-    entity_split,
     class_individual_list,
     truth_list,
     predict_list,
@@ -117,9 +90,8 @@ def graph_maker(
 
     Args:
         onto_type (str): The type of ontology "abox" or "tbox".
-        onto_file (owlready2.namespace.Ontology): The ontology file.
+        hierarchy (Hierarchy): The reasoned hierarchy of the ontology.
         entity_prefix (str): The prefix of the entity.
-        entity_split (str): The splitter for entity names.
         class_individual_list (list): The list of individuals.
         truth_list (list): The list of ground truth values.
         predict_list (list): The list of predicted values.
@@ -132,22 +104,24 @@ def graph_maker(
     for i, v in enumerate(class_individual_list):
         try:
             entity_uri = entity_prefix + v
-            entity = onto_file.search(iri=entity_uri)[0]
-            subs = entity.INDIRECT_is_a
+            entity = hierarchy.index(entity_uri)
+            if entity is None:
+                raise ValueError(f"{entity_uri} is not in the ontology")
 
             relations = []
 
             if onto_type == "tbox":
-                relations = find_parents_with_relations(entity, entity_split)
+                relations = find_parents_with_relations(hierarchy, entity)
             else:
-                subs = sorted(list(subs), key=lambda sub: len(list(sub.INDIRECT_is_a)))
-                subs = [
-                    str(sub).split(".")[-1] if str(sub) != "owl.Thing" else str(sub)
-                    for sub in subs
-                ]
+                # ancestors from the most general to the most specific
+                subs = sorted(
+                    hierarchy.ancestors(entity),
+                    key=lambda sub: (len(hierarchy.ancestors(sub)), sub),
+                )
+                subs = [hierarchy.name(sub) for sub in subs]
                 for j in range(len(subs) - 1):
                     relations.append([subs[j + 1], "subclassOf", subs[j]])
-                relations.append([str(entity).split(".")[-1], "isA", subs[-1]])
+                relations.append([hierarchy.name(entity), "isA", subs[-1]])
 
             relations = [
                 relation for relation in relations if relation[0] != relation[2]
@@ -204,34 +178,18 @@ def create_graph(ontology_name, algorithm, classifier):
         list: The list of graph fig
     """
     try:
-        # load individuals for checking whether it Tbox or not, and finding its prefix.
         fig_directory = get_path(ontology_name, algorithm, classifier, "graph_fig")
         replace_or_create_folder(fig_directory)
 
-        # check onto type
-        # consider as a ABox iff individuals_count is excess 10 percent of classes amount
-        coverage_class_percentage = coverage_class(ontology_name)
-        onto_type = "abox" if coverage_class_percentage > 10 else "tbox"
-
-        # Load ontology file
-        world = World()
-        onto_file_path = get_path(ontology_name, ontology_name + ".owl")
-        onto = world.get_ontology(onto_file_path).load()
-        sync_reasoner(onto)
-        input_files = ["individuals", "classes"]
-        files = load_multi_input_files(ontology_name, input_files)
-
-        # get prefix and its splitter
-        if onto_type == "ABox":
-            individuals = files["individuals"]
-            tmp_class_ind = individuals[0]
-        else:
-            classes = files["classes"]
-            tmp_class_ind = classes[0]
-
-        entity_prefix = get_prefix(tmp_class_ind)
-        entity = onto.search(iri=tmp_class_ind)[0]
-        entity_split = ".".join(str(entity).rsplit(".")[:-1]) + "."
+        # the onto type and the prefix of the evaluated entities, recorded by the extraction
+        manifest = get_manifest(ontology_name)
+        onto_type = manifest["onto_type"]
+        entity_prefix = manifest["prefixes"][
+            "individuals" if onto_type == "abox" else "classes"
+        ]
+
+        # Load the hierarchy reasoned by the extraction
+        hierarchy = get_hierarchy(ontology_name)
 
         # Read garbage metrics file
         garbage_file = read_garbage_metrics_pd(ontology_name, algorithm, classifier)
@@ -242,9 +200,8 @@ def create_graph(ontology_name, algorithm, classifier):
         # Create graphs for each class and individual
         graph_maker(
             onto_type,
-            onto,
+            hierarchy,
             entity_prefix,
-            entity_split,
             class_individual_list,
             truth_list,
             predict_list,
@@ -0,0 +1,408 @@
+import configparser
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from flask import Flask, current_app
+
+from controllers.embed_controller import embed_func, get_embed_variant
+from controllers.estimate_controller import check_limits
+from controllers.evaluator_controller import predict_func
+from controllers.ontology_controller import extract_data
+from controllers.resource_controller import cpu_allocation
+from controllers.sweep_controller import plan_sweep, sweep_func
+from models.job_model import (
+    attach_or_create_job,
+    claim_next_job,
+    finish_job,
+    get_job,
+    list_jobs_by_status,
+    request_cancel,
+    set_job_pid,
+)
+from models.resource_model import is_process_alive
+from utils.coalesce import coalesce
+from utils.directory_utils import get_lock_folder, get_path, remove_dir
+from utils.exceptions import JobException, handle_exception
+from utils.json_handler import convert_float32_to_float
+
+# the required keyword arguments of each operation, in order
+JOB_OPERATIONS = {
+    "extract": ("ontology_name",),
+    "embed": ("ontology_name", "algorithm"),
+    "evaluate": ("ontology_name", "algorithm", "classifier"),
+    "sweep": ("ontology_name", "algorithm", "classifier", "grid"),
+}
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_operation(operation):
+    """Return the controller function running the operation
+
+    Args:
+        operation (str): The name of the operation
+    Returns:
+        function: The controller function
+    """
+    return {
+        "extract": extract_data,
+        "embed": embed_func,
+        "evaluate": predict_func,
+        "sweep": sweep_func,
+    }[operation]
+
+
+def get_config_hash():
+    """Return the SHA-256 of the configuration file used by the operations
+
+    Returns:
+        str: The hex digest of the configuration file
+    """
+    with open(os.path.join("controllers", "default.cfg"), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_coalesce_key(operation, params):
+    """Build the key under which identical work is coalesced
+
+    Args:
+        operation (str): The name of the operation
+        params (dict): The keyword arguments of the operation
+    Returns:
+        str: The key, made of the operation, its ontology, algorithm (model variant) and
+            classifier, the grid of a sweep, and the hash of the configuration
+    """
+    algorithm = params.get("algorithm")
+    if params.get("overrides"):
+        # overrides equal to the defaults resolve to the default model
+        algorithm = get_embed_variant(algorithm, params["overrides"])[0]
+    key = {
+        "operation": operation,
+        "ontology_name": params.get("ontology_name"),
+        "algorithm": algorithm,
+        "classifier": params.get("classifier"),
+        "config": get_config_hash(),
+    }
+    if params.get("grid"):
+        key["grid"] = params["grid"]
+    return json.dumps(key, sort_keys=True)
+
+
+def run_coalesced(operation, func, **params):
+    """Run an operation, or attach to the identical one already running on this machine
+
+    Used by the synchronous routes and the job workers alike, so that a request never trains or
+    evaluates the same model as a concurrent one and overwrites its files. The run waits for
+    the cores of the operation in the CPU budget; attached callers do not use any.
+
+    Args:
+        operation (str): The name of the operation
+        func (function): The controller function running the operation
+        **params: The keyword arguments of the operation
+    Returns:
+        object: The result of the operation
+    """
+    key = get_coalesce_key(operation, params)
+
+    def run_allocated(**kwargs):
+        with cpu_allocation(operation):
+            return func(**kwargs)
+
+    return coalesce(get_lock_folder(), key, run_allocated, **params)
+
+
+def cleanup_failed_job(operation, params):
+    """Remove the partial output of a failed job, like the synchronous routes do
+
+    Args:
+        operation (str): The name of the operation
+        params (dict): The keyword arguments of the operation
+    Returns:
+        None
+    """
+    try:
+        if operation == "embed":
+            variant = params["algorithm"]
+            if params.get("overrides"):
+                variant = get_embed_variant(variant, params["overrides"])[0]
+            remove_dir(get_path(params["ontology_name"], variant))
+        elif operation == "evaluate":
+            remove_dir(
+                get_path(
+                    params["ontology_name"], params["algorithm"], params["classifier"]
+                )
+            )
+    except Exception as e:
+        print(f"Nothing to clean up for {operation} job: {str(e)}")
+
+
+def run_job(storage_folder, job_id):
+    """Entry point of a worker process: run the job and store its outcome
+
+    Args:
+        storage_folder (str): The storage folder of the application
+        job_id (str): The id of the job
+    Returns:
+        None
+    """
+    app = Flask(__name__)
+    app.config["STORAGE_FOLDER"] = storage_folder
+    with app.app_context():
+        job = get_job(job_id)
+        if job is None:
+            return
+        operation, params = job["operation"], job["params"]
+        start_time = time.time()
+        try:
+            result = run_coalesced(operation, get_operation(operation), **params)
+            finish_job(job_id, "succeeded", result=convert_float32_to_float(result))
+        except Exception as e:
+            exception = handle_exception(e)
+            cleanup_failed_job(operation, params)
+            finish_job(
+                job_id,
+                "failed",
+                error=exception["message"],
+                error_code=exception["error_code"],
+            )
+        print(
+            "---------------> time usage for job {} ({}): {} <---------------".format(
+                job_id, operation, time.time() - start_time
+            )
+        )
+
+
+class JobDispatcher:
+    """Thread claiming queued jobs and running each one in its own worker process
+
+    Jobs are claimed atomically in the job table, so several web processes may each run a
+    dispatcher against the same storage folder.
+    """
+
+    def __init__(self, app, workers, poll_interval):
+        self.app = app
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.processes = dict()
+        self.context = multiprocessing.get_context("spawn")
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the dispatcher thread, failing the jobs whose worker died with a previous server
+
+        Returns:
+            None
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self.app.app_context():
+            for job in list_jobs_by_status("running", "cancelling"):
+                # a missing pid means the server died between claim and spawn
+                stale = time.time() - (job["started_at"] or 0) > 60
+                if not is_process_alive(job["pid"]) and (job["pid"] or stale):
+                    cleanup_failed_job(job["operation"], job["params"])
+                    finish_job(
+                        job["id"],
+                        "failed",
+                        error="Job interrupted by a server restart",
+                        error_code=500,
+                    )
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="job-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def wake(self):
+        """Make the dispatcher poll the job table now"""
+        self._wake.set()
+
+    def stop(self):
+        """Stop the dispatcher thread after its current poll, the workers keep running
+
+        Returns:
+            None
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        with self.app.app_context():
+            while not self._stopped.is_set():
+                try:
+                    self.dispatch()
+                except Exception as e:
+                    print(f"Job dispatcher error: {str(e)}")
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def dispatch(self):
+        """Reap finished workers, terminate cancelled jobs and start queued ones
+
+        Returns:
+            None
+        """
+        for job_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del self.processes[job_id]
+            job = get_job(job_id)
+            if job is None or job["status"] not in ("running", "cancelling"):
+                # the worker stored the outcome of its job
+                continue
+            # a terminated or crashed worker leaves its partial output behind
+            if job["status"] == "cancelling":
+                cleanup_failed_job(job["operation"], job["params"])
+                finish_job(job_id, "cancelled")
+            elif process.exitcode != 0:
+                cleanup_failed_job(job["operation"], job["params"])
+                finish_job(
+                    job_id,
+                    "failed",
+                    error=f"Worker exited with code {process.exitcode}",
+                    error_code=500,
+                )
+
+        for job in list_jobs_by_status("cancelling"):
+            process = self.processes.get(job["id"])
+            if process is not None and process.is_alive():
+                process.terminate()
+
+        while len(self.processes) < self.workers:
+            job = claim_next_job()
+            if job is None:
+                break
+            process = self.context.Process(
+                target=run_job,
+                args=(self.app.config["STORAGE_FOLDER"], job["id"]),
+                name=f"job-{job['id']}",
+            )
+            process.start()
+            set_job_pid(job["id"], process.pid)
+            self.processes[job["id"]] = process
+
+
+def get_dispatcher(app=None):
+    """Return the dispatcher of this web process, starting it on first use
+
+    Args:
+        app (flask.Flask): The application whose storage folder holds the jobs, the current
+            one by default
+    Returns:
+        JobDispatcher: The dispatcher
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            config = configparser.ConfigParser()
+            config.read(os.path.join("controllers", "default.cfg"))
+            _dispatcher = JobDispatcher(
+                app if app is not None else current_app._get_current_object(),
+                workers=int(config["JOBS"]["workers"]),
+                poll_interval=float(config["JOBS"]["poll_interval"]),
+            )
+        _dispatcher.start()
+        return _dispatcher
+
+
+def submit_job(
+    operation,
+    ontology_name,
+    algorithm=None,
+    classifier=None,
+    overrides=None,
+    grid=None,
+):
+    """Queue an extract, embed, evaluate or sweep job, or attach to an identical queued or
+    running one
+
+    Args:
+        operation (str): The name of the operation (extract, embed, evaluate, sweep)
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (embed, evaluate, sweep)
+        classifier (str): The name of the classifier (evaluate, sweep)
+        overrides (dict): The embedding hyperparameters to override (embed)
+        grid (dict): The values to try of each embedding hyperparameter (sweep)
+    Returns:
+        dict: The job, with "attached" set if it was already active
+    """
+    if operation not in JOB_OPERATIONS:
+        raise JobException(f"Unsupported operation: {operation}", 400)
+
+    values = {
+        "ontology_name": ontology_name,
+        "algorithm": algorithm,
+        "classifier": classifier,
+        "grid": grid,
+    }
+    params = {name: values[name] for name in JOB_OPERATIONS[operation]}
+    missing = [name for name, value in params.items() if not value]
+    if missing:
+        raise JobException(f"Missing {', '.join(missing)} for {operation} job", 400)
+    if overrides:
+        if operation != "embed":
+            raise JobException(f"{operation} job takes no embedding parameters", 400)
+        if not isinstance(overrides, dict):
+            raise JobException("Embedding parameters must be an object", 400)
+        # reject invalid overrides before queueing
+        get_embed_variant(algorithm, overrides)
+        params["overrides"] = overrides
+    if operation == "sweep":
+        # reject invalid grids before queueing
+        plan_sweep(algorithm, grid)
+    if operation in ("embed", "evaluate"):
+        # reject runs estimated to exceed the limits of the configuration before queueing
+        check_limits(
+            operation,
+            ontology_name,
+            algorithm,
+            classifier=classifier,
+            overrides=overrides,
+        )
+
+    job, created = attach_or_create_job(
+        operation, params, get_coalesce_key(operation, params)
+    )
+    if created:
+        get_dispatcher().wake()
+    job["attached"] = not created
+    return job
+
+
+def get_job_status(job_id):
+    """Get a job
+
+    Args:
+        job_id (str): The id of the job
+    Returns:
+        dict: The job
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise JobException(f"Job not found: {job_id}", 404)
+    return job
+
+
+def cancel_job(job_id):
+    """Cancel a queued or running job
+
+    Args:
+        job_id (str): The id of the job
+    Returns:
+        dict: The job after the cancellation request
+    """
+    job = request_cancel(job_id)
+    if job is None:
+        raise JobException(f"Job not found: {job_id}", 404)
+    if job["status"] == "cancelling":
+        get_dispatcher().wake()
+    return job
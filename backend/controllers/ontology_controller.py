@@ -1,27 +1,40 @@
 import os
-import random
-from owlready2 import *
+import shutil
+import time
 from tqdm import tqdm
-from collections import defaultdict
 
+from controllers.sampling_controller import NegativeSampler
+from models.corpus_model import save_corpora
 from models.extract_model import (
     load_input_file,
     load_multi_input_files,
     save_annotations,
     save_axioms,
     save_classes,
+    save_coverage,
     save_individuals,
     save_infer,
 )
+from models.hierarchy_model import Hierarchy, save_hierarchy
+from models.manifest_model import (
+    build_manifest,
+    get_manifest,
+    get_onto_type,
+    remove_manifest,
+    save_manifest,
+)
 from models.ontology_model import (
     list_ontology,
     save_ontology,
 )
+from models.session_model import OntologySession
 
-from owl2vec_star.Onto_Projection import Reasoner, OntologyProjection
 from owl2vec_star.Label import pre_process_words
 from utils.directory_utils import get_path
 from utils.exceptions import ExtractionException, FileException, OntologyException
+from utils.lazy_import import lazy_import
+
+owlready2 = lazy_import("owlready2")
 
 
 def upload_ontology(file, ontology_name: str):
@@ -65,15 +78,12 @@ def get_onto_stat(ontology_name: str):
     Returns:
         dict: The statistics of the ontology
     """
-    # Get the statistics of the ontology
-    files_list = ["axioms", "classes", "individuals", "uri_labels", "annotations"]
-    files = load_multi_input_files(ontology_name, files_list)
+    # Get the statistics of the ontology, counted once by the manifest
+    manifest = get_manifest(ontology_name)
 
     return {
-        "no_class": len(files["classes"]),
-        "no_individual": len(files["individuals"]),
-        "no_axiom": len(files["axioms"]),
-        "no_annotation": len(files["uri_labels"] + files["annotations"]),
+        key: manifest[key]
+        for key in ("no_class", "no_individual", "no_axiom", "no_annotation")
     }
 
 
@@ -89,10 +99,18 @@ def extract_data(ontology_name: str):
     Returns:
         dict: The statistics of the ontology
     """
+    session = None
     try:
         onto_file_path = get_path(ontology_name, ontology_name + ".owl")
+        remove_manifest(ontology_name)
+        timings, start_time = dict(), time.time()
+
+        # the ontology is parsed once, every stage below reads the same world
+        session = OntologySession(ontology_name)
 
         # extract axiom, entity, annotation
+        from owl2vec_star.Onto_Projection import OntologyProjection, Reasoner
+
         projection = OntologyProjection(
             onto_file_path,
             reasoner=Reasoner.STRUCTURAL,
@@ -103,6 +121,8 @@ def extract_data(ontology_name: str):
             additional_preferred_labels_annotations=set(),
             additional_synonyms_annotations=set(),
             memory_reasoner="13351",
+            ontology=session.onto,
+            graph=session.graph,
         )
 
         # axioms
@@ -136,47 +156,54 @@ def extract_data(ontology_name: str):
                     ):
                         annotation = [e] + v.split()
                         annotations.append(annotation)
+        timings["projection"] = time.time() - start_time
 
         # save to files
+        start_time = time.time()
         axioms = save_axioms(ontology_name, axioms)
         classes = save_classes(ontology_name, classes)
         individuals = save_individuals(ontology_name, individuals)
         annotations = save_annotations(ontology_name, annotations, projection)
 
-        # extract axiom, entity, annotation
-        world = World()
-        onto = world.get_ontology(
-            get_path(ontology_name, ontology_name + ".owl")
-        ).load()
+        # tokenize the axioms and annotations once for the Word2Vec-based algorithms
+        save_corpora(ontology_name)
 
-        print("start run sync reasoner")
+        # the coverage of the asserted types, read by the evaluation
+        save_coverage(ontology_name, session.onto)
+        timings["save"] = time.time() - start_time
+
+        # run hermit reasoner on the same world
         start_time = time.time()
-        # run hermit reasoner
-        sync_reasoner(onto)
-        print(
-            f"sync reasoner time usage for {ontology_name}:", time.time() - start_time
-        )
+        onto = session.reason()
+        timings["reasoning"] = time.time() - start_time
 
-        tbox_results = tbox_infer(onto)
-        abox_results = abox_infer(onto)
+        # the reasoned hierarchy, read by the graphs instead of reasoning again
+        start_time = time.time()
+        hierarchy = save_hierarchy(ontology_name, onto)
+
+        # the inferred ancestors, read from the closure of the hierarchy
+        tbox_results = tbox_infer(onto, hierarchy)
+        abox_results = abox_infer(onto, hierarchy)
 
         # save inferred classes to file
         save_infer(ontology_name, tbox_results + abox_results)
+        timings["inference"] = time.time() - start_time
 
         files_list = ["classes", "individuals"]
         files = load_multi_input_files(ontology_name, files_list)
 
-        individuals_count = len(files["individuals"])
-
         # check ontology type
         # consider as an ABox if individuals_count exceeds 10 percent of classes amount
-        onto_type = (
-            "abox" if individuals_count > int(0.1 * len(files["classes"])) else "tbox"
-        )
+        start_time = time.time()
+        onto_type = get_onto_type(len(files["classes"]), len(files["individuals"]))
         if onto_type == "abox":
             train_test_val_gen_abox(onto, ontology_name)
         else:
             train_test_val_gen_tbox(onto, ontology_name)
+        timings["samples"] = time.time() - start_time
+
+        # the metadata read by the other controllers instead of the files
+        save_manifest(ontology_name, build_manifest(ontology_name, timings))
 
         return {
             "no_class": len(files["classes"]),
@@ -193,92 +220,58 @@ def extract_data(ontology_name: str):
 
         raise ExtractionException(f"Error extracting data: {e}")
 
+    finally:
+        if session is not None:
+            session.close()
+
 
 ##############################################################################################################
 ##############################################################################################################
 
 
-def get_all_superclasses(cls, cache: dict):
-    """Returns all superclasses of a class
-
-    Args:
-        cls (Class): The class to get the superclasses of
-        cache (dict): A dictionary to store the superclasses
-    Returns:
-        list: The list of superclasses of the class
-    """
-    try:
-        # Check if the superclasses are already in the cache
-        if cls in cache:
-            return cache[cls]
-
-        # Get all superclasses of the class
-        superclasses = []
-        for sc in cls.is_a:
-            if sc != owl.Thing:
-                superclasses.append(sc)
-                superclasses.extend(get_all_superclasses(sc, cache))
-
-        cache[cls] = superclasses
-        return superclasses
-
-    except Exception as e:
-        raise ExtractionException(f"Error retrieving superclasses for {cls}: {e}")
-
-
-def abox_infer(onto: Ontology):
+def abox_infer(onto: "owlready2.Ontology", hierarchy: Hierarchy):
     """Infer the classes of the individuals in the abox
 
     Args:
         onto (Ontology): The ontology to infer the classes from
+        hierarchy (Hierarchy): The reasoned hierarchy of the ontology
     Returns:
         list: The list of inferred classes of the individuals in the abox
     """
-    superclass_cache = defaultdict(list)
     results = []
 
     try:
-        # get all inferred classes of the individuals
+        # the ancestors of the individuals, without their types
         for ind in tqdm(onto.individuals(), desc="Processing individuals"):
-            ind_uri = ind.iri
-            inferred_classes = get_all_superclasses(ind, superclass_cache)
-            inferred_classes = inferred_classes[1:]
-            inferred_classes = [sc for sc in inferred_classes if sc not in ind.is_a]
-            inferred_classes_str = ",".join(
-                cls.iri for cls in inferred_classes if hasattr(cls, "iri")
-            )
-            if inferred_classes_str and not inferred_classes_str.endswith(","):
-                inferred_classes_str += ","
-            inferred_classes_str += "owl:Thing"
-            results.append(f"{ind_uri},{inferred_classes_str}")
+            inferred_classes = [
+                hierarchy.iris[i] for i in hierarchy.inferred(hierarchy.index(ind.iri))
+            ]
+            inferred_classes.append("owl:Thing")
+            results.append(f"{ind.iri},{','.join(inferred_classes)}")
     except Exception as e:
         raise ExtractionException(f"Error inferring classes in ABox: {e}")
 
     return results
 
 
-def tbox_infer(onto: Ontology):
+def tbox_infer(onto: "owlready2.Ontology", hierarchy: Hierarchy):
     """Infer the classes of the classes in the tbox
 
     Args:
         onto (Ontology): The ontology to infer the classes from
+        hierarchy (Hierarchy): The reasoned hierarchy of the ontology
     Returns:
         list: The list of inferred classes of the classes in the tbox
     """
-    superclass_cache = defaultdict(list)
     results = []
 
     try:
-        # get all inferred classes of the classes
+        # the ancestors of the classes, without their direct superclasses
         for cls in tqdm(onto.classes(), desc="Processing classes"):
-            cls_uri = cls.iri
-            inferred_classes = get_all_superclasses(cls, superclass_cache)
-            inferred_classes = inferred_classes[1:]
-            inferred_classes = [sc for sc in inferred_classes if sc not in cls.is_a]
-            inferred_classes_str = ",".join(
-                cls.iri for cls in inferred_classes if hasattr(cls, "iri")
-            )
-            results.append(f"{cls_uri},{inferred_classes_str}")
+            inferred_classes = [
+                hierarchy.iris[i] for i in hierarchy.inferred(hierarchy.index(cls.iri))
+            ]
+            results.append(f"{cls.iri},{','.join(inferred_classes)}")
     except Exception as e:
         raise ExtractionException(f"Error inferring classes in TBox: {e}")
 
@@ -297,7 +290,7 @@ def get_ground_truth(class_or_individuals):
         # get the ground truth of the class or individual
         immediate_superclasses = []
         for sc in class_or_individuals.is_a:
-            if sc != owl.Thing:
+            if sc != owlready2.Thing:
                 immediate_superclasses.append(sc)
         return immediate_superclasses
     except AttributeError as e:
@@ -392,15 +385,14 @@ def write_negative_samples_to_csv(csv_path: str, negative_samples: list):
 
     Args:
         csv_path (str): The path to the CSV file
-        negative_samples (list): The list of negative samples
+        negative_samples (list): The (individual/class IRI, class IRI, label) samples
     Returns:
         None
     """
     try:
         # write the negative samples to the CSV file
         with open(csv_path, "a") as f:
-            for ind, negative_class, label in negative_samples:
-                ind_uri = ind.iri
+            for ind_uri, negative_class, label in negative_samples:
                 f.write(f"{ind_uri},{negative_class},{label}\n")
         print(f"Negative samples appended successfully to: {csv_path}")
 
@@ -438,135 +430,7 @@ def read_infer_classes(file):
         raise Exception(f"Unexpected error reading file 'inferred_ancestors.txt': {e}")
 
 
-def generate_negative_samples_abox(
-    onto: Ontology, num_samples: int, infer_classes_path, label: int
-):
-    """Generates negative samples for the abox and returns them as a list.
-
-    Args:
-        onto (Ontology): The ontology to generate the negative samples from
-        num_samples (int): The number of negative samples to generate
-        infer_classes_path (File): The path to the infer_classes file
-        label (int): The label for the negative samples
-    Returns:
-        list: The list of negative samples
-    """
-    try:
-        all_individuals = list(onto.individuals())
-        infer_classes = read_infer_classes(infer_classes_path)
-        negative_samples = []
-
-        num_random_class_samples = num_samples // 2
-        num_inferred_class_samples = num_samples - num_random_class_samples
-
-        print(f"Number of random class samples: {num_random_class_samples}")
-        print(f"Number of inferred class samples: {num_inferred_class_samples}")
-
-        # If label == 1, then we need to generate negative samples for inferred incorrect classes more to make the dataset balanced
-        if label == 1:
-            num_random_class_samples += num_samples
-            num_samples *= 2
-
-        with tqdm(
-            total=num_random_class_samples, desc="Generating random class samples"
-        ) as pbar1:
-            while len(negative_samples) < num_random_class_samples:
-                ind = random.choice(all_individuals)
-                all_classes = list(onto.classes())
-                negative_class = random.choice(all_classes)
-                ind_classes_is_a = [cls.iri for cls in ind.is_a if hasattr(cls, "iri")]
-
-                if (
-                    negative_class.iri not in ind_classes_is_a
-                    and negative_class.iri not in infer_classes.get(ind.iri, [])
-                ):
-                    negative_samples.append((ind, negative_class.iri, 0))
-                    pbar1.update(1)
-
-        with tqdm(
-            total=num_inferred_class_samples, desc="Generating inferred class samples"
-        ) as pbar2:
-            while len(negative_samples) < num_samples:
-                ind = random.choice(all_individuals)
-                all_classes = list(onto.classes())
-                negative_class_iri = random.choice(infer_classes.get(ind.iri, []))
-                if negative_class_iri != "owl:Thing":
-                    negative_samples.append((ind, negative_class_iri, label))
-                    pbar2.update(1)
-
-        return negative_samples
-
-    except IOError as e:
-        raise FileException(f"IOError: {e}")
-    except KeyError as e:
-        raise ExtractionException(f"KeyError: {e}")
-    except Exception as e:
-        raise ExtractionException(f"Unexpected error: {e}")
-
-
-def generate_negative_samples_tbox(onto, num_samples, infer_classes_list, label):
-    """Generates negative samples for the tbox and returns them as a list.
-
-    Args:
-        onto (Ontology): The ontology to generate the negative samples from
-        num_samples (int): The number of negative samples to generate
-        infer_classes_list (list): The path to the infer_classes file
-        label (int): The label for the negative samples
-    Returns:
-        list: The list of negative samples
-    """
-    try:
-        all_classes = list(onto.classes())
-        infer_classes = read_infer_classes(infer_classes_list)
-        negative_samples = []
-
-        num_random_class_samples = num_samples // 2
-        num_inferred_class_samples = num_samples - num_random_class_samples
-
-        if label == 1:
-            num_random_class_samples += num_samples
-            num_samples *= 2
-
-        with tqdm(
-            total=num_random_class_samples, desc="Generating random class samples"
-        ) as pbar:
-            while len(negative_samples) < num_random_class_samples:
-                cls = random.choice(all_classes)
-                all_classes = list(onto.classes())
-                negative_class = random.choice(all_classes)
-                cls_classes_is_a = [cls.iri for cls in cls.is_a if hasattr(cls, "iri")]
-
-                if (
-                    negative_class.iri not in cls_classes_is_a
-                    and negative_class.iri not in infer_classes[cls.iri]
-                ):
-
-                    negative_samples.append((cls, negative_class.iri, 0))
-                    pbar.update(1)
-
-        with tqdm(
-            total=num_inferred_class_samples, desc="Generating inferred class samples"
-        ) as pbar:
-            while len(negative_samples) < num_samples:
-                cls = random.choice(all_classes)
-                all_classes = list(onto.classes())
-                if infer_classes[cls.iri] != []:
-                    negative_class_iri = random.choice(infer_classes[cls.iri])
-                    negative_samples.append((cls, negative_class_iri, label))
-                    pbar.update(1)
-        return negative_samples
-
-    except FileNotFoundError as e:
-        raise FileException(f"File not found error: {e.filename}", 404)
-    except IOError as e:
-        raise FileException(
-            f"File operation error: Could not read or write file {e.filename}", 500
-        )
-    except Exception as e:
-        raise ExtractionException(f"Unexpected error: {e}")
-
-
-def train_test_val_gen_abox(onto: Ontology, ontology_name: str):
+def train_test_val_gen_abox(onto: "owlready2.Ontology", ontology_name: str):
     """Main function for generating training, test, and validation sets for the abox.
 
     Args:
@@ -588,36 +452,25 @@ def train_test_val_gen_abox(onto: Ontology, ontology_name: str):
         test_csv_path = os.path.join(root, "test.csv")
         val_csv_path = os.path.join(root, "valid.csv")
 
-        # Write positive samples to CSV files
+        # Write positive samples to CSV files, both train sets share them
         write_positive_samples_to_csv(
             train_csv_path_0, train_individuals, ontology_name
         )
-        write_positive_samples_to_csv(
-            train_csv_path_1, train_individuals, ontology_name
-        )
+        shutil.copyfile(train_csv_path_0, train_csv_path_1)
         write_positive_samples_to_csv(test_csv_path, test_individuals, ontology_name)
         write_positive_samples_to_csv(val_csv_path, val_individuals, ontology_name)
 
         # Generate and write negative samples to CSV files for train sets
         start_time = time.time()
-        negative_samples = generate_negative_samples_abox(
-            onto,
-            len(train_individuals),
-            load_input_file(ontology_name, "inferred_ancestors"),
-            1,
-        )
-        write_negative_samples_to_csv(train_csv_path_0, negative_samples)
-        print("abox negative sample (-1) time usage:", time.time() - start_time)
-
-        start_time = time.time()
-        negative_samples = generate_negative_samples_abox(
-            onto,
-            len(train_individuals),
-            load_input_file(ontology_name, "inferred_ancestors"),
-            0,
+        sampler = NegativeSampler.from_ontology(
+            all_individuals,
+            list(onto.classes()),
+            read_infer_classes(load_input_file(ontology_name, "inferred_ancestors")),
         )
-        write_negative_samples_to_csv(train_csv_path_1, negative_samples)
-        print("abox negative sample (-0) time usage:", time.time() - start_time)
+        for label, csv_path in ((1, train_csv_path_0), (0, train_csv_path_1)):
+            negative_samples = sampler.generate(len(train_individuals), label)
+            write_negative_samples_to_csv(csv_path, negative_samples)
+        print("abox negative sample time usage:", time.time() - start_time)
 
     except FileNotFoundError as e:
         raise FileException(f"File not found: {e.filename}", 404)
@@ -651,30 +504,22 @@ def train_test_val_gen_tbox(onto, ontology_name):
         test_csv_path = os.path.join(root, "test.csv")
         val_csv_path = os.path.join(root, "valid.csv")
 
-        # Write positive samples to CSV files
+        # Write positive samples to CSV files, both train sets share them
         write_positive_samples_to_csv(train_csv_path_0, train_classes, ontology_name)
-        write_positive_samples_to_csv(train_csv_path_1, train_classes, ontology_name)
+        shutil.copyfile(train_csv_path_0, train_csv_path_1)
         write_positive_samples_to_csv(test_csv_path, test_classes, ontology_name)
         write_positive_samples_to_csv(val_csv_path, val_classes, ontology_name)
         # Generate and write negative samples to CSV files for train sets
         start_time = time.time()
-        negative_samples = generate_negative_samples_tbox(
-            onto,
-            len(train_classes),
-            load_input_file(ontology_name, "inferred_ancestors"),
-            1,
-        )
-        write_negative_samples_to_csv(train_csv_path_0, negative_samples)
-
-        start_time = time.time()
-        negative_samples = generate_negative_samples_tbox(
-            onto,
-            len(train_classes),
-            load_input_file(ontology_name, "inferred_ancestors"),
-            0,
+        sampler = NegativeSampler.from_ontology(
+            all_classes,
+            all_classes,
+            read_infer_classes(load_input_file(ontology_name, "inferred_ancestors")),
         )
-        write_negative_samples_to_csv(train_csv_path_1, negative_samples)
-        print("tbox negative sample (-0) time usage:", time.time() - start_time)
+        for label, csv_path in ((1, train_csv_path_0), (0, train_csv_path_1)):
+            negative_samples = sampler.generate(len(train_classes), label)
+            write_negative_samples_to_csv(csv_path, negative_samples)
+        print("tbox negative sample time usage:", time.time() - start_time)
 
     except FileNotFoundError as e:
         raise FileException(f"File not found: {e.filename}", 404)
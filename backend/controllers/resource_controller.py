@@ -0,0 +1,143 @@
+import configparser
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from models.resource_model import grant_lease, release_lease, request_lease
+from utils.lazy_import import lazy_import
+
+threadpoolctl = lazy_import("threadpoolctl")
+
+CONFIG_FILE = os.path.join("controllers", "default.cfg")
+
+# environment variables read by BLAS and OpenMP libraries when they are loaded
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+_allocation = threading.local()
+
+# the cores of the allocations running in this process, which share its BLAS thread pools
+_active_cores = []
+_active_lock = threading.Lock()
+_original_limits = None
+_original_env = None
+
+
+def get_resource_config(config_file=CONFIG_FILE):
+    """Read the [RESOURCES] section of the configuration
+
+    Args:
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The "budget" of cores of this machine, the "cores" of each operation and the
+            "poll_interval" of a waiting operation
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    section = config["RESOURCES"]
+    budget = int(section["cpu_budget"]) or os.cpu_count() or 1
+    cores = dict()
+    for operation in ("extract", "embed", "evaluate", "sweep"):
+        # an operation never asks for more than the whole budget
+        requested = int(section[f"{operation}_cores"])
+        cores[operation] = min(requested, budget) if requested > 0 else budget
+    return {
+        "budget": budget,
+        "cores": cores,
+        "poll_interval": float(section["poll_interval"]),
+    }
+
+
+def get_allocated_cores():
+    """Return the number of cores allocated to the operation running in this thread
+
+    Thread and process pools (gensim workers, walkers, process pools) are sized with it.
+
+    Returns:
+        int: The allocated cores, or every core of the machine outside of an allocation
+    """
+    return getattr(_allocation, "cores", None) or os.cpu_count() or 1
+
+
+def _limit_threads():
+    """Limit the BLAS and OpenMP thread pools of this process to the smallest running
+    allocation, or restore them when no allocation is running
+
+    Libraries already loaded are limited with threadpoolctl; libraries loaded later read the
+    thread environment variables.
+
+    Returns:
+        None
+    """
+    global _original_limits, _original_env
+    if not _active_cores:
+        if _original_limits is not None:
+            _original_limits.restore_original_limits()
+            _original_limits = None
+        if _original_env is not None:
+            for name, value in _original_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            _original_env = None
+        return
+
+    cores = min(_active_cores)
+    if _original_env is None:
+        _original_env = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(cores)
+    limits = threadpoolctl.threadpool_limits(limits=cores)
+    if _original_limits is None:
+        _original_limits = limits
+
+
+@contextmanager
+def cpu_allocation(operation, config_file=CONFIG_FILE):
+    """Context manager allocating cores of the machine's CPU budget to an operation
+
+    The cores are leased from a ledger shared by every process using the storage folder. The
+    operation waits in line while the budget cannot hold them. Inside the context,
+    get_allocated_cores returns them and the BLAS and OpenMP thread pools of this process are
+    limited to them.
+
+    Args:
+        operation (str): The name of the operation (extract, embed, evaluate, sweep)
+        config_file (str): The path of the configuration file
+    Yields:
+        int: The allocated cores
+    """
+    config = get_resource_config(config_file)
+    cores = config["cores"][operation]
+    lease_id = request_lease(cores, label=operation)
+    previous = getattr(_allocation, "cores", None)
+    try:
+        waiting = False
+        while not grant_lease(lease_id, config["budget"]):
+            if not waiting:
+                print(
+                    f"Waiting for {cores} of {config['budget']} cores to run {operation}"
+                )
+                waiting = True
+            time.sleep(config["poll_interval"])
+
+        _allocation.cores = cores
+        with _active_lock:
+            _active_cores.append(cores)
+            _limit_threads()
+        try:
+            yield cores
+        finally:
+            with _active_lock:
+                _active_cores.remove(cores)
+                _limit_threads()
+    finally:
+        _allocation.cores = previous
+        release_lease(lease_id)
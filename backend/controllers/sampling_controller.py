@@ -0,0 +1,178 @@
+import numpy as np
+
+from utils.exceptions import ExtractionException
+
+# ancestor every individual has, never drawn as a negative
+THING = "owl:Thing"
+# fewest candidates drawn at once
+MIN_BATCH = 1024
+
+
+class NegativeSampler(object):
+    """Draw the negative samples of the train files
+
+    The classes and the subjects (individuals of an ABox, classes of a TBox) are numbered
+    once. Random negatives pair a subject with a class that is neither one of its asserted
+    types nor one of its inferred ancestors; the excluded pairs are kept as one sorted array
+    of subject * classes + class keys. Inferred negatives pair a subject with one of its
+    inferred ancestors, stored one subject after the other. Candidates are drawn in batches
+    and rejected all at once, with the distribution of drawing them one by one.
+    """
+
+    def __init__(self, entities, classes, direct_types, inferred, rng=None):
+        """Number the subjects and classes and index the excluded and inferred classes
+
+        Args:
+            entities (list): The IRIs of the subjects
+            classes (list): The IRIs of the classes random negatives are drawn from
+            direct_types (dict): The IRIs of the asserted types of every subject
+            inferred (dict): The IRIs of the inferred ancestors of every subject, see
+                read_infer_classes
+            rng (numpy.random.Generator): The random generator, a new one by default
+        """
+        self.entities = list(entities)
+        self.classes = list(classes)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        n_classes = len(self.classes)
+        class_index = {iri: i for i, iri in enumerate(self.classes)}
+
+        keys = list()
+        for e, iri in enumerate(self.entities):
+            excluded = set(direct_types.get(iri, [])).union(inferred.get(iri, []))
+            keys.extend(
+                e * n_classes + class_index[c] for c in excluded if c in class_index
+            )
+        self.excluded = np.unique(np.asarray(keys, dtype=np.int64))
+
+        # the inferred ancestors of every subject, one subject after the other
+        self.ancestors = list()
+        ancestor_index, ancestor_ids, offsets = dict(), list(), [0]
+        for iri in self.entities:
+            for ancestor in inferred.get(iri, []):
+                if ancestor not in ancestor_index:
+                    ancestor_index[ancestor] = len(self.ancestors)
+                    self.ancestors.append(ancestor)
+                ancestor_ids.append(ancestor_index[ancestor])
+            offsets.append(len(ancestor_ids))
+        self.ancestor_ids = np.asarray(ancestor_ids, dtype=np.int32)
+        self.ancestor_offsets = np.asarray(offsets, dtype=np.int64)
+        self.thing_id = ancestor_index.get(THING, -1)
+
+    @classmethod
+    def from_ontology(cls, entities, classes, inferred, rng=None):
+        """Build a sampler from owlready2 entities
+
+        Args:
+            entities (list): The subjects, owlready2 individuals or classes
+            classes (list): The owlready2 classes random negatives are drawn from
+            inferred (dict): The IRIs of the inferred ancestors of every subject
+            rng (numpy.random.Generator): The random generator
+        Returns:
+            NegativeSampler: The sampler
+        """
+        direct_types = {
+            entity.iri: [c.iri for c in entity.is_a if hasattr(c, "iri")]
+            for entity in entities
+        }
+        return cls(
+            [entity.iri for entity in entities],
+            [c.iri for c in classes],
+            direct_types,
+            inferred,
+            rng,
+        )
+
+    def random_negatives(self, num_samples):
+        """Draw subjects paired with classes they are not an instance or subclass of
+
+        Args:
+            num_samples (int): The number of samples
+        Returns:
+            tuple: The subject numbers and the class numbers, numpy.ndarray
+        """
+        n_pairs = len(self.entities) * len(self.classes)
+        allowed = n_pairs - len(self.excluded)
+        if num_samples > 0 and allowed <= 0:
+            raise ExtractionException("No class is left to draw random negatives")
+
+        entities, classes = list(), list()
+        remaining = num_samples
+        while remaining > 0:
+            # enough candidates to fill the rest at the acceptance rate of a draw
+            size = max(MIN_BATCH, int(remaining * n_pairs / allowed * 1.2))
+            e = self.rng.integers(len(self.entities), size=size)
+            c = self.rng.integers(len(self.classes), size=size)
+            keys = e.astype(np.int64) * len(self.classes) + c
+            if len(self.excluded):
+                pos = np.minimum(
+                    np.searchsorted(self.excluded, keys), len(self.excluded) - 1
+                )
+                keep = self.excluded[pos] != keys
+                e, c = e[keep], c[keep]
+            entities.append(e[:remaining])
+            classes.append(c[:remaining])
+            remaining -= len(entities[-1])
+        return np.concatenate(entities or [[]]), np.concatenate(classes or [[]])
+
+    def inferred_negatives(self, num_samples):
+        """Draw subjects paired with one of their inferred ancestors other than owl:Thing
+
+        A subject is drawn uniformly, then one of its ancestors; subjects without one and
+        owl:Thing are drawn again.
+
+        Args:
+            num_samples (int): The number of samples
+        Returns:
+            tuple: The subject numbers and the ancestor numbers, numpy.ndarray
+        """
+        if num_samples > 0 and not np.any(self.ancestor_ids != self.thing_id):
+            raise ExtractionException("No subject has an inferred ancestor to draw")
+
+        entities, ancestors = list(), list()
+        remaining = num_samples
+        while remaining > 0:
+            size = max(MIN_BATCH, 2 * remaining)
+            e = self.rng.integers(len(self.entities), size=size)
+            starts = self.ancestor_offsets[e]
+            lengths = self.ancestor_offsets[e + 1] - starts
+            keep = lengths > 0
+            e, starts, lengths = e[keep], starts[keep], lengths[keep]
+            a = self.ancestor_ids[
+                starts + (self.rng.random(len(e)) * lengths).astype(np.int64)
+            ]
+            keep = a != self.thing_id
+            entities.append(e[keep][:remaining])
+            ancestors.append(a[keep][:remaining])
+            remaining -= len(entities[-1])
+        return np.concatenate(entities or [[]]), np.concatenate(ancestors or [[]])
+
+    def generate(self, num_samples, label):
+        """Generate the negative samples of a train file
+
+        Half of the samples are random negatives, the other half inferred ancestors with the
+        label of the file. A file labelling inferred ancestors 1 gets num_samples more random
+        negatives to stay balanced.
+
+        Args:
+            num_samples (int): The number of train subjects
+            label (int): The label of the inferred ancestors, 0 or 1
+        Returns:
+            list: The (subject IRI, class IRI, label) samples
+        """
+        num_random = num_samples // 2
+        num_inferred = num_samples - num_random
+        if label == 1:
+            num_random += num_samples
+
+        samples = list()
+        e, c = self.random_negatives(num_random)
+        samples.extend(
+            (self.entities[i], self.classes[j], 0)
+            for i, j in zip(e.tolist(), c.tolist())
+        )
+        e, a = self.inferred_negatives(num_inferred)
+        samples.extend(
+            (self.entities[i], self.ancestors[j], label)
+            for i, j in zip(e.tolist(), a.tolist())
+        )
+        return samples
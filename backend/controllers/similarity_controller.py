@@ -0,0 +1,411 @@
+import configparser
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from models.embed_model import (
+    EMBEDDING_FILE,
+    isModelExist,
+    load_embedding_entities,
+    load_embedding_meta,
+)
+from models.extract_model import load_multi_input_files
+from models.similarity_model import (
+    get_embedding_signature,
+    load_ivf_index,
+    load_normalized_embedding,
+    save_ivf_index,
+    save_normalized_embedding,
+)
+from utils.directory_utils import get_path
+from utils.exceptions import ModelException
+
+CONFIG_FILE = os.path.join("controllers", "default.cfg")
+SIMILARITY_KINDS = ("all", "class", "individual")
+
+# similarity indices of this process, least recently used first
+_indices = OrderedDict()
+_indices_lock = threading.Lock()
+
+
+class SimilarityIndex:
+    """Unit vectors of the entities of an embedding, with the inverted file index built on
+    first use by an approximate search"""
+
+    def __init__(self, ontology_name, algorithm, source, vectors, n_classes, entities):
+        self.ontology_name = ontology_name
+        self.algorithm = algorithm
+        self.source = source
+        self.vectors = vectors
+        self.n_classes = n_classes
+        self.entities = entities
+        self.ivf = None
+        self._ivf_lock = threading.Lock()
+
+    def row_range(self, kind):
+        """Return the rows holding the entities of a kind
+
+        Args:
+            kind (str): all, class or individual
+        Returns:
+            tuple: The first row and the end of the rows
+        """
+        if kind == "class":
+            return 0, self.n_classes
+        if kind == "individual":
+            return self.n_classes, len(self.vectors)
+        return 0, len(self.vectors)
+
+
+def get_similarity_config(config_file=CONFIG_FILE):
+    """Read the [SIMILARITY] section of the configuration
+
+    Args:
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The settings of the search, as numbers
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    section = config["SIMILARITY"]
+    return {name: int(section[name]) for name in section}
+
+
+def normalize_rows(matrix, block_size):
+    """Scale every row of a matrix to unit L2 norm, one block of rows at a time
+
+    Args:
+        matrix (numpy.ndarray): The vectors, possibly memory-mapped
+        block_size (int): The number of rows normalized at once
+    Returns:
+        numpy.ndarray: The float32 unit vectors, zero vectors are left as they are
+    """
+    vectors = np.empty(matrix.shape, dtype=np.float32)
+    for start in range(0, len(matrix), block_size):
+        block = np.asarray(matrix[start : start + block_size], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors[start : start + len(block)] = block / norms
+    return vectors
+
+
+def load_similarity_index(ontology_name, algorithm, config):
+    """Load the unit vectors of an embedding, normalizing and caching them on first use
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        config (dict): The [SIMILARITY] settings
+    Returns:
+        SimilarityIndex: The index
+    """
+    source = get_embedding_signature(ontology_name, algorithm)
+    if source is None or not isModelExist(ontology_name, algorithm):
+        raise ModelException(
+            f"No embedding of {ontology_name} with {algorithm}, generate it first", 404
+        )
+
+    entities = load_embedding_entities(ontology_name, algorithm)
+    meta = load_embedding_meta(ontology_name, algorithm)
+    if entities is None or meta is None:
+        # embeddings saved before the row sidecar existed
+        files = load_multi_input_files(ontology_name, ["classes", "individuals"])
+        entities = files["classes"] + files["individuals"]
+        n_classes = len(files["classes"])
+    else:
+        n_classes = meta["n_classes"]
+
+    loaded = load_normalized_embedding(ontology_name, algorithm, source)
+    if loaded is not None:
+        vectors = loaded[0]
+    else:
+        print(f"Normalize embedding of {ontology_name} with {algorithm} ...")
+        matrix = np.load(
+            get_path(ontology_name, algorithm, EMBEDDING_FILE), mmap_mode="r"
+        )
+        vectors = normalize_rows(matrix, config["block_size"])
+        save_normalized_embedding(ontology_name, algorithm, vectors, n_classes, source)
+
+    if len(entities) != len(vectors):
+        raise ModelException(
+            f"{len(vectors)} vectors for {len(entities)} entities, regenerate the embedding"
+        )
+    return SimilarityIndex(
+        ontology_name, algorithm, source, vectors, n_classes, entities
+    )
+
+
+def get_similarity_index(ontology_name, algorithm, config):
+    """Return the similarity index of an embedding, kept in memory until the embedding changes
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        config (dict): The [SIMILARITY] settings
+    Returns:
+        SimilarityIndex: The index
+    """
+    key = (ontology_name, algorithm)
+    source = get_embedding_signature(ontology_name, algorithm)
+    with _indices_lock:
+        index = _indices.get(key)
+        if index is not None and index.source == source:
+            _indices.move_to_end(key)
+            return index
+
+    index = load_similarity_index(ontology_name, algorithm, config)
+    with _indices_lock:
+        _indices[key] = index
+        _indices.move_to_end(key)
+        while len(_indices) > config["cache_size"]:
+            _indices.popitem(last=False)
+    return index
+
+
+def _merge_top_k(best_scores, best_rows, scores, rows, k):
+    """Keep the k best of the current and the new candidates of every query"""
+    scores = np.concatenate([best_scores, scores], axis=1)
+    rows = np.concatenate([best_rows, rows], axis=1)
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        rows = np.take_along_axis(rows, keep, axis=1)
+    return scores, rows
+
+
+def _sort_top_k(scores, rows):
+    """Sort the candidates of every query by decreasing score"""
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(
+        rows, order, axis=1
+    )
+
+
+def top_k_exact(vectors, queries, k, start, end, block_size, exclude=None):
+    """Exact cosine top-k over a range of rows, scoring one block of rows per matrix product
+
+    Args:
+        vectors (numpy.ndarray): The unit vectors
+        queries (numpy.ndarray): The unit query vectors, one per row
+        k (int): The number of neighbours of every query
+        start (int): The first row searched
+        end (int): The end of the rows searched
+        block_size (int): The number of rows scored at once
+        exclude (numpy.ndarray): The row of every query excluded from its neighbours, or -1
+    Returns:
+        tuple: The scores and rows of the neighbours of every query, best first
+    """
+    n_queries = len(queries)
+    best_scores = np.empty((n_queries, 0), dtype=np.float32)
+    best_rows = np.empty((n_queries, 0), dtype=np.int64)
+    for block_start in range(start, end, block_size):
+        block_end = min(block_start + block_size, end)
+        scores = queries @ np.asarray(vectors[block_start:block_end]).T
+        rows = np.broadcast_to(
+            np.arange(block_start, block_end, dtype=np.int64), scores.shape
+        )
+        if exclude is not None:
+            scores[rows == exclude[:, None]] = -np.inf
+        best_scores, best_rows = _merge_top_k(best_scores, best_rows, scores, rows, k)
+    return _sort_top_k(best_scores, best_rows)
+
+
+def train_ivf(vectors, n_lists, iterations, block_size, seed=42):
+    """Cluster unit vectors with spherical k-means and group their rows by cluster
+
+    Args:
+        vectors (numpy.ndarray): The unit vectors
+        n_lists (int): The number of clusters
+        iterations (int): The number of k-means iterations
+        block_size (int): The number of rows assigned at once
+        seed (int): The seed of the sampled starting centroids and training rows
+    Returns:
+        tuple: The unit centroids, the start offset of every list plus the end of the last,
+            and the rows grouped by list
+    """
+    rng = np.random.default_rng(seed)
+    n_lists = max(1, min(n_lists, len(vectors)))
+    # 64 training rows per list are enough for the centroids
+    sample_size = min(len(vectors), 64 * n_lists)
+    sample = np.asarray(
+        vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    )
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # an empty cluster keeps its centroid
+        filled = norms[:, 0] > 0
+        centroids[filled] = sums[filled] / norms[filled]
+
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = np.asarray(vectors[start : start + block_size])
+        assign[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    rows = np.argsort(assign, kind="stable")
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(assign, minlength=n_lists))
+    return centroids.astype(np.float32), offsets, rows
+
+
+def get_ivf(index, config):
+    """Return the inverted file index of a similarity index, building and caching it on first use
+
+    Args:
+        index (SimilarityIndex): The similarity index
+        config (dict): The [SIMILARITY] settings
+    Returns:
+        dict: The centroids, offsets and rows of the inverted file index
+    """
+    with index._ivf_lock:
+        if index.ivf is None:
+            ivf = load_ivf_index(index.ontology_name, index.algorithm, index.source)
+            if ivf is None:
+                n_lists = config["ivf_lists"] or int(np.sqrt(len(index.vectors)))
+                print(
+                    f"Build similarity index of {index.ontology_name} with "
+                    f"{index.algorithm} ({n_lists} lists) ..."
+                )
+                centroids, offsets, rows = train_ivf(
+                    index.vectors,
+                    n_lists,
+                    config["ivf_iterations"],
+                    config["block_size"],
+                )
+                save_ivf_index(
+                    index.ontology_name,
+                    index.algorithm,
+                    centroids,
+                    offsets,
+                    rows,
+                    index.source,
+                )
+                ivf = {"centroids": centroids, "offsets": offsets, "rows": rows}
+            index.ivf = ivf
+        return index.ivf
+
+
+def top_k_ivf(vectors, ivf, queries, k, start, end, probes, exclude=None):
+    """Approximate cosine top-k, scoring only the rows of the lists closest to every query
+
+    Args:
+        vectors (numpy.ndarray): The unit vectors
+        ivf (dict): The centroids, offsets and rows of the inverted file index
+        queries (numpy.ndarray): The unit query vectors, one per row
+        k (int): The number of neighbours of every query
+        start (int): The first row searched
+        end (int): The end of the rows searched
+        probes (int): The number of lists searched per query
+        exclude (numpy.ndarray): The row of every query excluded from its neighbours, or -1
+    Returns:
+        tuple: The scores and rows of the neighbours of every query, best first
+    """
+    offsets, list_rows = ivf["offsets"], ivf["rows"]
+    probes = min(probes, len(ivf["centroids"]))
+    nearest_lists = np.argpartition(
+        -(queries @ np.asarray(ivf["centroids"]).T), probes - 1, axis=1
+    )[:, :probes]
+
+    all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    all_rows = np.full((len(queries), k), -1, dtype=np.int64)
+    for i, query in enumerate(queries):
+        rows = np.concatenate(
+            [list_rows[offsets[j] : offsets[j + 1]] for j in nearest_lists[i]]
+        )
+        rows = np.sort(rows[(rows >= start) & (rows < end)])
+        if exclude is not None:
+            rows = rows[rows != exclude[i]]
+        if len(rows) == 0:
+            continue
+        scores = np.asarray(vectors[rows]) @ query
+        top = min(k, len(rows))
+        keep = np.argpartition(-scores, top - 1)[:top]
+        all_scores[i, :top] = scores[keep]
+        all_rows[i, :top] = rows[keep]
+    return _sort_top_k(all_scores, all_rows)
+
+
+def similar_entities(
+    ontology_name, algorithm, entities, k=10, kind="all", approximate=None
+):
+    """Find the entities whose embedding is the most similar (cosine) to those of given entities
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        entities (list): The entities to find the neighbours of, in one batch
+        k (int): The number of neighbours of every entity
+        kind (str): Search among all entities, only the classes or only the individuals
+        approximate (bool): Use the inverted file index, by default only from
+            [SIMILARITY] ivf_min_entities entities
+    Returns:
+        list: For every entity, its "neighbors" with their "entity" and "score", best first
+    """
+    config = get_similarity_config()
+    if not entities:
+        raise ModelException("No entity to search the neighbours of", 400)
+    if kind not in SIMILARITY_KINDS:
+        raise ModelException(
+            f"Unsupported kind: {kind}, use one of {', '.join(SIMILARITY_KINDS)}", 400
+        )
+    if not 1 <= k <= config["max_k"]:
+        raise ModelException(f"k must be between 1 and {config['max_k']}", 400)
+
+    try:
+        index = get_similarity_index(ontology_name, algorithm, config)
+        if isinstance(index.entities, list):
+            lookup = {entity: row for row, entity in enumerate(index.entities)}
+            query_rows = [lookup.get(entity) for entity in entities]
+        else:
+            query_rows = [index.entities.index(entity) for entity in entities]
+        missing = [e for e, row in zip(entities, query_rows) if row is None]
+        if missing:
+            raise ModelException(f"Unknown entities: {', '.join(missing)}", 404)
+
+        query_rows = np.array(query_rows, dtype=np.int64)
+        queries = np.asarray(index.vectors[query_rows])
+        start, end = index.row_range(kind)
+        if approximate is None:
+            approximate = len(index.vectors) >= config["ivf_min_entities"]
+
+        if approximate:
+            scores, rows = top_k_ivf(
+                index.vectors,
+                get_ivf(index, config),
+                queries,
+                k,
+                start,
+                end,
+                config["ivf_probes"],
+                exclude=query_rows,
+            )
+        else:
+            scores, rows = top_k_exact(
+                index.vectors,
+                queries,
+                k,
+                start,
+                end,
+                config["block_size"],
+                exclude=query_rows,
+            )
+
+        return [
+            {
+                "entity": entity,
+                "neighbors": [
+                    {"entity": index.entities[row], "score": float(score)}
+                    for score, row in zip(scores[i], rows[i])
+                    if row >= 0 and np.isfinite(score)
+                ],
+            }
+            for i, entity in enumerate(entities)
+        ]
+    except ModelException:
+        raise
+    except Exception as e:
+        raise ModelException(f"Error in similar_entities: {str(e)}")
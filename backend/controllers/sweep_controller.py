@@ -0,0 +1,393 @@
+import configparser
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from controllers.embed_controller import (
+    get_embed_variant,
+    get_model_meta,
+    get_probe_key,
+    get_word2vec_documents,
+    get_word2vec_params,
+    retrieval_embed_opa2vec_onto2vec,
+    retrieval_embed_owl2vec,
+)
+from controllers.evaluator_controller import predict_func
+from controllers.resource_controller import get_allocated_cores
+from controllers.training_controller import get_validation_probe, train_epochs
+from models.embed_model import (
+    isModelCurrent,
+    isModelExist,
+    save_embedding,
+    save_model,
+    save_model_meta,
+    save_training_curve,
+)
+from models.extract_model import load_multi_input_files
+from models.sweep_model import save_leaderboard
+from utils.exceptions import ModelException, handle_exception
+from utils.lazy_import import lazy_import
+
+gensim = lazy_import("gensim")
+
+CONFIG_FILE = os.path.join("controllers", "default.cfg")
+
+# algorithms whose variants train gensim Word2Vec models on documents they can share
+SWEEP_ALGORITHMS = ("owl2vec-star", "opa2vec", "onto2vec")
+
+# the configuration read to build the documents of each algorithm, variants agreeing on it
+# share one corpus and vocabulary
+DOCUMENT_OPTIONS = {
+    "owl2vec-star": [
+        ("DOCUMENT_OWL2VECSTAR", None),
+        ("MODEL_OWL2VECSTAR", "seed"),
+    ],
+    "opa2vec": [],
+    "onto2vec": [],
+}
+
+# metrics of the leaderboard, the first one ranks the variants
+LEADERBOARD_METRICS = ("mrr", "hit_at_1", "hit_at_5", "hit_at_10")
+
+
+def get_sweep_config(config_file=CONFIG_FILE):
+    """Read the [SWEEP] section of the configuration
+
+    Args:
+        config_file (str): The path of the configuration file
+    Returns:
+        dict: The "max_variants" of a sweep and the "workers_per_variant" of each training
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    return {name: int(value) for name, value in config["SWEEP"].items()}
+
+
+def expand_grid(grid, max_variants):
+    """Expand a grid of hyperparameter values into the overrides of every variant
+
+    Args:
+        grid (dict): The values to try of each hyperparameter, see EMBED_PARAMETERS; a single
+            value is tried alone
+        max_variants (int): The largest number of variants of a sweep
+    Returns:
+        list: The overrides of every combination of values
+    """
+    if not isinstance(grid, dict) or not grid:
+        raise ModelException("The sweep grid must be a non-empty object", 400)
+    names = sorted(grid)
+    values = [
+        grid[name] if isinstance(grid[name], list) else [grid[name]] for name in names
+    ]
+    if any(len(options) == 0 for options in values):
+        raise ModelException("Every hyperparameter of the grid needs a value", 400)
+
+    count = 1
+    for options in values:
+        count *= len(options)
+    if count > max_variants:
+        raise ModelException(
+            f"The grid has {count} variants, a sweep trains at most {max_variants}", 400
+        )
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def get_document_key(config, algorithm):
+    """Return the configuration the documents of an algorithm are built from
+
+    Args:
+        config (configparser.ConfigParser): The effective configuration
+        algorithm (str): The name of the algorithm
+    Returns:
+        str: The key, equal for the variants that can share documents
+    """
+    options = dict()
+    for section, option in DOCUMENT_OPTIONS[algorithm]:
+        if option is None:
+            options[section] = dict(config[section])
+        else:
+            options[f"{section}.{option}"] = config[section][option]
+    return json.dumps(options, sort_keys=True)
+
+
+def plan_sweep(algorithm, grid, config_file=CONFIG_FILE):
+    """Resolve the model variants of a sweep and group them by shared documents
+
+    Args:
+        algorithm (str): The name of the algorithm
+        grid (dict): The values to try of each hyperparameter
+        config_file (str): The path of the configuration file
+    Returns:
+        list: For every group of variants sharing documents, the list of its variants, each
+            a dict of its name, overrides, effective configuration and configuration hash
+    """
+    if algorithm not in SWEEP_ALGORITHMS:
+        raise ModelException(
+            f"Sweeps support {', '.join(SWEEP_ALGORITHMS)}, not {algorithm}", 400
+        )
+    sweep_config = get_sweep_config(config_file)
+
+    groups, seen = dict(), set()
+    for overrides in expand_grid(grid, sweep_config["max_variants"]):
+        variant, config, config_hash = get_embed_variant(
+            algorithm, overrides, config_file
+        )
+        # values equal to the defaults resolve to the same variant
+        if variant in seen:
+            continue
+        seen.add(variant)
+        groups.setdefault(get_document_key(config, algorithm), list()).append(
+            {
+                "variant": variant,
+                "overrides": overrides,
+                "config": config,
+                "config_hash": config_hash,
+            }
+        )
+    return list(groups.values())
+
+
+def get_sweep_id(algorithm, classifier, variants):
+    """Identify a sweep by what it trains and evaluates
+
+    Args:
+        algorithm (str): The name of the algorithm
+        classifier (str): The name of the classifier
+        variants (list): The names of the model variants
+    Returns:
+        str: The id of the sweep
+    """
+    key = json.dumps(
+        {
+            "algorithm": algorithm,
+            "classifier": classifier,
+            "variants": sorted(variants),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def train_word2vec(sentences, word_freq, params, workers, config, probe=None, key=str):
+    """Train a Word2Vec model from a corpus whose words were already counted
+
+    Training is the same as building the vocabulary from the sentences, but the corpus is
+    not scanned again for every variant.
+
+    Args:
+        sentences (list): The sentences, each a list of str
+        word_freq (dict): The frequency of every word of the sentences, in order of first
+            occurrence
+        params (dict): The Word2Vec hyperparameters, see get_word2vec_params
+        workers (int): The number of worker threads
+        config (configparser.ConfigParser): The effective configuration, see train_epochs
+        probe (dict): The validation probe, see get_validation_probe
+        key (function): Maps an entity to its word in the model vocabulary
+    Returns:
+        tuple: The model, its training curve and the training time in seconds
+    """
+    start_time = time.time()
+    model = gensim.models.Word2Vec(workers=workers, **params)
+    model.build_vocab_from_freq(word_freq, corpus_count=len(sentences))
+    curve = train_epochs(model, sentences, config, probe, key)
+    return model, curve, time.time() - start_time
+
+
+def train_variants(ontology_name, algorithm, group, files, workers_per_variant):
+    """Train the variants of a group on documents and a vocabulary built once
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        group (list): The variants sharing documents, see plan_sweep
+        files (dict): The classes and individuals of the ontology
+        workers_per_variant (int): The worker threads of each training
+    Returns:
+        dict: The training time in seconds of every variant
+    """
+    instances = files["classes"] + files["individuals"]
+    sentences = get_word2vec_documents(
+        ontology_name, group[0]["config"], algorithm, instances
+    )
+    word_freq = Counter()
+    for sentence in sentences:
+        word_freq.update(sentence)
+    print(
+        "Shared corpus of %d sentences and %d words for %d variants"
+        % (len(sentences), len(word_freq), len(group))
+    )
+
+    # variants train side by side, within the cores allocated to the sweep
+    cores = get_allocated_cores()
+    parallel = max(1, min(len(group), cores // max(1, workers_per_variant)))
+    workers = max(1, cores // parallel)
+    retrieval = (
+        retrieval_embed_owl2vec
+        if algorithm == "owl2vec-star"
+        else retrieval_embed_opa2vec_onto2vec
+    )
+    # the probe reads the validation split, which needs the application context
+    probe = get_validation_probe(ontology_name, group[0]["config"])
+
+    train_times = dict()
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        futures = {
+            executor.submit(
+                train_word2vec,
+                sentences,
+                word_freq,
+                get_word2vec_params(entry["config"], algorithm),
+                workers,
+                entry["config"],
+                probe,
+                get_probe_key(algorithm),
+            ): entry
+            for entry in group
+        }
+        # models are saved in this thread, which holds the application context
+        for future in as_completed(futures):
+            entry = futures[future]
+            model, curve, train_times[entry["variant"]] = future.result()
+            config = entry["config"]
+            save_model(
+                ontology_name,
+                entry["variant"],
+                model,
+                model_format=config["STORAGE"]["model_format"],
+                keep_walks=config["STORAGE"]["keep_walks"] == "yes",
+            )
+            save_training_curve(ontology_name, entry["variant"], curve)
+            save_embedding(
+                ontology_name,
+                entry["variant"],
+                retrieval(model, instances),
+                classes=files["classes"],
+                individuals=files["individuals"],
+                dtype=config["STORAGE"]["embedding_dtype"],
+            )
+            save_model_meta(
+                ontology_name,
+                entry["variant"],
+                get_model_meta(ontology_name, algorithm, config, entry["config_hash"]),
+            )
+            print(
+                "Trained %s in %.1fs"
+                % (entry["variant"], train_times[entry["variant"]])
+            )
+    return train_times
+
+
+def rank_leaderboard(entries):
+    """Rank the variants of a sweep by their metrics, failed variants last
+
+    Args:
+        entries (list): The leaderboard entries
+    Returns:
+        list: The entries, best first, each with its rank
+    """
+    ranked = sorted(
+        entries,
+        key=lambda entry: tuple(
+            -(entry.get(metric) or 0) for metric in LEADERBOARD_METRICS
+        ),
+    )
+    for rank, entry in enumerate(ranked, start=1):
+        entry["rank"] = rank
+    return ranked
+
+
+def sweep_func(ontology_name, algorithm, classifier, grid):
+    """Train and evaluate every combination of a grid of hyperparameters
+
+    Variants whose documents are configured alike share one corpus and one vocabulary and
+    train in parallel within the cores allocated to the sweep. Variants already trained on
+    the current ontology and configuration are reused. Every variant is saved like the
+    models of the embed route, evaluated with the classifier, and ranked in a leaderboard.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        classifier (str): The name of the classifier
+        grid (dict): The values to try of each hyperparameter, see EMBED_PARAMETERS
+    Returns:
+        dict: The leaderboard
+    """
+    groups = plan_sweep(algorithm, grid)
+    variants = [entry["variant"] for group in groups for entry in group]
+    sweep_id = get_sweep_id(algorithm, classifier, variants)
+
+    try:
+        start_time = time.time()
+        sweep_config = get_sweep_config()
+        files = load_multi_input_files(ontology_name, ["classes", "individuals"])
+
+        train_times = dict()
+        for group in groups:
+            pending = [
+                entry
+                for entry in group
+                if not (
+                    isModelExist(ontology_name, entry["variant"])
+                    and isModelCurrent(
+                        ontology_name, entry["variant"], entry["config_hash"]
+                    )
+                )
+            ]
+            if pending:
+                train_times.update(
+                    train_variants(
+                        ontology_name,
+                        algorithm,
+                        pending,
+                        files,
+                        sweep_config["workers_per_variant"],
+                    )
+                )
+
+        entries = list()
+        for group in groups:
+            for entry in group:
+                variant = entry["variant"]
+                result = {
+                    "variant": variant,
+                    "parameters": entry["overrides"],
+                    "trained": variant in train_times,
+                    "train_time": train_times.get(variant),
+                }
+                try:
+                    performance = predict_func(ontology_name, variant, classifier)[
+                        "performance"
+                    ]
+                    result.update(
+                        {
+                            metric: float(performance[metric])
+                            for metric in LEADERBOARD_METRICS
+                        }
+                    )
+                except Exception as e:
+                    # one failed evaluation does not lose the rest of the sweep
+                    result["error"] = handle_exception(e)["message"]
+                entries.append(result)
+
+        return save_leaderboard(
+            ontology_name,
+            sweep_id,
+            {
+                "sweep_id": sweep_id,
+                "ontology_name": ontology_name,
+                "algorithm": algorithm,
+                "classifier": classifier,
+                "grid": grid,
+                "groups": len(groups),
+                "time": time.time() - start_time,
+                "finished_at": time.time(),
+                "leaderboard": rank_leaderboard(entries),
+            },
+        )
+
+    except Exception as e:
+        raise ModelException(f"Internal server error in sweep_func: {str(e)}")
@@ -0,0 +1,325 @@
+import math
+import os
+import random
+
+import numpy as np
+
+from models.extract_model import (
+    load_input_file,
+    load_multi_input_files,
+    load_train_test_validation,
+)
+from models.knowledge_graph_model import get_knowledge_graph
+from owl2vec_star.RDF2Vec_Embed import construct_walker
+from utils.directory_utils import get_path, get_previous_path
+from utils.exceptions import ModelException
+
+REVISION_FILES = ["axioms", "classes", "individuals", "uri_labels", "annotations"]
+
+
+def diff_revisions(ontology_name):
+    """Diff the extraction artifacts of the ontology against its previously uploaded revision
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        dict: For every artifact the "added" and "removed" lines, plus the "changed_ratio" of
+            changed lines and the "entities" (classes and individuals) touched by a change,
+            or None if there is no previous revision to diff against
+    """
+    try:
+        if not all(
+            os.path.exists(get_previous_path(ontology_name, file + ".txt"))
+            for file in REVISION_FILES
+        ):
+            return None
+
+        new = load_multi_input_files(ontology_name, REVISION_FILES)
+        old = load_multi_input_files(ontology_name, REVISION_FILES, previous=True)
+
+        diff, changed, total = dict(), 0, 0
+        for file in REVISION_FILES:
+            new_lines, old_lines = set(new[file]), set(old[file])
+            diff[file] = {
+                "added": [line for line in new[file] if line not in old_lines],
+                "removed": [line for line in old[file] if line not in new_lines],
+            }
+            changed += len(diff[file]["added"]) + len(diff[file]["removed"])
+            total += max(len(new_lines), len(old_lines))
+
+        entities = set(new["classes"] + new["individuals"])
+        touched = set()
+        for file in REVISION_FILES:
+            for line in diff[file]["added"] + diff[file]["removed"]:
+                touched.update(token for token in line.split() if token in entities)
+
+        diff["changed_ratio"] = changed / total if total else 0.0
+        diff["entities"] = [
+            e for e in new["classes"] + new["individuals"] if e in touched
+        ]
+        return diff
+    except Exception as e:
+        raise ModelException(f"Error in diff_revisions: {str(e)}")
+
+
+def expand_affected_entities(kg, entities, upstream_hops, downstream_hops=0):
+    """Collect the entities whose walks can be affected by a change to the given entities
+
+    A walk rooted in u changes if it reaches a changed vertex, i.e. if u is at most
+    upstream_hops edges before it. Weisfeiler-Lehman labels also propagate a change
+    downstream_hops edges forward before the walks are affected.
+
+    Args:
+        kg (CSRKnowledgeGraph): The knowledge graph of the new revision
+        entities (list): The names of the changed entities
+        upstream_hops (int): The number of edges to follow backwards
+        downstream_hops (int): The number of edges to follow forwards first
+    Returns:
+        set: The names of the affected vertices, including the given entities
+    """
+    try:
+        names = kg.name_list()
+        indptr, objects = kg.adjacency()
+        inv_indptr, inv_edges = kg.inverse_adjacency()
+        subjects = kg.subjects().tolist()
+
+        def expand(frontier, hops, neighbors):
+            reached = set(frontier)
+            for _ in range(hops):
+                frontier = {n for v in frontier for n in neighbors(v)} - reached
+                if not frontier:
+                    break
+                reached |= frontier
+            return reached
+
+        seeds = {kg.vertex_id(e) for e in entities} - {-1}
+        seeds = expand(
+            seeds, downstream_hops, lambda v: objects[indptr[v] : indptr[v + 1]]
+        )
+        affected = expand(
+            seeds,
+            upstream_hops,
+            lambda v: [
+                subjects[e] for e in inv_edges[inv_indptr[v] : inv_indptr[v + 1]]
+            ],
+        )
+        return {names[v] for v in affected} | set(entities)
+    except Exception as e:
+        raise ModelException(f"Error in expand_affected_entities: {str(e)}")
+
+
+def walk_hops(walk_depth):
+    """Return the number of entity-to-entity hops of a walk of the given depth
+
+    Walks alternate entity and predicate hops, so a walk of depth d crosses ceil(d / 2) edges.
+
+    Args:
+        walk_depth (int): The depth of the walk
+    Returns:
+        int: The number of edges crossed
+    """
+    return math.ceil(walk_depth / 2)
+
+
+def affected_walk_roots(ontology_name, diff, walker_type, walk_depth, instances):
+    """Return the instances whose walks must be regenerated after a revision
+
+    Args:
+        ontology_name (str): The name of the ontology
+        diff (dict): The result of diff_revisions
+        walker_type (str): The walker type (random or wl)
+        walk_depth (int): The depth of the walks
+        instances (list): The classes and individuals of the new revision
+    Returns:
+        list: The affected instances, in the order of instances
+    """
+    walker = construct_walker(walker_type, walk_depth)
+    affected = expand_affected_entities(
+        get_knowledge_graph(ontology_name),
+        diff["entities"],
+        upstream_hops=walk_hops(walk_depth),
+        downstream_hops=walk_hops(getattr(walker, "wl_iterations", 0)),
+    )
+    return [e for e in instances if e in affected]
+
+
+def continue_training(model, sentences, epochs, workers=None):
+    """Continue training a gensim Word2Vec model on new sentences
+
+    The vocabulary is extended with the words of the sentences before training.
+
+    Args:
+        model (gensim.models.Word2Vec): The model to update
+        sentences (list): The sentences to train on, each a list of str
+        epochs (int): The number of epochs over the sentences
+        workers (int): The number of training threads, those of the model if None
+    Returns:
+        gensim.models.Word2Vec: The updated model
+    """
+    try:
+        if len(sentences) == 0:
+            return model
+        if workers:
+            model.workers = workers
+        model.build_vocab(sentences, update=True)
+        model.train(sentences, total_examples=len(sentences), epochs=epochs)
+        return model
+    except Exception as e:
+        raise ModelException(f"Error in continue_training: {str(e)}")
+
+
+def get_validation_probe(ontology_name, config):
+    """Sample the validation pairs used to probe the embedding during training
+
+    Args:
+        ontology_name (str): The name of the ontology
+        config (configparser.ConfigParser): The effective configuration
+    Returns:
+        dict: The "samples", (entity, superclass) pairs of valid.csv, and the "classes"
+            ranked for each, or None if [TRAINING] probe_size is 0 or the ontology has no
+            validation split
+    """
+    try:
+        size = int(config["TRAINING"]["probe_size"])
+        if size <= 0 or not os.path.exists(get_path(ontology_name, "valid.csv")):
+            return None
+        samples = [
+            sample[:2]
+            for sample in load_train_test_validation(ontology_name)[1]
+            if len(sample) >= 2
+        ]
+        if not samples:
+            return None
+        random.Random(int(config["TRAINING"]["probe_seed"])).shuffle(samples)
+        return {
+            "samples": samples[:size],
+            "classes": load_input_file(ontology_name, "classes"),
+        }
+    except Exception as e:
+        raise ModelException(f"Error in get_validation_probe: {str(e)}")
+
+
+def probe_mrr(model, probe, key=str, block_size=256):
+    """Rank the classes by cosine similarity to each probe entity and score the true superclass
+
+    Args:
+        model (gensim.models.Word2Vec): The model being trained
+        probe (dict): The probe, see get_validation_probe
+        key (function): Maps an entity to its word in the model vocabulary
+        block_size (int): The number of probe entities scored per matrix product
+    Returns:
+        float: The mean reciprocal rank of the true superclasses, 0 for entities or
+            superclasses missing from the vocabulary
+    """
+    key_to_index = model.wv.key_to_index
+    class_rows = [key_to_index.get(key(c)) for c in probe["classes"]]
+    class_rows = [row for row in class_rows if row is not None]
+    if not class_rows or not probe["samples"]:
+        return 0.0
+
+    class_position = {row: i for i, row in enumerate(class_rows)}
+    vectors = model.wv.vectors[class_rows]
+    vectors = vectors / np.maximum(
+        np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12
+    )
+
+    pairs = [
+        (key_to_index[key(sub)], class_position[key_to_index[key(gt)]])
+        for sub, gt in probe["samples"]
+        if key(sub) in key_to_index and key_to_index.get(key(gt)) in class_position
+    ]
+    reciprocal_sum = 0.0
+    for start in range(0, len(pairs), block_size):
+        block = pairs[start : start + block_size]
+        queries = model.wv.vectors[[row for row, _ in block]]
+        queries = queries / np.maximum(
+            np.linalg.norm(queries, axis=1, keepdims=True), 1e-12
+        )
+        scores = queries @ vectors.T
+        truth = scores[np.arange(len(block)), [position for _, position in block]]
+        ranks = 1 + (scores > truth[:, None]).sum(axis=1)
+        reciprocal_sum += float((1.0 / ranks).sum())
+    return reciprocal_sum / len(probe["samples"])
+
+
+def train_epochs(model, sentences, config, probe=None, key=str):
+    """Train a Word2Vec model whose vocabulary is built, one epoch at a time
+
+    The learning rate decays linearly over the model's epochs like a single gensim training
+    call. With [TRAINING] early_stopping, training stops once the monitored value improved
+    by less than min_delta for patience epochs in a row, after at least min_epochs: the
+    training loss (relative improvement), or the MRR of the validation probe when given.
+
+    Args:
+        model (gensim.models.Word2Vec): The model, with its vocabulary built
+        sentences (list): The sentences to train on, each a list of str
+        config (configparser.ConfigParser): The effective configuration
+        probe (dict): The validation probe, see get_validation_probe
+        key (function): Maps an entity to its word in the model vocabulary
+    Returns:
+        dict: The training curve: the "max_epochs", the "epochs" trained, whether training
+            "stopped_early", the "monitor"ed value and the loss and MRR of every epoch
+    """
+    try:
+        training = config["TRAINING"]
+        early_stopping = training["early_stopping"] == "yes"
+        min_epochs = int(training["min_epochs"])
+        patience = int(training["patience"])
+        min_delta = float(training["min_delta"])
+        monitor = "mrr" if probe is not None else "loss"
+
+        max_epochs = model.epochs
+        alpha, min_alpha = model.alpha, model.min_alpha
+        curve, best, stale = list(), None, 0
+        for epoch in range(max_epochs):
+            model.train(
+                sentences,
+                total_examples=model.corpus_count,
+                epochs=1,
+                start_alpha=alpha - (alpha - min_alpha) * epoch / max_epochs,
+                end_alpha=alpha - (alpha - min_alpha) * (epoch + 1) / max_epochs,
+                compute_loss=True,
+            )
+            point = {
+                "epoch": epoch + 1,
+                "loss": float(model.get_latest_training_loss()),
+            }
+            if probe is not None:
+                point["mrr"] = probe_mrr(model, probe, key)
+            curve.append(point)
+            print(
+                "Epoch %d/%d: %s"
+                % (
+                    epoch + 1,
+                    max_epochs,
+                    ", ".join(
+                        f"{name} {point[name]:.4f}"
+                        for name in ("loss", "mrr")
+                        if name in point
+                    ),
+                )
+            )
+
+            # the loss improves downwards, relative to its scale
+            if best is None:
+                improved = True
+            elif monitor == "loss":
+                improved = best - point["loss"] > min_delta * abs(best)
+            else:
+                improved = point["mrr"] - best > min_delta
+            if improved:
+                best, stale = point[monitor], 0
+            else:
+                stale += 1
+            if early_stopping and stale >= patience and epoch + 1 >= min_epochs:
+                break
+
+        return {
+            "max_epochs": max_epochs,
+            "epochs": len(curve),
+            "stopped_early": len(curve) < max_epochs,
+            "monitor": monitor,
+            "curve": curve,
+        }
+    except Exception as e:
+        raise ModelException(f"Error in train_epochs: {str(e)}")
@@ -1,3 +1,4 @@
+import click
 import datetime
 from logging.handlers import TimedRotatingFileHandler
 from flask import Flask, send_from_directory
@@ -9,6 +10,9 @@ from dotenv import load_dotenv
 import os
 import logging
 from models.log_model import configure_logging
+from controllers.embed_controller import migrate_model_artifacts
+from controllers.job_controller import get_dispatcher
+from owl2vec_star.Label import NLTK_RESOURCES
 
 
 def create_app():
@@ -39,10 +43,35 @@ def create_app():
         """function to serve the static files from the frontend folder"""
         return send_from_directory(app.static_folder, path)
 
+    @app.cli.command("migrate-models")
+    @click.option("--ontology", default=None, help="Only migrate this ontology.")
+    @click.option(
+        "--format",
+        "model_format",
+        type=click.Choice(["full", "slim"]),
+        default=None,
+        help="The format of the rewritten models, [STORAGE] model_format by default.",
+    )
+    def migrate_models(ontology, model_format):
+        """Rewrite the saved models in the configured format, dropping RDF2Vec walks"""
+        migrated = migrate_model_artifacts(ontology, model_format)
+        print(f"Migrated {len(migrated)} models")
+
+    @app.cli.command("download-nltk-data")
+    def download_nltk_data():
+        """Download the NLTK tokenizer models, which the server never fetches by itself"""
+        import nltk
+
+        for resource in NLTK_RESOURCES:
+            nltk.download(resource)
+
     # Initialize default user
     initialize_default_user(app.config["STORAGE_FOLDER"])
     logger = configure_logging()
     logger.info("Start logging...")
+
+    # run the jobs queued before a restart, and fail those its workers left running
+    get_dispatcher(app)
     return app
 
 
@@ -0,0 +1,148 @@
+import os
+
+from models.extract_model import load_input_file
+from owl2vec_star.Label import pre_process_words
+from utils.binary_store import (
+    StringTable,
+    decode_sentences,
+    encode_sentences,
+    load_arrays,
+    read_header,
+    save_arrays,
+)
+from utils.directory_utils import get_cache_path, get_file_signature, get_path
+from utils.exceptions import FileException
+
+CORPUS_FOLDER = "corpus"
+
+# the tokenized corpora: the extraction file each is built from and how its lines are split.
+# "split" keeps the whitespace-separated items of a line, "words" keeps the entity of an
+# annotation or label line followed by its text tokenized into words.
+CORPORA = {
+    "axioms": ("axioms", "split"),
+    "annotations": ("annotations", "split"),
+    "uri_labels": ("uri_labels", "split"),
+    "annotation_words": ("annotations", "words"),
+    "label_words": ("uri_labels", "words"),
+}
+
+
+def tokenize_lines(lines, mode):
+    """Tokenize the lines of an extraction file
+
+    Args:
+        lines (list): The lines
+        mode (str): split or words, see CORPORA
+    Returns:
+        list: The sentences, each a list of str
+    """
+    if mode == "split":
+        return [line.split() for line in lines]
+    sentences = []
+    for line in lines:
+        items = line.split()
+        if items:
+            sentences.append(items[:1] + pre_process_words(items[1:]))
+    return sentences
+
+
+def get_corpus_path(ontology_name, name):
+    """Return the path of a tokenized corpus in the cache folder of the ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        name (str): The name of the corpus, see CORPORA
+    Returns:
+        str: The path of the corpus file
+    """
+    return get_cache_path(ontology_name, CORPUS_FOLDER, name + ".bin")
+
+
+def save_corpus(ontology_name, name):
+    """Tokenize an extraction file and save it as integer token ids with a token table
+
+    Args:
+        ontology_name (str): The name of the ontology
+        name (str): The name of the corpus, see CORPORA
+    Returns:
+        list: The sentences, each a list of str
+    """
+    try:
+        file, mode = CORPORA[name]
+        source = get_file_signature(get_path(ontology_name, file + ".txt"))
+        sentences = tokenize_lines(load_input_file(ontology_name, file), mode)
+
+        tokens_blob, tokens_offsets, token_ids, offsets = encode_sentences(sentences)
+        arrays = {
+            "tokens_blob": tokens_blob,
+            "tokens_offsets": tokens_offsets,
+            "token_ids": token_ids,
+            "sentence_offsets": offsets,
+        }
+        meta = {"source": source, "n_sentences": len(sentences)}
+        save_arrays(get_corpus_path(ontology_name, name), arrays, meta)
+        return sentences
+    except Exception as e:
+        raise FileException(f"Error saving {name} corpus: {str(e)}")
+
+
+def save_corpora(ontology_name):
+    """Tokenize every extraction file read by the Word2Vec-based algorithms
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        None
+    """
+    for name in CORPORA:
+        save_corpus(ontology_name, name)
+
+
+def load_corpus(ontology_name, name, lower=False):
+    """Load a tokenized corpus if it was built from the current extraction file
+
+    Args:
+        ontology_name (str): The name of the ontology
+        name (str): The name of the corpus, see CORPORA
+        lower (bool): Lowercase the tokens
+    Returns:
+        list: The sentences, each a list of str, or None if the corpus is missing or stale
+    """
+    try:
+        path = get_corpus_path(ontology_name, name)
+        if not os.path.exists(path):
+            return None
+        meta, _, _ = read_header(path)
+        source_file = get_path(ontology_name, CORPORA[name][0] + ".txt")
+        if meta.get("source") != get_file_signature(source_file):
+            return None
+
+        arrays, _ = load_arrays(path)
+        tokens = StringTable(arrays["tokens_blob"], arrays["tokens_offsets"]).tolist()
+        if lower:
+            # lowercasing the token table is enough, every occurrence shares it
+            tokens = [token.lower() for token in tokens]
+        return decode_sentences(tokens, arrays["token_ids"], arrays["sentence_offsets"])
+    except Exception as e:
+        raise FileException(f"Error loading {name} corpus: {str(e)}")
+
+
+def get_corpus(ontology_name, name, lower=False):
+    """Return a tokenized corpus, building it when the ontology was extracted without it
+
+    Args:
+        ontology_name (str): The name of the ontology
+        name (str): The name of the corpus, see CORPORA
+        lower (bool): Lowercase the tokens
+    Returns:
+        list: The sentences, each a list of str
+    """
+    sentences = load_corpus(ontology_name, name, lower)
+    if sentences is not None:
+        return sentences
+
+    print(f"Build {name} corpus of {ontology_name} ...")
+    sentences = save_corpus(ontology_name, name)
+    if lower:
+        sentences = [[token.lower() for token in sentence] for sentence in sentences]
+    return sentences
@@ -1,11 +1,40 @@
+import copy
+import json
 import os
-import joblib
-import gensim
 import numpy
 
 from models.extract_model import load_multi_input_files
-from utils.directory_utils import get_path, replace_or_create_folder
+from models.ontology_model import get_ontology_hash
+from models.walk_model import write_walks
+from utils.binary_store import (
+    StringTable,
+    atomic_open,
+    encode_strings,
+    load_arrays,
+    save_arrays,
+)
+from utils.directory_utils import (
+    get_base_algorithm,
+    get_path,
+    get_previous_path,
+    replace_or_create_folder,
+)
 from utils.exceptions import FileException
+from utils.lazy_import import lazy_import
+
+gensim = lazy_import("gensim")
+joblib = lazy_import("joblib")
+
+MODEL_FILE = "model"
+SLIM_MODEL_FILE = "model.kv"
+MODEL_META_FILE = "model.json"
+TRAINING_CURVE_FILE = "training_curve.json"
+MODEL_WALKS_FILE = "walks.bin"
+MODEL_FORMATS = ("full", "slim")
+EMBEDDING_FILE = "embeddings.npy"
+EMBEDDING_META_FILE = "embeddings.json"
+EMBEDDING_ENTITIES_FILE = "entities.bin"
+EMBEDDING_DTYPES = ("float32", "float16")
 
 
 def isModelExist(ontology_name, algorithm):
@@ -18,19 +47,187 @@ def isModelExist(ontology_name, algorithm):
         bool: True if the model exists, False otherwise
     """
     try:
-        path = get_path(ontology_name, algorithm, "model")
-        return os.path.exists(path)
+        return os.path.exists(
+            get_path(ontology_name, algorithm, MODEL_FILE)
+        ) or os.path.exists(get_path(ontology_name, algorithm, SLIM_MODEL_FILE))
     except Exception as e:
         raise FileException(f"Error checking if model exists: {str(e)}")
 
 
-def save_model(ontology_name, algorithm, model):
+def isModelCurrent(ontology_name, algorithm, config_hash=None):
+    """Check if the model was trained on the current revision of the ontology and configuration
+
+    Models saved without metadata are considered current.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        config_hash (str): The hash of the effective configuration, None to ignore it
+    Returns:
+        bool: True if the model matches the ontology file and configuration, False otherwise
+    """
+    try:
+        meta = load_model_meta(ontology_name, algorithm)
+        if meta is None:
+            return True
+        if (
+            config_hash is not None
+            and meta.get("config_hash", config_hash) != config_hash
+        ):
+            return False
+        if "ontology_hash" not in meta:
+            return True
+        return meta["ontology_hash"] == get_ontology_hash(ontology_name)
+    except Exception as e:
+        raise FileException(f"Error checking if model is current: {str(e)}")
+
+
+def save_model_meta(ontology_name, algorithm, meta):
+    """Save the metadata of the model next to it
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        meta (dict): The metadata to save
+    Returns:
+        dict: The metadata saved
+    """
+    try:
+        path = get_path(ontology_name, algorithm, MODEL_META_FILE)
+        with open(path, "w") as f:
+            json.dump(meta, f, indent=2)
+        return meta
+    except Exception as e:
+        raise FileException(f"Error saving model metadata: {str(e)}")
+
+
+def load_model_meta(ontology_name, algorithm):
+    """Load the metadata of the model
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+    Returns:
+        dict: The metadata, or None if the model has no metadata
+    """
+    try:
+        path = get_path(ontology_name, algorithm, MODEL_META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        raise FileException(f"Error loading model metadata: {str(e)}")
+
+
+def save_training_curve(ontology_name, algorithm, curve):
+    """Save the epoch by epoch training curve of the model next to it
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        curve (dict): The training curve, see train_epochs
+    Returns:
+        dict: The training curve saved
+    """
+    try:
+        path = get_path(ontology_name, algorithm, TRAINING_CURVE_FILE)
+        with open(path, "w") as f:
+            json.dump(curve, f, indent=2)
+        return curve
+    except Exception as e:
+        raise FileException(f"Error saving training curve: {str(e)}")
+
+
+def load_training_curve(ontology_name, algorithm):
+    """Load the training curve of the model
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+    Returns:
+        dict: The training curve, or None if the model was trained without one
+    """
+    try:
+        path = get_path(ontology_name, algorithm, TRAINING_CURVE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        raise FileException(f"Error loading training curve: {str(e)}")
+
+
+def _model_files(folder):
+    """List the model files of an algorithm folder, including the arrays gensim stores next to them"""
+    return [
+        os.path.join(folder, name)
+        for name in os.listdir(folder)
+        if name in (MODEL_FILE, SLIM_MODEL_FILE, MODEL_WALKS_FILE)
+        or (name.startswith(MODEL_FILE + ".") and name.endswith(".npy"))
+    ]
+
+
+def write_model(
+    folder, algorithm, model, model_format="full", keep_walks=False, walks=None
+):
+    """Write the model files into the folder of the algorithm
+
+    A full model can continue training, a slim one only keeps the word vectors as
+    memory-mappable KeyedVectors. RDF2Vec models never keep their walks inside the model,
+    keep_walks writes them to a walk file next to it instead. The walks are given by the
+    caller; models saved with their walks in walks_ still have them written.
+
+    Args:
+        folder (str): The folder of the algorithm
+        algorithm (str): The name of the algorithm
+        model (object): The model to save
+        model_format (str): The format of the saved model (full or slim)
+        keep_walks (bool): Save the walks of an RDF2Vec model
+        walks (list): The walks the RDF2Vec model was trained on
+    Returns:
+        str: The path of the saved model
+    """
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(f"Unsupported model format: {model_format}")
+
+    if get_base_algorithm(algorithm) == "rdf2vec":
+        model_walks = getattr(model, "walks_", None)
+        if walks is None:
+            walks = model_walks
+        if keep_walks and walks:
+            write_walks(os.path.join(folder, MODEL_WALKS_FILE), walks)
+        if model_walks is not None:
+            model = copy.copy(model)
+            model.walks_ = None
+        w2v_model = getattr(model, "model_", None)
+    else:
+        w2v_model = model
+
+    if model_format == "slim":
+        path = os.path.join(folder, SLIM_MODEL_FILE)
+        w2v_model.wv.save(path, separately=["vectors"])
+    else:
+        path = os.path.join(folder, MODEL_FILE)
+        if get_base_algorithm(algorithm) == "rdf2vec":
+            joblib.dump(model, path)
+        else:
+            model.save(path)
+    return path
+
+
+def save_model(
+    ontology_name, algorithm, model, model_format="full", keep_walks=False, walks=None
+):
     """Save the model to the directory
 
     Args:
         ontology_name (str): The name of the ontology
         algorithm (str): The name of the algorithm
         model (object): The model to save
+        model_format (str): The format of the saved model (full or slim), see write_model
+        keep_walks (bool): Save the walks of an RDF2Vec model
+        walks (list): The walks the RDF2Vec model was trained on
 
     Returns:
         None
@@ -38,11 +235,7 @@ def save_model(ontology_name, algorithm, model):
     try:
         path = get_path(ontology_name, algorithm)
         replace_or_create_folder(path)
-        path = os.path.join(path, "model")
-        if algorithm == "rdf2vec":
-            joblib.dump(model, path)
-        else:
-            model.save(path)
+        write_model(path, algorithm, model, model_format, keep_walks, walks)
     except Exception as e:
         raise FileException(f"Error saving model: {str(e)}")
 
@@ -54,13 +247,16 @@ def load_model(ontology_name, algorithm):
         ontology_name (str): The name of the ontology
         algorithm (str): The name of the algorithm
     Returns:
-        object: The model
+        object: The model, or the memory-mapped gensim KeyedVectors of a slim model
     """
     try:
         if not isModelExist(ontology_name, algorithm):
             return None
-        path = get_path(ontology_name, algorithm, "model")
-        if algorithm == "rdf2vec":
+        path = get_path(ontology_name, algorithm, SLIM_MODEL_FILE)
+        if os.path.exists(path):
+            return gensim.models.KeyedVectors.load(path, mmap="r")
+        path = get_path(ontology_name, algorithm, MODEL_FILE)
+        if get_base_algorithm(algorithm) == "rdf2vec":
             return joblib.load(path)
         else:
             return gensim.models.word2vec.Word2Vec.load(path)
@@ -68,42 +264,188 @@ def load_model(ontology_name, algorithm):
         raise FileException(f"Error loading model: {str(e)}")
 
 
-def save_embedding(ontology_name, algorithm, embed):
-    """Save the embedding to the directory
+def load_previous_model(ontology_name, algorithm):
+    """Load the model trained on the previously uploaded revision of the ontology
 
     Args:
         ontology_name (str): The name of the ontology
         algorithm (str): The name of the algorithm
-        embed (numpy.ndarray): The embedding to save
+    Returns:
+        object: The model, or None if the previous revision has no full model to continue
+            training
+    """
+    try:
+        path = get_previous_path(ontology_name, algorithm, MODEL_FILE)
+        if not os.path.exists(path):
+            return None
+        if get_base_algorithm(algorithm) == "rdf2vec":
+            return joblib.load(path)
+        else:
+            return gensim.models.word2vec.Word2Vec.load(path)
+    except Exception as e:
+        raise FileException(f"Error loading previous model: {str(e)}")
+
+
+def migrate_model(ontology_name, algorithm, model_format="slim", keep_walks=False):
+    """Rewrite a saved full model in the given format, keeping the rest of the algorithm folder
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        model_format (str): The format to rewrite the model in (full or slim)
+        keep_walks (bool): Save the walks of an RDF2Vec model
+    Returns:
+        tuple: The size in bytes of the model files before and after, or None if the
+            folder has no full model to migrate
+    """
+    try:
+        folder = get_path(ontology_name, algorithm)
+        if not os.path.exists(os.path.join(folder, MODEL_FILE)):
+            return None
+        old_files = _model_files(folder)
+        before = sum(os.path.getsize(path) for path in old_files)
+
+        # write the new files aside, full models reuse the names of the old ones
+        model = load_model(ontology_name, algorithm)
+        tmp_folder = folder + ".migrate"
+        replace_or_create_folder(tmp_folder)
+        write_model(tmp_folder, algorithm, model, model_format, keep_walks)
+        del model
+
+        for path in old_files:
+            os.remove(path)
+        for name in os.listdir(tmp_folder):
+            os.replace(os.path.join(tmp_folder, name), os.path.join(folder, name))
+        os.rmdir(tmp_folder)
+
+        after = sum(os.path.getsize(path) for path in _model_files(folder))
+        return before, after
+    except Exception as e:
+        raise FileException(f"Error migrating model: {str(e)}")
+
+
+def save_embedding(
+    ontology_name, algorithm, embed, classes, individuals, dtype="float32"
+):
+    """Save the embedding to the directory, with a sidecar describing its rows
+
+    The vectors are stored as embeddings.npy in the given precision. The sidecar
+    embeddings.json records the number of class and individual rows and the file
+    entities.bin holds the entity of every row, so that loading does not depend on the
+    extraction files. Both files are replaced atomically, processes that memory-mapped the
+    previous embedding keep a consistent copy.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+        embed (numpy.ndarray): The embedding to save, the class rows first
+        classes (list): The classes of the first rows
+        individuals (list): The individuals of the remaining rows
+        dtype (str): The precision of the stored vectors (float32 or float16)
     Returns:
         numpy.ndarray: The embedding saved
     """
     try:
         if not isModelExist(ontology_name, algorithm):
             return None
-        path = get_path(ontology_name, algorithm, "embeddings.npy")
-        numpy.save(path, embed)
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        embed = numpy.asarray(embed, dtype=dtype)
+        entities = list(classes) + list(individuals)
+        if embed.ndim != 2 or embed.shape[0] != len(entities):
+            raise ValueError(
+                f"{embed.shape[0]} vectors for {len(entities)} classes and individuals"
+            )
+
+        blob, offsets = encode_strings(entities)
+        save_arrays(
+            get_path(ontology_name, algorithm, EMBEDDING_ENTITIES_FILE),
+            {"names_blob": blob, "names_offsets": offsets},
+        )
+
+        path = get_path(ontology_name, algorithm, EMBEDDING_FILE)
+        with atomic_open(path) as f:
+            numpy.save(f, embed)
+
+        meta = {
+            "dtype": dtype,
+            "dim": int(embed.shape[1]),
+            "n_classes": len(classes),
+            "n_individuals": len(individuals),
+        }
+        path = get_path(ontology_name, algorithm, EMBEDDING_META_FILE)
+        with atomic_open(path, "w") as f:
+            json.dump(meta, f, indent=2)
         return embed
     except Exception as e:
         raise FileException(f"Error saving embedding: {str(e)}")
 
 
+def load_embedding_meta(ontology_name: str, algorithm: str):
+    """Load the sidecar describing the rows of the embedding
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+    Returns:
+        dict: The dtype, dim, n_classes and n_individuals of the embedding, or None for an
+            embedding saved without sidecar
+    """
+    try:
+        path = get_path(ontology_name, algorithm, EMBEDDING_META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        raise FileException(f"Error loading embedding metadata: {str(e)}")
+
+
+def load_embedding_entities(ontology_name: str, algorithm: str):
+    """Memory-map the entity of every row of the embedding
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm
+    Returns:
+        StringTable: The classes followed by the individuals, or None for an embedding
+            saved without sidecar
+    """
+    try:
+        path = get_path(ontology_name, algorithm, EMBEDDING_ENTITIES_FILE)
+        if not os.path.exists(path):
+            return None
+        arrays, _ = load_arrays(path)
+        return StringTable(arrays["names_blob"], arrays["names_offsets"])
+    except Exception as e:
+        raise FileException(f"Error loading embedding entities: {str(e)}")
+
+
 def load_embedding_value(ontology_name: str, algorithm: str):
-    """Load the embedding from the directory
+    """Memory-map the embedding from the directory
+
+    The embedding is opened read-only with mmap_mode, so worker processes share the pages
+    of a single copy and loading does not depend on the size of the ontology.
 
     Args:
         ontology_name (str): The name of the ontology
         algorithm (str): The name of the algorithm
     Returns:
-        numpy.ndarray: The embedding loaded
+        tuple: The class vectors and the individual vectors
     """
     try:
-        no_class = len(load_multi_input_files(ontology_name, ["classes"])["classes"])
         if not isModelExist(ontology_name, algorithm):
             return None
-        path = get_path(ontology_name, algorithm, "embeddings.npy")
-        with open(path, "rb") as f:
-            embedding = numpy.load(f)
-            return embedding[:no_class], embedding[no_class:]
+        meta = load_embedding_meta(ontology_name, algorithm)
+        if meta is not None:
+            no_class = meta["n_classes"]
+        else:
+            # embeddings saved before the sidecar existed
+            no_class = len(
+                load_multi_input_files(ontology_name, ["classes"])["classes"]
+            )
+        path = get_path(ontology_name, algorithm, EMBEDDING_FILE)
+        embedding = numpy.load(path, mmap_mode="r")
+        return embedding[:no_class], embedding[no_class:]
     except Exception as e:
         raise FileException(f"Error loading embedding: {str(e)}")
@@ -1,10 +1,12 @@
 import csv
 import json
 import os
-import pandas as pd
 
 from utils.directory_utils import get_path
 from utils.exceptions import FileException
+from utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")
 
 
 def write_evaluate(ontology_name: str, algorithm: str, classifier: str, data: dict):
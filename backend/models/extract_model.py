@@ -1,8 +1,20 @@
+import json
 import os
-import owlready2
 
-from utils.directory_utils import get_path
+from models.session_model import OntologySession
+from utils.directory_utils import (
+    CACHE_FOLDER,
+    get_cache_path,
+    get_file_signature,
+    get_path,
+    get_previous_path,
+)
 from utils.exceptions import FileException
+from utils.lazy_import import lazy_import
+
+owlready2 = lazy_import("owlready2")
+
+COVERAGE_FILE = "coverage.json"
 
 
 def save_axioms(ontology_name, axioms):
@@ -97,36 +109,41 @@ def save_annotations(ontology_name, annotations, projection):
         raise FileException(f"Error saving annotations: {str(e)}")
 
 
-def load_multi_input_files(ontology_name, files_list):
+def load_multi_input_files(ontology_name, files_list, previous=False):
     """Load multiple input files
 
     Args:
         ontology_name (str): The name of the ontology
         files_list (str): The name of the input file
+        previous (bool): Load the files of the previously uploaded revision
     Returns:
         dict: The dictionary of types of input loaded from the files
     """
     try:
         files_dict = dict()
         for file in files_list:
-            tmp = load_input_file(ontology_name, file)
+            tmp = load_input_file(ontology_name, file, previous)
             files_dict[file] = tmp
         return files_dict
     except Exception as e:
         raise FileException(f"Error loading multiple input files: {str(e)}")
 
 
-def load_input_file(ontology_name, input_file):
+def load_input_file(ontology_name, input_file, previous=False):
     """Load single the input file
 
     Args:
         ontology_name (str): The name of the ontology
         input_file (str): The name of the input file
+        previous (bool): Load the file of the previously uploaded revision
     Returns:
         list: The list of content loaded from the file
     """
     try:
-        path = get_path(ontology_name, input_file + ".txt")
+        if previous:
+            path = get_previous_path(ontology_name, input_file + ".txt")
+        else:
+            path = get_path(ontology_name, input_file + ".txt")
         if not os.path.exists(path):
             raise FileException(f"Input file not found: {input_file}")
         return [line.strip() for line in open(path, "r", encoding="utf-8").readlines()]
@@ -183,16 +200,14 @@ def load_train_test_validation(ontology_name, type=0):
         raise FileException(f"Error loading train/test/validation files: {str(e)}")
 
 
-def coverage_class(ontology_name):
-    """Calculate the coverage of classes in the ontology
+def get_class_coverage(onto):
+    """Calculate the percentage of the classes of an ontology asserted as a type of an individual
 
     Args:
-        ontology_name (str): The name of the ontology
+        onto (owlready2.Ontology): The ontology, before reasoning
     Returns:
         float: The coverage percentage of classes in the ontology
     """
-    path = get_path(ontology_name, ontology_name + ".owl")
-    onto = owlready2.get_ontology(path).load()
     coverage_class = set()
 
     # Iterate through all individuals and add their classes to the set
@@ -210,3 +225,45 @@ def coverage_class(ontology_name):
     else:
         coverage_percentage = 0
     return coverage_percentage
+
+
+def save_coverage(ontology_name, onto):
+    """Save the class coverage of the ontology, computed on the ontology loaded for extraction
+
+    Args:
+        ontology_name (str): The name of the ontology
+        onto (owlready2.Ontology): The ontology, before reasoning
+    Returns:
+        float: The coverage percentage of classes in the ontology
+    """
+    try:
+        coverage = get_class_coverage(onto)
+        source = get_file_signature(get_path(ontology_name, ontology_name + ".owl"))
+        with open(get_cache_path(ontology_name, COVERAGE_FILE), "w") as f:
+            json.dump({"source": source, "coverage": coverage}, f)
+        return coverage
+    except Exception as e:
+        raise FileException(f"Error saving class coverage: {str(e)}")
+
+
+def coverage_class(ontology_name):
+    """Calculate the coverage of classes in the ontology
+
+    The coverage saved by the extraction is used while the ontology file is unchanged, the
+    ontology is only opened from its quadstore without it.
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        float: The coverage percentage of classes in the ontology
+    """
+    path = get_path(ontology_name, ontology_name + ".owl")
+    coverage_path = get_path(ontology_name, CACHE_FOLDER, COVERAGE_FILE)
+    if os.path.exists(coverage_path):
+        with open(coverage_path, "r") as f:
+            saved = json.load(f)
+        if saved.get("source") == get_file_signature(path):
+            return saved["coverage"]
+
+    with OntologySession(ontology_name) as session:
+        return get_class_coverage(session.onto)
@@ -0,0 +1,308 @@
+import os
+
+import numpy as np
+
+from models.session_model import OntologySession
+from utils.binary_store import StringTable, load_arrays, read_header, save_arrays
+from utils.directory_utils import get_cache_path, get_file_signature, get_path
+from utils.exceptions import FileException
+from utils.lazy_import import lazy_import
+
+owlready2 = lazy_import("owlready2")
+sparse = lazy_import("scipy.sparse")
+
+HIERARCHY_FILE = "hierarchy.bin"
+
+THING_IRI = "http://www.w3.org/2002/07/owl#Thing"
+# the name owlready2 prints for owl:Thing, kept by the graphs
+THING_NAME = "owl.Thing"
+
+
+class Hierarchy(object):
+    """The reasoned class hierarchy and individual types of an ontology
+
+    Entities are numbered: owl:Thing first, then the classes, then the individuals. The
+    direct parents of a class, or the direct types of an individual, are the named classes
+    of its is_a after reasoning, stored one entity after the other. The ancestors of every
+    entity, see build_closure, are stored the same way.
+    """
+
+    def __init__(
+        self,
+        iris,
+        n_classes,
+        parent_ids,
+        parent_offsets,
+        ancestor_ids=None,
+        ancestor_offsets=None,
+    ):
+        """Wrap the arrays of a hierarchy, computing the ancestors when they are not given
+
+        Args:
+            iris (StringTable): The IRI of every entity
+            n_classes (int): The number of classes, owl:Thing included
+            parent_ids (numpy.ndarray): The parents of every entity, one after the other
+            parent_offsets (numpy.ndarray): The start of the parents of every entity, plus
+                the end of the last
+            ancestor_ids (numpy.ndarray): The ancestors of every entity, one after the other
+            ancestor_offsets (numpy.ndarray): The start of the ancestors of every entity,
+                plus the end of the last
+        """
+        self.iris = iris
+        self.n_classes = n_classes
+        self.parent_ids = parent_ids
+        self.parent_offsets = parent_offsets
+        if ancestor_ids is None or ancestor_offsets is None:
+            ancestor_ids, ancestor_offsets = build_closure(
+                n_classes, parent_ids, parent_offsets
+            )
+        self.ancestor_ids = ancestor_ids
+        self.ancestor_offsets = ancestor_offsets
+
+    def __len__(self):
+        return len(self.iris)
+
+    def index(self, iri):
+        """Return the number of an entity, or None when it is not in the hierarchy"""
+        return self.iris.index(iri)
+
+    def name(self, i):
+        """Return the short name of an entity, as drawn in the graphs"""
+        if i == 0:
+            return THING_NAME
+        iri = self.iris[i]
+        delimiter = "#" if "#" in iri else "/"
+        return iri.rsplit(delimiter, 1)[-1]
+
+    def is_individual(self, i):
+        """Return whether an entity is an individual"""
+        return i >= self.n_classes
+
+    def parents(self, i):
+        """Return the direct parents of a class or the direct types of an individual"""
+        start, end = int(self.parent_offsets[i]), int(self.parent_offsets[i + 1])
+        return self.parent_ids[start:end].tolist()
+
+    def ancestors(self, i):
+        """Return every class above an entity, owl:Thing included
+
+        Args:
+            i (int): The number of the entity
+        Returns:
+            set: The numbers of the ancestor classes
+        """
+        start, end = int(self.ancestor_offsets[i]), int(self.ancestor_offsets[i + 1])
+        return set(self.ancestor_ids[start:end].tolist())
+
+    def inferred(self, i):
+        """Return the ancestors of an entity that are neither a direct parent nor owl:Thing
+
+        Args:
+            i (int): The number of the entity
+        Returns:
+            list: The numbers of the inferred ancestors, in ascending order
+        """
+        start, end = int(self.ancestor_offsets[i]), int(self.ancestor_offsets[i + 1])
+        excluded = set(self.parents(i))
+        excluded.add(0)
+        return [a for a in self.ancestor_ids[start:end].tolist() if a not in excluded]
+
+
+def _binarize(matrix):
+    """Set every stored value of a sparse matrix to 1, products count the paths"""
+    matrix = matrix.tocsr()
+    matrix.data[:] = 1
+    return matrix
+
+
+def _place_rows(rows, matrix, n_rows):
+    """Spread the rows of a sparse matrix to the given row numbers of a taller matrix"""
+    selection = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, np.arange(len(rows)))),
+        shape=(n_rows, len(rows)),
+    )
+    return selection @ matrix
+
+
+def build_closure(n_classes, parent_ids, parent_offsets):
+    """Compute the ancestors of every entity of a hierarchy
+
+    The classes are visited one topological level at a time, a level holding the classes
+    whose parents are all in the levels above: the ancestors of a level are its parents plus
+    their ancestors, one sparse boolean product per level. Classes on a cycle of is_a are
+    closed last by repeating the product until nothing changes. The types of an individual
+    are classes, its ancestors take one more product.
+
+    Args:
+        n_classes (int): The number of classes, owl:Thing included
+        parent_ids (numpy.ndarray): The parents of every entity, one after the other
+        parent_offsets (numpy.ndarray): The start of the parents of every entity, plus the
+            end of the last
+    Returns:
+        tuple: The ancestors of every entity one after the other, sorted and owl:Thing
+            included, and the start of the ancestors of every entity plus the end of the last
+    """
+    n_entities = len(parent_offsets) - 1
+    parents = _binarize(
+        sparse.csr_matrix(
+            (np.ones(len(parent_ids), dtype=np.int32), parent_ids, parent_offsets),
+            shape=(n_entities, n_classes),
+        )
+    )
+    class_parents = parents[:n_classes]
+    children = class_parents.T.tocsr()
+
+    closure = sparse.csr_matrix((n_classes, n_classes), dtype=np.int32)
+    remaining = np.diff(class_parents.indptr).astype(np.int64)
+    level = np.flatnonzero(remaining == 0)
+    done = np.zeros(n_classes, dtype=bool)
+    while len(level):
+        done[level] = True
+        rows = class_parents[level]
+        closure = closure + _place_rows(
+            level, _binarize(rows + rows @ closure), n_classes
+        )
+        remaining -= np.bincount(children[level].indices, minlength=n_classes)
+        level = np.flatnonzero((remaining == 0) & ~done)
+
+    cyclic = np.flatnonzero(~done)
+    if len(cyclic):
+        rows = class_parents[cyclic]
+        ancestors = _binarize(rows + rows @ closure)
+        while True:
+            full = closure + _place_rows(cyclic, ancestors, n_classes)
+            extended = _binarize(rows + rows @ full)
+            if extended.nnz == ancestors.nnz:
+                break
+            ancestors = extended
+        closure = full
+        # a class is not its own ancestor, even on a cycle
+        closure.setdiag(0)
+        closure.eliminate_zeros()
+
+    rows = parents[n_classes:]
+    closure = sparse.vstack([closure, rows + rows @ closure]).tocsr()
+    # owl:Thing is above every entity but itself
+    closure = closure + sparse.csr_matrix(
+        (
+            np.ones(n_entities - 1, dtype=np.int32),
+            (np.arange(1, n_entities), np.zeros(n_entities - 1, dtype=np.int64)),
+        ),
+        shape=(n_entities, n_classes),
+    )
+    closure = _binarize(closure)
+    closure.sort_indices()
+    return closure.indices.astype(np.int32), closure.indptr.astype(np.int64)
+
+
+def build_hierarchy(onto):
+    """Number the classes and individuals of a reasoned ontology and collect their parents
+
+    Args:
+        onto (owlready2.Ontology): The ontology, after reasoning
+    Returns:
+        Hierarchy: The hierarchy
+    """
+    # named parents from imported ontologies are numbered with the classes
+    classes = {owlready2.Thing: 0}
+    pending = list(onto.classes())
+    individuals = list(onto.individuals())
+    for individual in individuals:
+        pending.extend(individual.is_a)
+    for cls in pending:
+        if isinstance(cls, owlready2.ThingClass) and cls not in classes:
+            classes[cls] = len(classes)
+            pending.extend(cls.is_a)
+
+    entities = list(classes) + individuals
+    parent_ids, parent_offsets = list(), [0]
+    for entity in entities:
+        if entity is not owlready2.Thing:
+            parent_ids.extend(
+                classes[parent]
+                for parent in entity.is_a
+                if isinstance(parent, owlready2.ThingClass)
+            )
+        parent_offsets.append(len(parent_ids))
+
+    iris = [THING_IRI] + [entity.iri for entity in entities[1:]]
+    return Hierarchy(
+        StringTable.from_strings(iris),
+        len(classes),
+        np.asarray(parent_ids, dtype=np.int32),
+        np.asarray(parent_offsets, dtype=np.int64),
+    )
+
+
+def save_hierarchy(ontology_name, onto):
+    """Save the hierarchy of a reasoned ontology to the cache folder of the ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        onto (owlready2.Ontology): The ontology, after reasoning
+    Returns:
+        Hierarchy: The hierarchy
+    """
+    try:
+        source = get_file_signature(get_path(ontology_name, ontology_name + ".owl"))
+        hierarchy = build_hierarchy(onto)
+        arrays = {
+            "iris_blob": hierarchy.iris.blob,
+            "iris_offsets": hierarchy.iris.offsets,
+            "parent_ids": hierarchy.parent_ids,
+            "parent_offsets": hierarchy.parent_offsets,
+            "ancestor_ids": hierarchy.ancestor_ids,
+            "ancestor_offsets": hierarchy.ancestor_offsets,
+        }
+        meta = {"source": source, "n_classes": hierarchy.n_classes}
+        save_arrays(get_cache_path(ontology_name, HIERARCHY_FILE), arrays, meta)
+        return hierarchy
+    except Exception as e:
+        raise FileException(f"Error saving class hierarchy: {str(e)}")
+
+
+def load_hierarchy(ontology_name):
+    """Load the hierarchy saved by the extraction of the current ontology file
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        Hierarchy: The hierarchy, or None if it is missing or stale
+    """
+    try:
+        path = get_cache_path(ontology_name, HIERARCHY_FILE)
+        if not os.path.exists(path):
+            return None
+        meta, _, _ = read_header(path)
+        source = get_file_signature(get_path(ontology_name, ontology_name + ".owl"))
+        if meta.get("source") != source:
+            return None
+
+        arrays, _ = load_arrays(path)
+        return Hierarchy(
+            StringTable(arrays["iris_blob"], arrays["iris_offsets"]),
+            meta["n_classes"],
+            arrays["parent_ids"],
+            arrays["parent_offsets"],
+            arrays.get("ancestor_ids"),
+            arrays.get("ancestor_offsets"),
+        )
+    except Exception as e:
+        raise FileException(f"Error loading class hierarchy: {str(e)}")
+
+
+def get_hierarchy(ontology_name):
+    """Return the hierarchy of an ontology, reasoning once when it was extracted without it
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        Hierarchy: The hierarchy
+    """
+    hierarchy = load_hierarchy(ontology_name)
+    if hierarchy is not None:
+        return hierarchy
+
+    print(f"Build class hierarchy of {ontology_name} ...")
+    with OntologySession(ontology_name) as session:
+        return save_hierarchy(ontology_name, session.reason())
@@ -0,0 +1,301 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from flask import current_app
+
+from utils.exceptions import FileException
+
+JOB_DATABASE = "jobs.db"
+
+# queued -> running -> succeeded | failed | cancelled
+# running -> cancelling -> cancelled
+ACTIVE_STATUSES = ("queued", "running", "cancelling")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    error_code INTEGER,
+    pid INTEGER,
+    coalesce_key TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+# columns added after the first release of the table, with their type
+_MIGRATIONS = {"coalesce_key": "TEXT"}
+
+
+def _connect():
+    """Open a connection to the job database in the storage folder, creating the table if needed
+
+    Returns:
+        sqlite3.Connection: The connection, in autocommit mode
+    """
+    path = os.path.join(current_app.config["STORAGE_FOLDER"], JOB_DATABASE)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for column, column_type in _MIGRATIONS.items():
+        if column not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+    return conn
+
+
+@contextmanager
+def _database():
+    """Context manager yielding a job database connection that is closed afterwards"""
+    conn = _connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _to_dict(row):
+    """Convert a job row to a JSON-serialisable dict"""
+    if row is None:
+        return None
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    return job
+
+
+def create_job(operation, params, coalesce_key=None):
+    """Insert a queued job
+
+    Args:
+        operation (str): The name of the operation (extract, embed, evaluate)
+        params (dict): The keyword arguments of the operation
+        coalesce_key (str): The key identifying identical work
+    Returns:
+        dict: The created job
+    """
+    try:
+        job_id = uuid.uuid4().hex
+        with _database() as conn:
+            _insert_job(conn, job_id, operation, params, coalesce_key)
+        return get_job(job_id)
+    except Exception as e:
+        raise FileException(f"Error creating job: {str(e)}")
+
+
+def _insert_job(conn, job_id, operation, params, coalesce_key):
+    """Insert a queued job using an open connection"""
+    conn.execute(
+        "INSERT INTO jobs (id, operation, params, status, coalesce_key, created_at) "
+        "VALUES (?, ?, ?, 'queued', ?, ?)",
+        (
+            job_id,
+            operation,
+            json.dumps(params, sort_keys=True),
+            coalesce_key,
+            time.time(),
+        ),
+    )
+
+
+def attach_or_create_job(operation, params, coalesce_key):
+    """Return the active job doing the same work, or insert a queued job if there is none
+
+    The lookup and the insert run in one immediate transaction, so concurrent submissions of
+    identical work end up on a single job.
+
+    Args:
+        operation (str): The name of the operation (extract, embed, evaluate)
+        params (dict): The keyword arguments of the operation
+        coalesce_key (str): The key identifying identical work
+    Returns:
+        tuple: The job, and True if it was created or False if an active job was attached to
+    """
+    try:
+        with _database() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE coalesce_key = ? AND status IN (?, ?) "
+                "ORDER BY created_at LIMIT 1",
+                (coalesce_key, "queued", "running"),
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return get_job(row["id"]), False
+            job_id = uuid.uuid4().hex
+            _insert_job(conn, job_id, operation, params, coalesce_key)
+            conn.execute("COMMIT")
+        return get_job(job_id), True
+    except Exception as e:
+        raise FileException(f"Error creating job: {str(e)}")
+
+
+def get_job(job_id):
+    """Get a job by id
+
+    Args:
+        job_id (str): The id of the job
+    Returns:
+        dict: The job, or None if it does not exist
+    """
+    try:
+        with _database() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _to_dict(row)
+    except Exception as e:
+        raise FileException(f"Error getting job: {str(e)}")
+
+
+def list_jobs(status=None, limit=100):
+    """List the most recent jobs
+
+    Args:
+        status (str): Only list the jobs with this status
+        limit (int): The maximum number of jobs to list
+    Returns:
+        list: The jobs, newest first
+    """
+    try:
+        query, args = "SELECT * FROM jobs", []
+        if status:
+            query += " WHERE status = ?"
+            args.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        args.append(int(limit))
+        with _database() as conn:
+            rows = conn.execute(query, args).fetchall()
+        return [_to_dict(row) for row in rows]
+    except Exception as e:
+        raise FileException(f"Error listing jobs: {str(e)}")
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running
+
+    The claim runs in an immediate transaction, so concurrent dispatchers never claim the
+    same job.
+
+    Returns:
+        dict: The claimed job, or None if no job is queued
+    """
+    try:
+        with _database() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' "
+                "ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                (time.time(), row["id"]),
+            )
+            conn.execute("COMMIT")
+        return get_job(row["id"])
+    except Exception as e:
+        raise FileException(f"Error claiming job: {str(e)}")
+
+
+def set_job_pid(job_id, pid):
+    """Record the id of the process running the job
+
+    Args:
+        job_id (str): The id of the job
+        pid (int): The process id
+    Returns:
+        None
+    """
+    try:
+        with _database() as conn:
+            conn.execute("UPDATE jobs SET pid = ? WHERE id = ?", (pid, job_id))
+    except Exception as e:
+        raise FileException(f"Error updating job: {str(e)}")
+
+
+def finish_job(job_id, status, result=None, error=None, error_code=None):
+    """Store the outcome of a job that is still active
+
+    Args:
+        job_id (str): The id of the job
+        status (str): The final status (succeeded, failed or cancelled)
+        result (object): The JSON-serialisable result of the operation
+        error (str): The error message
+        error_code (int): The HTTP status code of the error
+    Returns:
+        bool: True if the job was updated, False if it had already finished
+    """
+    try:
+        with _database() as conn:
+            updated = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, error_code = ?, "
+                "finished_at = ? WHERE id = ? AND status IN (?, ?, ?)",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    error_code,
+                    time.time(),
+                    job_id,
+                    *ACTIVE_STATUSES,
+                ),
+            ).rowcount
+        return updated == 1
+    except Exception as e:
+        raise FileException(f"Error finishing job: {str(e)}")
+
+
+def request_cancel(job_id):
+    """Cancel a queued job, or flag a running job so that its worker gets terminated
+
+    Args:
+        job_id (str): The id of the job
+    Returns:
+        dict: The job after the request, or None if it does not exist
+    """
+    try:
+        with _database() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelling' "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+        return get_job(job_id)
+    except Exception as e:
+        raise FileException(f"Error cancelling job: {str(e)}")
+
+
+def list_jobs_by_status(*statuses):
+    """List all jobs with one of the given statuses, oldest first
+
+    Args:
+        *statuses (str): The statuses
+    Returns:
+        list: The jobs
+    """
+    try:
+        marks = ", ".join("?" for _ in statuses)
+        with _database() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs WHERE status IN ({marks}) ORDER BY created_at",
+                statuses,
+            ).fetchall()
+        return [_to_dict(row) for row in rows]
+    except Exception as e:
+        raise FileException(f"Error listing jobs: {str(e)}")
@@ -0,0 +1,102 @@
+import os
+
+from owl2vec_star.RDF2Vec_Embed import build_knowledge_graph
+from owl2vec_star.rdf2vec.graph import CSRKnowledgeGraph
+from utils.binary_store import (
+    StringTable,
+    encode_strings,
+    load_arrays,
+    read_header,
+    save_arrays,
+)
+from utils.directory_utils import get_cache_path, get_file_signature, get_path
+from utils.exceptions import FileException
+
+KNOWLEDGE_GRAPH_FILE = "knowledge_graph.bin"
+
+
+def save_knowledge_graph(ontology_name, kg, source=None):
+    """Save a CSR knowledge graph to the cache folder of the ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        kg (CSRKnowledgeGraph): The graph to save
+        source (dict): The signature of the ontology file the graph was built from
+    Returns:
+        str: The path of the saved graph
+    """
+    try:
+        names_blob, names_offsets = encode_strings(kg.name_list())
+        arrays = {
+            "names_blob": names_blob,
+            "names_offsets": names_offsets,
+            "indptr": kg.indptr,
+            "predicates": kg.predicates,
+            "objects": kg.objects,
+            "inv_indptr": kg.inv_indptr,
+            "inv_edges": kg.inv_edges,
+        }
+        meta = {
+            "source": source,
+            "n_vertices": kg.n_vertices,
+            "n_edges": kg.n_edges,
+        }
+        path = get_cache_path(ontology_name, KNOWLEDGE_GRAPH_FILE)
+        return save_arrays(path, arrays, meta)
+    except Exception as e:
+        raise FileException(f"Error saving knowledge graph: {str(e)}")
+
+
+def load_knowledge_graph(ontology_name):
+    """Memory-map the cached knowledge graph of the ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        CSRKnowledgeGraph: The graph, or None if it is not cached or the ontology file changed since
+    """
+    try:
+        path = get_cache_path(ontology_name, KNOWLEDGE_GRAPH_FILE)
+        onto_file = get_path(ontology_name, ontology_name + ".owl")
+        if not os.path.exists(path):
+            return None
+
+        meta, _, _ = read_header(path)
+        if meta.get("source") != get_file_signature(onto_file):
+            return None
+
+        arrays, _ = load_arrays(path)
+        return CSRKnowledgeGraph(
+            StringTable(arrays["names_blob"], arrays["names_offsets"]),
+            arrays["indptr"],
+            arrays["predicates"],
+            arrays["objects"],
+            arrays["inv_indptr"],
+            arrays["inv_edges"],
+        )
+    except Exception as e:
+        raise FileException(f"Error loading knowledge graph: {str(e)}")
+
+
+def get_knowledge_graph(ontology_name):
+    """Return the knowledge graph of the ontology, parsing the ontology file only when no valid cache exists
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        CSRKnowledgeGraph: The graph
+    """
+    kg = load_knowledge_graph(ontology_name)
+    if kg is not None:
+        return kg
+
+    try:
+        onto_file = get_path(ontology_name, ontology_name + ".owl")
+        source = get_file_signature(onto_file)
+        print(f"Build knowledge graph of {ontology_name} ...")
+        kg = build_knowledge_graph(onto_file)
+    except Exception as e:
+        raise FileException(f"Error building knowledge graph: {str(e)}")
+
+    save_knowledge_graph(ontology_name, kg, source)
+    return kg
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import time
+
+from models.extract_model import coverage_class, load_multi_input_files
+from utils.directory_utils import get_file_signature, get_path
+from utils.exceptions import FileException
+
+MANIFEST_FILE = "manifest.json"
+
+# the extraction files counted by the manifest
+STAT_FILES = ["axioms", "classes", "individuals", "uri_labels", "annotations"]
+
+# the files of an extraction, hashed by the manifest
+ARTIFACT_FILES = [file + ".txt" for file in STAT_FILES] + [
+    "inferred_ancestors.txt",
+    "train-infer-0.csv",
+    "train-infer-1.csv",
+    "valid.csv",
+    "test.csv",
+]
+
+
+def get_prefix(value):
+    """Get the prefix of the value because in ontology the class and individual id are separated by # or /
+
+    Args:
+        value (str): The value to get the prefix of
+    Returns:
+        prefix (str): The prefix of the value
+    """
+    # Get the delimiter # or /
+    delimiter = "#" if "#" in value else "/"
+    prefix = value.rsplit(delimiter, 1)[0] + delimiter
+    return prefix
+
+
+def get_onto_type(no_class, no_individual):
+    """Decide how the samples of an ontology are generated
+
+    Args:
+        no_class (int): The number of classes
+        no_individual (int): The number of individuals
+    Returns:
+        str: "abox" if the individuals exceed 10 percent of the classes, "tbox" otherwise
+    """
+    return "abox" if no_individual > int(0.1 * no_class) else "tbox"
+
+
+def hash_file(path):
+    """Return the SHA-256 of a file content
+
+    Args:
+        path (str): The path of the file
+    Returns:
+        str: The hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(ontology_name, timings=None):
+    """Collect the metadata of an extracted ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        timings (dict): The time in seconds of every stage of the extraction
+    Returns:
+        dict: The manifest
+    """
+    try:
+        onto_file = get_path(ontology_name, ontology_name + ".owl")
+        files = load_multi_input_files(ontology_name, STAT_FILES)
+        onto_type = get_onto_type(len(files["classes"]), len(files["individuals"]))
+
+        artifacts = {ontology_name + ".owl": hash_file(onto_file)}
+        for file in ARTIFACT_FILES:
+            path = get_path(ontology_name, file)
+            if os.path.exists(path):
+                artifacts[file] = hash_file(path)
+
+        return {
+            "source": get_file_signature(onto_file),
+            "onto_type": onto_type,
+            "no_class": len(files["classes"]),
+            "no_individual": len(files["individuals"]),
+            "no_axiom": len(files["axioms"]),
+            "no_annotation": len(files["uri_labels"] + files["annotations"]),
+            "coverage": coverage_class(ontology_name),
+            "prefixes": {
+                kind: get_prefix(files[kind][0]) if files[kind] else None
+                for kind in ("classes", "individuals")
+            },
+            "artifacts": artifacts,
+            "timings": timings or {},
+            "created_at": time.time(),
+        }
+    except FileException:
+        raise
+    except Exception as e:
+        raise FileException(f"Error building manifest: {str(e)}")
+
+
+def save_manifest(ontology_name, manifest):
+    """Save the manifest of an extracted ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        manifest (dict): The manifest, see build_manifest
+    Returns:
+        dict: The manifest
+    """
+    try:
+        path = get_path(ontology_name, MANIFEST_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+        return manifest
+    except Exception as e:
+        raise FileException(f"Error saving manifest: {str(e)}")
+
+
+def load_manifest(ontology_name):
+    """Load the manifest written by the extraction of the current ontology file
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        dict: The manifest, or None if it is missing or stale
+    """
+    try:
+        path = get_path(ontology_name, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            manifest = json.load(f)
+        source = get_file_signature(get_path(ontology_name, ontology_name + ".owl"))
+        if manifest.get("source") != source:
+            return None
+        return manifest
+    except Exception as e:
+        raise FileException(f"Error loading manifest: {str(e)}")
+
+
+def get_manifest(ontology_name):
+    """Return the manifest of an ontology, building it when it was extracted without it
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        dict: The manifest, see build_manifest
+    """
+    manifest = load_manifest(ontology_name)
+    if manifest is not None:
+        return manifest
+
+    print(f"Build manifest of {ontology_name} ...")
+    return save_manifest(ontology_name, build_manifest(ontology_name))
+
+
+def remove_manifest(ontology_name):
+    """Remove the manifest of an ontology whose extraction is running again
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        None
+    """
+    try:
+        path = get_path(ontology_name, MANIFEST_FILE)
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception as e:
+        raise FileException(f"Error removing manifest: {str(e)}")
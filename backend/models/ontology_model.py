@@ -1,7 +1,17 @@
+import hashlib
+import json
 import os
+import shutil
 from flask import current_app
 import csv
-from utils.directory_utils import replace_or_create_folder
+from utils.directory_utils import (
+    CACHE_FOLDER,
+    get_cache_path,
+    get_file_signature,
+    get_path,
+    get_previous_path,
+    replace_or_create_folder,
+)
 from utils.exceptions import FileException
 
 
@@ -19,8 +29,20 @@ def save_ontology(file, ontology_name, filename):
         STORAGE_FOLDER = current_app.config["STORAGE_FOLDER"]
         path = os.path.join(STORAGE_FOLDER, ontology_name)
 
+        # keep the artifacts of an earlier revision for incremental embedding
+        staging = os.path.join(STORAGE_FOLDER, f".previous-{ontology_name}")
+        if os.path.isdir(path):
+            shutil.rmtree(staging, ignore_errors=True)
+            os.rename(path, staging)
+            shutil.rmtree(os.path.join(staging, CACHE_FOLDER), ignore_errors=True)
+
         replace_or_create_folder(path)
 
+        if os.path.isdir(staging):
+            previous = get_previous_path(ontology_name)
+            os.makedirs(os.path.dirname(previous), exist_ok=True)
+            os.rename(staging, previous)
+
         path = os.path.join(path, filename)
 
         file.save(path)
@@ -42,7 +64,7 @@ def list_ontology():
 
         for dirname in os.listdir(STORAGE_FOLDER):
             dirpath = os.path.join(STORAGE_FOLDER, dirname)
-            if os.path.isdir(dirpath):
+            if os.path.isdir(dirpath) and not dirname.startswith("."):
                 ontologies.append(dirname)
 
         return ontologies
@@ -50,6 +72,40 @@ def list_ontology():
         raise FileException(f"Error listing ontologies: {str(e)}")
 
 
+def get_ontology_hash(ontology_name):
+    """Return the SHA-256 of the ontology file content
+
+    The digest is remembered in the cache folder together with the file size and mtime,
+    so the file is only hashed again after it has been replaced.
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        str: The hex digest of the ontology file
+    """
+    try:
+        onto_file = get_path(ontology_name, ontology_name + ".owl")
+        memo_file = get_cache_path(ontology_name, "ontology_hash.json")
+        signature = get_file_signature(onto_file)
+
+        if os.path.exists(memo_file):
+            with open(memo_file, "r") as f:
+                memo = json.load(f)
+            if memo.get("source") == signature:
+                return memo["sha256"]
+
+        digest = hashlib.sha256()
+        with open(onto_file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+        with open(memo_file, "w") as f:
+            json.dump({"source": signature, "sha256": digest.hexdigest()}, f)
+        return digest.hexdigest()
+    except Exception as e:
+        raise FileException(f"Error hashing ontology: {str(e)}")
+
+
 def write_to_ownership_csv(alias, ontology_name):
     """Write ontology ownership data to a CSV file
 
@@ -0,0 +1,172 @@
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from flask import current_app
+
+from utils.exceptions import FileException
+
+RESOURCE_DATABASE = "resources.db"
+
+# a lease waits in line until it is granted, and is deleted when released
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    id TEXT PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    cores INTEGER NOT NULL,
+    label TEXT,
+    granted INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leases_queue ON leases (granted, created_at);
+"""
+
+
+def is_process_alive(pid):
+    """Check whether a process with the given id exists on this machine
+
+    Args:
+        pid (int): The process id
+    Returns:
+        bool: True if the process exists
+    """
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def _connect():
+    """Open a connection to the lease database in the storage folder, creating the table if needed
+
+    Returns:
+        sqlite3.Connection: The connection, in autocommit mode
+    """
+    path = os.path.join(current_app.config["STORAGE_FOLDER"], RESOURCE_DATABASE)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+@contextmanager
+def _database():
+    """Context manager yielding a lease database connection that is closed afterwards"""
+    conn = _connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _remove_dead_leases(conn):
+    """Delete the leases of processes that exited without releasing them, using an open
+    connection"""
+    pids = [row["pid"] for row in conn.execute("SELECT DISTINCT pid FROM leases")]
+    for pid in pids:
+        if not is_process_alive(pid):
+            conn.execute("DELETE FROM leases WHERE pid = ?", (pid,))
+
+
+def request_lease(cores, label=None):
+    """Queue a request for cores of the CPU budget on behalf of this process
+
+    Args:
+        cores (int): The number of cores
+        label (str): What the cores are used for
+    Returns:
+        str: The id of the lease
+    """
+    try:
+        lease_id = uuid.uuid4().hex
+        with _database() as conn:
+            conn.execute(
+                "INSERT INTO leases (id, pid, cores, label, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (lease_id, os.getpid(), int(cores), label, time.time()),
+            )
+        return lease_id
+    except Exception as e:
+        raise FileException(f"Error requesting cores: {str(e)}")
+
+
+def grant_lease(lease_id, budget):
+    """Grant a queued lease if it is first in line and its cores fit in the budget
+
+    Leases are granted in the order they were requested, so an operation asking for many
+    cores is not overtaken forever by smaller ones. The check and the grant run in one
+    immediate transaction, so concurrent processes never exceed the budget.
+
+    Args:
+        lease_id (str): The id of the lease
+        budget (int): The number of cores shared by all leases
+    Returns:
+        bool: True if the lease is granted
+    """
+    try:
+        with _database() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                _remove_dead_leases(conn)
+                lease = conn.execute(
+                    "SELECT granted, cores FROM leases WHERE id = ?", (lease_id,)
+                ).fetchone()
+                if lease is None:
+                    raise FileException(f"Lease not found: {lease_id}", 404)
+                if lease["granted"]:
+                    return True
+                head = conn.execute(
+                    "SELECT id FROM leases WHERE granted = 0 "
+                    "ORDER BY created_at, rowid LIMIT 1"
+                ).fetchone()
+                used = conn.execute(
+                    "SELECT COALESCE(SUM(cores), 0) FROM leases WHERE granted = 1"
+                ).fetchone()[0]
+                if head["id"] != lease_id or used + lease["cores"] > budget:
+                    return False
+                conn.execute("UPDATE leases SET granted = 1 WHERE id = ?", (lease_id,))
+                return True
+            finally:
+                conn.execute("COMMIT")
+    except FileException:
+        raise
+    except Exception as e:
+        raise FileException(f"Error granting cores: {str(e)}")
+
+
+def release_lease(lease_id):
+    """Give the cores of a lease back to the budget, or leave the line if it is not granted
+
+    Args:
+        lease_id (str): The id of the lease
+    Returns:
+        None
+    """
+    try:
+        with _database() as conn:
+            conn.execute("DELETE FROM leases WHERE id = ?", (lease_id,))
+    except Exception as e:
+        raise FileException(f"Error releasing cores: {str(e)}")
+
+
+def list_leases():
+    """List the granted and queued leases, oldest first
+
+    Returns:
+        list: The leases
+    """
+    try:
+        with _database() as conn:
+            rows = conn.execute(
+                "SELECT * FROM leases ORDER BY created_at, rowid"
+            ).fetchall()
+        return [dict(row) for row in rows]
+    except Exception as e:
+        raise FileException(f"Error listing leases: {str(e)}")
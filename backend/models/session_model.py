@@ -0,0 +1,150 @@
+import json
+import os
+import time
+
+from utils.directory_utils import (
+    CACHE_FOLDER,
+    get_cache_path,
+    get_file_signature,
+    get_path,
+)
+from utils.exceptions import OntologyException
+from utils.lazy_import import lazy_import
+
+owlready2 = lazy_import("owlready2")
+
+# the owlready2 quadstore of the uploaded ontology, and the revision it was converted from
+QUADSTORE_FILE = "quadstore.sqlite3"
+QUADSTORE_META_FILE = "quadstore.json"
+
+
+def load_quadstore_meta(ontology_name):
+    """Load the description of the quadstore of an ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        dict: The "source" signature of the ontology file the quadstore was converted from and
+            the "base_iri" of the ontology, None without a quadstore
+    """
+    meta_path = get_path(ontology_name, CACHE_FOLDER, QUADSTORE_META_FILE)
+    if not os.path.exists(get_path(ontology_name, CACHE_FOLDER, QUADSTORE_FILE)):
+        return None
+    try:
+        with open(meta_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_quadstore(ontology_name):
+    """Parse the ontology file of an uploaded ontology into an owlready2 quadstore
+
+    The quadstore is written next to its final path and moved in place once complete, a
+    reader never opens a partial one.
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        dict: The description of the quadstore, see load_quadstore_meta
+    """
+    path = get_path(ontology_name, ontology_name + ".owl")
+    store_path = get_cache_path(ontology_name, QUADSTORE_FILE)
+    tmp_path = f"{store_path}.{os.getpid()}.tmp"
+    source = get_file_signature(path)
+
+    start_time = time.time()
+    world = owlready2.World(filename=tmp_path, exclusive=False)
+    try:
+        onto = world.get_ontology(path).load()
+        meta = {"source": source, "base_iri": onto.base_iri}
+        world.save()
+    finally:
+        world.close()
+    os.replace(tmp_path, store_path)
+    with open(get_cache_path(ontology_name, QUADSTORE_META_FILE), "w") as f:
+        json.dump(meta, f)
+    print(
+        f"quadstore conversion time usage for {ontology_name}:",
+        time.time() - start_time,
+    )
+    return meta
+
+
+class OntologySession:
+    """An uploaded ontology opened from its quadstore and shared by the stages of the extraction
+
+    The ontology file is converted once, on the first session of every uploaded revision, into
+    an owlready2 SQLite quadstore in the cache folder of the ontology. Later sessions open the
+    quadstore instead of parsing the file again.
+
+    The projection reads the asserted ontology through the rdflib view of the world, then the
+    reasoner adds its inferences to the same world for the inferred ancestors and the samples.
+    The inferences are never committed, the quadstore keeps the asserted ontology only. The
+    world is closed with the session.
+    """
+
+    def __init__(self, ontology_name):
+        """Open the quadstore of an uploaded ontology, converting the ontology file if needed
+
+        Args:
+            ontology_name (str): The name of the ontology
+        """
+        self.ontology_name = ontology_name
+        self.path = get_path(ontology_name, ontology_name + ".owl")
+        self.reasoned = False
+        self._graph = None
+        try:
+            meta = load_quadstore_meta(ontology_name)
+            if meta is None or meta.get("source") != get_file_signature(self.path):
+                meta = build_quadstore(ontology_name)
+            self.world = owlready2.World(
+                filename=get_path(ontology_name, CACHE_FOLDER, QUADSTORE_FILE),
+                exclusive=False,
+            )
+            self.onto = self.world.get_ontology(meta["base_iri"]).load()
+        except Exception as e:
+            raise OntologyException(f"Error loading ontology {ontology_name}: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def graph(self):
+        """The rdflib view of the world, built on first use
+
+        Returns:
+            rdflib.Graph: The view, reflecting the inferences once the reasoner ran
+        """
+        if self._graph is None:
+            self._graph = self.world.as_rdflib_graph()
+        return self._graph
+
+    def reason(self):
+        """Run the HermiT reasoner on the ontology, once
+
+        Returns:
+            owlready2.Ontology: The ontology, with the inferences of the reasoner
+        """
+        if not self.reasoned:
+            print("start run sync reasoner")
+            start_time = time.time()
+            owlready2.sync_reasoner(self.onto)
+            print(
+                f"sync reasoner time usage for {self.ontology_name}:",
+                time.time() - start_time,
+            )
+            self.reasoned = True
+        return self.onto
+
+    def close(self):
+        """Release the world, dropping the uncommitted inferences of the reasoner
+
+        Returns:
+            None
+        """
+        self._graph = None
+        self.world.close()
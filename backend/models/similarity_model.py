@@ -0,0 +1,133 @@
+import os
+
+from utils.binary_store import load_arrays, read_header, save_arrays
+from utils.directory_utils import get_cache_path, get_file_signature, get_path
+from utils.exceptions import FileException
+from models.embed_model import EMBEDDING_FILE
+
+SIMILARITY_FOLDER = "similarity"
+NORMALIZED_FILE = "normalized.bin"
+IVF_INDEX_FILE = "ivf.bin"
+
+
+def get_embedding_signature(ontology_name, algorithm):
+    """Return the signature of the saved embedding the similarity indices are built from
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+    Returns:
+        dict: The signature of embeddings.npy, or None if there is no embedding
+    """
+    path = get_path(ontology_name, algorithm, EMBEDDING_FILE)
+    if not os.path.exists(path):
+        return None
+    return get_file_signature(path)
+
+
+def _load_index(ontology_name, algorithm, file_name, source):
+    """Memory-map a cached similarity index if it was built from the given embedding
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        file_name (str): The file of the index
+        source (dict): The signature of the current embedding
+    Returns:
+        tuple: The dict of arrays and the metadata dict, or None if the index is missing or
+            stale
+    """
+    path = get_cache_path(ontology_name, SIMILARITY_FOLDER, algorithm, file_name)
+    if not os.path.exists(path):
+        return None
+    meta, _, _ = read_header(path)
+    if meta.get("source") != source:
+        return None
+    return load_arrays(path)
+
+
+def save_normalized_embedding(ontology_name, algorithm, vectors, n_classes, source):
+    """Save the L2-normalized copy of an embedding to the cache folder of the ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        vectors (numpy.ndarray): The float32 unit vectors, one row per entity
+        n_classes (int): The number of class rows, which come first
+        source (dict): The signature of the embedding the vectors were normalized from
+    Returns:
+        str: The path of the saved file
+    """
+    try:
+        path = get_cache_path(
+            ontology_name, SIMILARITY_FOLDER, algorithm, NORMALIZED_FILE
+        )
+        meta = {"source": source, "n_classes": int(n_classes)}
+        return save_arrays(path, {"vectors": vectors}, meta)
+    except Exception as e:
+        raise FileException(f"Error saving normalized embedding: {str(e)}")
+
+
+def load_normalized_embedding(ontology_name, algorithm, source):
+    """Memory-map the L2-normalized copy of an embedding
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        source (dict): The signature of the current embedding
+    Returns:
+        tuple: The unit vectors and the number of class rows, or None if the copy is missing
+            or was normalized from another embedding
+    """
+    try:
+        loaded = _load_index(ontology_name, algorithm, NORMALIZED_FILE, source)
+        if loaded is None:
+            return None
+        arrays, meta = loaded
+        return arrays["vectors"], meta["n_classes"]
+    except Exception as e:
+        raise FileException(f"Error loading normalized embedding: {str(e)}")
+
+
+def save_ivf_index(ontology_name, algorithm, centroids, offsets, rows, source):
+    """Save an inverted file index of an embedding to the cache folder of the ontology
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        centroids (numpy.ndarray): The unit centroid of every list
+        offsets (numpy.ndarray): The start of every list in rows, plus the end of the last
+        rows (numpy.ndarray): The embedding rows, grouped by list
+        source (dict): The signature of the embedding the index was built from
+    Returns:
+        str: The path of the saved file
+    """
+    try:
+        path = get_cache_path(
+            ontology_name, SIMILARITY_FOLDER, algorithm, IVF_INDEX_FILE
+        )
+        arrays = {"centroids": centroids, "offsets": offsets, "rows": rows}
+        meta = {"source": source, "n_lists": int(len(centroids))}
+        return save_arrays(path, arrays, meta)
+    except Exception as e:
+        raise FileException(f"Error saving similarity index: {str(e)}")
+
+
+def load_ivf_index(ontology_name, algorithm, source):
+    """Memory-map the inverted file index of an embedding
+
+    Args:
+        ontology_name (str): The name of the ontology
+        algorithm (str): The name of the algorithm (model variant)
+        source (dict): The signature of the current embedding
+    Returns:
+        dict: The centroids, offsets and rows of the index, or None if it is missing or was
+            built from another embedding
+    """
+    try:
+        loaded = _load_index(ontology_name, algorithm, IVF_INDEX_FILE, source)
+        if loaded is None:
+            return None
+        return loaded[0]
+    except Exception as e:
+        raise FileException(f"Error loading similarity index: {str(e)}")
@@ -0,0 +1,70 @@
+import json
+import os
+
+from utils.directory_utils import get_cache_path
+from utils.exceptions import FileException
+
+SWEEPS_FOLDER = "sweeps"
+
+
+def save_leaderboard(ontology_name, sweep_id, leaderboard):
+    """Save the leaderboard of a hyperparameter sweep
+
+    The leaderboard only ranks model variants saved in their own folders, so it is kept in the
+    cache folder of the ontology.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        sweep_id (str): The id of the sweep
+        leaderboard (dict): The leaderboard
+    Returns:
+        dict: The leaderboard saved
+    """
+    try:
+        path = get_cache_path(ontology_name, SWEEPS_FOLDER, sweep_id + ".json")
+        with open(path, "w") as f:
+            json.dump(leaderboard, f, indent=2)
+        return leaderboard
+    except Exception as e:
+        raise FileException(f"Error saving sweep leaderboard: {str(e)}")
+
+
+def load_leaderboard(ontology_name, sweep_id):
+    """Load the leaderboard of a hyperparameter sweep
+
+    Args:
+        ontology_name (str): The name of the ontology
+        sweep_id (str): The id of the sweep
+    Returns:
+        dict: The leaderboard
+    """
+    try:
+        path = get_cache_path(ontology_name, SWEEPS_FOLDER, sweep_id + ".json")
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise FileException(f"Sweep not found: {sweep_id}", 404)
+    except Exception as e:
+        raise FileException(f"Error loading sweep leaderboard: {str(e)}")
+
+
+def list_leaderboards(ontology_name):
+    """List the leaderboards of the sweeps run on an ontology, most recent first
+
+    Args:
+        ontology_name (str): The name of the ontology
+    Returns:
+        list: The leaderboards
+    """
+    try:
+        folder = os.path.dirname(get_cache_path(ontology_name, SWEEPS_FOLDER, "_"))
+        leaderboards = list()
+        for file in os.listdir(folder):
+            if file.endswith(".json"):
+                with open(os.path.join(folder, file), "r") as f:
+                    leaderboards.append(json.load(f))
+        return sorted(
+            leaderboards, key=lambda board: board.get("finished_at", 0), reverse=True
+        )
+    except Exception as e:
+        raise FileException(f"Error listing sweep leaderboards: {str(e)}")
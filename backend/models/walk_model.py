@@ -0,0 +1,167 @@
+import glob
+import hashlib
+import json
+import math
+import os
+from flask import current_app
+
+from utils.binary_store import (
+    StringTable,
+    decode_sentences,
+    encode_sentences,
+    load_arrays,
+    read_header,
+    save_arrays,
+)
+from utils.directory_utils import CACHE_FOLDER, get_cache_path
+from utils.exceptions import FileException
+
+WALKS_FOLDER = "walks"
+
+
+def get_walk_corpus_key(
+    ontology_hash, walker_type, walk_depth, walks_per_entity, seed, entities
+):
+    """Build the key identifying a walk corpus
+
+    Exhaustive walks (walks_per_entity is infinite) do not depend on the seed, so the seed is
+    left out of their key and the corpus is shared by every algorithm using the same walker.
+
+    Args:
+        ontology_hash (str): The SHA-256 of the ontology file
+        walker_type (str): The walker type (random or wl)
+        walk_depth (int): The depth of the walks
+        walks_per_entity (float): The maximum number of walks per entity
+        seed (int): The seed used to sample walks
+        entities (list): The seed entities of the walks
+    Returns:
+        dict: The key of the corpus
+    """
+    exhaustive = walks_per_entity is None or math.isinf(walks_per_entity)
+    return {
+        "ontology": ontology_hash,
+        "walker": walker_type.lower(),
+        "depth": int(walk_depth),
+        "walks_per_entity": None if exhaustive else int(walks_per_entity),
+        "seed": None if exhaustive or seed is None else int(seed),
+        "entities": hashlib.sha256("\n".join(entities).encode("utf-8")).hexdigest(),
+    }
+
+
+def get_walk_corpus_path(ontology_name, key):
+    """Return the path of the walk corpus file for the given key
+
+    Args:
+        ontology_name (str): The name of the ontology
+        key (dict): The key of the corpus
+    Returns:
+        str: The path of the corpus file
+    """
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8"))
+    return get_cache_path(ontology_name, WALKS_FOLDER, digest.hexdigest()[:24] + ".bin")
+
+
+def write_walks(path, walks, meta=None):
+    """Write walks as integer token ids with a token table
+
+    Args:
+        path (str): The path of the file to write
+        walks (list): The walks, each a list of str
+        meta (dict): The metadata stored in the header
+    Returns:
+        str: The path of the written file
+    """
+    tokens_blob, tokens_offsets, token_ids, offsets = encode_sentences(walks)
+    arrays = {
+        "tokens_blob": tokens_blob,
+        "tokens_offsets": tokens_offsets,
+        "token_ids": token_ids,
+        "walk_offsets": offsets,
+    }
+    return save_arrays(path, arrays, {**(meta or {}), "n_walks": len(walks)})
+
+
+def read_walks(path):
+    """Read walks written by write_walks
+
+    Args:
+        path (str): The path of the file
+    Returns:
+        list: The walks, each a list of str
+    """
+    arrays, _ = load_arrays(path)
+    tokens = StringTable(arrays["tokens_blob"], arrays["tokens_offsets"]).tolist()
+    return decode_sentences(tokens, arrays["token_ids"], arrays["walk_offsets"])
+
+
+def save_walk_corpus(ontology_name, key, walks):
+    """Save walks as integer token ids with a token table
+
+    Args:
+        ontology_name (str): The name of the ontology
+        key (dict): The key of the corpus
+        walks (list): The walks, each a list of str
+    Returns:
+        str: The path of the saved corpus
+    """
+    try:
+        path = get_walk_corpus_path(ontology_name, key)
+        return write_walks(path, walks, {"key": key})
+    except Exception as e:
+        raise FileException(f"Error saving walk corpus: {str(e)}")
+
+
+def load_walk_corpus(ontology_name, key):
+    """Load a cached walk corpus and mark it as recently used
+
+    Args:
+        ontology_name (str): The name of the ontology
+        key (dict): The key of the corpus
+    Returns:
+        list: The walks, each a list of str, or None if the corpus is not cached
+    """
+    try:
+        path = get_walk_corpus_path(ontology_name, key)
+        if not os.path.exists(path):
+            return None
+
+        meta, _, _ = read_header(path)
+        if meta.get("key") != key:
+            return None
+
+        walks = read_walks(path)
+
+        # the modification time orders the corpora for eviction
+        os.utime(path)
+        return walks
+    except Exception as e:
+        raise FileException(f"Error loading walk corpus: {str(e)}")
+
+
+def evict_walk_corpora(max_bytes):
+    """Remove the least recently used walk corpora of all ontologies until they fit in max_bytes
+
+    Args:
+        max_bytes (int): The total size allowed for walk corpora
+    Returns:
+        list: The paths of the removed corpora
+    """
+    try:
+        STORAGE_FOLDER = current_app.config["STORAGE_FOLDER"]
+        pattern = os.path.join(STORAGE_FOLDER, "*", CACHE_FOLDER, WALKS_FOLDER, "*.bin")
+        corpora = sorted(
+            ((os.stat(path), path) for path in glob.glob(pattern)),
+            key=lambda item: item[0].st_mtime,
+            reverse=True,
+        )
+
+        # the most recently used corpus is always kept, even if it exceeds the budget
+        removed, total = [], sum(stat.st_size for stat, _ in corpora[:1])
+        for stat, path in corpora[1:]:
+            total += stat.st_size
+            if total > max_bytes:
+                os.remove(path)
+                removed.append(path)
+        return removed
+    except Exception as e:
+        raise FileException(f"Error evicting walk corpora: {str(e)}")
@@ -1,12 +1,4 @@
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.neural_network import MLPClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn import svm
-from sklearn.calibration import CalibratedClassifierCV
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.linear_model import SGDClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import make_pipeline
+# scikit-learn is imported by the classifier runs, so that importing the evaluator stays cheap
 
 
 class Evaluator:
@@ -22,6 +14,7 @@ class Evaluator:
 
     # the simple one
     def run_random_forest(self):
+        from sklearn.ensemble import RandomForestClassifier
         rf = RandomForestClassifier(n_estimators=200)
         rf.fit(self.train_X, self.train_y)
         rf_best = rf
@@ -50,6 +43,7 @@ class Evaluator:
     """
 
     def run_mlp(self):
+        from sklearn.neural_network import MLPClassifier
         mlp = MLPClassifier(max_iter=1000, hidden_layer_sizes=200)
         mlp.fit(self.train_X, self.train_y)
         mlp_best = mlp
@@ -78,6 +72,7 @@ class Evaluator:
     """
 
     def run_logistic_regression(self):
+        from sklearn.linear_model import LogisticRegression
         lr = LogisticRegression(random_state=0)
         lr.fit(self.train_X, self.train_y)
         lr_best = lr
@@ -85,6 +80,7 @@ class Evaluator:
         print('Testing, MRR: %.3f, Hits@1: %.3f, Hits@5: %.3f, Hits@10: %.3f\n\n' % (MRR, hits1, hits5, hits10))
 
     def run_svm(self):
+        from sklearn import svm
         m = svm.SVC(probability=True)
         m.fit(self.train_X, self.train_y)
         m_best = m
@@ -92,6 +88,8 @@ class Evaluator:
         print('Testing, MRR: %.3f, Hits@1: %.3f, Hits@5: %.3f, Hits@10: %.3f\n\n' % (MRR, hits1, hits5, hits10))
 
     def run_linear_svc(self):
+        from sklearn import svm
+        from sklearn.calibration import CalibratedClassifierCV
         lin_clf = svm.LinearSVC()
         m = CalibratedClassifierCV(lin_clf)
         m.fit(self.train_X, self.train_y)
@@ -100,6 +98,7 @@ class Evaluator:
         print('Testing, MRR: %.3f, Hits@1: %.3f, Hits@5: %.3f, Hits@10: %.3f\n\n' % (MRR, hits1, hits5, hits10))
 
     def run_decision_tree(self):
+        from sklearn.tree import DecisionTreeClassifier
         dt = DecisionTreeClassifier(random_state=0)
         dt.fit(self.train_X, self.train_y)
         m_best = dt
@@ -107,6 +106,9 @@ class Evaluator:
         print('Testing, MRR: %.3f, Hits@1: %.3f, Hits@5: %.3f, Hits@10: %.3f\n\n' % (MRR, hits1, hits5, hits10))
 
     def run_sgd_log(self):
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
         clf = make_pipeline(StandardScaler(), SGDClassifier(loss='log'))
         clf.fit(self.train_X, self.train_y)
         m_best = clf
@@ -1,5 +1,25 @@
 import re
-from nltk import word_tokenize
+
+# the NLTK models used by word_tokenize (punkt_tab since NLTK 3.8.2)
+NLTK_RESOURCES = ("punkt", "punkt_tab")
+
+_word_tokenize = None
+
+
+def get_word_tokenize():
+    """Return the NLTK word tokenizer, importing NLTK on first use.
+    Nothing is downloaded: word_tokenize needs the punkt models, and when they are not installed
+    the Treebank tokenizer, which needs no data, is used instead"""
+    global _word_tokenize
+    if _word_tokenize is None:
+        import nltk
+        try:
+            nltk.word_tokenize('probe')
+            _word_tokenize = nltk.word_tokenize
+        except LookupError:
+            print('NLTK punkt models not found, tokenizing with the Treebank tokenizer')
+            _word_tokenize = nltk.tokenize.TreebankWordTokenizer().tokenize
+    return _word_tokenize
 
 
 def URI_parse(uri):
@@ -25,7 +45,7 @@ def URI_parse(uri):
 
 def pre_process_words(words):
     text = ' '.join([re.sub(r'https?:\/\/.*[\r\n]*', '', word, flags=re.MULTILINE) for word in words])
-    tokens = word_tokenize(text)
+    tokens = get_word_tokenize()(text)
     # processed_tokens = [token.lower() for token in tokens if token.isalpha()]
     processed_tokens = [token.lower() for token in tokens]
     return processed_tokens
\ No newline at end of file
@@ -34,14 +34,20 @@ class OntologyAccess(object):
     def getOntologyIRI(self):
         return self.urionto
 
-    def loadOntology(self, reasoner=Reasoner.NONE, memory_java="10240"):
-
-        self.world = World()
-
-        # Method from owlready
-        # self.onto = get_ontology(self.urionto).load()
-        self.onto = self.world.get_ontology(self.urionto).load()
-        self.onto.load()
+    def loadOntology(
+        self, reasoner=Reasoner.NONE, memory_java="10240", ontology=None, graph=None
+    ):
+        # reuse an ontology already loaded (and its rdflib view) instead of parsing the file
+        if ontology is not None:
+            self.world = ontology.world
+            self.onto = ontology
+        else:
+            self.world = World()
+
+            # Method from owlready
+            # self.onto = get_ontology(self.urionto).load()
+            self.onto = self.world.get_ontology(self.urionto).load()
+            self.onto.load()
 
         # self.classifiedOnto = get_ontology(self.urionto + '_classified')
         owlready2.reasoning.JAVA_MEMORY = memory_java
@@ -93,7 +99,7 @@ class OntologyAccess(object):
 
         # self.graph = default_world.as_rdflib_graph()
         # logging.info("There are {} triples in the ontology".format(len(self.graph)))
-        self.graph = self.world.as_rdflib_graph()
+        self.graph = graph if graph is not None else self.world.as_rdflib_graph()
         logging.info("There are {} triples in the ontology".format(len(self.graph)))
 
     def getOntology(self):
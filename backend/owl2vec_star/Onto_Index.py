@@ -0,0 +1,331 @@
+from collections import defaultdict
+from functools import cached_property
+
+from rdflib import URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+NOTHING = "http://www.w3.org/2002/07/owl#Nothing"
+THING = "http://www.w3.org/2002/07/owl#Thing"
+
+# rdf:type objects that are OWL vocabulary, not classes of an individual
+TYPE_VOCABULARY = {
+    str(OWL.Ontology),
+    str(OWL.AnnotationProperty),
+    str(OWL.ObjectProperty),
+    str(OWL.Class),
+    str(OWL.DatatypeProperty),
+    str(OWL.Restriction),
+    str(OWL.NamedIndividual),
+    THING,
+    str(OWL.TransitiveProperty),
+    str(OWL.FunctionalProperty),
+    str(OWL.InverseFunctionalProperty),
+    str(OWL.SymmetricProperty),
+    str(OWL.AsymmetricProperty),
+    str(OWL.ReflexiveProperty),
+    str(OWL.IrreflexiveProperty),
+}
+
+# the predicates also indexed from object to subject
+REVERSE_PREDICATES = {
+    RDFS.subClassOf,
+    OWL.equivalentClass,
+    OWL.inverseOf,
+    OWL.equivalentProperty,
+    OWL.onProperty,
+}
+
+# the fillers of a restriction
+RESTRICTION_TARGETS = (OWL.someValuesFrom, OWL.allValuesFrom, OWL.onClass)
+
+
+def isIRI(term):
+    return isinstance(term, URIRef)
+
+
+def isNamedClass(term):
+    return isIRI(term) and str(term) not in (NOTHING, THING)
+
+
+class GraphIndex(object):
+    """
+    Index of the triples of an ontology graph by predicate, built in one pass over the graph
+
+    Answers the query patterns of the projection with dictionary lookups: atomic axioms and
+    assertions from the predicate index, restrictions and class expressions by following
+    their blank nodes (owl:onProperty, the restriction fillers, then rdf:first/rdf:rest
+    lists). Every method returns the rows the matching SPARQL query of OntologyProjection
+    returns, as tuples, in no particular order.
+    """
+
+    def __init__(self, graph):
+        # predicate -> subject -> objects, and object -> subjects for REVERSE_PREDICATES
+        self.objects = defaultdict(lambda: defaultdict(list))
+        self.subjects = {p: defaultdict(list) for p in REVERSE_PREDICATES}
+        for s, p, o in graph.triples((None, None, None)):
+            self.objects[p][s].append(o)
+            if p in self.subjects:
+                self.subjects[p][o].append(s)
+
+    def __objects__(self, subject, predicate):
+        return self.objects[predicate].get(subject, [])
+
+    def __subjects__(self, predicate, obj):
+        return self.subjects[predicate].get(obj, [])
+
+    def __pairs__(self, predicate):
+        for s, objects in self.objects[predicate].items():
+            for o in objects:
+                yield s, o
+
+    def __listMembers__(self, node):
+        # rdf:rest* then rdf:first, a malformed cyclic list is followed once
+        members, seen = [], set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            members.extend(self.__objects__(node, RDF.first))
+            rest = self.__objects__(node, RDF.rest)
+            node = rest[0] if rest else None
+        return members
+
+    def __expressionMembers__(self, node):
+        # the members of the intersections and unions a node is
+        members = []
+        for connector in (OWL.intersectionOf, OWL.unionOf):
+            for head in self.__objects__(node, connector):
+                members.extend(self.__listMembers__(head))
+        return members
+
+    def __restrictions__(self, prop_uri):
+        return self.__subjects__(OWL.onProperty, URIRef(prop_uri))
+
+    def __targets__(self, restriction):
+        for predicate in RESTRICTION_TARGETS:
+            yield from self.__objects__(restriction, predicate)
+
+    def atomicClassSubsumptions(self):
+        return [
+            (s, o)
+            for s, o in self.__pairs__(RDFS.subClassOf)
+            if isNamedClass(s) and isNamedClass(o)
+        ]
+
+    def atomicClassEquivalences(self):
+        return [
+            (s, o)
+            for s, o in self.__pairs__(OWL.equivalentClass)
+            if isNamedClass(s) and isNamedClass(o)
+        ]
+
+    def allClassTypes(self):
+        return [
+            (s, o)
+            for s, o in self.__pairs__(RDF.type)
+            if isIRI(s) and isIRI(o) and str(o) not in TYPE_VOCABULARY
+        ]
+
+    def allSameAs(self):
+        return [(s, o) for s, o in self.__pairs__(OWL.sameAs) if isIRI(s) and isIRI(o)]
+
+    def objectRoleAssertions(self, prop_uri):
+        return [
+            (s, o) for s, o in self.__pairs__(URIRef(prop_uri)) if isIRI(s) and isIRI(o)
+        ]
+
+    def dataRoleAssertions(self, prop_uri):
+        return [(s, o) for s, o in self.__pairs__(URIRef(prop_uri)) if isIRI(s)]
+
+    def domains(self, prop_uri):
+        domains = self.__objects__(URIRef(prop_uri), RDFS.domain)
+        return [(d,) for d in dict.fromkeys(domains) if isIRI(d)]
+
+    def ranges(self, prop_uri):
+        ranges = self.__objects__(URIRef(prop_uri), RDFS.range)
+        return [(r,) for r in dict.fromkeys(ranges) if isIRI(r)]
+
+    def domainsAndRanges(self, prop_uri):
+        return [
+            (d, r) for (d,) in self.domains(prop_uri) for (r,) in self.ranges(prop_uri)
+        ]
+
+    def complexDomains(self, prop_uri):
+        return self.__complexMembers__(prop_uri, RDFS.domain)
+
+    def complexRanges(self, prop_uri):
+        return self.__complexMembers__(prop_uri, RDFS.range)
+
+    def __complexMembers__(self, prop_uri, predicate):
+        members = []
+        for node in self.__objects__(URIRef(prop_uri), predicate):
+            members.extend(self.__expressionMembers__(node))
+        return [(m,) for m in dict.fromkeys(members) if isIRI(m)]
+
+    def inverses(self, prop_uri):
+        return self.__symmetric__(prop_uri, OWL.inverseOf)
+
+    def atomicEquivalentProperties(self, prop_uri):
+        return self.__symmetric__(prop_uri, OWL.equivalentProperty)
+
+    def __symmetric__(self, prop_uri, predicate):
+        prop = URIRef(prop_uri)
+        found = self.__subjects__(predicate, prop) + self.__objects__(prop, predicate)
+        return [(p,) for p in dict.fromkeys(found) if isIRI(p)]
+
+    def restrictionsRHS(self, prop_uri, axiom=RDFS.subClassOf):
+        # A sub/equiv R some B
+        rows = set()
+        for restriction in self.__restrictions__(prop_uri):
+            for s in self.__subjects__(axiom, restriction):
+                if isIRI(s):
+                    rows.update(
+                        (s, o) for o in self.__targets__(restriction) if isIRI(o)
+                    )
+        return list(rows)
+
+    def dataRestrictionsRHS(self, prop_uri, axiom=RDFS.subClassOf):
+        # A sub/equiv R some datatype, only the class is kept
+        rows = set()
+        for restriction in self.__restrictions__(prop_uri):
+            rows.update((s,) for s in self.__subjects__(axiom, restriction) if isIRI(s))
+        return list(rows)
+
+    def restrictionsLHS(self, prop_uri):
+        # R some B sub A
+        rows = set()
+        for restriction in self.__restrictions__(prop_uri):
+            for s in self.__objects__(restriction, RDFS.subClassOf):
+                if isIRI(s):
+                    rows.update(
+                        (s, o) for o in self.__targets__(restriction) if isIRI(o)
+                    )
+        return list(rows)
+
+    def complexRestrictionsLHS(self, prop_uri):
+        # R some (B or C) sub A
+        rows = set()
+        for restriction in self.__restrictions__(prop_uri):
+            for s in self.__objects__(restriction, RDFS.subClassOf):
+                if not isIRI(s):
+                    continue
+                for target in self.__targets__(restriction):
+                    rows.update(
+                        (s, o) for o in self.__expressionMembers__(target) if isIRI(o)
+                    )
+        return list(rows)
+
+    def annotations(self, ann_prop_uri):
+        # the values of the annotation, and the labels of the individuals it points to
+        rows = set()
+        for s, o in self.__pairs__(URIRef(ann_prop_uri)):
+            rows.add((s, o))
+            rows.update((s, label) for label in self.__objects__(o, RDFS.label))
+        return list(rows)
+
+
+class SPARQLIndex(object):
+    """
+    The GraphIndex interface answered by the SPARQL queries of OntologyProjection, one query
+    per call
+    """
+
+    def __init__(self, projection):
+        self.projection = projection
+
+    def __query__(self, query):
+        return self.projection.onto.queryGraph(query)
+
+    def atomicClassSubsumptions(self):
+        return self.__query__(self.projection.getQueryForAtomicClassSubsumptions())
+
+    def atomicClassEquivalences(self):
+        return self.__query__(self.projection.getQueryForAtomicClassEquivalences())
+
+    def allClassTypes(self):
+        return self.__query__(self.projection.getQueryForAllClassTypes())
+
+    def allSameAs(self):
+        return self.__query__(self.projection.getQueryForAllSameAs())
+
+    def objectRoleAssertions(self, prop_uri):
+        return self.__query__(self.projection.getQueryObjectRoleAssertions(prop_uri))
+
+    def dataRoleAssertions(self, prop_uri):
+        return self.__query__(self.projection.getQueryDataRoleAssertions(prop_uri))
+
+    def domains(self, prop_uri):
+        return self.__query__(self.projection.getQueryForDomain(prop_uri))
+
+    def ranges(self, prop_uri):
+        return self.__query__(self.projection.getQueryForRange(prop_uri))
+
+    def domainsAndRanges(self, prop_uri):
+        return self.__query__(self.projection.getQueryForDomainAndRange(prop_uri))
+
+    def complexDomains(self, prop_uri):
+        return self.__query__(self.projection.getQueryForComplexDomain(prop_uri))
+
+    def complexRanges(self, prop_uri):
+        return self.__query__(self.projection.getQueryForComplexRange(prop_uri))
+
+    def inverses(self, prop_uri):
+        return self.__query__(self.projection.getQueryForInverses(prop_uri))
+
+    def atomicEquivalentProperties(self, prop_uri):
+        return self.__query__(
+            self.projection.getQueryForAtomicEquivalentObjectProperties(prop_uri)
+        )
+
+    def restrictionsRHS(self, prop_uri, axiom=RDFS.subClassOf):
+        if axiom == RDFS.subClassOf:
+            query = self.projection.getQueryForRestrictionsRHSSubClassOf(prop_uri)
+        else:
+            query = self.projection.getQueryForRestrictionsRHSEquivalent(prop_uri)
+        return self.__query__(query)
+
+    def dataRestrictionsRHS(self, prop_uri, axiom=RDFS.subClassOf):
+        if axiom == RDFS.subClassOf:
+            query = self.projection.getQueryForDataRestrictionsRHSSubClassOf(prop_uri)
+        else:
+            query = self.projection.getQueryForDataRestrictionsRHSEquivalent(prop_uri)
+        return self.__query__(query)
+
+    def restrictionsLHS(self, prop_uri):
+        return self.__query__(self.projection.getQueryForRestrictionsLHS(prop_uri))
+
+    def complexRestrictionsLHS(self, prop_uri):
+        return self.__query__(
+            self.projection.getQueryForComplexRestrictionsLHS(prop_uri)
+        )
+
+    def annotations(self, ann_prop_uri):
+        return self.__query__(self.projection.getQueryForAnnotations(ann_prop_uri))
+
+
+class PropertyMetadata(object):
+    """
+    The inverses, equivalent properties, atomic domains and atomic ranges of a property
+
+    Each is looked up in the index of the projection on first use and kept, a property is
+    never queried twice for the same relation.
+    """
+
+    def __init__(self, index, iri, name=None):
+        self.index = index
+        self.iri = iri
+        self.name = name if name is not None else iri
+
+    @cached_property
+    def inverses(self):
+        return [row[0] for row in self.index.inverses(self.iri)]
+
+    @cached_property
+    def equivalents(self):
+        return [row[0] for row in self.index.atomicEquivalentProperties(self.iri)]
+
+    @cached_property
+    def domains(self):
+        return [row[0] for row in self.index.domains(self.iri)]
+
+    @cached_property
+    def ranges(self):
+        return [row[0] for row in self.index.ranges(self.iri)]
@@ -9,9 +9,10 @@ import time
 import sys
 from owl2vec_star.Onto_Access import OntologyAccess, Reasoner
 from rdflib import Graph, URIRef
-from rdflib.namespace import RDF, RDFS
+from rdflib.namespace import OWL, RDF, RDFS
 import logging
 from owl2vec_star.Onto_Annotations import AnnotationURIs
+from owl2vec_star.Onto_Index import GraphIndex, PropertyMetadata, SPARQLIndex
 ######
 
 
@@ -47,8 +48,13 @@ class OntologyProjection(object):
     7. additional_synonyms_annotations
      Optional set of additional annotation URIs to be included in case the lexical information (e.g. preferred labels and synonyms are not present in standard annotation properties)
     8. memory_reasoner (necessary for Hermit and Pellet as they are internally called as Java applications)
+    9. ontology and graph
+     Optional owlready2 ontology already loaded from urionto, and its rdflib view, used instead of loading the file again
+    10. use_index
+    True: the projection patterns are answered by a GraphIndex built in one pass over the graph
+    False: one SPARQL query per pattern and property
     '''
-    def __init__(self, urionto, reasoner=Reasoner.NONE, only_taxonomy=False, bidirectional_taxonomy=False, include_literals=True, avoid_properties=set(), additional_preferred_labels_annotations=set(), additional_synonyms_annotations=set(), memory_reasoner='10240'):
+    def __init__(self, urionto, reasoner=Reasoner.NONE, only_taxonomy=False, bidirectional_taxonomy=False, include_literals=True, avoid_properties=set(), additional_preferred_labels_annotations=set(), additional_synonyms_annotations=set(), memory_reasoner='10240', ontology=None, graph=None, use_index=True):
 
         try:
             logging.basicConfig(format='%(levelname)s: %(message)s', level=logging.INFO)
@@ -77,10 +83,18 @@ class OntologyProjection(object):
 
             self.propagate_domain_range = (reasoner==Reasoner.STRUCTURAL)
 
+            self.use_index = use_index
+            self.index = None
+
+            #Metadata of the properties, looked up once per projection
+            self.property_metadata = {}
+            self.object_properties = None
+            self.data_properties = None
+
 
             ## 1. Create ontology using ontology_access
             self.onto = OntologyAccess(urionto)
-            self.onto.loadOntology(reasoner, memory_reasoner)
+            self.onto.loadOntology(reasoner, memory_reasoner, ontology, graph)
 
 
             #To index annotations
@@ -89,6 +103,7 @@ class OntologyProjection(object):
             self.entityToSynonyms = {}
             self.entityToPrefLabelsAndSynonyms = {}
             self.entityToAllLexicalLabels = {}
+            self.label_table = {}
 
 
 
@@ -142,22 +157,22 @@ class OntologyProjection(object):
 
 
         #Class assertions
-        results = self.onto.queryGraph(self.getQueryForAllClassTypes())
+        results = self.getIndex().allClassTypes()
         for row in results:
             self.axioms_manchester.add(str(row[0]) + " Type " + str(row[1]))
 
 
 
         #Object Role assertions
-        for prop in list(self.onto.getObjectProperties()):
-            results = self.onto.queryGraph(self.getQueryObjectRoleAssertions(prop.iri))
+        for prop in self.getObjectProperties():
+            results = self.getIndex().objectRoleAssertions(prop.iri)
             for row in results:
                 self.axioms_manchester.add(str(row[0]) + " " + str(prop.iri) + " " + str(row[1]))
 
 
         #Data Role assertions
-        for prop in list(self.onto.getDataProperties()):
-            results = self.onto.queryGraph(self.getQueryDataRoleAssertions(prop.iri))
+        for prop in self.getDataProperties():
+            results = self.getIndex().dataRoleAssertions(prop.iri)
 
             for row in results:
                 self.axioms_manchester.add(str(row[0]) + " " + str(prop.iri) + " " + str(row[1]))
@@ -320,7 +335,7 @@ class OntologyProjection(object):
         ## 3. Extract triples for subsumption (optionaly bidirectional: superclass).
         logging.info("\tExtracting subsumption triples")
         start_time = time.time()
-        results = self.onto.queryGraph(self.getQueryForAtomicClassSubsumptions())
+        results = self.getIndex().atomicClassSubsumptions()
         for row in results:
 
             self.__addSubsumptionTriple__(row[0], row[1])
@@ -333,7 +348,7 @@ class OntologyProjection(object):
         ## 4. Triples for equivalences (split into 2 subsumptions). (no propagation)
         logging.info("\tExtracting equivalence triples")
         start_time = time.time()
-        results = self.onto.queryGraph(self.getQueryForAtomicClassEquivalences())
+        results = self.getIndex().atomicClassEquivalences()
         for row in results:
             #print(row[0], row[1])
             self.__addSubsumptionTriple__(row[0], row[1])
@@ -374,7 +389,7 @@ class OntologyProjection(object):
         ## 5. Triples for rdf:type (optional bidirectional: typeOf)
         start_time = time.time()
         logging.info("\tExtracting class membership triples.")
-        results = self.onto.queryGraph(self.getQueryForAllClassTypes())
+        results = self.getIndex().allClassTypes()
         for row in results:
             self.__addClassTypeTriple__(row[0], row[1])
 
@@ -387,7 +402,7 @@ class OntologyProjection(object):
         ## 6. Triples for same_as (no propagation)
         logging.info("\tExtracting sameAs triples")
         start_time = time.time()
-        results = self.onto.queryGraph(self.getQueryForAllSameAs())
+        results = self.getIndex().allSameAs()
         for row in results:
             self.__addSameAsTriple__(row[0], row[1])
             self.__addSameAsTriple__(row[1], row[0])
@@ -415,7 +430,7 @@ class OntologyProjection(object):
 
         ####################
         #OBJECT PROPERTIES
-        for prop in list(self.onto.getObjectProperties()):
+        for prop in self.getObjectProperties():
 
             ## Filter properties accordingly
             if prop.iri in self.avoid_properties:
@@ -442,25 +457,21 @@ class OntologyProjection(object):
             ## 7. Extract triples for domain and ranges for object properties (object)
             #print(self.getQueryForDomainAndRange(prop.iri))
             #logging.info("\t\tExtracting domain and range for " + str(prop.name))
-            results = self.onto.queryGraph(self.getQueryForDomainAndRange(prop.iri))
+            results = [(d, r) for d in prop.domains for r in prop.ranges]
             self.__processPropertyResults__(prop.iri, results, True, True)
 
             #To propagate domain/range entailment. Only atomic domains
-            results_domain = self.onto.queryGraph(self.getQueryForDomain(prop.iri))
-            results_range = self.onto.queryGraph(self.getQueryForRange(prop.iri))
-            for row_domain in results_domain:
-                self.domains.add(row_domain[0])
-                self.domains_dict[prop.iri].add(row_domain[0])
+            self.domains.update(prop.domains)
+            self.domains_dict[prop.iri].update(prop.domains)
 
-            for row_range in results_range:
-                self.ranges.add(row_range[0])
-                self.ranges_dict[prop.iri].add(row_range[0])
+            self.ranges.update(prop.ranges)
+            self.ranges_dict[prop.iri].update(prop.ranges)
 
 
             ##7a. Complex domain and ranges
             #logging.info("\t\tExtracting complex domain and range for " + str(prop.name))
-            results_domain = self.onto.queryGraph(self.getQueryForComplexDomain(prop.iri))
-            results_range = self.onto.queryGraph(self.getQueryForComplexRange(prop.iri))
+            results_domain = self.getIndex().complexDomains(prop.iri)
+            results_range = self.getIndex().complexRanges(prop.iri)
             #for row_range in results_range:
             #    self.ranges.add(row_range[0])
             for row_domain in results_domain:
@@ -478,9 +489,9 @@ class OntologyProjection(object):
             ## 8. Extract triples for restrictions (object)
             ##8.a RHS restrictions (some, all, cardinality) via subclassof and equivalence
             #logging.info("\t\tExtracting RHS restrictions for " + str(prop.name))
-            results = self.onto.queryGraph(self.getQueryForRestrictionsRHSSubClassOf(prop.iri))
+            results = self.getIndex().restrictionsRHS(prop.iri, RDFS.subClassOf)
             self.__processPropertyResults__(prop.iri, results, True, True)
-            results = self.onto.queryGraph(self.getQueryForRestrictionsRHSEquivalent(prop.iri))
+            results = self.getIndex().restrictionsRHS(prop.iri, OWL.equivalentClass)
             self.__processPropertyResults__(prop.iri, results, True, True)
 
             ##Not optimal to query via SPARQL: integrated in complex axioms method
@@ -494,18 +505,18 @@ class OntologyProjection(object):
 
             ##8.c LHS restrictions (some, all, cardinality) via subclassof (considered above in case of equivalence)
             #logging.info("\t\tExtracting LHS restrictions for " + str(prop.name))
-            results = self.onto.queryGraph(self.getQueryForRestrictionsLHS(prop.iri))
+            results = self.getIndex().restrictionsLHS(prop.iri)
             self.__processPropertyResults__(prop.iri, results, True, True)
 
             ##8.d Complex restrictions LHS: "R some (A or B)"
             #logging.info("\t\tExtracting Complex LHS restrictions for " + str(prop.name))
-            results = self.onto.queryGraph(self.getQueryForComplexRestrictionsLHS(prop.iri))
+            results = self.getIndex().complexRestrictionsLHS(prop.iri)
             self.__processPropertyResults__(prop.iri, results, True, True)
 
 
             ## 9. Extract triples for role assertions (object and data)
             #logging.info("\t\tExtracting triples for role assertions for " + str(prop.name))
-            results = self.onto.queryGraph(self.getQueryObjectRoleAssertions(prop.iri))
+            results = self.getIndex().objectRoleAssertions(prop.iri)
             self.__processPropertyResults__(prop.iri, results, False, True)
 
 
@@ -513,22 +524,20 @@ class OntologyProjection(object):
             if (not self.only_taxonomy):
                 ## 10. Extract named inverses and create/propagate new reversed triples. tbox and abox
                 #logging.info("\t\tExtracting inverses for " + str(prop.name))
-                results = self.onto.queryGraph(self.getQueryForInverses(prop.iri))
-                for row in results:
+                for inverse in prop.inverses:
                     for sub in self.triple_dict:
                         for obj in self.triple_dict[sub]:
-                            self.__addTriple__(obj, row[0], sub) #Reversed triple. Already all as URIRef
+                            self.__addTriple__(obj, inverse, sub) #Reversed triple. Already all as URIRef
 
 
 
                 ## 11. Propagate property equivalences only not subproperties (object). tbox and abox
                 #logging.info("\t\tExtracting equivalences for " + str(prop.name))
-                results = self.onto.queryGraph(self.getQueryForAtomicEquivalentObjectProperties(prop.iri))
-                for row in results:
-                    #print("\t" + row[0])
+                for equivalent in prop.equivalents:
+                    #print("\t" + equivalent)
                     for sub in self.triple_dict:
                         for obj in self.triple_dict[sub]:
-                            self.__addTriple__(sub, row[0], obj) #Inferred triple. Already all as URIRef
+                            self.__addTriple__(sub, equivalent, obj) #Inferred triple. Already all as URIRef
 
 
             #print(self.triple_dict)
@@ -549,7 +558,7 @@ class OntologyProjection(object):
         logging.info("\tExtracting data property assertions")
         ####################
         ##DATA PROPERTIES
-        for prop in list(self.onto.getDataProperties()):
+        for prop in self.getDataProperties():
 
             #print(prop.iri)
 
@@ -569,31 +578,28 @@ class OntologyProjection(object):
             #if self.include_literals:
 
             ## 12a. Domain
-            results_domain = self.onto.queryGraph(self.getQueryForDomain(prop.iri))
-            for row_domain in results_domain:
-                self.domains.add(row_domain[0])
-                self.domains_dict[prop.iri].add(row_domain[0])
+            self.domains.update(prop.domains)
+            self.domains_dict[prop.iri].update(prop.domains)
 
 
             ## 12b. Restrictions
-            results = self.onto.queryGraph(self.getQueryForDataRestrictionsRHSSubClassOf(prop.iri))
+            results = self.getIndex().dataRestrictionsRHS(prop.iri, RDFS.subClassOf)
             self.__processPropertyResults__(prop.iri, results, True, False)  ##Propagates domain and range but avoids adding the triple
-            results = self.onto.queryGraph(self.getQueryForDataRestrictionsRHSEquivalent(prop.iri))
+            results = self.getIndex().dataRestrictionsRHS(prop.iri, OWL.equivalentClass)
             self.__processPropertyResults__(prop.iri, results, True, False)
 
 
             ## 12c. Extract triples for role assertions (data)
-            results = self.onto.queryGraph(self.getQueryDataRoleAssertions(prop.iri))
+            results = self.getIndex().dataRoleAssertions(prop.iri)
             self.__processPropertyResults__(prop.iri, results, False, self.include_literals)
 
 
             ## 12d. Propagate property equivalences only not subproperties (data). abox
-            results = self.onto.queryGraph(self.getQueryForAtomicEquivalentDataProperties(prop.iri))
-            for row in results:
-                #print("\t" + row[0])
+            for equivalent in prop.equivalents:
+                #print("\t" + equivalent)
                 for sub in self.triple_dict:
                     for obj in self.triple_dict[sub]:
-                        self.__addTriple__(sub, row[0], obj) #Inferred triple. Already all as URIRef
+                        self.__addTriple__(sub, equivalent, obj) #Inferred triple. Already all as URIRef
 
 
 
@@ -637,7 +643,7 @@ class OntologyProjection(object):
             for ann_prop_uri in all_annotation_uris:
                 #print(ann_prop_uri)
 
-                results = self.onto.queryGraph(self.getQueryForAnnotations(ann_prop_uri))
+                results = self.getIndex().annotations(ann_prop_uri)
                 for row in results:
                     #Filter by language
                     try:
@@ -664,6 +670,49 @@ class OntologyProjection(object):
 
 
 
+    ##Returns the index answering the projection queries, built on first use
+    def getIndex(self):
+
+        if self.index is None:
+            if self.use_index:
+                start_time = time.time()
+                self.index = GraphIndex(self.onto.getGraph())
+                logging.info("\tTime indexing the ontology graph: %s seconds " % (time.time() - start_time))
+            else:
+                self.index = SPARQLIndex(self)
+
+        return self.index
+
+
+
+    ##Returns the metadata of a property, looked up once per projection
+    def getPropertyMetadata(self, prop_iri, name=None):
+
+        if prop_iri not in self.property_metadata:
+            self.property_metadata[prop_iri] = PropertyMetadata(self.getIndex(), prop_iri, name)
+
+        return self.property_metadata[prop_iri]
+
+
+    ##Returns the metadata of the object properties of the ontology
+    def getObjectProperties(self):
+
+        if self.object_properties is None:
+            self.object_properties = [self.getPropertyMetadata(prop.iri, prop.name) for prop in self.onto.getObjectProperties()]
+
+        return self.object_properties
+
+
+    ##Returns the metadata of the data properties of the ontology
+    def getDataProperties(self):
+
+        if self.data_properties is None:
+            self.data_properties = [self.getPropertyMetadata(prop.iri, prop.name) for prop in self.onto.getDataProperties()]
+
+        return self.data_properties
+
+
+
     ##Returns an rdflib Graph object
     def getProjectionGraph(self):
         return self.projection
@@ -904,20 +953,21 @@ class OntologyProjection(object):
 
             ##end creation of targets
 
+            #Inverses and equivalences depend on the property only
+            prop = self.getPropertyMetadata(property_iri)
+
             for target_cls in targets:
 
                 self.__addTriple__(URIRef(cls.iri), URIRef(property_iri), URIRef(target_cls))
 
                 ##Propagate equivalences and inverses for cls_exp2.property
                 ## 12a. Extract named inverses and create/propagate new reversed triples.
-                results = self.onto.queryGraph(self.getQueryForInverses(property_iri))
-                for row in results:
-                    self.__addTriple__(URIRef(target_cls), row[0], URIRef(cls.iri)) #Reversed triple. Already all as URIRef
+                for inverse in prop.inverses:
+                    self.__addTriple__(URIRef(target_cls), inverse, URIRef(cls.iri)) #Reversed triple. Already all as URIRef
 
                 ## 12b. Propagate property equivalences only (object).
-                results = self.onto.queryGraph(self.getQueryForAtomicEquivalentObjectProperties(property_iri))
-                for row in results:
-                    self.__addTriple__(URIRef(cls.iri), row[0], URIRef(target_cls)) #Inferred triple. Already all as URIRef
+                for equivalent in prop.equivalents:
+                    self.__addTriple__(URIRef(cls.iri), equivalent, URIRef(target_cls)) #Inferred triple. Already all as URIRef
             ##end targets
 
         except AttributeError:
@@ -1440,35 +1490,45 @@ class OntologyProjection(object):
         all_annotation_uris.update(self.additional_synonyms_annotations)
 
 
-        self.__populateDictionary__(pref_label_annotation_uris, self.entityToPreferredLabels)
-        self.__populateDictionary__(synonyms_annotation_uris, self.entityToSynonyms)
-        self.__populateDictionary__(all_annotation_uris, self.entityToAllLexicalLabels)
+        #Every annotation property is read once, its literals routed to the dictionaries of
+        #the annotation sets it belongs to
+        routes = {}
+        for annotation_uris, dictionary in ((pref_label_annotation_uris, self.entityToPreferredLabels), (synonyms_annotation_uris, self.entityToSynonyms), (all_annotation_uris, self.entityToAllLexicalLabels)):
+            for ann_prop_uri in annotation_uris:
+                routes.setdefault(ann_prop_uri, []).append(dictionary)
 
-        #self.__populateDictionary__(pref_label_and_synonyms_annotation_uris, self.entityToPrefLabelsAndSynonyms)
+        for ann_prop_uri, dictionaries in routes.items():
 
+            for row in self.getIndex().annotations(ann_prop_uri):
 
+                #Filter by language
+                try:
+                    #Keep labels in English or not specified
+                    if not (row[1].language=="en" or row[1].language==None):
+                        continue
+                except AttributeError:
+                    continue
 
+                entity = self.__internLabel__(str(row[0]))
+                value = self.__internLabel__(row[1].value)
+                for dictionary in dictionaries:
+                    if not entity in dictionary:
+                        dictionary[entity]=set()
+                    dictionary[entity].add(value)
 
+        #self.__populateDictionary__(pref_label_and_synonyms_annotation_uris, self.entityToPrefLabelsAndSynonyms)
 
-    def __populateDictionary__(self, annotation_uris, dictionary):
 
-        for ann_prop_uri in annotation_uris:
 
-            results = self.onto.queryGraph(self.getQueryForAnnotations(ann_prop_uri))
-            for row in results:
 
-                #Filter by language
-                try:
-                    #Keep labels in English or not specified
-                    if row[1].language=="en" or row[1].language==None:
 
-                        if not str(row[0]) in dictionary:
-                            dictionary[str(row[0])]=set()
-                        dictionary[str(row[0])].add(row[1].value)
+    ##The same entity and label strings are shared by every dictionary
+    def __internLabel__(self, value):
 
+        if not isinstance(value, str):
+            return value
 
-                except AttributeError:
-                    pass
+        return self.label_table.setdefault(value, value)
 
 
 
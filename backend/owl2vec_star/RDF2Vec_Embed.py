@@ -1,54 +1,99 @@
-import rdflib
 import sys
 import numpy as np
 
 from owl2vec_star.rdf2vec.embed import RDF2VecTransformer
-from owl2vec_star.rdf2vec.graph import KnowledgeGraph, Vertex
+from owl2vec_star.rdf2vec.graph import CSRKnowledgeGraph
 from owl2vec_star.rdf2vec.walkers.random import RandomWalker
 from owl2vec_star.rdf2vec.walkers.weisfeiler_lehman import WeisfeilerLehmanWalker
 
 
-def construct_kg_walker(onto_file, walker_type, walk_depth):
+def build_knowledge_graph(onto_file):
+    import rdflib
+
     g = rdflib.Graph()
     if onto_file.endswith("ttl") or onto_file.endswith("TTL"):
         g.parse(onto_file, format="turtle")
     else:
         g.parse(onto_file)
-    kg = KnowledgeGraph()
-    for s, p, o in g:
-        s_v, o_v = Vertex(str(s)), Vertex(str(o))
-        p_v = Vertex(str(p), predicate=True, _from=s_v, _to=o_v)
-        kg.add_vertex(s_v)
-        kg.add_vertex(p_v)
-        kg.add_vertex(o_v)
-        kg.add_edge(s_v, p_v)
-        kg.add_edge(p_v, o_v)
+    return CSRKnowledgeGraph.from_triples((str(s), str(p), str(o)) for s, p, o in g)
+
 
+def construct_walker(walker_type, walk_depth, walks_per_graph=float("inf"), seed=None):
     if walker_type.lower() == "random":
-        walker = RandomWalker(depth=walk_depth, walks_per_graph=float("inf"))
+        walker = RandomWalker(
+            depth=walk_depth, walks_per_graph=walks_per_graph, seed=seed
+        )
     elif walker_type.lower() == "wl":
-        walker = WeisfeilerLehmanWalker(depth=walk_depth, walks_per_graph=float("inf"))
+        walker = WeisfeilerLehmanWalker(
+            depth=walk_depth, walks_per_graph=walks_per_graph, seed=seed
+        )
     else:
         print("walker %s not implemented" % walker_type)
         sys.exit()
 
+    return walker
+
+
+def construct_kg_walker(
+    onto_file, walker_type, walk_depth, kg=None, walks_per_graph=float("inf"), seed=None
+):
+    if kg is None:
+        kg = build_knowledge_graph(onto_file)
+
+    walker = construct_walker(walker_type, walk_depth, walks_per_graph, seed)
     return kg, walker
 
 
-def get_rdf2vec_embed(onto_file, walker_type, walk_depth, embed_size, classes):
-    kg, walker = construct_kg_walker(
-        onto_file=onto_file, walker_type=walker_type, walk_depth=walk_depth
+def get_rdf2vec_embed(
+    onto_file,
+    walker_type,
+    walk_depth,
+    embed_size,
+    classes,
+    kg=None,
+    walks=None,
+    n_jobs=None,
+    trainer=None,
+):
+    if walks is None:
+        kg, walker = construct_kg_walker(
+            onto_file=onto_file, walker_type=walker_type, walk_depth=walk_depth, kg=kg
+        )
+    else:
+        walker = construct_walker(walker_type=walker_type, walk_depth=walk_depth)
+    transformer = RDF2VecTransformer(
+        walkers=[walker], vector_size=embed_size, n_jobs=n_jobs
+    )
+    from rdflib import URIRef
+
+    instances = [URIRef(c) for c in classes]
+    walk_embeddings = transformer.fit_transform(
+        graph=kg, instances=instances, walks=walks, trainer=trainer
     )
-    transformer = RDF2VecTransformer(walkers=[walker], vector_size=embed_size)
-    instances = [rdflib.URIRef(c) for c in classes]
-    walk_embeddings = transformer.fit_transform(graph=kg, instances=instances)
     return np.array(walk_embeddings), transformer
 
 
-def get_rdf2vec_walks(onto_file, walker_type, walk_depth, classes):
+def get_rdf2vec_walks(
+    onto_file,
+    walker_type,
+    walk_depth,
+    classes,
+    kg=None,
+    walks_per_graph=float("inf"),
+    seed=None,
+):
     kg, walker = construct_kg_walker(
-        onto_file=onto_file, walker_type=walker_type, walk_depth=walk_depth
+        onto_file=onto_file,
+        walker_type=walker_type,
+        walk_depth=walk_depth,
+        kg=kg,
+        walks_per_graph=walks_per_graph,
+        seed=seed,
     )
-    instances = [rdflib.URIRef(c) for c in classes]
-    walks_ = list(walker.extract(graph=kg, instances=instances))
+    from rdflib import URIRef
+
+    instances = [URIRef(c) for c in classes]
+    walks_ = [
+        list(map(str, walk)) for walk in walker.extract(graph=kg, instances=instances)
+    ]
     return walks_
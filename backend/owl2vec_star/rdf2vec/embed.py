@@ -1,6 +1,4 @@
 import re
-from sklearn.utils.validation import check_is_fitted
-from gensim.models.word2vec import Word2Vec
 
 import sys
 from owl2vec_star.rdf2vec.walkers.random import RandomWalker
@@ -32,8 +30,8 @@ class RDF2VecTransformer:
         The maximum number of walks to extract from the neighborhood of
         each instance.
 
-    n_jobs: int (default: 1)
-        gensim.models.Word2Vec parameter.
+    n_jobs: int (default: None)
+        gensim.models.Word2Vec parameter. Half of the cores if None.
 
     window: int (default: 5)
         gensim.models.Word2Vec parameter.
@@ -67,21 +65,24 @@ class RDF2VecTransformer:
         max_iter=10,
         negative=25,
         min_count=1,
+        n_jobs=None,
     ):
         self.vector_size = vector_size
         self.walkers = walkers
-        self.n_jobs = (
-            int(multiprocessing.cpu_count() / 2)
-            if int(multiprocessing.cpu_count() / 2) > 1
-            else 1
-        )
+        if n_jobs is None:
+            n_jobs = (
+                int(multiprocessing.cpu_count() / 2)
+                if int(multiprocessing.cpu_count() / 2) > 1
+                else 1
+            )
+        self.n_jobs = n_jobs
         self.window = window
         self.sg = sg
         self.max_iter = max_iter
         self.negative = negative
         self.min_count = min_count
 
-    def fit(self, graph, instances):
+    def fit(self, graph, instances, walks=None, trainer=None):
         """Fit the embedding network based on provided instances.
 
         Parameters
@@ -96,19 +97,33 @@ class RDF2VecTransformer:
             to note that the test instances should be passed to the fit method
             as well. Due to RDF2Vec being unsupervised, there is no
             label leakage.
+
+        walks: list of lists of str (default: None)
+            Pre-computed walks (e.g. from a walk corpus cache). When given,
+            the walkers are not run and graph may be None.
+
+        trainer: callable (default: None)
+            Called as trainer(model, sentences) to train the Word2Vec model
+            once its vocabulary is built, e.g. epoch by epoch with early
+            stopping. Its result is kept as `training_curve_`. The model is
+            trained for `max_iter` epochs at once if None.
         -------
         """
-        self.walks_ = []
-        for walker in self.walkers:
-            self.walks_ += list(walker.extract(graph, instances))
+        if walks is not None:
+            sentences = walks
+        else:
+            # walks are streamed by the walkers straight into the training corpus
+            sentences = []
+            for walker in self.walkers:
+                for walk in walker.extract(graph, instances):
+                    sentences.append(list(map(str, walk)))
+        # the walks are only referenced for training, never kept on the transformer
         print(
-            "Extracted {} walks for {} instances!".format(
-                len(self.walks_), len(instances)
-            )
+            "Extracted {} walks for {} instances!".format(len(sentences), len(instances))
         )
-        sentences = [list(map(str, x)) for x in self.walks_]
+        from gensim.models.word2vec import Word2Vec
+
         self.model_ = Word2Vec(
-            sentences,
             vector_size=self.vector_size,
             window=self.window,
             workers=self.n_jobs,
@@ -118,6 +133,16 @@ class RDF2VecTransformer:
             min_count=self.min_count,
             seed=42,
         )
+        self.model_.build_vocab(sentences)
+        if trainer is None:
+            self.model_.train(
+                sentences,
+                total_examples=self.model_.corpus_count,
+                epochs=self.model_.epochs,
+            )
+            self.training_curve_ = None
+        else:
+            self.training_curve_ = trainer(self.model_, sentences)
 
     def transform(self, instances):
         """Construct a feature vector for the provided instances.
@@ -139,6 +164,8 @@ class RDF2VecTransformer:
         embeddings: array-like
             The embeddings of the provided instances.
         """
+        from sklearn.utils.validation import check_is_fitted
+
         check_is_fitted(self, ["model_"])
 
         feature_vectors = []
@@ -146,7 +173,7 @@ class RDF2VecTransformer:
             feature_vectors.append(self.model_.wv.get_vector(str(instance)))
         return feature_vectors
 
-    def fit_transform(self, graph, instances):
+    def fit_transform(self, graph, instances, walks=None, trainer=None):
         """First apply fit to create a Word2Vec model and then generate
         embeddings for the provided instances.
 
@@ -160,10 +187,16 @@ class RDF2VecTransformer:
         instances: array-like
             The instances for which an embedding will be created.
 
+        walks: list of lists of str (default: None)
+            Pre-computed walks, see fit.
+
+        trainer: callable (default: None)
+            Trains the Word2Vec model, see fit.
+
         Returns
         -------
         embeddings: array-like
             The embeddings of the provided instances.
         """
-        self.fit(graph, instances)
+        self.fit(graph, instances, walks=walks, trainer=trainer)
         return self.transform(instances)
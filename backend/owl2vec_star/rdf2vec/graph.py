@@ -86,4 +86,100 @@ class KnowledgeGraph(object):
         nx.draw_networkx_edges(nx_graph, pos=_pos)
         nx.draw_networkx_labels(nx_graph, pos=_pos)
         names = nx.get_edge_attributes(nx_graph, 'name')
-        nx.draw_networkx_edge_labels(nx_graph, pos=_pos, edge_labels=names)
\ No newline at end of file
+        nx.draw_networkx_edge_labels(nx_graph, pos=_pos, edge_labels=names)
+
+class CSRKnowledgeGraph(object):
+    """Immutable knowledge graph stored as compressed sparse row arrays.
+
+    Every vertex (subject, predicate or object name) gets an integer id, and
+    every triple (s, p, o) becomes an edge s -> o labelled with p. The edges
+    are sorted by subject, so the outgoing edges of vertex v are the ids
+    indptr[v] .. indptr[v + 1] - 1, and inv_edges lists the edge ids sorted
+    by object for the reverse direction. The arrays may be memory-mapped.
+    """
+
+    def __init__(self, names, indptr, predicates, objects, inv_indptr, inv_edges):
+        self.names = names
+        self.indptr = indptr
+        self.predicates = predicates
+        self.objects = objects
+        self.inv_indptr = inv_indptr
+        self.inv_edges = inv_edges
+        self._index = None
+        self._cache = {}
+
+    @classmethod
+    def from_triples(cls, triples):
+        """Build the graph from an iterable of (subject, predicate, object) names."""
+        index = {}
+        subjects, predicates, objects = [], [], []
+        for s, p, o in triples:
+            subjects.append(index.setdefault(s, len(index)))
+            predicates.append(index.setdefault(p, len(index)))
+            objects.append(index.setdefault(o, len(index)))
+
+        n_vertices, n_edges = len(index), len(subjects)
+        id_dtype = np.int32 if max(n_vertices, n_edges) < 2 ** 31 else np.int64
+        subjects = np.asarray(subjects, dtype=np.int64)
+        order = np.argsort(subjects, kind='stable')
+        predicates = np.asarray(predicates, dtype=id_dtype)[order]
+        objects = np.asarray(objects, dtype=id_dtype)[order]
+
+        indptr = np.zeros(n_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(subjects, minlength=n_vertices), out=indptr[1:])
+        inv_indptr = np.zeros(n_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(objects, minlength=n_vertices), out=inv_indptr[1:])
+        inv_edges = np.argsort(objects, kind='stable').astype(id_dtype)
+
+        return cls(list(index), indptr, predicates, objects, inv_indptr, inv_edges)
+
+    @classmethod
+    def from_knowledge_graph(cls, kg):
+        """Convert an object based KnowledgeGraph."""
+        triples = ((v.name, p.name, o.name)
+                   for v in kg._vertices if not v.predicate
+                   for p in kg.get_neighbors(v)
+                   for o in kg.get_neighbors(p))
+        return cls.from_triples(triples)
+
+    @property
+    def n_vertices(self):
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self):
+        return len(self.objects)
+
+    def name_list(self):
+        """All vertex names as a list indexed by vertex id."""
+        if 'names' not in self._cache:
+            names = self.names
+            self._cache['names'] = (names.tolist() if hasattr(names, 'tolist')
+                                    else list(names))
+        return self._cache['names']
+
+    def vertex_id(self, name):
+        """Id of the vertex called name, or -1 when it is not in the graph."""
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.name_list())}
+        return self._index.get(name, -1)
+
+    def adjacency(self):
+        """(indptr, objects) as Python lists for fast walking."""
+        if 'adjacency' not in self._cache:
+            self._cache['adjacency'] = (self.indptr.tolist(),
+                                        self.objects.tolist())
+        return self._cache['adjacency']
+
+    def inverse_adjacency(self):
+        """(inv_indptr, inv_edges) as Python lists for fast walking."""
+        if 'inverse_adjacency' not in self._cache:
+            self._cache['inverse_adjacency'] = (self.inv_indptr.tolist(),
+                                                self.inv_edges.tolist())
+        return self._cache['inverse_adjacency']
+
+    def subjects(self):
+        """Subject vertex id of every edge."""
+        return np.repeat(np.arange(self.n_vertices, dtype=self.objects.dtype),
+                         np.diff(self.indptr))
+
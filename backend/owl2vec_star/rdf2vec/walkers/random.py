@@ -1,15 +1,27 @@
-from owl2vec_star.rdf2vec.walkers.walker import Walker
-from owl2vec_star.rdf2vec.graph import Vertex
+from owl2vec_star.rdf2vec.walkers.walker import Walker, walk_fingerprint
 import numpy as np
 from hashlib import md5
 
 
 class RandomWalker(Walker):
-    def __init__(self, depth, walks_per_graph):
+    def __init__(self, depth, walks_per_graph, seed=None):
         super(RandomWalker, self).__init__(depth, walks_per_graph)
+        self.seed = seed
+        self._rng = None
+
+    def _reset_rng(self):
+        """Restart the sampling of walks from self.seed, if one is set."""
+        self._rng = (np.random.RandomState(self.seed)
+                     if self.seed is not None else None)
 
     def extract_random_walks(self, graph, root):
-        """Extract random walks of depth - 1 hops rooted in root."""
+        """Extract random walks of depth - 1 hops rooted in root.
+
+        Walks are tuples of integer ids: even positions hold vertex ids of
+        the CSR graph, odd positions hold edge ids. A root of -1 (an
+        instance absent from the graph) yields the walk (root,)."""
+        indptr, objects = graph.adjacency()
+
         # Initialize one walk of length 1 (the root)
         walks = {(root,)}
 
@@ -18,8 +30,13 @@ class RandomWalker(Walker):
             # last hop, get all its neighbors and extend the walks
             walks_copy = walks.copy()
             for walk in walks_copy:
-                node = walk[-1]
-                neighbors = graph.get_neighbors(node)
+                hop = walk[-1]
+                if len(walk) % 2 == 0:
+                    neighbors = (objects[hop], )
+                elif hop >= 0:
+                    neighbors = range(indptr[hop], indptr[hop + 1])
+                else:
+                    neighbors = ()
 
                 if len(neighbors) > 0:
                     walks.remove(walk)
@@ -30,7 +47,8 @@ class RandomWalker(Walker):
             # TODO: Should we prune in every iteration?
             if self.walks_per_graph is not None:
                 n_walks = min(len(walks),  self.walks_per_graph)
-                walks_ix = np.random.choice(range(len(walks)), replace=False,
+                rng = self._rng if self._rng is not None else np.random
+                walks_ix = rng.choice(range(len(walks)), replace=False,
                                             size=n_walks)
                 if len(walks_ix) > 0:
                     walks_list = list(walks)
@@ -40,19 +58,31 @@ class RandomWalker(Walker):
         return list(walks)
 
     def extract(self, graph, instances):
-        canonical_walks = set()
+        """Stream the canonical walks of all instances, skipping duplicates.
+
+        Walks are yielded as tuples of strings as soon as they are built;
+        only a 64-bit fingerprint of each emitted walk is kept in memory."""
+        graph = self._as_csr(graph)
+        self._reset_rng()
+        names = graph.name_list()
+        predicates = graph.predicates.tolist()
+
+        seen = set()
         for instance in instances:
-            walks = self.extract_random_walks(graph, Vertex(str(instance)))
+            root = str(instance)
+            walks = self.extract_random_walks(graph, graph.vertex_id(root))
             for walk in walks:
-                canonical_walk = []
-                for i, hop in enumerate(walk):
-                    if i == 0 or i % 2 == 1:
-                        canonical_walk.append(hop.name)
+                canonical_walk = [root]
+                for i in range(1, len(walk)):
+                    if i % 2 == 1:
+                        canonical_walk.append(names[predicates[walk[i]]])
                     else:
                         # digest = md5(hop.name.encode()).digest()[:8]
                         # canonical_walk.append(str(digest))
-                        canonical_walk.append(hop.name)
-
-                canonical_walks.add(tuple(canonical_walk))
+                        canonical_walk.append(names[walk[i]])
 
-        return canonical_walks
+                canonical_walk = tuple(canonical_walk)
+                fingerprint = walk_fingerprint(canonical_walk)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    yield canonical_walk
@@ -1,5 +1,19 @@
 
 
+from hashlib import blake2b
+
+from owl2vec_star.rdf2vec.graph import KnowledgeGraph, CSRKnowledgeGraph
+
+
+def walk_fingerprint(walk):
+    """Return a 64-bit fingerprint of a canonical walk (a tuple of strings).
+
+    Walkers keep a set of these integers instead of the walks themselves to
+    de-duplicate their output while streaming it."""
+    digest = blake2b('\x1f'.join(walk).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
 class Walker():
     def __init__(self, depth, walks_per_graph):
         self.depth = depth
@@ -26,5 +40,12 @@ class Walker():
                 myfile.write(s)
                 myfile.write('\n\n')
 
+    @staticmethod
+    def _as_csr(graph):
+        """Walkers run on a CSRKnowledgeGraph; convert an object graph."""
+        if isinstance(graph, KnowledgeGraph):
+            return CSRKnowledgeGraph.from_knowledge_graph(graph)
+        return graph
+
     def extract(self, graph, instances):
         raise NotImplementedError('This must be implemented!')
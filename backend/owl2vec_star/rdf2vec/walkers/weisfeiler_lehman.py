@@ -1,59 +1,87 @@
 from hashlib import md5
 from owl2vec_star.rdf2vec.walkers.random import RandomWalker
-from collections import defaultdict
-from owl2vec_star.rdf2vec.graph import Vertex
+from owl2vec_star.rdf2vec.walkers.walker import walk_fingerprint
 
 
 class WeisfeilerLehmanWalker(RandomWalker):
-    def __init__(self, depth, walks_per_graph, wl_iterations=4):
-        super(WeisfeilerLehmanWalker, self).__init__(depth, walks_per_graph)
+    def __init__(self, depth, walks_per_graph, wl_iterations=4, seed=None):
+        super(WeisfeilerLehmanWalker, self).__init__(depth, walks_per_graph,
+                                                     seed=seed)
         self.wl_iterations = wl_iterations
 
-    def _create_label(self, graph, vertex, n):
+    @staticmethod
+    def _create_label(label, neighbor_labels):
         """Take labels of neighbors, sort them lexicographically and join."""
-        neighbor_names = [self._label_map[x][n - 1]
-                          for x in graph.get_inv_neighbors(vertex)]
-        suffix = '-'.join(sorted(set(map(str, neighbor_names))))
+        suffix = '-'.join(sorted(set(map(str, neighbor_labels))))
 
         # TODO: Experiment with not adding the prefix
-        return self._label_map[vertex][n - 1] + '-' + suffix
-        # return suffix
+        s_n = label + '-' + suffix
+        return str(md5(s_n.encode()).digest())
 
     def _weisfeiler_lehman(self, graph):
-        """Perform Weisfeiler-Lehman relabeling of the vertices"""
-        self._label_map = defaultdict(dict)
-        self._inv_label_map = defaultdict(dict)
+        """Perform Weisfeiler-Lehman relabeling of the vertices.
 
-        for v in graph._vertices:
-            self._label_map[v][0] = v.name
-            self._inv_label_map[v.name][0] = v
+        The labels of the entity vertices are kept per iteration in
+        self._vertex_labels[n][vertex_id]. Predicate hops (edges) only
+        have a single inverse neighbor, their subject, and only their
+        previous labels are needed to compute the next iteration."""
+        names = graph.name_list()
+        inv_indptr, inv_edges = graph.inverse_adjacency()
+        subjects = graph.subjects().tolist()
+
+        vertex_labels = [names]
+        edge_labels = [names[p] for p in graph.predicates.tolist()]
 
         for n in range(1, self.wl_iterations+1):
-            for vertex in graph._vertices:
-                # Create multi-set label
-                s_n = self._create_label(graph, vertex, n)
-                # Store it in our label_map
-                self._label_map[vertex][n] = str(md5(s_n.encode()).digest())
+            previous = vertex_labels[-1]
+            vertex_labels.append([
+                self._create_label(
+                    previous[v],
+                    [edge_labels[e]
+                     for e in inv_edges[inv_indptr[v]:inv_indptr[v + 1]]])
+                for v in range(len(previous))])
+            edge_labels = [self._create_label(label, [previous[subjects[e]]])
+                           for e, label in enumerate(edge_labels)]
 
-        for vertex in graph._vertices:
-            for key, val in self._label_map[vertex].items():
-                self._inv_label_map[vertex][val] = key
+        self._vertex_labels = vertex_labels
 
     def extract(self, graph, instances):
+        """Stream the canonical walks of every WL iteration, skipping duplicates.
+
+        Each random walk is relabelled once per iteration and yielded straight
+        away instead of being collected into a global set. A walk whose
+        relabelled hops are identical to those of the previous iteration
+        (e.g. a walk without any hop after the root) is skipped, and the
+        remaining ones are de-duplicated through 64-bit fingerprints."""
+        graph = self._as_csr(graph)
+        self._reset_rng()
         self._weisfeiler_lehman(graph)
+        names = graph.name_list()
+        predicates = graph.predicates.tolist()
 
-        canonical_walks = set()
+        seen = set()
         for instance in instances:
-            walks = self.extract_random_walks(graph, Vertex(str(instance)))
-            for n in range(self.wl_iterations + 1):
-                for walk in walks:
-                    canonical_walk = []
-                    for i, hop in enumerate(walk):
-                        if i == 0 or i % 2 == 1:
-                            canonical_walk.append(hop.name)
-                        else:
-                            canonical_walk.append(self._label_map[hop][n])
+            root = str(instance)
+            walks = self.extract_random_walks(graph, graph.vertex_id(root))
+            for walk in walks:
+                previous_labels = None
+                for n in range(self.wl_iterations + 1):
+                    vertex_labels = self._vertex_labels[n]
+                    labels = tuple(vertex_labels[walk[i]]
+                                   for i in range(2, len(walk), 2))
+                    if labels == previous_labels:
+                        continue
+                    previous_labels = labels
 
-                    canonical_walks.add(tuple(canonical_walk))
+                    canonical_walk = [root]
+                    for i in range(1, len(walk)):
+                        if i % 2 == 1:
+                            canonical_walk.append(names[predicates[walk[i]]])
+                        else:
+                            canonical_walk.append(vertex_labels[walk[i]])
 
-        return canonical_walks
+                    canonical_walk = tuple(canonical_walk)
+                    fingerprint = walk_fingerprint(canonical_walk)
+                    if fingerprint not in seen:
+                        seen.add(fingerprint)
+                        yield canonical_walk
@@ -7,7 +7,20 @@ from utils.directory_utils import explore_directory, get_path, remove_dir, zip_f
 from utils.json_handler import convert_float32_to_float
 from utils.exceptions import handle_exception
 from controllers.evaluator_controller import predict_func
-from controllers.embed_controller import embed_func
+from controllers.embed_controller import embed_func, get_embed_variant
+from controllers.estimate_controller import (
+    check_limits,
+    estimate_embed,
+    estimate_evaluate,
+)
+from controllers.job_controller import (
+    cancel_job,
+    get_job_status,
+    run_coalesced,
+    submit_job,
+)
+from controllers.similarity_controller import similar_entities
+from controllers.sweep_controller import sweep_func
 from controllers.ontology_controller import (
     get_onto_stat,
     get_all_ontology,
@@ -15,7 +28,9 @@ from controllers.ontology_controller import (
     extract_data,
 )
 from models.evaluator_model import read_evaluate, read_garbage_metrics
+from models.job_model import list_jobs
 from models.graph_model import load_graph
+from models.sweep_model import list_leaderboards, load_leaderboard
 from models.ontology_model import remove_row_ownership_csv, write_to_ownership_csv
 from models.log_model import configure_logging
 
@@ -23,6 +38,23 @@ from models.log_model import configure_logging
 ontology_blueprint = Blueprint("ontology", __name__)
 # configure the logger
 logger = configure_logging()
+# query parameters of the embed route that are not embedding hyperparameters
+EMBED_RESERVED_ARGS = ("algo", "async")
+
+
+def is_async_request():
+    """Check whether the client asked to run the request as a background job"""
+    return request.args.get("async", "0").lower() in ("1", "true", "yes")
+
+
+def job_submitted_response(job):
+    """Response returned instead of the result when the work runs as a background job"""
+    message = "Attached to identical job" if job["attached"] else "Job submitted"
+    logger.info("{} : {}".format(message, [job["id"], job["operation"]]))
+    return (
+        jsonify({"message": message, "job_id": job["id"], "job": job}),
+        202,
+    )
 
 
 @ontology_blueprint.route("/upload", methods=["POST"])
@@ -88,9 +120,12 @@ def extract(ontology):
         dict: The response message
     """
     try:
+        if is_async_request():
+            return job_submitted_response(submit_job("extract", ontology))
+
         start_time = time.time()
         # Extract data from the ontology file
-        data = extract_data(ontology)
+        data = run_coalesced("extract", extract_data, ontology_name=ontology)
         print(
             "---------------> time usage for extract {}: {} <---------------".format(
                 ontology, time.time() - start_time
@@ -163,33 +198,66 @@ def get_ontology_stat(ontology):
 def embed_route(ontology):
     """Generates the embeddings for the ontology file using the specified algorithm
 
+    Query parameters other than algo and async override the embedding hyperparameters, the
+    resulting model is stored as a variant whose name is returned and can be evaluated like
+    an algorithm.
+
     Args:
         ontology (str): The name of the ontology file
     Returns:
         dict: The response message
     """
+    variant = None
     try:
-        # get the algorithm from the query parameters
+        # get the algorithm and the hyperparameter overrides from the query parameters
         algorithm = request.args.get("algo")
-        print(f"Ontology: {ontology}, Algorithm: {algorithm}")
+        overrides = {
+            name: value
+            for name, value in request.args.items()
+            if name not in EMBED_RESERVED_ARGS
+        }
+        print(f"Ontology: {ontology}, Algorithm: {algorithm}, Overrides: {overrides}")
+
+        if is_async_request():
+            return job_submitted_response(
+                submit_job("embed", ontology, algorithm, overrides=overrides)
+            )
+
+        # a rejected run leaves the model already trained in place
+        check_limits("embed", ontology, algorithm, overrides=overrides)
+        variant = get_embed_variant(algorithm, overrides)[0] if overrides else algorithm
 
         start_time = time.time()
-        result = embed_func(ontology_name=ontology, algorithm=algorithm)
+        result = run_coalesced(
+            "embed",
+            embed_func,
+            ontology_name=ontology,
+            algorithm=algorithm,
+            overrides=overrides,
+        )
         print(
             "---------------> time usage for embed {} with {}: {} <---------------".format(
-                ontology, algorithm, time.time() - start_time
+                ontology, variant, time.time() - start_time
             )
         )
 
-        print(result, f"{algorithm}")
-        logger.info("Embed successful for {}".format([ontology, algorithm]))
+        print(result, f"{variant}")
+        logger.info("Embed successful for {}".format([ontology, variant]))
         return (
-            jsonify({"message": result, "ontology_name": ontology, "algo": algorithm}),
+            jsonify(
+                {
+                    "message": result,
+                    "ontology_name": ontology,
+                    "algo": algorithm,
+                    "variant": variant,
+                }
+            ),
             200,
         )
     except Exception as e:
         logger.error("Embed failed for {}".format([ontology, algorithm]))
-        remove_dir(get_path(ontology, algorithm))
+        if variant is not None:
+            remove_dir(get_path(ontology, variant))
         exception = handle_exception(e)
         return jsonify({"message": exception["message"]}), exception["error_code"]
 
@@ -207,10 +275,26 @@ def predict_route(ontology, algorithm, classifier):
     Returns:
         dict: The response message
     """
+    try:
+        if is_async_request():
+            return job_submitted_response(
+                submit_job("evaluate", ontology, algorithm, classifier)
+            )
+        # a rejected run leaves the previous evaluation in place
+        check_limits("evaluate", ontology, algorithm, classifier=classifier)
+    except Exception as e:
+        exception = handle_exception(e)
+        logger.error("Evaluate failed for {}".format([ontology, algorithm, classifier]))
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
     try:
         start_time = time.time()
-        result = predict_func(
-            ontology_name=ontology, algorithm=algorithm, classifier=classifier
+        result = run_coalesced(
+            "evaluate",
+            predict_func,
+            ontology_name=ontology,
+            algorithm=algorithm,
+            classifier=classifier,
         )
         result = convert_float32_to_float(result)
         print(
@@ -230,6 +314,44 @@ def predict_route(ontology, algorithm, classifier):
         return jsonify({"message": exception["message"]}), exception["error_code"]
 
 
+@ontology_blueprint.route("/estimate/<ontology>/<algorithm>", methods=["GET"])
+def estimate_route(ontology, algorithm):
+    """Estimates the corpus, vocabulary, training time and peak memory of an embedding and
+    the evaluation time of each classifier, without running them
+
+    Query parameters other than classifier override the embedding hyperparameters like on
+    the embed route. The estimate lists the limits of the configuration it exceeds and, when
+    fewer walks would fit them, the parameters suggested instead.
+
+    Args:
+        ontology (str): The name of the ontology file
+        algorithm (str): The name of the algorithm
+    Returns:
+        dict: The response message
+    """
+    try:
+        classifier = request.args.get("classifier")
+        overrides = {
+            name: value for name, value in request.args.items() if name != "classifier"
+        }
+        result = {
+            "message": "estimate successful!",
+            "ontology_name": ontology,
+            "algo": algorithm,
+            "embed": estimate_embed(ontology, algorithm, overrides),
+            "evaluate": estimate_evaluate(
+                ontology, algorithm, classifier, overrides=overrides
+            ),
+        }
+        logger.info("Estimate successful for {}".format([ontology, algorithm]))
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error("Estimate failed for {}".format([ontology, algorithm]))
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
 @ontology_blueprint.route(
     "/evaluate/<ontology>/<algorithm>/<classifier>/stat", methods=["GET"]
 )
@@ -280,6 +402,147 @@ def get_evaluate_stat(ontology, algorithm, classifier):
         return jsonify(result), exception["error_code"]
 
 
+@ontology_blueprint.route("/similar/<ontology>/<algorithm>", methods=["GET", "POST"])
+def similar_route(ontology, algorithm):
+    """Finds the entities most similar to the given entities in the embedding of the ontology
+
+    The entities are given as repeated entity query parameters, or as the "entities" list of
+    a JSON body that may also hold k, kind and approximate.
+
+    Args:
+        ontology (str): The name of the ontology file
+        algorithm (str): The name of the algorithm or model variant
+    Returns:
+        dict: The neighbours of every entity
+    """
+    try:
+        params = request.args.to_dict()
+        entities = request.args.getlist("entity")
+        if request.method == "POST":
+            body = request.get_json(silent=True) or dict()
+            params.update(body)
+            entities = body.get("entities", entities)
+
+        try:
+            k = int(params.get("k", 10))
+        except (TypeError, ValueError):
+            return jsonify({"message": "k must be an integer"}), 400
+        approximate = params.get("approximate")
+        if isinstance(approximate, str):
+            approximate = approximate.lower() in ("1", "true", "yes")
+
+        result = similar_entities(
+            ontology,
+            algorithm,
+            entities,
+            k=k,
+            kind=params.get("kind", "all"),
+            approximate=approximate,
+        )
+        logger.info("Similarity search successful for {}".format([ontology, algorithm]))
+        return (
+            jsonify(
+                {
+                    "message": "similarity search successful!",
+                    "ontology_name": ontology,
+                    "algo": algorithm,
+                    "results": result,
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        logger.error("Similarity search failed for {}".format([ontology, algorithm]))
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route(
+    "/sweep/<ontology>/<algorithm>/<classifier>", methods=["POST"]
+)
+def sweep_route(ontology, algorithm, classifier):
+    """Trains a model variant for every combination of a grid of hyperparameters, evaluates
+    each one with the classifier and returns their leaderboard
+
+    The JSON body holds the grid, the values to try of each embedding hyperparameter.
+
+    Args:
+        ontology (str): The name of the ontology file
+        algorithm (str): The name of the algorithm
+        classifier (str): The name of the classifier
+    Returns:
+        dict: The response message
+    """
+    try:
+        grid = (request.get_json(silent=True) or dict()).get("grid")
+        if is_async_request():
+            return job_submitted_response(
+                submit_job("sweep", ontology, algorithm, classifier, grid=grid)
+            )
+
+        start_time = time.time()
+        result = run_coalesced(
+            "sweep",
+            sweep_func,
+            ontology_name=ontology,
+            algorithm=algorithm,
+            classifier=classifier,
+            grid=grid,
+        )
+        print(
+            "---------------> time usage for sweep {} with {}: {} <---------------".format(
+                ontology, algorithm, time.time() - start_time
+            )
+        )
+        logger.info("Sweep successful for {}".format([ontology, algorithm, classifier]))
+        return jsonify({"message": "sweep successful!", "sweep": result}), 200
+
+    except Exception as e:
+        logger.error("Sweep failed for {}".format([ontology, algorithm, classifier]))
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route("/sweep/<ontology>", methods=["GET"])
+def list_sweeps_route(ontology):
+    """Lists the leaderboards of the sweeps run on the ontology, most recent first
+
+    Args:
+        ontology (str): The name of the ontology file
+    Returns:
+        dict: The response message
+    """
+    try:
+        if not os.path.isdir(get_path(ontology)):
+            return jsonify({"message": f"Ontology not found: {ontology}"}), 404
+        sweeps = list_leaderboards(ontology)
+        return jsonify({"message": "Sweeps listed successfully", "sweeps": sweeps}), 200
+
+    except Exception as e:
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route("/sweep/<ontology>/<sweep_id>", methods=["GET"])
+def get_sweep_route(ontology, sweep_id):
+    """Returns the leaderboard of a sweep
+
+    Args:
+        ontology (str): The name of the ontology file
+        sweep_id (str): The id of the sweep
+    Returns:
+        dict: The response message
+    """
+    try:
+        sweep = load_leaderboard(ontology, sweep_id)
+        return jsonify({"message": "Sweep loaded successfully", "sweep": sweep}), 200
+
+    except Exception as e:
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
 @ontology_blueprint.route("/explore", methods=["GET"])
 def explore_directory_endpoint():
     """Explores the directory and returns its structure as a JSON object
@@ -362,3 +625,87 @@ def delete_file(ontology_name):
         exception = handle_exception(e)
         logger.error("File deletion failed {}".format([ontology_name]))
         return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route("/jobs", methods=["POST"])
+def submit_job_route():
+    """Submits an extract, embed, evaluate or sweep job and returns its id immediately
+
+    The JSON body holds the operation and its arguments: ontology, algorithm, classifier, the
+    embedding hyperparameters to override as parameters and the grid of a sweep.
+
+    Returns:
+        dict: The response message
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        job = submit_job(
+            data.get("operation"),
+            data.get("ontology"),
+            algorithm=data.get("algorithm"),
+            classifier=data.get("classifier"),
+            overrides=data.get("parameters"),
+            grid=data.get("grid"),
+        )
+        return job_submitted_response(job)
+
+    except Exception as e:
+        exception = handle_exception(e)
+        logger.error("Job submission failed : {}".format(str(e)))
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route("/jobs", methods=["GET"])
+def list_jobs_route():
+    """Lists the most recent jobs, optionally filtered by status
+
+    Returns:
+        dict: The response message
+    """
+    try:
+        jobs = list_jobs(
+            status=request.args.get("status"),
+            limit=int(request.args.get("limit", 100)),
+        )
+        return jsonify({"message": "Jobs listed successfully", "jobs": jobs}), 200
+
+    except Exception as e:
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route("/jobs/<job_id>", methods=["GET"])
+def get_job_route(job_id):
+    """Returns the status of a job, and its result once it has finished
+
+    Args:
+        job_id (str): The id of the job
+    Returns:
+        dict: The response message
+    """
+    try:
+        job = get_job_status(job_id)
+        return jsonify({"message": "Job loaded successfully", "job": job}), 200
+
+    except Exception as e:
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
+
+
+@ontology_blueprint.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job_route(job_id):
+    """Cancels a queued or running job
+
+    Args:
+        job_id (str): The id of the job
+    Returns:
+        dict: The response message
+    """
+    try:
+        job = cancel_job(job_id)
+        logger.info("Job cancellation requested : {}".format([job_id]))
+        return jsonify({"message": "Job cancellation requested", "job": job}), 200
+
+    except Exception as e:
+        exception = handle_exception(e)
+        return jsonify({"message": exception["message"]}), exception["error_code"]
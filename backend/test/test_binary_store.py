@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+sys.path.append("../backend")
+from utils.binary_store import atomic_open, load_arrays, save_arrays
+
+
+class TestBinaryStore(unittest.TestCase):
+    """Test cases for binary_store.py"""
+
+    def setUp(self):
+        """Create a temporary folder
+
+        Args:
+            self: TestBinaryStore object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "arrays.bin")
+
+    def tearDown(self):
+        """Remove the temporary folder
+
+        Args:
+            self: TestBinaryStore object
+        Returns:
+            None
+        """
+        self.tmp.cleanup()
+
+    def test_concurrent_writers(self):
+        """Test that writers of the same file never break each other
+
+        Args:
+            self: TestBinaryStore object
+        Returns:
+            None
+        """
+        errors = []
+
+        def write(value):
+            for _ in range(50):
+                try:
+                    save_arrays(
+                        self.path,
+                        {"values": np.full(10000, value, dtype=np.int64)},
+                        {"value": value},
+                    )
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        arrays, meta = load_arrays(self.path, mmap=False)
+        self.assertEqual(set(arrays["values"].tolist()), {meta["value"]})
+        self.assertEqual(os.listdir(self.tmp.name), ["arrays.bin"])
+
+    def test_atomic_open_failure(self):
+        """Test that a failed write keeps the previous file and removes its temporary file
+
+        Args:
+            self: TestBinaryStore object
+        Returns:
+            None
+        """
+        with atomic_open(self.path, "w") as f:
+            f.write("previous")
+
+        with self.assertRaises(ValueError):
+            with atomic_open(self.path, "w") as f:
+                f.write("partial")
+                raise ValueError("failed")
+
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "previous")
+        self.assertEqual(os.listdir(self.tmp.name), ["arrays.bin"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+sys.path.append("../backend")
+from utils.coalesce import _run_across_processes, coalesce
+from utils.exceptions import ModelException
+
+
+class TestCoalesce(unittest.TestCase):
+    """Test cases for coalesce.py"""
+
+    def setUp(self):
+        """Create a temporary lock folder
+
+        Args:
+            self: TestCoalesce object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.lock_folder = os.path.join(self.tmp.name, ".locks")
+
+    def tearDown(self):
+        """Remove the temporary lock folder
+
+        Args:
+            self: TestCoalesce object
+        Returns:
+            None
+        """
+        self.tmp.cleanup()
+
+    def slow(self, value, started):
+        """Return a function signalling its start and returning value a little later"""
+
+        def func():
+            started.set()
+            time.sleep(0.3)
+            return value
+
+        return MagicMock(side_effect=func)
+
+    def test_threads_share_one_run(self):
+        """Test that concurrent threads asking for the same key run the computation once
+
+        Args:
+            self: TestCoalesce object
+        Returns:
+            None
+        """
+        started = threading.Event()
+        func = self.slow("model", started)
+        results = []
+
+        def call():
+            results.append(coalesce(self.lock_folder, "embed:onto", func))
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(results, ["model"] * 4)
+
+        # a later request runs the computation again
+        self.assertEqual(coalesce(self.lock_folder, "embed:onto", func), "model")
+        self.assertEqual(func.call_count, 2)
+
+    def test_waiter_receives_outcome_through_lock_file(self):
+        """Test that a caller blocked on the lock file receives the outcome of the holder
+
+        Args:
+            self: TestCoalesce object
+        Returns:
+            None
+        """
+        started = threading.Event()
+        leader = self.slow("model", started)
+        follower = MagicMock(return_value="other")
+        results = []
+
+        thread = threading.Thread(
+            target=lambda: results.append(
+                _run_across_processes(self.lock_folder, "k", leader, (), {})
+            )
+        )
+        thread.start()
+        started.wait()
+        results.append(_run_across_processes(self.lock_folder, "k", follower, (), {}))
+        thread.join()
+
+        follower.assert_not_called()
+        self.assertEqual(results, ["model", "model"])
+
+    def test_waiter_receives_error(self):
+        """Test that the error of the holder is raised in the callers attached to it
+
+        Args:
+            self: TestCoalesce object
+        Returns:
+            None
+        """
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.3)
+            raise ModelException("Training failed", 422)
+
+        thread = threading.Thread(
+            target=lambda: self.assertRaises(
+                ModelException,
+                _run_across_processes,
+                self.lock_folder,
+                "k",
+                fail,
+                (),
+                {},
+            )
+        )
+        thread.start()
+        started.wait()
+        with self.assertRaises(ModelException) as context:
+            _run_across_processes(self.lock_folder, "k", MagicMock(), (), {})
+        thread.join()
+
+        self.assertEqual(context.exception.message, "Training failed")
+        self.assertEqual(context.exception.error_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
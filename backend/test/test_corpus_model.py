@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.corpus_model import (
+    get_corpus,
+    get_corpus_path,
+    load_corpus,
+    save_corpora,
+    tokenize_lines,
+)
+
+
+class TestCorpusModel(unittest.TestCase):
+    """Test cases for corpus_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder holding extraction files
+
+        Args:
+            self: TestCorpusModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+        os.makedirs(os.path.join(self.tmp.name, "onto"))
+        self.write("axioms", ["http://a SubClassOf http://B", "http://b Type http://C"])
+        self.write("annotations", ["http://a The Cats", "http://b"])
+        self.write("uri_labels", ["http://a cat", "http://b dog house"])
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestCorpusModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def write(self, file, lines):
+        """Write an extraction file of the test ontology
+
+        Args:
+            self: TestCorpusModel object
+            file (str): The name of the extraction file
+            lines (list): The lines
+        Returns:
+            None
+        """
+        path = os.path.join(self.tmp.name, "onto", file + ".txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def test_tokenize_lines(self):
+        """Test that words mode keeps the entity and skips empty lines
+
+        Args:
+            self: TestCorpusModel object
+        Returns:
+            None
+        """
+        self.assertEqual(
+            tokenize_lines(["http://a The Cats", "http://b"], "split"),
+            [["http://a", "The", "Cats"], ["http://b"]],
+        )
+        sentences = tokenize_lines(["http://a The Cats", "", "http://b"], "words")
+        self.assertEqual(
+            [sentence[0] for sentence in sentences], ["http://a", "http://b"]
+        )
+        self.assertEqual(sentences[1], ["http://b"])
+
+    def test_round_trip(self):
+        """Test that saved corpora load back as the tokenized extraction files
+
+        Args:
+            self: TestCorpusModel object
+        Returns:
+            None
+        """
+        save_corpora("onto")
+
+        self.assertEqual(
+            load_corpus("onto", "axioms"),
+            [["http://a", "SubClassOf", "http://B"], ["http://b", "Type", "http://C"]],
+        )
+        self.assertEqual(
+            load_corpus("onto", "axioms", lower=True),
+            [["http://a", "subclassof", "http://b"], ["http://b", "type", "http://c"]],
+        )
+        self.assertEqual(
+            load_corpus("onto", "label_words"),
+            tokenize_lines(["http://a cat", "http://b dog house"], "words"),
+        )
+
+    def test_stale_corpus(self):
+        """Test that a corpus is rebuilt when its extraction file changes
+
+        Args:
+            self: TestCorpusModel object
+        Returns:
+            None
+        """
+        self.assertIsNone(load_corpus("onto", "uri_labels"))
+        get_corpus("onto", "uri_labels")
+        self.assertTrue(os.path.exists(get_corpus_path("onto", "uri_labels")))
+
+        self.write("uri_labels", ["http://c bird"])
+        self.assertIsNone(load_corpus("onto", "uri_labels"))
+        self.assertEqual(get_corpus("onto", "uri_labels"), [["http://c", "bird"]])
+
+        with patch("models.corpus_model.save_corpus") as mock_save_corpus:
+            self.assertEqual(get_corpus("onto", "uri_labels"), [["http://c", "bird"]])
+            mock_save_corpus.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
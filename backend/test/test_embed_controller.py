@@ -7,7 +7,15 @@ from unittest.mock import MagicMock, patch
 from main import create_app
 
 sys.path.append("../backend")
-from controllers.embed_controller import opa2vec_or_onto2vec, owl2vec_star, rdf2vec
+from controllers.embed_controller import (
+    CONFIG_FILE,
+    get_embed_variant,
+    incremental_embed,
+    opa2vec_or_onto2vec,
+    owl2vec_star,
+    rdf2vec,
+)
+from utils.exceptions import ModelException
 
 
 class TestEmbedFunctions(unittest.TestCase):
@@ -33,24 +41,36 @@ class TestEmbedFunctions(unittest.TestCase):
     @patch(
         "controllers.embed_controller.load_multi_input_files",
         return_value={
-            "axioms": ["axiom1", "axiom2"],
             "classes": ["class1", "class2"],
             "individuals": ["individual1", "individual2"],
-            "uri_labels": ["uri1 label1", "uri2 label2 label3"],
-            "annotations": ["uri1 annotation1", "uri2 annotation2"],
         },
     )
+    @patch(
+        "controllers.embed_controller.get_corpus",
+        return_value=[["uri1", "label1"], ["uri2", "label2", "label3"]],
+    )
     @patch("controllers.embed_controller.save_model", return_value=None)
+    @patch("controllers.embed_controller.save_training_curve")
+    @patch("controllers.embed_controller.train_epochs")
     @patch("controllers.embed_controller.gensim.models.Word2Vec")
     def test_opa2vec_or_onto2vec(
-        self, mock_Word2Vec, mock_save_model, mock_load_multi_input_files
+        self,
+        mock_Word2Vec,
+        mock_train_epochs,
+        mock_save_training_curve,
+        mock_save_model,
+        mock_get_corpus,
+        mock_load_multi_input_files,
     ):
         """Test opa2vec_or_onto2vec function in embed_controller.py
 
         Args:
             self: TestEmbedFunctions object
             mock_Word2Vec: MagicMock object
+            mock_train_epochs: MagicMock object
+            mock_save_training_curve: MagicMock object
             mock_save_model: MagicMock object
+            mock_get_corpus: MagicMock object
             mock_load_multi_input_files: MagicMock object
         Returns:
             None
@@ -66,27 +86,45 @@ class TestEmbedFunctions(unittest.TestCase):
 
             self.assertEqual(result, "opa2vec embedded success!!")
             mock_load_multi_input_files.assert_called_once_with(
-                "ontology_name",
-                ["axioms", "classes", "individuals", "uri_labels", "annotations"],
+                "ontology_name", ["classes", "individuals"]
+            )
+            self.assertEqual(
+                [call.args[1] for call in mock_get_corpus.call_args_list],
+                ["axioms", "annotations", "uri_labels"],
+            )
+            self.assertTrue(
+                all(call.kwargs["lower"] for call in mock_get_corpus.call_args_list)
             )
             mock_Word2Vec.assert_called_once()
+            mock_train_epochs.assert_called_once()
+            mock_save_training_curve.assert_called_once_with(
+                "ontology_name",
+                "opa2vec",
+                mock_train_epochs.return_value,
+            )
 
     @patch(
         "controllers.embed_controller.load_multi_input_files",
         return_value={
-            "axioms": ["axiom1", "axiom2"],
             "classes": ["class1", "class2"],
             "individuals": ["individual1", "individual2"],
-            "uri_labels": ["uri1 label1", "uri2 label2 label3"],
-            "annotations": ["uri1 annotation1", "uri2 annotation2"],
         },
     )
+    @patch(
+        "controllers.embed_controller.get_corpus",
+        return_value=[["uri1", "label1"], ["uri2", "label2", "label3"]],
+    )
     @patch("controllers.embed_controller.save_model", return_value=None)
+    @patch("controllers.embed_controller.save_training_curve")
+    @patch("controllers.embed_controller.train_epochs")
     @patch("controllers.embed_controller.gensim.models.Word2Vec")
     def test_owl2vec_star(
         self,
         mock_Word2Vec,
+        mock_train_epochs,
+        mock_save_training_curve,
         mock_save_model,
+        mock_get_corpus,
         mock_load_multi_input_files,
     ):
         """Test owl2vec_star function in embed_controller.py
@@ -94,7 +132,10 @@ class TestEmbedFunctions(unittest.TestCase):
         Args:
             self: TestEmbedFunctions object
             mock_Word2Vec: MagicMock object
+            mock_train_epochs: MagicMock object
+            mock_save_training_curve: MagicMock object
             mock_save_model: MagicMock object
+            mock_get_corpus: MagicMock object
             mock_load_multi_input_files: MagicMock object
         Returns:
             None
@@ -110,10 +151,19 @@ class TestEmbedFunctions(unittest.TestCase):
 
             self.assertEqual(result, "owl2vec-star embedded success!!")
             mock_load_multi_input_files.assert_called_once_with(
-                "ontology_name",
-                ["axioms", "classes", "individuals", "uri_labels", "annotations"],
+                "ontology_name", ["classes", "individuals"]
+            )
+            self.assertEqual(
+                sorted(call.args[1] for call in mock_get_corpus.call_args_list),
+                ["annotation_words", "axioms", "label_words"],
             )
             mock_Word2Vec.assert_called_once()
+            mock_train_epochs.assert_called_once()
+            mock_save_training_curve.assert_called_once_with(
+                "ontology_name",
+                "owl2vec-star",
+                mock_train_epochs.return_value,
+            )
 
     @patch(
         "controllers.embed_controller.load_multi_input_files",
@@ -123,6 +173,7 @@ class TestEmbedFunctions(unittest.TestCase):
         },
     )
     @patch("controllers.embed_controller.save_model", return_value=None)
+    @patch("controllers.embed_controller.get_walk_corpus", return_value=[])
     @patch(
         "controllers.embed_controller.get_rdf2vec_embed",
         return_value=(None, "mock_model"),
@@ -130,6 +181,7 @@ class TestEmbedFunctions(unittest.TestCase):
     def test_rdf2vec(
         self,
         mock_get_rdf2vec_embed,
+        mock_get_walk_corpus,
         mock_save_model,
         mock_load_multi_input_files,
     ):
@@ -138,6 +190,7 @@ class TestEmbedFunctions(unittest.TestCase):
         Args:
             self: TestEmbedFunctions object
             mock_get_rdf2vec_embed: MagicMock object
+            mock_get_walk_corpus: MagicMock object
             mock_save_model: MagicMock object
             mock_load_multi_input_files: MagicMock object
         Returns:
@@ -156,6 +209,106 @@ class TestEmbedFunctions(unittest.TestCase):
                 "ontology_name", ["classes", "individuals"]
             )
             mock_get_rdf2vec_embed.assert_called_once()
+            mock_get_walk_corpus.assert_called_once()
+            self.assertEqual(mock_get_rdf2vec_embed.call_args.kwargs["walks"], [])
+
+    @patch(
+        "controllers.embed_controller.load_multi_input_files",
+        return_value={"classes": ["class1"], "individuals": ["individual1"]},
+    )
+    @patch(
+        "controllers.embed_controller.diff_revisions",
+        return_value={"entities": {"class1"}, "changed_ratio": 0.1},
+    )
+    @patch("controllers.embed_controller.load_previous_model")
+    @patch("controllers.embed_controller.affected_walk_roots", return_value=["class1"])
+    @patch(
+        "controllers.embed_controller.get_walk_corpus",
+        return_value=[["class1", "p", "individual1"]],
+    )
+    @patch("controllers.embed_controller.continue_training")
+    @patch("controllers.embed_controller.save_model")
+    @patch("controllers.embed_controller.save_embedding")
+    def test_incremental_embed_rdf2vec(
+        self,
+        mock_save_embedding,
+        mock_save_model,
+        mock_continue_training,
+        mock_get_walk_corpus,
+        mock_affected_walk_roots,
+        mock_load_previous_model,
+        mock_diff_revisions,
+        mock_load_multi_input_files,
+    ):
+        """Test that an incremental RDF2Vec update saves the walks it trained on
+
+        Args:
+            self: TestEmbedFunctions object
+            mock_save_embedding: MagicMock object
+            mock_save_model: MagicMock object
+            mock_continue_training: MagicMock object
+            mock_get_walk_corpus: MagicMock object
+            mock_affected_walk_roots: MagicMock object
+            mock_load_previous_model: MagicMock object
+            mock_diff_revisions: MagicMock object
+            mock_load_multi_input_files: MagicMock object
+        Returns:
+            None
+        """
+        mock_load_previous_model.return_value.transform.return_value = [[0.0], [1.0]]
+
+        result = incremental_embed("ontology_name", CONFIG_FILE, "rdf2vec")
+
+        self.assertEqual(result, "rdf2vec embedded incrementally success!!")
+        mock_continue_training.assert_called_once()
+        self.assertEqual(
+            mock_save_model.call_args.kwargs["walks"],
+            mock_get_walk_corpus.return_value,
+        )
+
+    def test_get_embed_variant(self):
+        """Test that hyperparameter overrides resolve to a model variant of the algorithm
+
+        Args:
+            self: TestEmbedFunctions object
+        Returns:
+            None
+        """
+        variant, config, config_hash = get_embed_variant("rdf2vec")
+        self.assertEqual(variant, "rdf2vec")
+
+        # overrides equal to the defaults keep the default model
+        same = get_embed_variant(
+            "rdf2vec", {"embed_size": config["BASIC"]["embed_size"]}
+        )
+        self.assertEqual(same[0], "rdf2vec")
+        self.assertEqual(same[2], config_hash)
+
+        variant, config, _ = get_embed_variant(
+            "rdf2vec", {"embed_size": "32", "walk_depth": 4}
+        )
+        self.assertTrue(variant.startswith("rdf2vec@"))
+        self.assertEqual(config["BASIC"]["embed_size"], "32")
+        self.assertEqual(config["MODEL_RDF2VEC"]["walk_depth"], "4")
+        self.assertEqual(
+            get_embed_variant("rdf2vec", {"walk_depth": "4", "embed_size": 32})[0],
+            variant,
+        )
+
+        # every algorithm maps the shared parameter names to its own options
+        _, config, _ = get_embed_variant("onto2vec", {"window": "3"})
+        self.assertEqual(config["MODEL_OPA2VEC_ONTO2VEC"]["windsize"], "3")
+
+        for algorithm, overrides in [
+            ("rdf2vec", {"window": "3"}),
+            ("rdf2vec", {"embed_size": "-1"}),
+            ("rdf2vec", {"walker": "bfs"}),
+            ("rdf2vec", {"unknown": "1"}),
+            ("unknown", {}),
+        ]:
+            with self.assertRaises(ModelException) as context:
+                get_embed_variant(algorithm, overrides)
+            self.assertEqual(context.exception.error_code, 400)
 
 
 if __name__ == "__main__":
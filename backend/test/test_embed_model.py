@@ -1,5 +1,10 @@
+import os
 import sys
+import tempfile
 import unittest
+
+import gensim
+import numpy as np
 from unittest.mock import MagicMock, patch
 from models import embed_model as om
 
@@ -27,6 +32,32 @@ class TestModelFunctions(unittest.TestCase):
         mock_exists.return_value = False
         self.assertFalse(om.isModelExist("ontology", "algorithm"))
 
+    @patch("models.embed_model.get_ontology_hash", return_value="new")
+    @patch("models.embed_model.load_model_meta")
+    def test_isModelCurrent(self, mock_load_model_meta, mock_get_ontology_hash):
+        """Test that isModelCurrent compares the ontology hash saved with the model
+
+        Args:
+            mock_load_model_meta: MagicMock object
+            mock_get_ontology_hash: MagicMock object
+        Returns:
+            None
+        """
+        mock_load_model_meta.return_value = {"ontology_hash": "new"}
+        self.assertTrue(om.isModelCurrent("ontology", "algorithm"))
+
+        mock_load_model_meta.return_value = {"ontology_hash": "old"}
+        self.assertFalse(om.isModelCurrent("ontology", "algorithm"))
+
+        # models saved before metadata existed are kept
+        mock_load_model_meta.return_value = None
+        self.assertTrue(om.isModelCurrent("ontology", "algorithm"))
+
+        # a model trained with another configuration is stale
+        mock_load_model_meta.return_value = {"ontology_hash": "new", "config_hash": "a"}
+        self.assertTrue(om.isModelCurrent("ontology", "algorithm", "a"))
+        self.assertFalse(om.isModelCurrent("ontology", "algorithm", "b"))
+
     @patch("models.embed_model.replace_or_create_folder")
     @patch("models.embed_model.get_path")
     @patch("joblib.dump")
@@ -45,32 +76,59 @@ class TestModelFunctions(unittest.TestCase):
             None
         """
         model = MagicMock()
+        model.walks_ = [["a", "p", "b"]]
         algorithm = "rdf2vec"
+        folder = os.path.join("fake", "path", algorithm)
 
-        mock_get_path.return_value = f"\\fake\\path\\{algorithm}"
+        mock_get_path.return_value = folder
 
         om.save_model("ontology", algorithm, model)
-        mock_joblib_dump.assert_called_once_with(
-            model, f"\\fake\\path\\{algorithm}\\model"
+        mock_joblib_dump.assert_called_once()
+        dumped, path = mock_joblib_dump.call_args.args
+        self.assertEqual(path, os.path.join(folder, "model"))
+        # the walks are not persisted with the model, nor removed from the caller's one
+        self.assertIsNone(dumped.walks_)
+        self.assertEqual(model.walks_, [["a", "p", "b"]])
+        mock_replace_folder.assert_called_once_with(folder)
+
+        # the walks given by the caller are written next to the model
+        model = MagicMock(walks_=None)
+        with patch("models.embed_model.write_walks") as mock_write_walks:
+            om.save_model("ontology", algorithm, model, keep_walks=True, walks=[["a"]])
+        mock_write_walks.assert_called_once_with(
+            os.path.join(folder, "walks.bin"), [["a"]]
         )
-        mock_replace_folder.assert_called_once_with(f"\\fake\\path\\{algorithm}")
 
         mock_joblib_dump.reset_mock()
         mock_replace_folder.reset_mock()
 
         algorithm = "word2vec"
-        mock_get_path.return_value = f"\\fake\\path\\{algorithm}"
+        folder = os.path.join("fake", "path", algorithm)
+        mock_get_path.return_value = folder
 
         om.save_model("ontology", algorithm, model)
-        model.save.assert_called_once_with(f"\\fake\\path\\{algorithm}\\model")
-        mock_replace_folder.assert_called_once_with(f"\\fake\\path\\{algorithm}")
+        model.save.assert_called_once_with(os.path.join(folder, "model"))
+        mock_replace_folder.assert_called_once_with(folder)
+
+        # slim models only keep the word vectors
+        om.save_model("ontology", algorithm, model, model_format="slim")
+        model.wv.save.assert_called_once_with(
+            os.path.join(folder, "model.kv"), separately=["vectors"]
+        )
+        self.assertEqual(model.save.call_count, 1)
 
     @patch("models.embed_model.get_path")
+    @patch("gensim.models.KeyedVectors.load")
     @patch("joblib.load")
     @patch("gensim.models.word2vec.Word2Vec.load")
     @patch("os.path.exists")
     def test_load_model(
-        self, mock_exists, mock_gensim_load, mock_joblib_load, mock_get_path
+        self,
+        mock_exists,
+        mock_gensim_load,
+        mock_joblib_load,
+        mock_kv_load,
+        mock_get_path,
     ):
         """Test load_model function in embed_model.py
 
@@ -78,14 +136,16 @@ class TestModelFunctions(unittest.TestCase):
             mock_exists: MagicMock object
             mock_gensim_load: MagicMock object
             mock_joblib_load: MagicMock object
+            mock_kv_load: MagicMock object
             mock_get_path: MagicMock object
         Returns:
             None
         """
         algorithm = "rdf2vec"
 
-        mock_get_path.return_value = f"\\fake\\path\\{algorithm}\\model"
-        mock_exists.return_value = True
+        mock_get_path.side_effect = lambda _, *args: "\\".join(["\\fake\\path", *args])
+        # a full model and no slim one
+        mock_exists.side_effect = lambda path: not path.endswith("model.kv")
 
         # Call the function under test
         result = om.load_model("ontology", algorithm)
@@ -98,9 +158,6 @@ class TestModelFunctions(unittest.TestCase):
 
         algorithm = "word2vec"
 
-        mock_get_path.return_value = f"\\fake\\path\\{algorithm}\\model"
-        mock_exists.return_value = True
-
         # Call the function under test
         result = om.load_model("ontology", algorithm)
 
@@ -110,12 +167,93 @@ class TestModelFunctions(unittest.TestCase):
             result
         )  # Assuming load_model returns None when model doesn't exist
 
+        # slim models are memory-mapped
+        mock_exists.side_effect = None
+        mock_exists.return_value = True
+        result = om.load_model("ontology", algorithm)
+        mock_kv_load.assert_called_once_with(
+            f"\\fake\\path\\{algorithm}\\model.kv", mmap="r"
+        )
+
         mock_exists.return_value = False
 
         # Test when model doesn't exist
         result = om.load_model("ontology", "rdf2vec")
         self.assertIsNone(result)
 
+    def test_migrate_model(self):
+        """Test that a saved full model is rewritten as a slim one in place
+
+        Args:
+            self: TestModelFunctions object
+        Returns:
+            None
+        """
+        sentences = [["a", "b", "c"], ["b", "c", "d"]] * 10
+        model = gensim.models.Word2Vec(sentences, vector_size=8, min_count=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch(
+                "models.embed_model.get_path",
+                side_effect=lambda _, *args: os.path.join(tmp, *args),
+            ):
+                om.save_model("ontology", "onto2vec", model)
+                open(os.path.join(tmp, "onto2vec", "embeddings.npy"), "w").close()
+
+                before, after = om.migrate_model("ontology", "onto2vec", "slim")
+
+                self.assertLess(after, before)
+                self.assertEqual(
+                    sorted(os.listdir(os.path.join(tmp, "onto2vec"))),
+                    ["embeddings.npy", "model.kv", "model.kv.vectors.npy"],
+                )
+                kv = om.load_model("ontology", "onto2vec")
+                np.testing.assert_array_equal(kv["a"], model.wv["a"])
+
+                # slim models have nothing left to migrate
+                self.assertIsNone(om.migrate_model("ontology", "onto2vec", "slim"))
+
+    @patch("models.embed_model.load_multi_input_files")
+    @patch("models.embed_model.isModelExist", return_value=True)
+    @patch("models.embed_model.get_path")
+    def test_save_and_load_embedding(
+        self, mock_get_path, mock_isModelExist, mock_load_multi_input_files
+    ):
+        """Test that embeddings are stored as float32 and memory-mapped back without the extraction files
+
+        Args:
+            mock_get_path: MagicMock object
+            mock_isModelExist: MagicMock object
+            mock_load_multi_input_files: MagicMock object
+        Returns:
+            None
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            mock_get_path.side_effect = lambda _, *args: os.path.join(tmp, *args[1:])
+            embed = np.arange(12, dtype=np.float64).reshape(4, 3)
+
+            om.save_embedding("onto", "algo", embed, ["c1", "c2", "c3"], ["i1"])
+            classes_e, individuals_e = om.load_embedding_value("onto", "algo")
+
+            self.assertIsInstance(classes_e, np.memmap)
+            self.assertEqual(classes_e.dtype, np.float32)
+            np.testing.assert_array_equal(classes_e, embed[:3])
+            np.testing.assert_array_equal(individuals_e, embed[3:])
+            mock_load_multi_input_files.assert_not_called()
+            self.assertEqual(
+                om.load_embedding_entities("onto", "algo").tolist(),
+                ["c1", "c2", "c3", "i1"],
+            )
+            self.assertEqual(om.load_embedding_meta("onto", "algo")["n_classes"], 3)
+
+            om.save_embedding(
+                "onto", "algo", embed, ["c1"], ["i1", "i2", "i3"], "float16"
+            )
+            self.assertEqual(om.load_embedding_meta("onto", "algo")["dtype"], "float16")
+            self.assertEqual(len(om.load_embedding_value("onto", "algo")[1]), 3)
+
+            with self.assertRaises(Exception):
+                om.save_embedding("onto", "algo", embed, ["c1"], [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,266 @@
+import configparser
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from controllers.embed_controller import (
+    CONFIG_FILE,
+    get_embed_config,
+    get_word2vec_documents,
+)
+from controllers.estimate_controller import (
+    check_limits,
+    count_walks,
+    estimate_embed,
+    estimate_evaluate,
+    walk_statistics,
+)
+from owl2vec_star.rdf2vec.graph import CSRKnowledgeGraph
+from owl2vec_star.rdf2vec.walkers.random import RandomWalker
+from owl2vec_star.rdf2vec.walkers.weisfeiler_lehman import WeisfeilerLehmanWalker
+from utils.exceptions import ModelException
+
+
+class TestEstimateController(unittest.TestCase):
+    """Test cases for estimate_controller.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder holding an extracted
+        ontology and its knowledge graph
+
+        Args:
+            self: TestEstimateController object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+        rng = random.Random(0)
+        self.classes = ["http://c%d" % i for i in range(20)]
+        self.individuals = ["http://i%d" % i for i in range(5)]
+        predicates = ["http://p%d" % i for i in range(3)]
+        entities = self.classes + self.individuals
+        triples = {
+            (rng.choice(entities), rng.choice(predicates), rng.choice(entities))
+            for _ in range(60)
+        }
+        self.kg = CSRKnowledgeGraph.from_triples(sorted(triples))
+
+        os.makedirs(os.path.join(self.tmp.name, "onto"))
+        self.write(
+            "onto.owl",
+            ['<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/>'],
+        )
+        self.write("classes.txt", self.classes)
+        self.write("individuals.txt", self.individuals)
+        self.write(
+            "axioms.txt",
+            ["http://c%d SubClassOf http://c%d" % (i, i + 1) for i in range(10)],
+        )
+        self.write("annotations.txt", ["http://c0 A Class", "http://c1 Another"])
+        self.write("uri_labels.txt", ["http://c0 first class", "http://c1 second"])
+        self.write("train-infer-0.csv", ["http://c0,http://c1,1"] * 40)
+        self.write("test.csv", ["http://c0,http://c1"] * 8)
+
+        self.config_file = os.path.join(self.tmp.name, "default.cfg")
+        self.set_config()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestEstimateController object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def write(self, file, lines):
+        """Write a file of the test ontology
+
+        Args:
+            self: TestEstimateController object
+            file (str): The name of the file
+            lines (list): The lines
+        Returns:
+            None
+        """
+        with open(os.path.join(self.tmp.name, "onto", file), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def set_config(self, **options):
+        """Write the default configuration with some options changed
+
+        Args:
+            self: TestEstimateController object
+            **options: The new values, keyed by section and option joined by a dot
+        Returns:
+            None
+        """
+        config = configparser.ConfigParser()
+        config.read(CONFIG_FILE)
+        for name, value in options.items():
+            section, option = name.split(".")
+            config[section][option] = str(value)
+        with open(self.config_file, "w") as f:
+            config.write(f)
+
+    def test_walk_statistics(self):
+        """Test that the walks are counted like the walkers extract them
+
+        Args:
+            self: TestEstimateController object
+        Returns:
+            None
+        """
+        entities = self.classes + ["http://missing"]
+        for depth in (1, 2, 3, 4):
+            statistics = walk_statistics(self.kg, entities, depth)
+
+            walks = list(RandomWalker(depth, float("inf")).extract(self.kg, entities))
+            self.assertEqual(
+                count_walks(statistics),
+                {
+                    "walks": len(walks),
+                    "tokens": sum(len(walk) for walk in walks),
+                    "squares": sum(len(walk) ** 2 for walk in walks),
+                },
+            )
+
+            walker = WeisfeilerLehmanWalker(depth, float("inf"))
+            walks = list(walker.extract(self.kg, entities))
+            self.assertEqual(
+                count_walks(statistics, wl_iterations=walker.wl_iterations)["walks"],
+                len(walks),
+            )
+
+            walks = list(RandomWalker(depth, 2, seed=0).extract(self.kg, entities))
+            self.assertGreaterEqual(count_walks(statistics, 2)["walks"], len(walks))
+
+    def test_estimate_embed(self):
+        """Test that the estimated corpus matches the documents the embedding would build
+
+        Args:
+            self: TestEstimateController object
+        Returns:
+            None
+        """
+        self.set_config(
+            **{
+                "DOCUMENT_OWL2VECSTAR.Lit_Doc": "no",
+                "DOCUMENT_OWL2VECSTAR.Mix_Doc": "no",
+            }
+        )
+        with patch(
+            "controllers.embed_controller.get_knowledge_graph", return_value=self.kg
+        ), patch(
+            "controllers.estimate_controller.get_knowledge_graph", return_value=self.kg
+        ):
+            for algorithm in ("owl2vec-star", "opa2vec"):
+                config = get_embed_config(self.config_file, algorithm)
+                sentences = get_word2vec_documents(
+                    "onto", config, algorithm, self.classes + self.individuals
+                )
+                estimate = estimate_embed(
+                    "onto", algorithm, config_file=self.config_file
+                )
+
+                self.assertEqual(estimate["corpus"]["sentences"], len(sentences))
+                self.assertEqual(estimate["corpus"]["tokens"], sum(map(len, sentences)))
+                self.assertEqual(estimate["exceeded_limits"], [])
+                self.assertGreater(estimate["peak_rss_mb"], 0)
+            self.assertEqual(
+                estimate["corpus"]["vocabulary"],
+                len({word for sentence in sentences for word in sentence}),
+            )
+
+        with self.assertRaises(ModelException) as context:
+            estimate_embed("missing", "opa2vec", config_file=self.config_file)
+        self.assertEqual(context.exception.error_code, 404)
+
+    @patch("controllers.estimate_controller.get_knowledge_graph")
+    def test_check_limits(self, mock_get_knowledge_graph):
+        """Test that runs over the limits are rejected with parameters that fit them
+
+        Args:
+            self: TestEstimateController object
+            mock_get_knowledge_graph: MagicMock object
+        Returns:
+            None
+        """
+        mock_get_knowledge_graph.return_value = self.kg
+        self.assertIsNone(
+            check_limits("embed", "onto", "rdf2vec", config_file=self.config_file)
+        )
+        mock_get_knowledge_graph.assert_not_called()
+
+        full = estimate_embed("onto", "rdf2vec", config_file=self.config_file)
+        limit = full["corpus"]["tokens"] // 2
+        self.set_config(**{"LIMITS.max_tokens": limit})
+        with self.assertRaises(ModelException) as context:
+            check_limits("embed", "onto", "rdf2vec", config_file=self.config_file)
+        self.assertEqual(context.exception.error_code, 413)
+        self.assertIn("walks_per_entity", str(context.exception))
+
+        suggested = estimate_embed("onto", "rdf2vec", config_file=self.config_file)[
+            "suggested_overrides"
+        ]
+        downsized = check_limits(
+            "embed",
+            "onto",
+            "rdf2vec",
+            overrides=suggested,
+            config_file=self.config_file,
+        )
+        self.assertLessEqual(downsized["corpus"]["tokens"], limit)
+
+    def test_estimate_evaluate(self):
+        """Test that evaluation is estimated from the samples and the classes
+
+        Args:
+            self: TestEstimateController object
+        Returns:
+            None
+        """
+        estimate = estimate_evaluate("onto", "opa2vec", config_file=self.config_file)
+        self.assertEqual(estimate["train_samples"], 40)
+        self.assertEqual(estimate["test_samples"], 8)
+        self.assertEqual(estimate["classes"], 20)
+        self.assertEqual(estimate["features"], 200)
+        self.assertEqual(len(estimate["classifiers"]), 7)
+
+        estimate = estimate_evaluate(
+            "onto",
+            "opa2vec",
+            "svm",
+            overrides={"embed_size": 10},
+            config_file=self.config_file,
+        )
+        self.assertEqual(list(estimate["classifiers"]), ["svm"])
+        self.assertEqual(estimate["features"], 20)
+
+        self.set_config(**{"LIMITS.max_rss_mb": 1})
+        with self.assertRaises(ModelException) as context:
+            check_limits(
+                "evaluate", "onto", "opa2vec", "svm", config_file=self.config_file
+            )
+        self.assertEqual(context.exception.error_code, 413)
+
+        with self.assertRaises(ModelException) as context:
+            estimate_evaluate("onto", "opa2vec", "knn", config_file=self.config_file)
+        self.assertEqual(context.exception.error_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
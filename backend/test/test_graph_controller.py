@@ -3,13 +3,19 @@ import sys
 import unittest
 from unittest import mock
 from unittest.mock import MagicMock, Mock, mock_open, patch
-from owlready2 import World
+import numpy as np
 
 # Assuming the module is named 'controllers.graph_controller'
 sys.path.append("../backend")
 import controllers.graph_controller as gm
+from models.hierarchy_model import THING_IRI, Hierarchy
+from utils.binary_store import StringTable
 import pandas as pd
 
+# graph_controller imports these on first use, load them before builtins.open is patched
+import matplotlib.pyplot
+import networkx
+
 
 class TestGraphModule(unittest.TestCase):
     """Test cases for graph_controller.py"""
@@ -41,104 +47,70 @@ class TestGraphModule(unittest.TestCase):
         self.assertEqual(truth_list, ["True1", "True2"])
         self.assertEqual(predict_list, ["Pred1", "Pred2"])
 
-    def test_get_prefix(self):
-        """Test get_prefix function in graph_controller.py
-        Args:
-            self: TestGraphModule object
-        Returns:
-            None
-        """
-        value_with_hash = "http://example.com#Entity"
-        value_with_slash = "http://example.com/Entity"
-
-        self.assertEqual(gm.get_prefix(value_with_hash), "http://example.com#")
-        self.assertEqual(gm.get_prefix(value_with_slash), "http://example.com/")
-
-    @patch("controllers.graph_controller.World")
-    @patch("controllers.graph_controller.nx.nx_pydot.graphviz_layout")
-    @patch("controllers.graph_controller.nx.draw")
-    @patch("controllers.graph_controller.replace_or_create_folder")
     @patch("controllers.graph_controller.find_parents_with_relations")
-    @patch("controllers.graph_controller.plt.savefig")
     @patch("builtins.open", new_callable=mock_open)
-    def test_graph_maker(
-        self,
-        mock_open,
-        mock_savefig,
-        mock_find_parents_with_relations,
-        mock_replace_or_create_folder,
-        mock_draw,
-        mock_layout,
-        mock_World,
-    ):
+    def test_graph_maker(self, mock_open, mock_find_parents_with_relations):
         """Test graph_maker function in graph_controller.py
 
         Args:
             mock_open: MagicMock object
-            mock_savefig: MagicMock object
             mock_find_parents_with_relations: MagicMock object
-            mock_replace_or_create_folder: MagicMock object
-            mock_draw: MagicMock object
-            mock_layout: MagicMock object
-            mock_World: MagicMock object
         Returns:
             None
         """
-        mock_layout.return_value = {
-            "Ind1": (0, 0),
-            "True1": (1, 1),
-            "Pred1": (3, 3),
-            "owl.Thing": (4, 4),
-        }
-        mock_replace_or_create_folder.return_value = None
         mock_find_parents_with_relations.return_value = [
             ["Ind1", "relation", "True1"],
             ["True1", "relation", "Pred1"],
             ["Pred1", "relation", "owl.Thing"],
         ]
-        fig_directory = "fig_directory"
-
-        entity_prefix = "http://example.com#"
-        class_individual_list = ["Ind1"]
-        truth_list = ["True1"]
-        predict_list = ["Pred1"]
-
-        mock_world_instance = MagicMock()
-        mock_World.return_value = mock_world_instance
-        mock_ontology_instance = MagicMock()
-        mock_world_instance.get_ontology.return_value = mock_ontology_instance
-        mock_ontology_instance.load.return_value = mock_ontology_instance
-        mock_ontology = MagicMock()
-
-        mock_ontology.search.return_value = [MagicMock()]
+        hierarchy = Hierarchy(
+            StringTable.from_strings(
+                [THING_IRI, "http://example.com#True1", "http://example.com#Ind1"]
+            ),
+            2,
+            np.array([0, 1], dtype=np.int32),
+            np.array([0, 0, 1, 2], dtype=np.int64),
+        )
 
-        # Mock the search results for the ontology
-        def mock_search(iri):
-            entity = MagicMock()
-            entity.INDIRECT_is_a = ["owl.Thing"]
-            return [entity]
+        gm.graph_maker(
+            onto_type="tbox",
+            hierarchy=hierarchy,
+            entity_prefix="http://example.com#",
+            class_individual_list=["Ind1"],
+            truth_list=["True1"],
+            predict_list=["Pred1"],
+            fig_directory="fig_directory",
+        )
+        mock_find_parents_with_relations.assert_called_once_with(hierarchy, 2)
+        mock_open.assert_called_with(os.path.join("fig_directory", "graph_0.dot"), "w")
 
-        mock_ontology.search.side_effect = mock_search
+        # individuals are drawn below the chain of their ancestors
+        gm.graph_maker(
+            onto_type="abox",
+            hierarchy=hierarchy,
+            entity_prefix="http://example.com#",
+            class_individual_list=["Ind1"],
+            truth_list=["True1"],
+            predict_list=["Pred1"],
+            fig_directory="fig_directory",
+        )
+        dot_string = mock_open().write.call_args[0][0]
+        self.assertIn('"True1" -> "owl.Thing" [label="subclassOf"]', dot_string)
+        self.assertIn('"Ind1" -> "True1" [label="isA"]', dot_string)
 
-        with patch(
-            "controllers.graph_controller.get_ontology", return_value=mock_ontology
-        ):
+        with self.assertRaises(gm.GraphException):
             gm.graph_maker(
-                onto_type="tbox",
-                onto_file=mock_ontology,
-                entity_prefix=entity_prefix,
-                entity_split=".",
-                class_individual_list=class_individual_list,
-                truth_list=truth_list,
-                predict_list=predict_list,
-                fig_directory=fig_directory,
+                "tbox",
+                hierarchy,
+                "http://example.com#",
+                ["Missing"],
+                ["True1"],
+                ["Pred1"],
+                "fig_directory",
             )
-        mock_open.assert_called_with(os.path.join("fig_directory", "graph_0.dot"), "w")
 
-    @patch("controllers.graph_controller.coverage_class")
-    @patch("controllers.graph_controller.World")
-    @patch("controllers.graph_controller.load_multi_input_files")
-    @patch("controllers.graph_controller.get_prefix")
+    @patch("controllers.graph_controller.get_manifest")
+    @patch("controllers.graph_controller.get_hierarchy")
     @patch("controllers.graph_controller.graph_maker", return_value=None)
     @patch("controllers.graph_controller.read_garbage_metrics_pd")
     @patch("controllers.graph_controller.extract_garbage_value")
@@ -153,10 +125,8 @@ class TestGraphModule(unittest.TestCase):
         mock_extract_garbage_value,
         mock_read_garbage_metrics_pd,
         mock_graph_maker,
-        mock_get_prefix,
-        mock_load_multi_input_files,
-        mock_world,
-        mock_coverage_class,
+        mock_get_hierarchy,
+        mock_get_manifest,
     ):
         """Test create_graph function in graph_controller.py
 
@@ -167,10 +137,8 @@ class TestGraphModule(unittest.TestCase):
             mock_extract_garbage_value: MagicMock object
             mock_read_garbage_metrics_pd: MagicMock object
             mock_graph_maker: MagicMock object
-            mock_get_prefix: MagicMock object
-            mock_load_multi_input_files: MagicMock object
-            mock_world: MagicMock object
-            mock_coverage_class: MagicMock object
+            mock_get_hierarchy: MagicMock object
+            mock_get_manifest: MagicMock object
         Returns:
             None
         """
@@ -180,20 +148,17 @@ class TestGraphModule(unittest.TestCase):
         classifier = "test_classifier"
 
         # Mock return values for the dependencies
-        mock_load_multi_input_files.return_value = {
-            "individuals": ["http://example.com#Ind1", "http://example.com#Ind2"],
-            "classes": ["http://example.com#Class1", "http://example.com#Class2"],
+        mock_get_manifest.return_value = {
+            "onto_type": "abox",
+            "prefixes": {
+                "classes": "http://example.com/classes#",
+                "individuals": "http://example.com#",
+            },
         }
 
-        mock_get_prefix.return_value = "http://example.com#"
-        mock_coverage_class.return_value = 20
-
         # Mock ontology and graph data
-        mock_ontology = Mock()
-        mock_world.return_value.get_ontology.return_value.load.return_value = (
-            mock_ontology
-        )
-        mock_ontology.search.return_value = ["mock_search_result"]
+        mock_hierarchy = Mock()
+        mock_get_hierarchy.return_value = mock_hierarchy
 
         mock_read_garbage_metrics_pd.return_value = "mock_garbage_metrics_data"
         mock_extract_garbage_value.return_value = (
@@ -223,21 +188,16 @@ class TestGraphModule(unittest.TestCase):
             "\\fake\\path\\test_algo\\test_classifier\\graph_fig"
         )
 
-        mock_load_multi_input_files.assert_called_once_with(
-            ontology_name, ["individuals", "classes"]
-        )
-        mock_world.return_value.get_ontology.assert_called_once_with(
-            "\\fake\\path\\ontology.owl"
-        )
+        mock_get_manifest.assert_called_once_with(ontology_name)
+        mock_get_hierarchy.assert_called_once_with(ontology_name)
         mock_read_garbage_metrics_pd.assert_called_once_with(
             ontology_name, algorithm, classifier
         )
         mock_extract_garbage_value.assert_called_once_with("mock_garbage_metrics_data")
         mock_graph_maker.assert_called_once_with(
             "abox",
-            mock_ontology,
+            mock_hierarchy,
             "http://example.com#",
-            ".",
             ["Ind1", "Ind2"],
             ["True1", "True2"],
             ["Pred1", "Pred2"],
@@ -0,0 +1,179 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from flask import Flask
+
+sys.path.append("../backend")
+from controllers.graph_controller import find_parents_with_relations
+from models.hierarchy_model import (
+    THING_NAME,
+    build_closure,
+    get_hierarchy,
+    load_hierarchy,
+    save_hierarchy,
+)
+from models.session_model import OntologySession
+
+ONTOLOGY = """<?xml version="1.0"?>
+<rdf:RDF xmlns="http://test.org/onto#"
+     xml:base="http://test.org/onto"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#">
+    <owl:Ontology rdf:about="http://test.org/onto"/>
+    <owl:ObjectProperty rdf:about="http://test.org/onto#hasOwner"/>
+    <owl:Class rdf:about="http://test.org/onto#Animal"/>
+    <owl:Class rdf:about="http://test.org/onto#Person"/>
+    <owl:Class rdf:about="http://test.org/onto#Dog">
+        <rdfs:subClassOf rdf:resource="http://test.org/onto#Animal"/>
+    </owl:Class>
+    <owl:Class rdf:about="http://test.org/onto#Puppy">
+        <rdfs:subClassOf rdf:resource="http://test.org/onto#Dog"/>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://test.org/onto#hasOwner"/>
+                <owl:someValuesFrom rdf:resource="http://test.org/onto#Person"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+    </owl:Class>
+    <owl:NamedIndividual rdf:about="http://test.org/onto#rex">
+        <rdf:type rdf:resource="http://test.org/onto#Puppy"/>
+    </owl:NamedIndividual>
+</rdf:RDF>
+"""
+
+
+class TestHierarchyModel(unittest.TestCase):
+    """Test cases for hierarchy_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder holding an ontology
+
+        Args:
+            self: TestHierarchyModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+        os.makedirs(os.path.join(self.tmp.name, "onto"))
+        with open(os.path.join(self.tmp.name, "onto", "onto.owl"), "w") as f:
+            f.write(ONTOLOGY)
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestHierarchyModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_save_hierarchy(self):
+        """Test that the saved hierarchy keeps the named parents and types of the ontology
+
+        Args:
+            self: TestHierarchyModel object
+        Returns:
+            None
+        """
+        self.assertIsNone(load_hierarchy("onto"))
+        with OntologySession("onto") as session:
+            save_hierarchy("onto", session.onto)
+
+        hierarchy = load_hierarchy("onto")
+        self.assertEqual(hierarchy.n_classes, 5)
+        self.assertEqual(len(hierarchy), 6)
+        puppy = hierarchy.index("http://test.org/onto#Puppy")
+        rex = hierarchy.index("http://test.org/onto#rex")
+        self.assertIsNone(hierarchy.index("http://test.org/onto#Cat"))
+        self.assertTrue(hierarchy.is_individual(rex))
+        self.assertFalse(hierarchy.is_individual(puppy))
+
+        self.assertEqual(hierarchy.parents(rex), [puppy])
+        self.assertEqual(
+            [hierarchy.name(i) for i in hierarchy.inferred(rex)], ["Animal", "Dog"]
+        )
+        self.assertEqual([hierarchy.name(i) for i in hierarchy.parents(puppy)], ["Dog"])
+        self.assertEqual(
+            sorted(hierarchy.name(i) for i in hierarchy.ancestors(rex)),
+            sorted(["Puppy", "Dog", "Animal", THING_NAME]),
+        )
+        self.assertEqual(
+            find_parents_with_relations(hierarchy, puppy),
+            [
+                ["Puppy", "subclassOf", "Dog"],
+                ["Dog", "subclassOf", "Animal"],
+                ["Animal", "subclassOf", THING_NAME],
+            ],
+        )
+
+        # a new upload of the ontology makes the hierarchy stale
+        with open(os.path.join(self.tmp.name, "onto", "onto.owl"), "a") as f:
+            f.write("\n")
+        self.assertIsNone(load_hierarchy("onto"))
+
+    def test_build_closure(self):
+        """Test that the ancestors follow every path of a diamond and of a cycle
+
+        Args:
+            self: TestHierarchyModel object
+        Returns:
+            None
+        """
+        # A below owl:Thing, B and C below A, D below B and C, E and F on a cycle below D,
+        # then an individual of D
+        parents = [[], [0], [1], [1], [2, 3], [6], [5, 4], [4]]
+        ancestor_ids, ancestor_offsets = build_closure(
+            7,
+            np.asarray([p for entity in parents for p in entity], dtype=np.int32),
+            np.cumsum([0] + [len(entity) for entity in parents]),
+        )
+        ancestors = [
+            ancestor_ids[ancestor_offsets[i] : ancestor_offsets[i + 1]].tolist()
+            for i in range(len(parents))
+        ]
+        self.assertEqual(
+            ancestors,
+            [
+                [],
+                [0],
+                [0, 1],
+                [0, 1],
+                [0, 1, 2, 3],
+                [0, 1, 2, 3, 4, 6],
+                [0, 1, 2, 3, 4, 5],
+                [0, 1, 2, 3, 4],
+            ],
+        )
+
+    @patch("models.session_model.owlready2.sync_reasoner")
+    def test_get_hierarchy(self, mock_sync_reasoner):
+        """Test that the reasoner only runs for an ontology extracted without a hierarchy
+
+        Args:
+            self: TestHierarchyModel object
+            mock_sync_reasoner: MagicMock object
+        Returns:
+            None
+        """
+        hierarchy = get_hierarchy("onto")
+        self.assertEqual(len(hierarchy), 6)
+        mock_sync_reasoner.assert_called_once()
+
+        self.assertEqual(len(get_hierarchy("onto")), 6)
+        mock_sync_reasoner.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,310 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from controllers.job_controller import (
+    JobDispatcher,
+    cancel_job,
+    get_dispatcher,
+    run_job,
+    submit_job,
+)
+from models.job_model import (
+    claim_next_job,
+    create_job,
+    finish_job,
+    get_job,
+    set_job_pid,
+)
+from utils.exceptions import JobException, ModelException
+
+
+class TestJobController(unittest.TestCase):
+    """Test cases for job_controller.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder
+
+        Args:
+            self: TestJobController object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.app = Flask(__name__)
+        self.app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestJobController object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    @patch("controllers.job_controller.get_dispatcher")
+    def test_submit_job(self, mock_get_dispatcher):
+        """Test that a job keeps only the arguments of its operation and wakes the dispatcher
+
+        Args:
+            self: TestJobController object
+            mock_get_dispatcher: MagicMock object
+        Returns:
+            None
+        """
+        job = submit_job("embed", "onto", algorithm="rdf2vec", classifier="svm")
+
+        self.assertEqual(job["status"], "queued")
+        self.assertEqual(
+            job["params"], {"ontology_name": "onto", "algorithm": "rdf2vec"}
+        )
+        self.assertFalse(job["attached"])
+        mock_get_dispatcher.return_value.wake.assert_called_once()
+
+        # an identical submission attaches to the active job
+        again = submit_job("embed", "onto", algorithm="rdf2vec")
+        self.assertEqual(again["id"], job["id"])
+        self.assertTrue(again["attached"])
+        mock_get_dispatcher.return_value.wake.assert_called_once()
+
+        other = submit_job("embed", "onto", algorithm="onto2vec")
+        self.assertNotEqual(other["id"], job["id"])
+
+    @patch("controllers.job_controller.get_dispatcher")
+    def test_submit_job_invalid(self, mock_get_dispatcher):
+        """Test that unknown operations and missing arguments are rejected
+
+        Args:
+            self: TestJobController object
+            mock_get_dispatcher: MagicMock object
+        Returns:
+            None
+        """
+        with self.assertRaises(JobException) as context:
+            submit_job("train", "onto")
+        self.assertEqual(context.exception.error_code, 400)
+
+        with self.assertRaises(JobException) as context:
+            submit_job("evaluate", "onto", algorithm="rdf2vec")
+        self.assertEqual(context.exception.error_code, 400)
+        self.assertIn("classifier", context.exception.message)
+
+        with self.assertRaises(JobException) as context:
+            submit_job("sweep", "onto", algorithm="opa2vec", classifier="svm")
+        self.assertIn("grid", context.exception.message)
+
+        with self.assertRaises(ModelException) as context:
+            submit_job("sweep", "onto", "rdf2vec", "svm", grid={"embed_size": [10, 20]})
+        self.assertEqual(context.exception.error_code, 400)
+
+        mock_get_dispatcher.assert_not_called()
+
+    @patch("controllers.job_controller.get_operation")
+    def test_run_job(self, mock_get_operation):
+        """Test that a worker stores the result of a successful job
+
+        Args:
+            self: TestJobController object
+            mock_get_operation: MagicMock object
+        Returns:
+            None
+        """
+        mock_get_operation.return_value = MagicMock(return_value={"mrr": 0.25})
+        job = create_job("extract", {"ontology_name": "onto"})
+        claim_next_job()
+
+        run_job(self.tmp.name, job["id"])
+
+        mock_get_operation.return_value.assert_called_once_with(ontology_name="onto")
+        job = get_job(job["id"])
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["result"], {"mrr": 0.25})
+
+    @patch("controllers.job_controller.remove_dir")
+    @patch("controllers.job_controller.get_operation")
+    def test_run_job_failure(self, mock_get_operation, mock_remove_dir):
+        """Test that a failed job stores its error and removes its partial output
+
+        Args:
+            self: TestJobController object
+            mock_get_operation: MagicMock object
+            mock_remove_dir: MagicMock object
+        Returns:
+            None
+        """
+        mock_get_operation.return_value = MagicMock(
+            side_effect=JobException("Boom", 418)
+        )
+        job = create_job("embed", {"ontology_name": "onto", "algorithm": "rdf2vec"})
+        claim_next_job()
+
+        run_job(self.tmp.name, job["id"])
+
+        job = get_job(job["id"])
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "Boom")
+        self.assertEqual(job["error_code"], 418)
+        mock_remove_dir.assert_called_once()
+
+    def test_cancel_job_not_found(self):
+        """Test that cancelling an unknown job raises a 404
+
+        Args:
+            self: TestJobController object
+        Returns:
+            None
+        """
+        with self.assertRaises(JobException) as context:
+            cancel_job("missing")
+        self.assertEqual(context.exception.error_code, 404)
+
+    def worker(self, alive=True, exitcode=None):
+        """Build a worker process stand-in
+
+        Args:
+            self: TestJobController object
+            alive (bool): Whether the worker is running
+            exitcode (int): The exit code of the worker once it stopped
+        Returns:
+            MagicMock: The worker, terminate stops it with exit code -15
+        """
+        process = MagicMock(pid=os.getpid(), exitcode=exitcode)
+        process.is_alive.return_value = alive
+
+        def terminate():
+            process.is_alive.return_value = False
+            process.exitcode = -15
+
+        process.terminate.side_effect = terminate
+        return process
+
+    @patch("controllers.job_controller.get_dispatcher")
+    def test_cancel_running_job(self, mock_get_dispatcher):
+        """Test that cancelling a running embed job terminates it and removes its folder
+
+        Args:
+            self: TestJobController object
+            mock_get_dispatcher: MagicMock object
+        Returns:
+            None
+        """
+        job = create_job("embed", {"ontology_name": "onto", "algorithm": "rdf2vec"})
+        claim_next_job()
+        folder = os.path.join(self.tmp.name, "onto", "rdf2vec")
+        os.makedirs(folder)
+        with open(os.path.join(folder, "model"), "w") as f:
+            f.write("partial")
+
+        dispatcher = JobDispatcher(self.app, workers=0, poll_interval=1)
+        process = self.worker()
+        dispatcher.processes[job["id"]] = process
+
+        self.assertEqual(cancel_job(job["id"])["status"], "cancelling")
+        mock_get_dispatcher.return_value.wake.assert_called_once()
+        dispatcher.dispatch()
+        process.terminate.assert_called_once()
+        dispatcher.dispatch()
+
+        self.assertEqual(get_job(job["id"])["status"], "cancelled")
+        self.assertFalse(os.path.exists(folder))
+        self.assertEqual(dispatcher.processes, {})
+
+    def test_dead_worker(self):
+        """Test that the job of a crashed worker fails and its folder is removed, unlike
+        the output of a job its worker finished
+
+        Args:
+            self: TestJobController object
+        Returns:
+            None
+        """
+        crashed = create_job("embed", {"ontology_name": "onto", "algorithm": "rdf2vec"})
+        claim_next_job()
+        done = create_job("embed", {"ontology_name": "onto", "algorithm": "opa2vec"})
+        claim_next_job()
+        finish_job(done["id"], "succeeded", result="done")
+        for variant in ("rdf2vec", "opa2vec"):
+            os.makedirs(os.path.join(self.tmp.name, "onto", variant))
+
+        dispatcher = JobDispatcher(self.app, workers=0, poll_interval=1)
+        dispatcher.processes[crashed["id"]] = self.worker(alive=False, exitcode=1)
+        dispatcher.processes[done["id"]] = self.worker(alive=False, exitcode=1)
+        dispatcher.dispatch()
+
+        crashed = get_job(crashed["id"])
+        self.assertEqual(crashed["status"], "failed")
+        self.assertEqual(crashed["error"], "Worker exited with code 1")
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "onto", "rdf2vec")))
+        self.assertEqual(get_job(done["id"])["status"], "succeeded")
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "onto", "opa2vec")))
+
+    @patch("controllers.job_controller._dispatcher", None)
+    @patch("controllers.job_controller.multiprocessing.get_context")
+    def test_startup_claims_queued_jobs(self, mock_get_context):
+        """Test that the dispatcher started with the application runs the jobs queued before
+        and fails those an earlier server left running
+
+        Args:
+            self: TestJobController object
+            mock_get_context: MagicMock object
+        Returns:
+            None
+        """
+        mock_get_context.return_value.Process.return_value.pid = os.getpid()
+        # a job the previous server was running when it stopped, then one it queued
+        interrupted = create_job(
+            "embed", {"ontology_name": "onto", "algorithm": "rdf2vec"}
+        )
+        claim_next_job()
+        set_job_pid(interrupted["id"], 2**22 + 1)
+        queued = create_job("extract", {"ontology_name": "onto"})
+
+        dispatcher = get_dispatcher(self.app)
+        try:
+            deadline = time.time() + 10
+            while (
+                get_job(queued["id"])["status"] == "queued" and time.time() < deadline
+            ):
+                time.sleep(0.05)
+        finally:
+            dispatcher.stop()
+
+        self.assertEqual(get_job(queued["id"])["status"], "running")
+        mock_get_context.return_value.Process.assert_called_once_with(
+            target=run_job,
+            args=(self.tmp.name, queued["id"]),
+            name=f"job-{queued['id']}",
+        )
+        interrupted = get_job(interrupted["id"])
+        self.assertEqual(interrupted["status"], "failed")
+        self.assertEqual(interrupted["error"], "Job interrupted by a server restart")
+
+    @patch("main.get_dispatcher")
+    def test_create_app_starts_dispatcher(self, mock_get_dispatcher):
+        """Test that the application starts the job dispatcher
+
+        Args:
+            self: TestJobController object
+            mock_get_dispatcher: MagicMock object
+        Returns:
+            None
+        """
+        import main
+
+        app = main.create_app()
+        mock_get_dispatcher.assert_called_once_with(app)
+
+
+if __name__ == "__main__":
+    unittest.main()
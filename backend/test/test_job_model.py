@@ -0,0 +1,114 @@
+import sys
+import tempfile
+import unittest
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.job_model import (
+    claim_next_job,
+    create_job,
+    finish_job,
+    get_job,
+    list_jobs,
+    list_jobs_by_status,
+    request_cancel,
+)
+
+
+class TestJobModel(unittest.TestCase):
+    """Test cases for job_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder
+
+        Args:
+            self: TestJobModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestJobModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_job_lifecycle(self):
+        """Test that a job is queued, claimed once and finished once
+
+        Args:
+            self: TestJobModel object
+        Returns:
+            None
+        """
+        job = create_job("embed", {"ontology_name": "onto", "algorithm": "rdf2vec"})
+        self.assertEqual(job["status"], "queued")
+        self.assertEqual(job["params"]["algorithm"], "rdf2vec")
+
+        claimed = claim_next_job()
+        self.assertEqual(claimed["id"], job["id"])
+        self.assertEqual(claimed["status"], "running")
+        self.assertIsNone(claim_next_job())
+
+        self.assertTrue(finish_job(job["id"], "succeeded", result={"mrr": 0.5}))
+        self.assertFalse(finish_job(job["id"], "failed", error="late"))
+
+        job = get_job(job["id"])
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["result"], {"mrr": 0.5})
+        self.assertIsNone(job["error"])
+
+    def test_claim_order(self):
+        """Test that jobs are claimed oldest first
+
+        Args:
+            self: TestJobModel object
+        Returns:
+            None
+        """
+        first = create_job("extract", {"ontology_name": "a"})
+        second = create_job("extract", {"ontology_name": "b"})
+
+        self.assertEqual(claim_next_job()["id"], first["id"])
+        self.assertEqual(claim_next_job()["id"], second["id"])
+        self.assertEqual(
+            [job["id"] for job in list_jobs_by_status("running")],
+            [first["id"], second["id"]],
+        )
+
+    def test_request_cancel(self):
+        """Test that queued jobs are cancelled and running jobs flagged for cancellation
+
+        Args:
+            self: TestJobModel object
+        Returns:
+            None
+        """
+        running = create_job("extract", {"ontology_name": "a"})
+        claim_next_job()
+        queued = create_job("extract", {"ontology_name": "b"})
+
+        self.assertEqual(request_cancel(queued["id"])["status"], "cancelled")
+        self.assertEqual(request_cancel(running["id"])["status"], "cancelling")
+        self.assertIsNone(request_cancel("missing"))
+        self.assertIsNone(claim_next_job())
+
+        self.assertEqual(len(list_jobs()), 2)
+        self.assertEqual(
+            [job["id"] for job in list_jobs(status="cancelled")], [queued["id"]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import rdflib
+
+sys.path.append("../backend")
+from models.knowledge_graph_model import get_knowledge_graph, load_knowledge_graph
+from owl2vec_star.rdf2vec.walkers.random import RandomWalker
+from owl2vec_star.rdf2vec.walkers.weisfeiler_lehman import WeisfeilerLehmanWalker
+
+
+class TestKnowledgeGraphModel(unittest.TestCase):
+    """Test cases for knowledge_graph_model.py"""
+
+    def setUp(self):
+        """Write a small ontology into a temporary storage folder and patch the path helpers.
+
+        Args:
+            self: TestKnowledgeGraphModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.onto_file = os.path.join(self.tmp.name, "onto.owl")
+
+        ex = rdflib.Namespace("http://example.org/")
+        g = rdflib.Graph()
+        g.add((ex.Cat, rdflib.RDFS.subClassOf, ex.Animal))
+        g.add((ex.Dog, rdflib.RDFS.subClassOf, ex.Animal))
+        g.add((ex.Animal, rdflib.RDFS.label, rdflib.Literal("animal")))
+        g.add((ex.tom, rdflib.RDF.type, ex.Cat))
+        g.serialize(self.onto_file, format="xml")
+
+        cache = os.path.join(self.tmp.name, ".cache")
+        os.makedirs(cache)
+        self.patches = [
+            patch(
+                "models.knowledge_graph_model.get_path",
+                side_effect=lambda _, *args: os.path.join(self.tmp.name, *args),
+            ),
+            patch(
+                "models.knowledge_graph_model.get_cache_path",
+                side_effect=lambda _, *args: os.path.join(cache, *args),
+            ),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Stop the patches and remove the temporary storage folder
+
+        Args:
+            self: TestKnowledgeGraphModel object
+        Returns:
+            None
+        """
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+
+    @patch("models.knowledge_graph_model.build_knowledge_graph")
+    def test_get_knowledge_graph_cached(self, mock_build):
+        """Test that get_knowledge_graph parses the ontology once and memory-maps it afterwards
+
+        Args:
+            mock_build: MagicMock object
+        Returns:
+            None
+        """
+        from owl2vec_star.RDF2Vec_Embed import build_knowledge_graph
+
+        mock_build.side_effect = build_knowledge_graph
+        built = get_knowledge_graph("onto")
+        cached = get_knowledge_graph("onto")
+
+        mock_build.assert_called_once_with(self.onto_file)
+        self.assertEqual(cached.n_edges, 4)
+        self.assertEqual(sorted(cached.name_list()), sorted(built.name_list()))
+
+        instances = ["http://example.org/Animal", "http://example.org/tom"]
+        walkers = [
+            RandomWalker(2, float("inf")),
+            WeisfeilerLehmanWalker(2, float("inf")),
+        ]
+        for walker in walkers:
+            self.assertEqual(
+                set(walker.extract(built, instances)),
+                set(walker.extract(cached, instances)),
+            )
+
+    def test_load_knowledge_graph_stale(self):
+        """Test that a cached graph is ignored once the ontology file changes
+
+        Args:
+            self: TestKnowledgeGraphModel object
+        Returns:
+            None
+        """
+        self.assertIsNone(load_knowledge_graph("onto"))
+        get_knowledge_graph("onto")
+        self.assertIsNotNone(load_knowledge_graph("onto"))
+
+        with open(self.onto_file, "a", encoding="utf-8") as f:
+            f.write("\n")
+        self.assertIsNone(load_knowledge_graph("onto"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.manifest_model import (
+    MANIFEST_FILE,
+    get_manifest,
+    get_onto_type,
+    get_prefix,
+    load_manifest,
+    remove_manifest,
+)
+from utils.exceptions import FileException
+
+
+class TestManifestModel(unittest.TestCase):
+    """Test cases for manifest_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder holding an extracted
+        ontology
+
+        Args:
+            self: TestManifestModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+        os.makedirs(os.path.join(self.tmp.name, "onto"))
+        self.write("onto.owl", ["<rdf:RDF/>"])
+        self.write("axioms.txt", ["http://a.org#C1 SubClassOf http://a.org#C0"])
+        self.write("classes.txt", ["http://a.org#C%d" % i for i in range(20)])
+        self.write("individuals.txt", ["http://a.org/data/i0", "http://a.org/data/i1"])
+        self.write("uri_labels.txt", ["http://a.org#C0 first"])
+        self.write("annotations.txt", ["http://a.org#C0 a class", "http://a.org#C1 b"])
+        self.write("test.csv", ["http://a.org#C1,http://a.org#C0"])
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestManifestModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def write(self, file, lines):
+        """Write a file of the test ontology
+
+        Args:
+            self: TestManifestModel object
+            file (str): The name of the file
+            lines (list): The lines
+        Returns:
+            None
+        """
+        with open(os.path.join(self.tmp.name, "onto", file), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def test_get_onto_type(self):
+        """Test that ontologies with few individuals are TBoxes
+
+        Args:
+            self: TestManifestModel object
+        Returns:
+            None
+        """
+        self.assertEqual(get_onto_type(20, 2), "tbox")
+        self.assertEqual(get_onto_type(20, 3), "abox")
+        self.assertEqual(get_onto_type(5, 1), "abox")
+
+    def test_get_prefix(self):
+        """Test get_prefix function in manifest_model.py
+
+        Args:
+            self: TestManifestModel object
+        Returns:
+            None
+        """
+        self.assertEqual(get_prefix("http://example.com#Entity"), "http://example.com#")
+        self.assertEqual(get_prefix("http://example.com/Entity"), "http://example.com/")
+
+    @patch("models.manifest_model.coverage_class", return_value=5.0)
+    def test_get_manifest(self, mock_coverage_class):
+        """Test that the manifest is built once and read until the ontology changes
+
+        Args:
+            self: TestManifestModel object
+            mock_coverage_class: MagicMock object
+        Returns:
+            None
+        """
+        self.assertIsNone(load_manifest("onto"))
+        manifest = get_manifest("onto")
+        self.assertEqual(manifest["onto_type"], "tbox")
+        self.assertEqual(
+            [manifest[key] for key in ("no_class", "no_individual", "no_axiom")],
+            [20, 2, 1],
+        )
+        self.assertEqual(manifest["no_annotation"], 3)
+        self.assertEqual(manifest["coverage"], 5.0)
+        self.assertEqual(
+            manifest["prefixes"],
+            {"classes": "http://a.org#", "individuals": "http://a.org/data/"},
+        )
+        self.assertIn("test.csv", manifest["artifacts"])
+        self.assertNotIn("valid.csv", manifest["artifacts"])
+
+        # later reads do not count the files again
+        with patch("models.manifest_model.load_multi_input_files") as mock_load:
+            self.assertEqual(get_manifest("onto"), manifest)
+            mock_load.assert_not_called()
+        mock_coverage_class.assert_called_once_with("onto")
+
+        with open(os.path.join(self.tmp.name, "onto", MANIFEST_FILE)) as f:
+            self.assertEqual(json.load(f), manifest)
+
+        # a new upload of the ontology makes the manifest stale
+        self.write("onto.owl", ["<rdf:RDF />"])
+        self.assertIsNone(load_manifest("onto"))
+
+        remove_manifest("onto")
+        self.assertFalse(
+            os.path.exists(os.path.join(self.tmp.name, "onto", MANIFEST_FILE))
+        )
+
+        with self.assertRaises(FileException):
+            get_manifest("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
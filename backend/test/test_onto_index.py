@@ -0,0 +1,317 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from rdflib import URIRef
+
+sys.path.append("../backend")
+from owl2vec_star.Onto_Access import Reasoner
+from owl2vec_star.Onto_Index import GraphIndex, SPARQLIndex
+from owl2vec_star.Onto_Projection import OntologyProjection
+
+ONTOLOGY = """<?xml version="1.0"?>
+<rdf:RDF xmlns="http://test.org/onto#"
+     xml:base="http://test.org/onto"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#"
+     xmlns:xsd="http://www.w3.org/2001/XMLSchema#"
+     xmlns:skos="http://www.w3.org/2004/02/skos/core#"
+     xmlns:oboInOwl="http://www.geneontology.org/formats/oboInOwl#">
+    <owl:Ontology rdf:about="http://test.org/onto"/>
+    <owl:ObjectProperty rdf:about="http://test.org/onto#owns">
+        <rdfs:domain rdf:resource="http://test.org/onto#Person"/>
+        <rdfs:range rdf:resource="http://test.org/onto#Animal"/>
+        <owl:inverseOf rdf:resource="http://test.org/onto#ownedBy"/>
+        <owl:equivalentProperty rdf:resource="http://test.org/onto#has"/>
+    </owl:ObjectProperty>
+    <owl:ObjectProperty rdf:about="http://test.org/onto#ownedBy"/>
+    <owl:ObjectProperty rdf:about="http://test.org/onto#has"/>
+    <owl:ObjectProperty rdf:about="http://test.org/onto#feeds">
+        <rdfs:domain>
+            <owl:Class>
+                <owl:unionOf rdf:parseType="Collection">
+                    <rdf:Description rdf:about="http://test.org/onto#Person"/>
+                    <rdf:Description rdf:about="http://test.org/onto#Robot"/>
+                </owl:unionOf>
+            </owl:Class>
+        </rdfs:domain>
+        <rdfs:range>
+            <owl:Class>
+                <owl:intersectionOf rdf:parseType="Collection">
+                    <rdf:Description rdf:about="http://test.org/onto#Animal"/>
+                    <rdf:Description rdf:about="http://test.org/onto#Pet"/>
+                </owl:intersectionOf>
+            </owl:Class>
+        </rdfs:range>
+    </owl:ObjectProperty>
+    <owl:DatatypeProperty rdf:about="http://test.org/onto#name">
+        <rdfs:domain rdf:resource="http://test.org/onto#Animal"/>
+        <owl:equivalentProperty rdf:resource="http://test.org/onto#title"/>
+    </owl:DatatypeProperty>
+    <owl:DatatypeProperty rdf:about="http://test.org/onto#title"/>
+    <owl:Class rdf:about="http://test.org/onto#Animal">
+        <rdfs:label xml:lang="en">animal</rdfs:label>
+        <rdfs:label xml:lang="fr">bête</rdfs:label>
+        <oboInOwl:hasExactSynonym>beast</oboInOwl:hasExactSynonym>
+        <rdfs:comment>A living creature</rdfs:comment>
+    </owl:Class>
+    <owl:Class rdf:about="http://test.org/onto#Pet">
+        <skos:prefLabel rdf:resource="http://test.org/onto#petLabel"/>
+        <oboInOwl:hasExactSynonym>animal</oboInOwl:hasExactSynonym>
+    </owl:Class>
+    <rdf:Description rdf:about="http://test.org/onto#petLabel">
+        <rdfs:label>pet</rdfs:label>
+    </rdf:Description>
+    <owl:Class rdf:about="http://test.org/onto#Person"/>
+    <owl:Class rdf:about="http://test.org/onto#Robot"/>
+    <owl:Class rdf:about="http://test.org/onto#Dog">
+        <rdfs:subClassOf rdf:resource="http://test.org/onto#Animal"/>
+        <owl:equivalentClass rdf:resource="http://test.org/onto#Hound"/>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://test.org/onto#name"/>
+                <owl:someValuesFrom rdf:resource="http://www.w3.org/2001/XMLSchema#string"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+    </owl:Class>
+    <owl:Class rdf:about="http://test.org/onto#Hound"/>
+    <owl:Class rdf:about="http://test.org/onto#Owner">
+        <owl:equivalentClass>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://test.org/onto#owns"/>
+                <owl:someValuesFrom rdf:resource="http://test.org/onto#Pet"/>
+            </owl:Restriction>
+        </owl:equivalentClass>
+    </owl:Class>
+    <owl:Class rdf:about="http://test.org/onto#Keeper">
+        <rdfs:subClassOf>
+            <owl:Class>
+                <owl:intersectionOf rdf:parseType="Collection">
+                    <rdf:Description rdf:about="http://test.org/onto#Person"/>
+                    <owl:Restriction>
+                        <owl:onProperty rdf:resource="http://test.org/onto#feeds"/>
+                        <owl:allValuesFrom>
+                            <owl:Class>
+                                <owl:unionOf rdf:parseType="Collection">
+                                    <rdf:Description rdf:about="http://test.org/onto#Dog"/>
+                                    <rdf:Description rdf:about="http://test.org/onto#Pet"/>
+                                </owl:unionOf>
+                            </owl:Class>
+                        </owl:allValuesFrom>
+                    </owl:Restriction>
+                </owl:intersectionOf>
+            </owl:Class>
+        </rdfs:subClassOf>
+        <rdfs:subClassOf>
+            <owl:Restriction>
+                <owl:onProperty rdf:resource="http://test.org/onto#owns"/>
+                <owl:someValuesFrom rdf:resource="http://test.org/onto#Dog"/>
+            </owl:Restriction>
+        </rdfs:subClassOf>
+    </owl:Class>
+    <owl:Restriction>
+        <owl:onProperty rdf:resource="http://test.org/onto#owns"/>
+        <owl:someValuesFrom rdf:resource="http://test.org/onto#Robot"/>
+        <rdfs:subClassOf rdf:resource="http://test.org/onto#Person"/>
+    </owl:Restriction>
+    <owl:Restriction>
+        <owl:onProperty rdf:resource="http://test.org/onto#feeds"/>
+        <owl:someValuesFrom>
+            <owl:Class>
+                <owl:unionOf rdf:parseType="Collection">
+                    <rdf:Description rdf:about="http://test.org/onto#Dog"/>
+                    <rdf:Description rdf:about="http://test.org/onto#Robot"/>
+                </owl:unionOf>
+            </owl:Class>
+        </owl:someValuesFrom>
+        <rdfs:subClassOf rdf:resource="http://test.org/onto#Keeper"/>
+    </owl:Restriction>
+    <owl:NamedIndividual rdf:about="http://test.org/onto#alice">
+        <rdf:type rdf:resource="http://test.org/onto#Person"/>
+        <owns rdf:resource="http://test.org/onto#rex"/>
+        <owl:sameAs rdf:resource="http://test.org/onto#ally"/>
+    </owl:NamedIndividual>
+    <owl:NamedIndividual rdf:about="http://test.org/onto#ally"/>
+    <owl:NamedIndividual rdf:about="http://test.org/onto#rex">
+        <rdf:type rdf:resource="http://test.org/onto#Dog"/>
+        <name rdf:datatype="http://www.w3.org/2001/XMLSchema#string">Rex</name>
+    </owl:NamedIndividual>
+</rdf:RDF>
+"""
+
+
+class TestOntoIndex(unittest.TestCase):
+    """Test cases for Onto_Index.py"""
+
+    def setUp(self):
+        """Write the test ontology into a temporary folder
+
+        Args:
+            self: TestOntoIndex object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.onto_file = os.path.join(self.tmp.name, "onto.owl")
+        with open(self.onto_file, "w") as f:
+            f.write(ONTOLOGY)
+
+    def tearDown(self):
+        """Remove the temporary folder
+
+        Args:
+            self: TestOntoIndex object
+        Returns:
+            None
+        """
+        self.tmp.cleanup()
+
+    def project(self, use_index):
+        """Project the test ontology and write its axioms
+
+        Args:
+            self: TestOntoIndex object
+            use_index (bool): Whether the projection reads the graph index
+        Returns:
+            OntologyProjection: The projection
+        """
+        projection = OntologyProjection(
+            self.onto_file,
+            reasoner=Reasoner.STRUCTURAL,
+            bidirectional_taxonomy=True,
+            include_literals=True,
+            use_index=use_index,
+        )
+        projection.extractProjection()
+        projection.createManchesterSyntaxAxioms()
+        return projection
+
+    def test_same_projection(self):
+        """Test that the index projects the triples and axioms of the SPARQL queries
+
+        Args:
+            self: TestOntoIndex object
+        Returns:
+            None
+        """
+        queried = self.project(use_index=False)
+        indexed = self.project(use_index=True)
+        self.assertIsInstance(indexed.getIndex(), GraphIndex)
+
+        triples = set(indexed.getProjectionGraph())
+        self.assertEqual(triples, set(queried.getProjectionGraph()))
+        self.assertEqual(indexed.axioms_manchester, queried.axioms_manchester)
+
+        onto = "http://test.org/onto#"
+        for s, p, o in [
+            ("Keeper", "owns", "Dog"),
+            ("Dog", "ownedBy", "Keeper"),
+            ("Person", "feeds", "Pet"),
+            ("Keeper", "feeds", "Robot"),
+            ("alice", "has", "rex"),
+        ]:
+            self.assertIn(
+                (URIRef(onto + s), URIRef(onto + p), URIRef(onto + o)), triples
+            )
+
+    def test_patterns(self):
+        """Test the patterns that follow blank nodes and lists
+
+        Args:
+            self: TestOntoIndex object
+        Returns:
+            None
+        """
+        index = self.project(use_index=True).getIndex()
+        onto = "http://test.org/onto#"
+        names = lambda rows: sorted(
+            tuple(str(term).replace(onto, "") for term in row) for row in rows
+        )
+
+        self.assertEqual(
+            names(index.complexDomains(onto + "feeds")), [("Person",), ("Robot",)]
+        )
+        self.assertEqual(
+            names(index.complexRanges(onto + "feeds")), [("Animal",), ("Pet",)]
+        )
+        self.assertEqual(
+            names(index.restrictionsLHS(onto + "owns")), [("Person", "Robot")]
+        )
+        self.assertEqual(
+            names(index.complexRestrictionsLHS(onto + "feeds")),
+            [("Keeper", "Dog"), ("Keeper", "Robot")],
+        )
+        self.assertEqual(names(index.dataRestrictionsRHS(onto + "name")), [("Dog",)])
+        self.assertEqual(names(index.inverses(onto + "ownedBy")), [("owns",)])
+        self.assertEqual(
+            names(index.atomicEquivalentProperties(onto + "title")), [("name",)]
+        )
+
+    def test_property_metadata(self):
+        """Test that the relations of a property are queried once per projection
+
+        Args:
+            self: TestOntoIndex object
+        Returns:
+            None
+        """
+        with patch.object(
+            SPARQLIndex, "inverses", autospec=True, side_effect=SPARQLIndex.inverses
+        ) as mock_inverses:
+            projection = self.project(use_index=False)
+
+        queried = [call.args[1] for call in mock_inverses.call_args_list]
+        self.assertEqual(len(queried), len(set(queried)))
+        self.assertIn("http://test.org/onto#owns", queried)
+
+        owns = projection.getPropertyMetadata("http://test.org/onto#owns")
+        self.assertIs(projection.getObjectProperties()[0].index, owns.index)
+        self.assertEqual(owns.name, "owns")
+        self.assertEqual(
+            [str(p) for p in owns.inverses], ["http://test.org/onto#ownedBy"]
+        )
+        self.assertEqual(
+            [str(p) for p in owns.equivalents], ["http://test.org/onto#has"]
+        )
+
+    def test_annotations(self):
+        """Test that the labels are indexed like the SPARQL queries find them
+
+        Args:
+            self: TestOntoIndex object
+        Returns:
+            None
+        """
+        queried = self.project(use_index=False)
+        indexed = self.project(use_index=True)
+        queried.indexAnnotations()
+        indexed.indexAnnotations()
+
+        for name in (
+            "entityToPreferredLabels",
+            "entityToSynonyms",
+            "entityToAllLexicalLabels",
+        ):
+            self.assertEqual(getattr(indexed, name), getattr(queried, name))
+
+        onto = "http://test.org/onto#"
+        self.assertEqual(indexed.entityToPreferredLabels[onto + "Animal"], {"animal"})
+        self.assertEqual(indexed.entityToPreferredLabels[onto + "Pet"], {"pet"})
+        self.assertEqual(indexed.entityToSynonyms[onto + "Animal"], {"beast"})
+        self.assertIn(
+            "A living creature", indexed.entityToAllLexicalLabels[onto + "Animal"]
+        )
+
+        # one string is kept for a label of several entities and dictionaries
+        animal = list(indexed.entityToPreferredLabels[onto + "Animal"])[0]
+        self.assertIs(list(indexed.entityToSynonyms[onto + "Pet"])[0], animal)
+        keys = {key: key for key in indexed.entityToAllLexicalLabels}
+        for key in indexed.entityToPreferredLabels:
+            self.assertIs(keys[key], key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -78,23 +78,24 @@ class TestOntologyModule(unittest.TestCase):
         self.assertEqual(result, ["onto1", "onto2"])
 
     @patch(
-        "controllers.ontology_controller.load_multi_input_files",
+        "controllers.ontology_controller.get_manifest",
         return_value={
-            "axioms": ["axiom1", "axiom2"],
-            "classes": ["class1", "class2"],
-            "individuals": ["individual1", "individual2"],
-            "uri_labels": ["uri1 label1", "uri2 label2 label3"],
-            "annotations": ["uri1 annotation1", "uri2 annotation2"],
+            "onto_type": "abox",
+            "no_class": 2,
+            "no_individual": 2,
+            "no_axiom": 2,
+            "no_annotation": 4,
+            "coverage": 50.0,
         },
     )
     def test_get_onto_stat(
         self,
-        mock_load_multi_input_files,
+        mock_get_manifest,
     ):
         """Test get_onto_stat function in ontology_controller.py
 
         Args:
-            mock_load_multi_input_files: MagicMock object
+            mock_get_manifest: MagicMock object
         Returns:
             None
         """
@@ -106,10 +107,7 @@ class TestOntologyModule(unittest.TestCase):
             {"no_class": 2, "no_individual": 2, "no_axiom": 2, "no_annotation": 4},
         )
 
-        mock_load_multi_input_files.assert_called_once_with(
-            "ontology_name",
-            ["axioms", "classes", "individuals", "uri_labels", "annotations"],
-        )
+        mock_get_manifest.assert_called_once_with("ontology_name")
 
     @patch("controllers.ontology_controller.train_test_val_gen_abox")
     @patch("controllers.ontology_controller.train_test_val_gen_tbox")
@@ -117,12 +115,18 @@ class TestOntologyModule(unittest.TestCase):
     @patch("controllers.ontology_controller.save_infer")
     @patch("controllers.ontology_controller.abox_infer")
     @patch("controllers.ontology_controller.tbox_infer")
-    @patch("controllers.ontology_controller.World")
+    @patch("controllers.ontology_controller.save_manifest")
+    @patch("controllers.ontology_controller.build_manifest")
+    @patch("controllers.ontology_controller.remove_manifest")
+    @patch("controllers.ontology_controller.save_hierarchy")
+    @patch("controllers.ontology_controller.save_coverage")
+    @patch("controllers.ontology_controller.OntologySession")
+    @patch("controllers.ontology_controller.save_corpora")
     @patch("controllers.ontology_controller.save_annotations")
     @patch("controllers.ontology_controller.save_individuals")
     @patch("controllers.ontology_controller.save_classes")
     @patch("controllers.ontology_controller.save_axioms")
-    @patch("controllers.ontology_controller.OntologyProjection")
+    @patch("owl2vec_star.Onto_Projection.OntologyProjection")
     @patch("controllers.ontology_controller.get_path")
     def test_extract_data(
         self,
@@ -132,7 +136,13 @@ class TestOntologyModule(unittest.TestCase):
         mock_save_classes,
         mock_save_individuals,
         mock_save_annotations,
-        mock_World,
+        mock_save_corpora,
+        mock_OntologySession,
+        mock_save_coverage,
+        mock_save_hierarchy,
+        mock_remove_manifest,
+        mock_build_manifest,
+        mock_save_manifest,
         mock_tbox_infer,
         mock_abox_infer,
         mock_save_infer,
@@ -149,7 +159,13 @@ class TestOntologyModule(unittest.TestCase):
             mock_save_classes: MagicMock object
             mock_save_individuals: MagicMock object
             mock_save_annotations: MagicMock object
-            mock_World: MagicMock object
+            mock_save_corpora: MagicMock object
+            mock_OntologySession: MagicMock object
+            mock_save_coverage: MagicMock object
+            mock_save_hierarchy: MagicMock object
+            mock_remove_manifest: MagicMock object
+            mock_build_manifest: MagicMock object
+            mock_save_manifest: MagicMock object
             mock_tbox_infer: MagicMock object
             mock_abox_infer: MagicMock object
             mock_save_infer: MagicMock object
@@ -162,11 +178,9 @@ class TestOntologyModule(unittest.TestCase):
 
         # Setup mocks
         mock_get_path.return_value = "path_to_ontology"
-        mock_world_instance = MagicMock()
-        mock_World.return_value = mock_world_instance
-        mock_ontology_instance = MagicMock()
-        mock_world_instance.get_ontology.return_value = mock_ontology_instance
-        mock_ontology_instance.load.return_value = mock_ontology_instance
+        mock_session = MagicMock()
+        mock_OntologySession.return_value = mock_session
+        mock_session.reason.return_value = mock_session.onto
 
         mock_projection_instance = MagicMock()
         mock_OntologyProjection.return_value = mock_projection_instance
@@ -228,10 +242,30 @@ class TestOntologyModule(unittest.TestCase):
             additional_preferred_labels_annotations=set(),
             additional_synonyms_annotations=set(),
             memory_reasoner="13351",
+            ontology=mock_session.onto,
+            graph=mock_session.graph,
+        )
+        # the ontology is loaded and reasoned once, then released
+        mock_OntologySession.assert_called_once_with(ontology_name)
+        mock_save_coverage.assert_called_once_with(ontology_name, mock_session.onto)
+        mock_session.reason.assert_called_once()
+        mock_save_hierarchy.assert_called_once_with(ontology_name, mock_session.onto)
+        mock_remove_manifest.assert_called_once_with(ontology_name)
+        timings = mock_build_manifest.call_args[0][1]
+        self.assertEqual(
+            set(timings), {"projection", "save", "reasoning", "inference", "samples"}
+        )
+        mock_save_manifest.assert_called_once_with(
+            ontology_name, mock_build_manifest.return_value
+        )
+        # the inferred ancestors come from the closure of the saved hierarchy
+        mock_tbox_infer.assert_called_once_with(
+            mock_session.onto, mock_save_hierarchy.return_value
+        )
+        mock_abox_infer.assert_called_once_with(
+            mock_session.onto, mock_save_hierarchy.return_value
         )
-        mock_World.assert_called_once()
-        mock_world_instance.get_ontology.assert_called_once_with("path_to_ontology")
-        mock_ontology_instance.load.assert_called_once()
+        mock_session.close.assert_called_once()
         mock_load_multi_input_files.assert_called_once_with(
             ontology_name, ["classes", "individuals"]
         )
@@ -239,6 +273,7 @@ class TestOntologyModule(unittest.TestCase):
         mock_save_classes.assert_called_once_with(ontology_name, {"class1", "class2"})
         mock_save_individuals.assert_called_once_with(ontology_name, {"ind1", "ind2"})
         self.assertTrue(mock_save_annotations.called)
+        mock_save_corpora.assert_called_once_with(ontology_name)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from controllers.resource_controller import (
+    cpu_allocation,
+    get_allocated_cores,
+    get_resource_config,
+)
+from models.resource_model import list_leases
+
+
+class TestResourceController(unittest.TestCase):
+    """Test cases for resource_controller.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder with a 4 core budget
+
+        Args:
+            self: TestResourceController object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, "default.cfg")
+        with open(self.config_file, "w") as f:
+            f.write(
+                "[RESOURCES]\ncpu_budget = 4\nextract_cores = 1\nembed_cores = 3\n"
+                "evaluate_cores = 8\nsweep_cores = 0\npoll_interval = 0.01\n"
+            )
+        self.app = Flask(__name__)
+        self.app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestResourceController object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_get_resource_config(self):
+        """Test that an operation never asks for more cores than the budget
+
+        Args:
+            self: TestResourceController object
+        Returns:
+            None
+        """
+        config = get_resource_config(self.config_file)
+        self.assertEqual(config["budget"], 4)
+        self.assertEqual(
+            config["cores"], {"extract": 1, "embed": 3, "evaluate": 4, "sweep": 4}
+        )
+
+    @patch("controllers.resource_controller.threadpoolctl")
+    def test_cpu_allocation(self, mock_threadpoolctl):
+        """Test that the allocated cores size the thread pools inside the context only
+
+        Args:
+            self: TestResourceController object
+            mock_threadpoolctl: Mock object for threadpoolctl
+        Returns:
+            None
+        """
+        with patch.dict(os.environ, {"OMP_NUM_THREADS": "16"}):
+            with cpu_allocation("embed", self.config_file) as cores:
+                self.assertEqual(cores, 3)
+                self.assertEqual(get_allocated_cores(), 3)
+                self.assertEqual(os.environ["OMP_NUM_THREADS"], "3")
+                self.assertEqual(len(list_leases()), 1)
+            self.assertEqual(os.environ["OMP_NUM_THREADS"], "16")
+
+        mock_threadpoolctl.threadpool_limits.assert_called_once_with(limits=3)
+        mock_threadpoolctl.threadpool_limits.return_value.restore_original_limits.assert_called_once()
+        self.assertEqual(get_allocated_cores(), os.cpu_count())
+        self.assertEqual(list_leases(), [])
+
+    @patch("controllers.resource_controller.threadpoolctl")
+    def test_cpu_allocation_waits(self, mock_threadpoolctl):
+        """Test that an operation waits while the budget cannot hold its cores
+
+        Args:
+            self: TestResourceController object
+            mock_threadpoolctl: Mock object for threadpoolctl
+        Returns:
+            None
+        """
+        order = []
+
+        def evaluate():
+            with self.app.app_context():
+                with cpu_allocation("evaluate", self.config_file):
+                    order.append("evaluate")
+
+        with cpu_allocation("embed", self.config_file):
+            thread = threading.Thread(target=evaluate)
+            thread.start()
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+            order.append("embed")
+        thread.join(5)
+
+        self.assertEqual(order, ["embed", "evaluate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.resource_model import (
+    grant_lease,
+    list_leases,
+    release_lease,
+    request_lease,
+)
+
+
+class TestResourceModel(unittest.TestCase):
+    """Test cases for resource_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder
+
+        Args:
+            self: TestResourceModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestResourceModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_budget(self):
+        """Test that leases are granted while their cores fit in the budget
+
+        Args:
+            self: TestResourceModel object
+        Returns:
+            None
+        """
+        first = request_lease(3, label="embed")
+        second = request_lease(2, label="evaluate")
+
+        self.assertTrue(grant_lease(first, budget=4))
+        self.assertFalse(grant_lease(second, budget=4))
+
+        release_lease(first)
+        self.assertTrue(grant_lease(second, budget=4))
+        self.assertEqual([lease["id"] for lease in list_leases()], [second])
+
+    def test_grant_order(self):
+        """Test that a small lease does not overtake a larger one waiting before it
+
+        Args:
+            self: TestResourceModel object
+        Returns:
+            None
+        """
+        running = request_lease(2)
+        large = request_lease(4)
+        small = request_lease(1)
+        self.assertTrue(grant_lease(running, budget=4))
+
+        self.assertFalse(grant_lease(large, budget=4))
+        self.assertFalse(grant_lease(small, budget=4))
+
+        release_lease(running)
+        self.assertFalse(grant_lease(small, budget=4))
+        self.assertTrue(grant_lease(large, budget=4))
+
+    def test_dead_process_leases(self):
+        """Test that the leases of exited processes are given back to the budget
+
+        Args:
+            self: TestResourceModel object
+        Returns:
+            None
+        """
+        with patch("models.resource_model.os.getpid", return_value=999999):
+            request_lease(4)
+        lease = request_lease(4)
+
+        with patch(
+            "models.resource_model.is_process_alive",
+            side_effect=lambda pid: pid != 999999,
+        ):
+            self.assertTrue(grant_lease(lease, budget=4))
+        self.assertEqual(len(list_leases()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
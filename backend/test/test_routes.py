@@ -238,6 +238,117 @@ class TestRoutes(unittest.TestCase):
             self.assertIn("test_ontology", response.get_json()["ontology_name"])
             self.assertIn("test_algo", response.get_json()["algo"])
 
+    @patch("routes.routes.remove_dir")
+    @patch("routes.routes.embed_func")
+    def test_embed_route_variant(self, mock_embed_func, mock_remove_dir):
+        """Test that hyperparameter overrides train a model variant and that invalid ones are rejected
+
+        Args:
+            mock_embed_func: MagicMock object
+            mock_remove_dir: MagicMock object
+        Returns:
+            None
+        """
+        mock_embed_func.return_value = "rdf2vec embedded success!!"
+        response = self.app.get("/api/embed/test_ontology?algo=rdf2vec&embed_size=32")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()["variant"].startswith("rdf2vec@"))
+        self.assertEqual(
+            mock_embed_func.call_args.kwargs["overrides"], {"embed_size": "32"}
+        )
+
+        mock_embed_func.reset_mock()
+        response = self.app.get("/api/embed/test_ontology?algo=rdf2vec&window=3")
+
+        self.assertEqual(response.status_code, 400)
+        mock_embed_func.assert_not_called()
+        mock_remove_dir.assert_not_called()
+
+    @patch("routes.routes.similar_entities")
+    def test_similar_route(self, mock_similar_entities):
+        """Test that the similar route passes batch queries from the query string or the body
+
+        Args:
+            mock_similar_entities: MagicMock object
+        Returns:
+            None
+        """
+        mock_similar_entities.return_value = [{"entity": "a", "neighbors": []}]
+        response = self.app.get(
+            "/api/similar/test_ontology/rdf2vec?entity=a&entity=b&k=5&approximate=1"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json()["results"], [{"entity": "a", "neighbors": []}]
+        )
+        mock_similar_entities.assert_called_with(
+            "test_ontology", "rdf2vec", ["a", "b"], k=5, kind="all", approximate=True
+        )
+
+        response = self.app.post(
+            "/api/similar/test_ontology/rdf2vec",
+            json={"entities": ["a"], "kind": "class"},
+        )
+        self.assertEqual(response.status_code, 200)
+        mock_similar_entities.assert_called_with(
+            "test_ontology", "rdf2vec", ["a"], k=10, kind="class", approximate=None
+        )
+
+        response = self.app.get("/api/similar/test_ontology/rdf2vec?entity=a&k=x")
+        self.assertEqual(response.status_code, 400)
+
+    @patch("routes.routes.sweep_func")
+    def test_sweep_route(self, mock_sweep_func):
+        """Test that the sweep route passes the grid of the body and returns the leaderboard
+
+        Args:
+            mock_sweep_func: MagicMock object
+        Returns:
+            None
+        """
+        mock_sweep_func.return_value = {"sweep_id": "abc", "leaderboard": []}
+        response = self.app.post(
+            "/api/sweep/test_ontology/opa2vec/svm",
+            json={"grid": {"window": [3, 5]}},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["sweep"]["sweep_id"], "abc")
+        mock_sweep_func.assert_called_once_with(
+            ontology_name="test_ontology",
+            algorithm="opa2vec",
+            classifier="svm",
+            grid={"window": [3, 5]},
+        )
+
+    @patch("routes.routes.estimate_evaluate")
+    @patch("routes.routes.estimate_embed")
+    def test_estimate_route(self, mock_estimate_embed, mock_estimate_evaluate):
+        """Test that the estimate route passes the overrides and the classifier
+
+        Args:
+            mock_estimate_embed: MagicMock object
+            mock_estimate_evaluate: MagicMock object
+        Returns:
+            None
+        """
+        mock_estimate_embed.return_value = {"corpus": {"tokens": 10}}
+        mock_estimate_evaluate.return_value = {"classifiers": {}}
+        response = self.app.get(
+            "/api/estimate/test_ontology/owl2vec-star?walk_depth=2&classifier=svm"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["embed"]["corpus"]["tokens"], 10)
+        mock_estimate_embed.assert_called_once_with(
+            "test_ontology", "owl2vec-star", {"walk_depth": "2"}
+        )
+        mock_estimate_evaluate.assert_called_once_with(
+            "test_ontology", "owl2vec-star", "svm", overrides={"walk_depth": "2"}
+        )
+
     @patch("routes.routes.predict_func")
     def test_predict_route(self, mock_predict_func):
         """Test that the predict route returns the prediction result
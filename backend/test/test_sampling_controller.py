@@ -0,0 +1,106 @@
+import sys
+import unittest
+from collections import Counter
+from unittest.mock import Mock
+
+import numpy as np
+
+sys.path.append("../backend")
+from controllers.sampling_controller import THING, NegativeSampler
+from utils.exceptions import ExtractionException
+
+
+class TestSamplingController(unittest.TestCase):
+    """Test cases for sampling_controller.py"""
+
+    def setUp(self):
+        """Build a sampler over a few individuals and classes
+
+        Args:
+            self: TestSamplingController object
+        Returns:
+            None
+        """
+        self.classes = ["c%d" % i for i in range(6)]
+        self.entities = ["i0", "i1", "i2"]
+        self.direct_types = {"i0": ["c0"], "i1": ["c1"], "i2": ["c2"]}
+        self.inferred = {
+            "i0": ["c3", "c4", THING],
+            "i1": ["c3", THING],
+            "i2": [THING],
+        }
+        self.sampler = NegativeSampler(
+            self.entities,
+            self.classes,
+            self.direct_types,
+            self.inferred,
+            np.random.default_rng(0),
+        )
+
+    def test_generate(self):
+        """Test that negatives avoid the known classes and inferred samples are ancestors
+
+        Args:
+            self: TestSamplingController object
+        Returns:
+            None
+        """
+        for label, expected in ((0, (50, 50)), (1, (150, 50))):
+            samples = self.sampler.generate(100, label)
+            self.assertEqual(len(samples), sum(expected))
+
+            random_samples, inferred_samples = (
+                samples[: expected[0]],
+                samples[expected[0] :],
+            )
+            for entity, cls, sample_label in random_samples:
+                self.assertEqual(sample_label, 0)
+                self.assertNotIn(cls, self.direct_types[entity])
+                self.assertNotIn(cls, self.inferred[entity])
+            for entity, cls, sample_label in inferred_samples:
+                self.assertEqual(sample_label, label)
+                self.assertIn(cls, self.inferred[entity])
+                self.assertNotEqual(cls, THING)
+
+        # draws of owl:Thing are drawn again: i0 is kept 2/3 of the time, i1 1/2
+        counts = Counter(
+            entity for entity, _, _ in self.sampler.generate(4000, 0)[2000:]
+        )
+        self.assertNotIn("i2", counts)
+        self.assertAlmostEqual(counts["i0"] / 2000, 4 / 7, delta=0.03)
+
+    def test_exhausted(self):
+        """Test that a sampler with nothing left to draw fails instead of looping
+
+        Args:
+            self: TestSamplingController object
+        Returns:
+            None
+        """
+        sampler = NegativeSampler(["i0"], ["c0"], {"i0": ["c0"]}, {"i0": [THING]})
+        self.assertEqual(sampler.generate(0, 1), [])
+        with self.assertRaises(ExtractionException):
+            sampler.random_negatives(1)
+        with self.assertRaises(ExtractionException):
+            sampler.inferred_negatives(1)
+
+    def test_from_ontology(self):
+        """Test that the asserted types of owlready2 entities are excluded
+
+        Args:
+            self: TestSamplingController object
+        Returns:
+            None
+        """
+        classes = [Mock(iri=iri, is_a=[]) for iri in self.classes]
+        restriction = Mock(spec=[])
+        individual = Mock(iri="i0", is_a=[classes[0], restriction])
+        sampler = NegativeSampler.from_ontology(
+            [individual], classes, {"i0": ["c1", THING]}
+        )
+        self.assertEqual(sampler.entities, ["i0"])
+        self.assertEqual(sampler.excluded.tolist(), [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.extract_model import coverage_class, save_coverage
+from models.session_model import (
+    QUADSTORE_FILE,
+    OntologySession,
+    build_quadstore,
+    load_quadstore_meta,
+)
+from utils.exceptions import OntologyException
+
+ONTOLOGY = """<?xml version="1.0"?>
+<rdf:RDF xmlns="http://test.org/onto#"
+     xml:base="http://test.org/onto"
+     xmlns:owl="http://www.w3.org/2002/07/owl#"
+     xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+     xmlns:rdfs="http://www.w3.org/2000/01/rdf-schema#">
+    <owl:Ontology rdf:about="http://test.org/onto"/>
+    <owl:Class rdf:about="http://test.org/onto#Animal"/>
+    <owl:Class rdf:about="http://test.org/onto#Dog">
+        <rdfs:subClassOf rdf:resource="http://test.org/onto#Animal"/>
+    </owl:Class>
+    <owl:NamedIndividual rdf:about="http://test.org/onto#rex">
+        <rdf:type rdf:resource="http://test.org/onto#Dog"/>
+    </owl:NamedIndividual>
+</rdf:RDF>
+"""
+
+
+class TestSessionModel(unittest.TestCase):
+    """Test cases for session_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder holding an ontology
+
+        Args:
+            self: TestSessionModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+        os.makedirs(os.path.join(self.tmp.name, "onto"))
+        with open(os.path.join(self.tmp.name, "onto", "onto.owl"), "w") as f:
+            f.write(ONTOLOGY)
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestSessionModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    @patch("models.session_model.owlready2.sync_reasoner")
+    def test_session(self, mock_sync_reasoner):
+        """Test that a session loads the ontology once and reasons on it once
+
+        Args:
+            self: TestSessionModel object
+            mock_sync_reasoner: MagicMock object
+        Returns:
+            None
+        """
+        with OntologySession("onto") as session:
+            self.assertEqual(len(list(session.onto.classes())), 2)
+            graph = session.graph
+            self.assertIs(session.graph, graph)
+            self.assertGreater(len(graph), 0)
+
+            self.assertIs(session.reason(), session.onto)
+            session.reason()
+            mock_sync_reasoner.assert_called_once_with(session.onto)
+
+        with self.assertRaises(OntologyException):
+            OntologySession("missing")
+
+    def test_quadstore(self):
+        """Test that the ontology is converted once per upload and opened from its quadstore
+
+        Args:
+            self: TestSessionModel object
+        Returns:
+            None
+        """
+        self.assertIsNone(load_quadstore_meta("onto"))
+        with patch(
+            "models.session_model.build_quadstore", side_effect=build_quadstore
+        ) as mock_build:
+            with OntologySession("onto") as session:
+                self.assertEqual(session.onto.base_iri, "http://test.org/onto#")
+                # changes to the world are not kept by the quadstore
+                with session.onto:
+                    session.world["http://test.org/onto#rex"].is_a.append(
+                        session.onto.Animal
+                    )
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(self.tmp.name, "onto", ".cache", QUADSTORE_FILE)
+                )
+            )
+
+            with OntologySession("onto") as session:
+                rex = session.world["http://test.org/onto#rex"]
+                self.assertEqual(rex.is_a, [session.onto.Dog])
+                self.assertEqual(len(list(session.onto.individuals())), 1)
+            mock_build.assert_called_once_with("onto")
+
+            # a new upload of the ontology is converted again
+            with open(os.path.join(self.tmp.name, "onto", "onto.owl"), "a") as f:
+                f.write("\n")
+            OntologySession("onto").close()
+            self.assertEqual(mock_build.call_count, 2)
+
+    def test_coverage(self):
+        """Test that the coverage saved by the extraction is read while the ontology is unchanged
+
+        Args:
+            self: TestSessionModel object
+        Returns:
+            None
+        """
+        with OntologySession("onto") as session:
+            self.assertEqual(save_coverage("onto", session.onto), 50)
+
+        with patch("models.session_model.owlready2.World") as mock_World:
+            self.assertEqual(coverage_class("onto"), 50)
+            mock_World.assert_not_called()
+
+        # a new upload of the ontology is loaded again
+        with open(os.path.join(self.tmp.name, "onto", "onto.owl"), "a") as f:
+            f.write("\n")
+        with patch("models.extract_model.get_class_coverage", return_value=0) as mock:
+            self.assertEqual(coverage_class("onto"), 0)
+            mock.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from flask import Flask
+
+sys.path.append("../backend")
+from controllers import similarity_controller as sc
+from models.embed_model import MODEL_FILE, save_embedding
+from utils.exceptions import ModelException
+
+CONFIG = {
+    "block_size": 7,
+    "ivf_min_entities": 1000,
+    "ivf_lists": 4,
+    "ivf_probes": 2,
+    "ivf_iterations": 5,
+    "max_k": 20,
+    "cache_size": 2,
+}
+
+
+def brute_force(vectors, queries, k):
+    """Reference top-k rows by cosine similarity"""
+    scores = queries @ vectors.T
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+class TestSimilarityController(unittest.TestCase):
+    """Test cases for similarity_controller.py"""
+
+    def setUp(self):
+        """Save an embedding of 30 classes and 10 individuals in a temporary storage folder
+
+        Args:
+            self: TestSimilarityController object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+        os.makedirs(os.path.join(self.tmp.name, "onto", "algo"))
+        open(os.path.join(self.tmp.name, "onto", "algo", MODEL_FILE), "w").close()
+
+        rng = np.random.default_rng(0)
+        self.embedding = rng.normal(size=(40, 8))
+        self.classes = [f"c{i}" for i in range(30)]
+        self.individuals = [f"i{i}" for i in range(10)]
+        save_embedding("onto", "algo", self.embedding, self.classes, self.individuals)
+        sc._indices.clear()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestSimilarityController object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_top_k_exact(self):
+        """Test that the blocked search returns the brute force neighbours
+
+        Args:
+            self: TestSimilarityController object
+        Returns:
+            None
+        """
+        vectors = sc.normalize_rows(self.embedding, block_size=7)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1, rtol=1e-5)
+
+        scores, rows = sc.top_k_exact(vectors, vectors[:3], 5, 0, 40, block_size=7)
+        np.testing.assert_array_equal(rows, brute_force(vectors, vectors[:3], 5))
+        self.assertTrue(np.all(np.diff(scores, axis=1) <= 0))
+
+        _, rows = sc.top_k_exact(
+            vectors, vectors[:3], 5, 0, 40, 7, exclude=np.array([0, 1, 2])
+        )
+        self.assertFalse(np.any(rows == np.array([[0], [1], [2]])))
+
+    def test_top_k_ivf(self):
+        """Test that the approximate search probing every list is exact
+
+        Args:
+            self: TestSimilarityController object
+        Returns:
+            None
+        """
+        vectors = sc.normalize_rows(self.embedding, block_size=7)
+        centroids, offsets, rows = sc.train_ivf(vectors, 4, 5, block_size=7)
+        self.assertEqual(offsets[-1], 40)
+        self.assertEqual(sorted(rows.tolist()), list(range(40)))
+
+        ivf = {"centroids": centroids, "offsets": offsets, "rows": rows}
+        _, found = sc.top_k_ivf(vectors, ivf, vectors[:3], 5, 0, 40, probes=4)
+        np.testing.assert_array_equal(found, brute_force(vectors, vectors[:3], 5))
+
+    @patch("controllers.similarity_controller.get_similarity_config")
+    def test_similar_entities(self, mock_config):
+        """Test a batch search, its kinds, and the cached indices
+
+        Args:
+            self: TestSimilarityController object
+            mock_config: MagicMock object
+        Returns:
+            None
+        """
+        mock_config.return_value = CONFIG
+        vectors = sc.normalize_rows(self.embedding, block_size=7)
+
+        result = sc.similar_entities("onto", "algo", ["c0", "i0"], k=3)
+        expected = brute_force(vectors, vectors[[0, 30]], 4)[:, 1:]
+        self.assertEqual(
+            [[n["entity"] for n in r["neighbors"]] for r in result],
+            [
+                [(self.classes + self.individuals)[row] for row in rows]
+                for rows in expected
+            ],
+        )
+
+        result = sc.similar_entities("onto", "algo", ["c0"], k=20, kind="individual")
+        self.assertEqual(
+            sorted(n["entity"] for n in result[0]["neighbors"]),
+            sorted(self.individuals),
+        )
+
+        result = sc.similar_entities("onto", "algo", ["c0"], k=3, approximate=True)
+        self.assertEqual(len(result[0]["neighbors"]), 3)
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    self.tmp.name, "onto", ".cache", "similarity", "algo", "ivf.bin"
+                )
+            )
+        )
+
+        with self.assertRaises(ModelException) as context:
+            sc.similar_entities("onto", "algo", ["unknown"])
+        self.assertEqual(context.exception.error_code, 404)
+        with self.assertRaises(ModelException) as context:
+            sc.similar_entities("onto", "algo", ["c0"], kind="property")
+        self.assertEqual(context.exception.error_code, 400)
+
+    @patch("controllers.similarity_controller.get_similarity_config")
+    def test_similarity_index_invalidation(self, mock_config):
+        """Test that a new embedding replaces the cached index
+
+        Args:
+            self: TestSimilarityController object
+            mock_config: MagicMock object
+        Returns:
+            None
+        """
+        mock_config.return_value = CONFIG
+        first = sc.get_similarity_index("onto", "algo", CONFIG)
+        self.assertIs(sc.get_similarity_index("onto", "algo", CONFIG), first)
+
+        save_embedding("onto", "algo", -self.embedding, self.classes, self.individuals)
+        second = sc.get_similarity_index("onto", "algo", CONFIG)
+        self.assertIsNot(second, first)
+        np.testing.assert_allclose(second.vectors, -first.vectors, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
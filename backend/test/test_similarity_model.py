@@ -0,0 +1,88 @@
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+from flask import Flask
+
+sys.path.append("../backend")
+from models.similarity_model import (
+    load_ivf_index,
+    load_normalized_embedding,
+    save_ivf_index,
+    save_normalized_embedding,
+)
+
+
+class TestSimilarityModel(unittest.TestCase):
+    """Test cases for similarity_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder
+
+        Args:
+            self: TestSimilarityModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestSimilarityModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_normalized_embedding(self):
+        """Test that the normalized copy is memory-mapped back only for its embedding
+
+        Args:
+            self: TestSimilarityModel object
+        Returns:
+            None
+        """
+        source = {"size": 10, "mtime_ns": 1}
+        vectors = np.eye(3, dtype=np.float32)
+        save_normalized_embedding("onto", "algo", vectors, 2, source)
+
+        loaded, n_classes = load_normalized_embedding("onto", "algo", source)
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, vectors)
+        self.assertEqual(n_classes, 2)
+
+        self.assertIsNone(
+            load_normalized_embedding("onto", "algo", {"size": 10, "mtime_ns": 2})
+        )
+        self.assertIsNone(load_normalized_embedding("onto", "other", source))
+
+    def test_ivf_index(self):
+        """Test that the inverted file index is loaded back only for its embedding
+
+        Args:
+            self: TestSimilarityModel object
+        Returns:
+            None
+        """
+        source = {"size": 10, "mtime_ns": 1}
+        centroids = np.eye(2, dtype=np.float32)
+        offsets = np.array([0, 1, 3])
+        rows = np.array([2, 0, 1])
+        save_ivf_index("onto", "algo", centroids, offsets, rows, source)
+
+        ivf = load_ivf_index("onto", "algo", source)
+        np.testing.assert_array_equal(ivf["offsets"], offsets)
+        np.testing.assert_array_equal(ivf["rows"], rows)
+        self.assertIsNone(load_ivf_index("onto", "algo", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
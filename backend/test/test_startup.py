@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append("../backend")
+import owl2vec_star.Label as label
+
+BACKEND_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules only the endpoints that use them may import
+HEAVY_MODULES = [
+    "gensim",
+    "joblib",
+    "matplotlib",
+    "networkx",
+    "nltk",
+    "owlready2",
+    "pandas",
+    "pydot",
+    "rdflib",
+    "sklearn",
+]
+
+# seconds allowed to import the application, measured in a fresh interpreter
+STARTUP_BUDGET = 1.5
+
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+print(",".join(m for m in {modules!r} if m in sys.modules))
+"""
+
+
+def import_app():
+    """Import the application in a fresh interpreter without network access
+
+    Returns:
+        tuple: The import time in seconds and the heavy modules that were imported
+    """
+    env = dict(os.environ)
+    # any download attempt fails instead of reaching the network
+    env.update(
+        {
+            "HTTP_PROXY": "http://127.0.0.1:9",
+            "HTTPS_PROXY": "http://127.0.0.1:9",
+            "NO_PROXY": "",
+        }
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(modules=HEAVY_MODULES)],
+        cwd=BACKEND_FOLDER,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    ).stdout.splitlines()
+    return float(output[-2]), [m for m in output[-1].split(",") if m]
+
+
+class TestStartup(unittest.TestCase):
+    """Startup benchmark of main.py"""
+
+    def test_startup_imports_no_heavy_module(self):
+        """Test that importing the application loads no heavy scientific module
+
+        Args:
+            self: TestStartup object
+        Returns:
+            None
+        """
+        _, loaded = import_app()
+        self.assertEqual(loaded, [])
+
+    def test_startup_time(self):
+        """Test that the application imports within the startup budget, best of three runs
+
+        Args:
+            self: TestStartup object
+        Returns:
+            None
+        """
+        seconds = min(import_app()[0] for _ in range(3))
+        print(f"Application import time: {seconds:.3f}s")
+        self.assertLess(seconds, STARTUP_BUDGET)
+
+    def test_tokenize_without_nltk_data(self):
+        """Test that words are tokenized without downloading the missing NLTK models
+
+        Args:
+            self: TestStartup object
+        Returns:
+            None
+        """
+        with patch.object(label, "_word_tokenize", None), patch(
+            "nltk.word_tokenize", side_effect=LookupError
+        ), patch("nltk.download") as mock_download:
+            tokens = label.pre_process_words(["Heart", "disease."])
+
+        self.assertEqual(tokens, ["heart", "disease", "."])
+        mock_download.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
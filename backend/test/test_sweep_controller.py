@@ -0,0 +1,198 @@
+import os
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+import numpy as np
+from flask import Flask
+from gensim.models import Word2Vec
+
+sys.path.append("../backend")
+from controllers.embed_controller import CONFIG_FILE, get_embed_config
+from controllers.sweep_controller import (
+    expand_grid,
+    plan_sweep,
+    sweep_func,
+    train_word2vec,
+)
+from models.embed_model import load_embedding_value, load_training_curve
+from models.sweep_model import load_leaderboard
+from utils.exceptions import ModelException
+
+
+class TestSweepController(unittest.TestCase):
+    """Test cases for sweep_controller.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder holding an ontology
+
+        Args:
+            self: TestSweepController object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+        os.makedirs(os.path.join(self.tmp.name, "onto"))
+        with open(os.path.join(self.tmp.name, "onto", "onto.owl"), "w") as f:
+            f.write("<rdf:RDF/>")
+        rng = np.random.default_rng(0)
+        self.classes = ["http://c%d" % i for i in range(10)]
+        self.individuals = ["http://i%d" % i for i in range(5)]
+        self.sentences = [
+            list(rng.choice(self.classes + self.individuals, size=6))
+            for _ in range(200)
+        ]
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestSweepController object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_expand_grid(self):
+        """Test that a grid expands into every combination and is bounded
+
+        Args:
+            self: TestSweepController object
+        Returns:
+            None
+        """
+        self.assertEqual(
+            expand_grid({"window": [3, 5], "embed_size": 50}, 10),
+            [{"embed_size": 50, "window": 3}, {"embed_size": 50, "window": 5}],
+        )
+        for grid in ({}, {"window": []}, [3, 5]):
+            with self.assertRaises(ModelException) as context:
+                expand_grid(grid, 10)
+            self.assertEqual(context.exception.error_code, 400)
+        with self.assertRaises(ModelException) as context:
+            expand_grid({"window": [1, 2, 3], "embed_size": [10, 20]}, 5)
+        self.assertEqual(context.exception.error_code, 400)
+
+    def test_plan_sweep(self):
+        """Test that variants are grouped by their documents and defaults are not repeated
+
+        Args:
+            self: TestSweepController object
+        Returns:
+            None
+        """
+        groups = plan_sweep(
+            "owl2vec-star", {"walk_depth": [2, 3], "window": [3, 4], "seed": 42}
+        )
+        self.assertEqual([len(group) for group in groups], [2, 2])
+        for group in groups:
+            self.assertEqual(
+                len({entry["overrides"]["walk_depth"] for entry in group}), 1
+            )
+
+        # opa2vec documents have no configuration, every variant shares them
+        groups = plan_sweep("opa2vec", {"embed_size": [100, "100", 50]})
+        self.assertEqual(len(groups), 1)
+        self.assertEqual([entry["variant"] for entry in groups[0]][0], "opa2vec")
+        self.assertEqual(len(groups[0]), 2)
+
+        with self.assertRaises(ModelException) as context:
+            plan_sweep("rdf2vec", {"embed_size": [50]})
+        self.assertEqual(context.exception.error_code, 400)
+        with self.assertRaises(ModelException) as context:
+            plan_sweep("opa2vec", {"negative": [5]})
+        self.assertEqual(context.exception.error_code, 400)
+
+    def test_train_word2vec(self):
+        """Test that training on a shared vocabulary gives the model of the constructor
+
+        Args:
+            self: TestSweepController object
+        Returns:
+            None
+        """
+        params = {"vector_size": 8, "window": 2, "sg": 1, "epochs": 2, "seed": 1}
+        expected = Word2Vec(self.sentences, workers=1, **params)
+
+        word_freq = Counter()
+        for sentence in self.sentences:
+            word_freq.update(sentence)
+        config = get_embed_config(CONFIG_FILE, "owl2vec-star")
+        config["TRAINING"]["early_stopping"] = "no"
+        model, curve, train_time = train_word2vec(
+            self.sentences, word_freq, params, 1, config
+        )
+
+        self.assertEqual(model.wv.index_to_key, expected.wv.index_to_key)
+        np.testing.assert_array_equal(model.wv.vectors, expected.wv.vectors)
+        self.assertEqual(curve["epochs"], 2)
+        self.assertGreaterEqual(train_time, 0)
+        self.assertEqual(sum(word_freq.values()), 6 * len(self.sentences))
+
+    @patch("controllers.sweep_controller.predict_func")
+    @patch("controllers.sweep_controller.get_word2vec_documents")
+    @patch("controllers.sweep_controller.load_multi_input_files")
+    def test_sweep_func(
+        self, mock_load_multi_input_files, mock_get_documents, mock_predict_func
+    ):
+        """Test that a sweep builds documents once, saves every variant and ranks them
+
+        Args:
+            self: TestSweepController object
+            mock_load_multi_input_files: MagicMock object
+            mock_get_documents: MagicMock object
+            mock_predict_func: MagicMock object
+        Returns:
+            None
+        """
+        mock_load_multi_input_files.return_value = {
+            "classes": self.classes,
+            "individuals": self.individuals,
+        }
+        mock_get_documents.return_value = self.sentences
+
+        def predict(ontology_name, algorithm, classifier):
+            if algorithm == "owl2vec-star":
+                raise ModelException("Evaluation failed")
+            mrr = 0.5 if "@" in algorithm else 0.1
+            metrics = ("mrr", "hit_at_1", "hit_at_5", "hit_at_10")
+            return {"performance": {metric: np.float32(mrr) for metric in metrics}}
+
+        mock_predict_func.side_effect = predict
+        grid = {"embed_size": [8, 100]}
+
+        result = sweep_func("onto", "owl2vec-star", "svm", grid)
+
+        mock_get_documents.assert_called_once()
+        board = result["leaderboard"]
+        self.assertEqual(len(board), 2)
+        self.assertEqual([entry["rank"] for entry in board], [1, 2])
+        self.assertEqual(board[0]["parameters"], {"embed_size": 8})
+        self.assertEqual(board[0]["mrr"], 0.5)
+        self.assertTrue(board[0]["trained"])
+        self.assertIn("error", board[1])
+        self.assertEqual(load_leaderboard("onto", result["sweep_id"]), result)
+
+        self.assertIsNotNone(load_training_curve("onto", board[0]["variant"]))
+        classes_e, individuals_e = load_embedding_value("onto", board[0]["variant"])
+        self.assertEqual(np.asarray(classes_e).shape, (10, 8))
+        self.assertEqual(np.asarray(individuals_e).shape, (5, 8))
+
+        # trained variants are reused by the next sweep
+        mock_get_documents.reset_mock()
+        again = sweep_func("onto", "owl2vec-star", "svm", grid)
+        mock_get_documents.assert_not_called()
+        self.assertEqual(again["sweep_id"], result["sweep_id"])
+        self.assertFalse(any(entry["trained"] for entry in again["leaderboard"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
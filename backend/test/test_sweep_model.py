@@ -0,0 +1,63 @@
+import sys
+import tempfile
+import unittest
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.sweep_model import list_leaderboards, load_leaderboard, save_leaderboard
+from utils.exceptions import FileException
+
+
+class TestSweepModel(unittest.TestCase):
+    """Test cases for sweep_model.py"""
+
+    def setUp(self):
+        """Push an application context on a temporary storage folder
+
+        Args:
+            self: TestSweepModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        self.ctx = app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        """Pop the application context and remove the temporary storage folder
+
+        Args:
+            self: TestSweepModel object
+        Returns:
+            None
+        """
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_leaderboards(self):
+        """Test that leaderboards load back and are listed most recent first
+
+        Args:
+            self: TestSweepModel object
+        Returns:
+            None
+        """
+        self.assertEqual(list_leaderboards("onto"), [])
+        first = {"sweep_id": "a", "finished_at": 1, "leaderboard": []}
+        second = {"sweep_id": "b", "finished_at": 2, "leaderboard": []}
+        save_leaderboard("onto", "a", first)
+        save_leaderboard("onto", "b", second)
+
+        self.assertEqual(load_leaderboard("onto", "a"), first)
+        self.assertEqual(list_leaderboards("onto"), [second, first])
+
+        with self.assertRaises(FileException) as context:
+            load_leaderboard("onto", "c")
+        self.assertEqual(context.exception.error_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import configparser
+import sys
+import unittest
+from unittest.mock import patch
+
+import gensim
+
+sys.path.append("../backend")
+from controllers.training_controller import (
+    continue_training,
+    diff_revisions,
+    expand_affected_entities,
+    probe_mrr,
+    train_epochs,
+)
+from owl2vec_star.rdf2vec.graph import CSRKnowledgeGraph
+
+
+class TestTrainingController(unittest.TestCase):
+    """Test cases for training_controller.py"""
+
+    @patch("controllers.training_controller.get_previous_path")
+    @patch("controllers.training_controller.os.path.exists", return_value=True)
+    @patch("controllers.training_controller.load_multi_input_files")
+    def test_diff_revisions(
+        self, mock_load_multi_input_files, mock_exists, mock_get_previous_path
+    ):
+        """Test that diff_revisions reports the changed lines and the entities they touch
+
+        Args:
+            mock_load_multi_input_files: MagicMock object
+            mock_exists: MagicMock object
+            mock_get_previous_path: MagicMock object
+        Returns:
+            None
+        """
+        old = {
+            "axioms": ["A SubClassOf B", "C SubClassOf B"],
+            "classes": ["A", "B", "C"],
+            "individuals": [],
+            "uri_labels": ["A a", "B b"],
+            "annotations": [],
+        }
+        new = {
+            "axioms": ["A SubClassOf B", "C SubClassOf D"],
+            "classes": ["A", "B", "C", "D"],
+            "individuals": [],
+            "uri_labels": ["A a", "B b"],
+            "annotations": [],
+        }
+        mock_load_multi_input_files.side_effect = lambda name, files, previous=False: (
+            old if previous else new
+        )
+
+        diff = diff_revisions("ontology_name")
+
+        self.assertEqual(diff["axioms"]["added"], ["C SubClassOf D"])
+        self.assertEqual(diff["axioms"]["removed"], ["C SubClassOf B"])
+        self.assertEqual(diff["classes"]["added"], ["D"])
+        self.assertEqual(diff["entities"], ["B", "C", "D"])
+        self.assertAlmostEqual(diff["changed_ratio"], 3 / 8)
+
+    @patch("controllers.training_controller.get_previous_path")
+    @patch("controllers.training_controller.os.path.exists", return_value=False)
+    def test_diff_revisions_without_previous(self, mock_exists, mock_get_previous_path):
+        """Test that diff_revisions returns None when there is no previous revision
+
+        Args:
+            mock_exists: MagicMock object
+            mock_get_previous_path: MagicMock object
+        Returns:
+            None
+        """
+        self.assertIsNone(diff_revisions("ontology_name"))
+
+    def test_expand_affected_entities(self):
+        """Test that the roots of walks reaching a changed entity are collected
+
+        Args:
+            self: TestTrainingController object
+        Returns:
+            None
+        """
+        kg = CSRKnowledgeGraph.from_triples(
+            [("A", "p", "B"), ("B", "p", "C"), ("C", "p", "D"), ("E", "p", "A")]
+        )
+        self.assertEqual(expand_affected_entities(kg, ["C"], 1), {"B", "C"})
+        self.assertEqual(expand_affected_entities(kg, ["C"], 2), {"A", "B", "C"})
+        self.assertEqual(
+            expand_affected_entities(kg, ["B"], 1, downstream_hops=1),
+            {"A", "B", "C"},
+        )
+        self.assertEqual(expand_affected_entities(kg, ["new"], 2), {"new"})
+
+    def test_continue_training(self):
+        """Test that continue_training adds the new words to the vocabulary
+
+        Args:
+            self: TestTrainingController object
+        Returns:
+            None
+        """
+        model = gensim.models.Word2Vec(
+            [["a", "b", "c"]] * 5, vector_size=8, min_count=1, workers=1
+        )
+        continue_training(model, [["c", "d"]], epochs=2)
+        self.assertIn("d", model.wv.key_to_index)
+        self.assertIs(continue_training(model, [], epochs=2), model)
+
+    def training_config(self, **options):
+        """Build a [TRAINING] configuration
+
+        Args:
+            self: TestTrainingController object
+            **options: The options overriding the defaults
+        Returns:
+            configparser.ConfigParser: The configuration
+        """
+        config = configparser.ConfigParser()
+        training = {
+            "early_stopping": "yes",
+            "min_epochs": "1",
+            "patience": "1",
+            "min_delta": "0.005",
+            "probe_size": "0",
+            "probe_seed": "42",
+        }
+        training.update(options)
+        config.read_dict({"TRAINING": training})
+        return config
+
+    def test_train_epochs(self):
+        """Test that training records every epoch and stops once the loss plateaus
+
+        Args:
+            self: TestTrainingController object
+        Returns:
+            None
+        """
+        sentences = [["a", "b", "c", "d"], ["b", "c", "d", "e"]] * 50
+
+        model = gensim.models.Word2Vec(
+            vector_size=8, min_count=1, workers=1, seed=1, epochs=6
+        )
+        model.build_vocab(sentences)
+        curve = train_epochs(
+            model, sentences, self.training_config(early_stopping="no")
+        )
+        self.assertEqual(curve["epochs"], 6)
+        self.assertFalse(curve["stopped_early"])
+        self.assertEqual(curve["monitor"], "loss")
+        self.assertEqual(
+            [point["epoch"] for point in curve["curve"]], list(range(1, 7))
+        )
+
+        # an improvement threshold no epoch reaches stops after patience epochs
+        model = gensim.models.Word2Vec(
+            vector_size=8, min_count=1, workers=1, seed=1, epochs=6
+        )
+        model.build_vocab(sentences)
+        curve = train_epochs(
+            model, sentences, self.training_config(min_delta="1", min_epochs="3")
+        )
+        self.assertEqual(curve["epochs"], 3)
+        self.assertTrue(curve["stopped_early"])
+
+    def test_probe_mrr(self):
+        """Test that the probe ranks the classes by cosine similarity
+
+        Args:
+            self: TestTrainingController object
+        Returns:
+            None
+        """
+        model = gensim.models.Word2Vec(vector_size=2, min_count=1)
+        model.build_vocab([["x", "y", "A", "B", "C"]])
+        vectors = {
+            "x": [1.0, 0.1],
+            "y": [0.0, 1.0],
+            "A": [1.0, 0.0],
+            "B": [0.0, 1.0],
+            "C": [0.7, 0.7],
+        }
+        for word, vector in vectors.items():
+            model.wv.vectors[model.wv.key_to_index[word]] = vector
+
+        probe = {
+            "samples": [["x", "A"], ["y", "A"], ["z", "A"]],
+            "classes": ["A", "B", "C"],
+        }
+        # x ranks A first, y ranks A last of three, z is not in the vocabulary
+        self.assertAlmostEqual(probe_mrr(model, probe), (1 + 1 / 3) / 3)
+        self.assertEqual(probe_mrr(model, {"samples": [], "classes": ["A"]}), 0.0)
+        self.assertAlmostEqual(
+            probe_mrr(
+                model,
+                {"samples": [["X", "A"]], "classes": ["A"]},
+                key=lambda entity: entity if entity != "X" else "x",
+            ),
+            1.0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.append("../backend")
+from models.walk_model import (
+    evict_walk_corpora,
+    get_walk_corpus_key,
+    load_walk_corpus,
+    save_walk_corpus,
+)
+
+
+class TestWalkModel(unittest.TestCase):
+    """Test cases for walk_model.py"""
+
+    def setUp(self):
+        """Create a temporary storage folder and patch the cache path helper
+
+        Args:
+            self: TestWalkModel object
+        Returns:
+            None
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+
+        def cache_path(ontology_name, *args):
+            path = os.path.join(self.tmp.name, ontology_name, ".cache", *args)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            return path
+
+        self.patch = patch("models.walk_model.get_cache_path", side_effect=cache_path)
+        self.patch.start()
+        self.walks = [
+            ["http://a", "http://p", "http://b"],
+            ["http://b"],
+            ["http://a", "http://q", "ünïcode"],
+        ]
+
+    def tearDown(self):
+        """Stop the patch and remove the temporary storage folder
+
+        Args:
+            self: TestWalkModel object
+        Returns:
+            None
+        """
+        self.patch.stop()
+        self.tmp.cleanup()
+
+    def test_get_walk_corpus_key(self):
+        """Test that exhaustive walks share a key regardless of the seed
+
+        Args:
+            self: TestWalkModel object
+        Returns:
+            None
+        """
+        inf = float("inf")
+        self.assertEqual(
+            get_walk_corpus_key("h", "WL", 2, inf, 1, ["a"]),
+            get_walk_corpus_key("h", "wl", 2, inf, 42, ["a"]),
+        )
+        self.assertNotEqual(
+            get_walk_corpus_key("h", "wl", 2, 10, 1, ["a"]),
+            get_walk_corpus_key("h", "wl", 2, 10, 42, ["a"]),
+        )
+        self.assertNotEqual(
+            get_walk_corpus_key("h", "wl", 2, inf, None, ["a"]),
+            get_walk_corpus_key("h", "wl", 3, inf, None, ["a"]),
+        )
+
+    def test_save_and_load_walk_corpus(self):
+        """Test that a saved walk corpus is loaded back unchanged
+
+        Args:
+            self: TestWalkModel object
+        Returns:
+            None
+        """
+        key = get_walk_corpus_key("h", "random", 2, float("inf"), None, ["http://a"])
+        other = get_walk_corpus_key("h", "random", 3, float("inf"), None, ["http://a"])
+
+        self.assertIsNone(load_walk_corpus("onto", key))
+        save_walk_corpus("onto", key, self.walks)
+        self.assertEqual(load_walk_corpus("onto", key), self.walks)
+        self.assertIsNone(load_walk_corpus("onto", other))
+
+    def test_evict_walk_corpora(self):
+        """Test that the least recently used corpora are evicted first
+
+        Args:
+            self: TestWalkModel object
+        Returns:
+            None
+        """
+        app = Flask(__name__)
+        app.config["STORAGE_FOLDER"] = self.tmp.name
+        with app.app_context():
+            self.check_evict_walk_corpora()
+
+    def check_evict_walk_corpora(self):
+        """Evict corpora of three ontologies, one of them recently read"""
+        keys = [
+            get_walk_corpus_key("h", "random", depth, float("inf"), None, [])
+            for depth in range(3)
+        ]
+        paths = []
+        for i, key in enumerate(keys):
+            paths.append(save_walk_corpus("onto%d" % i, key, self.walks))
+            os.utime(paths[-1], (1000 + i, 1000 + i))
+
+        # reading the oldest corpus makes it the most recently used one
+        load_walk_corpus("onto0", keys[0])
+
+        size = os.path.getsize(paths[0])
+        removed = evict_walk_corpora(2 * size)
+        self.assertEqual(removed, [paths[1]])
+        self.assertIsNotNone(load_walk_corpus("onto0", keys[0]))
+        self.assertIsNone(load_walk_corpus("onto1", keys[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
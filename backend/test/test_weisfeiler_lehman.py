@@ -0,0 +1,101 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append("../backend")
+from owl2vec_star.rdf2vec.graph import CSRKnowledgeGraph
+from owl2vec_star.rdf2vec.walkers import weisfeiler_lehman
+from owl2vec_star.rdf2vec.walkers.weisfeiler_lehman import WeisfeilerLehmanWalker
+
+
+class TestWeisfeilerLehman(unittest.TestCase):
+    """Test cases for weisfeiler_lehman.py"""
+
+    def setUp(self):
+        """Build a small graph with a sink vertex and the walker
+
+        Args:
+            self: TestWeisfeilerLehman object
+        Returns:
+            None
+        """
+        self.graph = CSRKnowledgeGraph.from_triples(
+            [
+                ("http://a", "http://p", "http://b"),
+                ("http://a", "http://q", "http://c"),
+                ("http://b", "http://p", "http://c"),
+                ("http://c", "http://q", "http://a"),
+                ("http://d", "http://p", "http://b"),
+                ("http://b", "http://q", "http://e"),
+            ]
+        )
+        self.instances = ["http://a", "http://b", "http://e", "http://missing"]
+        self.walker = WeisfeilerLehmanWalker(4, float("inf"), wl_iterations=3)
+
+    def canonical_walks(self):
+        """Collect the walks of every iteration into one set, as the walker used to
+
+        Args:
+            self: TestWeisfeilerLehman object
+        Returns:
+            set: The canonical walks
+        """
+        self.walker._weisfeiler_lehman(self.graph)
+        names = self.graph.name_list()
+        predicates = self.graph.predicates.tolist()
+
+        canonical_walks = set()
+        for instance in self.instances:
+            walks = self.walker.extract_random_walks(
+                self.graph, self.graph.vertex_id(instance)
+            )
+            for n in range(self.walker.wl_iterations + 1):
+                for walk in walks:
+                    canonical_walk = [instance]
+                    for i in range(1, len(walk)):
+                        if i % 2 == 1:
+                            canonical_walk.append(names[predicates[walk[i]]])
+                        else:
+                            canonical_walk.append(
+                                self.walker._vertex_labels[n][walk[i]]
+                            )
+                    canonical_walks.add(tuple(canonical_walk))
+        return canonical_walks
+
+    def test_extract(self):
+        """Test that the streamed walks are the set of canonical walks, each yielded once
+
+        Args:
+            self: TestWeisfeilerLehman object
+        Returns:
+            None
+        """
+        walks = list(self.walker.extract(self.graph, self.instances))
+
+        self.assertEqual(len(walks), len(set(walks)))
+        self.assertEqual(set(walks), self.canonical_walks())
+        self.assertIn(("http://e",), walks)
+        self.assertIn(("http://missing",), walks)
+
+    def test_skip_unchanged_iteration(self):
+        """Test that an iteration relabelling the hops of a walk like the previous one
+        is skipped
+
+        Args:
+            self: TestWeisfeilerLehman object
+        Returns:
+            None
+        """
+        with patch.object(
+            weisfeiler_lehman,
+            "walk_fingerprint",
+            side_effect=weisfeiler_lehman.walk_fingerprint,
+        ) as mock_fingerprint:
+            walks = list(self.walker.extract(self.graph, ["http://e"]))
+
+        self.assertEqual(walks, [("http://e",)])
+        mock_fingerprint.assert_called_once_with(("http://e",))
+
+
+if __name__ == "__main__":
+    unittest.main()
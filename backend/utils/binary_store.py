@@ -0,0 +1,242 @@
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.exceptions import FileException
+
+# Single-file container for numpy arrays:
+#   MAGIC | uint64 header length | JSON header | padding | array data
+# Every array starts on an ALIGNMENT boundary so it can be memory-mapped.
+MAGIC = b"KBCARR01"
+ALIGNMENT = 64
+
+
+def _align(value: int):
+    """Round value up to the next ALIGNMENT boundary"""
+    return (value + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "wb"):
+    """Open a temporary file next to path and move it into place once written.
+
+    Every writer gets its own temporary file, so concurrent writers of the same path never
+    truncate each other's data: the last one replaces the file. The temporary file is removed
+    if writing fails.
+
+    Args:
+        path (str): The path of the file to write
+        mode (str): The mode the temporary file is opened with
+    Returns:
+        file: The open temporary file
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_arrays(path: str, arrays: dict, meta: dict = None):
+    """Save named numpy arrays and a JSON-serialisable metadata dict into one binary file.
+
+    The file is written to a temporary path first and then moved into place, so readers
+    never observe a partially written file.
+
+    Args:
+        path (str): The path of the file to write
+        arrays (dict): Mapping of array name to numpy.ndarray
+        meta (dict): Optional metadata stored in the header
+    Returns:
+        str: The path of the written file
+    """
+    try:
+        layout, offset = {}, 0
+        arrays = {name: np.ascontiguousarray(value) for name, value in arrays.items()}
+        for name, value in arrays.items():
+            layout[name] = {
+                "dtype": value.dtype.str,
+                "shape": list(value.shape),
+                "offset": offset,
+            }
+            offset = _align(offset + value.nbytes)
+
+        header = json.dumps({"meta": meta or {}, "arrays": layout}).encode("utf-8")
+        data_start = _align(len(MAGIC) + 8 + len(header))
+
+        with atomic_open(path) as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name, value in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(value.tobytes())
+            f.truncate(data_start + offset)
+        return path
+    except Exception as e:
+        raise FileException(f"Error saving binary arrays to {path}: {str(e)}")
+
+
+def read_header(path: str):
+    """Read the header of a binary array file without touching the array data.
+
+    Args:
+        path (str): The path of the file
+    Returns:
+        tuple: The metadata dict, the array layout dict and the offset of the data section
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise FileException(f"Not a binary array file: {path}")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_length).decode("utf-8"))
+        data_start = _align(len(MAGIC) + 8 + header_length)
+        return header["meta"], header["arrays"], data_start
+    except FileException:
+        raise
+    except Exception as e:
+        raise FileException(f"Error reading binary array header of {path}: {str(e)}")
+
+
+def load_arrays(path: str, mmap: bool = True):
+    """Load the arrays of a binary array file.
+
+    Args:
+        path (str): The path of the file
+        mmap (bool): Memory-map the arrays read-only instead of reading them into memory
+    Returns:
+        tuple: The dict of arrays and the metadata dict
+    """
+    meta, layout, data_start = read_header(path)
+    try:
+        arrays = {}
+        for name, spec in layout.items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            count = int(np.prod(shape)) if shape else 1
+            if count == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(
+                    path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=data_start + spec["offset"],
+                    shape=shape,
+                )
+            else:
+                with open(path, "rb") as f:
+                    f.seek(data_start + spec["offset"])
+                    arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(
+                        shape
+                    )
+        return arrays, meta
+    except Exception as e:
+        raise FileException(f"Error loading binary arrays from {path}: {str(e)}")
+
+
+def encode_strings(strings):
+    """Encode a sequence of strings into a byte blob and an offsets array.
+
+    Args:
+        strings (iterable): The strings to encode
+    Returns:
+        tuple: The uint8 blob and the int64 offsets (len(strings) + 1 entries)
+    """
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def encode_sentences(sentences):
+    """Encode sentences of tokens as a token table and integer token ids.
+
+    Args:
+        sentences (iterable): The sentences, each a list of str
+    Returns:
+        tuple: The token table (uint8 blob and int64 offsets), the int32 token ids of all
+            sentences one after the other and the int64 start of every sentence in them, plus
+            the end of the last
+    """
+    tokens, token_ids, offsets = {}, [], [0]
+    for sentence in sentences:
+        token_ids.extend(tokens.setdefault(token, len(tokens)) for token in sentence)
+        offsets.append(len(token_ids))
+    tokens_blob, tokens_offsets = encode_strings(tokens)
+    return (
+        tokens_blob,
+        tokens_offsets,
+        np.asarray(token_ids, dtype=np.int32),
+        np.asarray(offsets, dtype=np.int64),
+    )
+
+
+def decode_sentences(tokens, token_ids, offsets):
+    """Decode sentences encoded by encode_sentences.
+
+    Args:
+        tokens (list): The token table, decoded
+        token_ids (numpy.ndarray): The token ids of all sentences
+        offsets (numpy.ndarray): The start of every sentence, plus the end of the last
+    Returns:
+        list: The sentences, each a list of str
+    """
+    token_ids = token_ids.tolist()
+    offsets = offsets.tolist()
+    return [
+        [tokens[i] for i in token_ids[offsets[n] : offsets[n + 1]]]
+        for n in range(len(offsets) - 1)
+    ]
+
+
+class StringTable(object):
+    """Read-only sequence of strings backed by a byte blob and an offsets array.
+
+    Strings are decoded on access, so a memory-mapped table costs nothing until used.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+        self._index = None
+
+    @classmethod
+    def from_strings(cls, strings):
+        """Build a table from a sequence of strings"""
+        return cls(*encode_strings(strings))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return bytes(self.blob[start:end]).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self):
+        """Decode the whole table into a list of strings"""
+        data = bytes(self.blob)
+        offsets = self.offsets.tolist()
+        return [
+            data[offsets[i] : offsets[i + 1]].decode("utf-8")
+            for i in range(len(offsets) - 1)
+        ]
+
+    def index(self, value):
+        """Return the position of value in the table, or None when it is absent"""
+        if self._index is None:
+            self._index = {s: i for i, s in enumerate(self.tolist())}
+        return self._index.get(value)
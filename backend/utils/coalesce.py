@@ -0,0 +1,198 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import uuid
+
+from utils import exceptions
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class _Flight:
+    """A computation running in this process, shared by every thread asking for the same key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_flights = dict()
+_flights_lock = threading.Lock()
+
+
+def _lock_file(handle, blocking):
+    """Take an exclusive lock on an open file
+
+    Args:
+        handle (file): The open lock file
+        blocking (bool): Wait for the lock instead of failing when it is held
+    Returns:
+        bool: True if the lock was taken
+    """
+    if os.name == "nt":
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(0.1)
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _unlock_file(handle):
+    """Release the lock taken by _lock_file
+
+    Args:
+        handle (file): The open lock file
+    Returns:
+        None
+    """
+    if os.name == "nt":
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _read_outcome(path):
+    """Read the outcome stored by the last process that ran the computation
+
+    Args:
+        path (str): The path of the result file
+    Returns:
+        dict: The outcome with its "token", or None if there is none
+    """
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _write_outcome(path, outcome):
+    """Atomically store the outcome of a computation for the processes waiting on it
+
+    Args:
+        path (str): The path of the result file
+        outcome (dict): The outcome
+    Returns:
+        None
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(outcome, f)
+    os.replace(tmp_path, path)
+
+
+def _raise_outcome_error(error):
+    """Re-raise the error of a computation run by another process
+
+    Args:
+        error (dict): The name, message and error code of the exception
+    Returns:
+        None
+    """
+    cls = getattr(exceptions, error["type"], None)
+    if not (isinstance(cls, type) and issubclass(cls, exceptions.CustomException)):
+        cls = exceptions.CustomException
+    raise cls(error["message"], error["error_code"])
+
+
+def _run_across_processes(lock_folder, key, func, args, kwargs):
+    """Run func unless another process is already running it for the same key, in which case
+    wait for that process and return its outcome
+
+    Args:
+        lock_folder (str): The folder holding the lock and result files
+        key (str): The key of the computation
+        func (function): The computation
+        args (tuple): The positional arguments of func
+        kwargs (dict): The keyword arguments of func
+    Returns:
+        object: The result of the computation
+    """
+    os.makedirs(lock_folder, exist_ok=True)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    lock_path = os.path.join(lock_folder, digest + ".lock")
+    result_path = os.path.join(lock_folder, digest + ".result")
+
+    # an outcome written while we wait for the lock belongs to a run we attached to
+    before = _read_outcome(result_path)
+    before_token = before["token"] if before else None
+
+    with open(lock_path, "a+b") as handle:
+        if not _lock_file(handle, blocking=False):
+            print(f"Attach to the running computation of {key}")
+            _lock_file(handle, blocking=True)
+            outcome = _read_outcome(result_path)
+            if outcome is not None and outcome["token"] != before_token:
+                _unlock_file(handle)
+                if outcome["error"] is not None:
+                    _raise_outcome_error(outcome["error"])
+                return outcome["result"]
+        try:
+            outcome = {"token": uuid.uuid4().hex, "result": None, "error": None}
+            try:
+                outcome["result"] = func(*args, **kwargs)
+            except Exception as e:
+                handled = exceptions.handle_exception(e)
+                outcome["error"] = {"type": type(e).__name__, **handled}
+                raise
+            finally:
+                _write_outcome(result_path, outcome)
+            return outcome["result"]
+        finally:
+            _unlock_file(handle)
+
+
+def coalesce(lock_folder, key, func, *args, **kwargs):
+    """Run a computation once for every caller asking for the same key at the same time
+
+    Threads of this process attach to the flight of the first one. Processes on the same
+    machine attach through a lock file in lock_folder and receive the outcome of the process
+    that ran the computation. A caller arriving after the computation finished runs it again.
+
+    Args:
+        lock_folder (str): The folder holding the lock and result files
+        key (str): The key of the computation
+        func (function): The computation
+        *args: The positional arguments of func
+        **kwargs: The keyword arguments of func
+    Returns:
+        object: The result of the computation
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = _run_across_processes(lock_folder, key, func, args, kwargs)
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
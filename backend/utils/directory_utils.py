@@ -13,6 +13,15 @@ from utils.exceptions import (
     FileException,
 )
 
+# hidden per-ontology folder for derived data that can always be rebuilt
+CACHE_FOLDER = ".cache"
+# artifacts of the previously uploaded revision, kept inside the cache folder
+PREVIOUS_FOLDER = "previous"
+# separates the algorithm from the configuration hash in the folder name of a model variant
+VARIANT_SEPARATOR = "@"
+# hidden storage-wide folder for the lock and result files of coalesced computations
+LOCK_FOLDER = ".locks"
+
 
 def get_ontology_alias_mapping():
     try:
@@ -52,6 +61,8 @@ def explore_directory(directory):
 
         for ontology_name in os.listdir(directory):
             ontology_path = os.path.join(directory, ontology_name)
+            if ontology_name.startswith("."):
+                continue
             if os.path.isdir(ontology_path):
                 ontology_info = {
                     "name": ontology_name,
@@ -67,6 +78,8 @@ def explore_directory(directory):
 
                 for item in os.listdir(ontology_path):
                     item_path = os.path.join(ontology_path, item)
+                    if item.startswith("."):
+                        continue
                     if os.path.isfile(item_path):
                         ontology_info["process_files"].append(get_file_info(item_path))
                     elif os.path.isdir(item_path):
@@ -135,7 +148,9 @@ def zip_files(directory):
         with zipfile.ZipFile(
             zip_buffer, "w", zipfile.ZIP_DEFLATED, allowZip64=True
         ) as zipf:
-            for root, _, files in os.walk(directory):
+            for root, dirs, files in os.walk(directory):
+                # skip the cache folder, it is rebuilt on demand
+                dirs[:] = [d for d in dirs if d != CACHE_FOLDER]
                 for file in files:
                     file_path = os.path.join(root, file)
                     zipf.write(file_path, os.path.relpath(file_path, directory))
@@ -178,6 +193,89 @@ def get_path(ontology_name: str, *args):
         raise DirectoryException(f"Error getting ontology directory path: {str(e)}")
 
 
+def get_file_signature(path):
+    """Return the size and modification time of a file, used to detect a replaced file cheaply.
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        dict: The size and mtime (ns) of the file.
+    """
+    try:
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    except Exception as e:
+        raise FileException(f"Error getting file signature for {path}: {str(e)}")
+
+
+def get_cache_path(ontology_name: str, *args):
+    """Constructs a path inside the hidden cache folder of the ontology and makes sure its parent folder exists.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        *args: The rest parts of the path to be joined. (sub folder, file_name)
+
+    Returns:
+        str: The constructed path.
+    """
+    try:
+        path = get_path(ontology_name, CACHE_FOLDER, *args)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+    except Exception as e:
+        raise DirectoryException(f"Error getting ontology cache path: {str(e)}")
+
+
+def get_previous_path(ontology_name: str, *args):
+    """Constructs a path inside the artifacts of the previous revision of the ontology.
+
+    Args:
+        ontology_name (str): The name of the ontology
+        *args: The rest parts of the path to be joined. (algorithm, file_name)
+
+    Returns:
+        str: The constructed path.
+    """
+    return get_path(ontology_name, CACHE_FOLDER, PREVIOUS_FOLDER, *args)
+
+
+def get_variant_name(algorithm: str, config_hash: str = None):
+    """Constructs the folder name of a model variant trained with a non-default configuration.
+
+    Args:
+        algorithm (str): The name of the algorithm
+        config_hash (str): The hash of the effective configuration, None for the default one
+
+    Returns:
+        str: The algorithm name, followed by the first characters of the hash for a variant.
+    """
+    if config_hash is None:
+        return algorithm
+    return f"{algorithm}{VARIANT_SEPARATOR}{config_hash[:8]}"
+
+
+def get_base_algorithm(variant: str):
+    """Returns the algorithm of a model variant folder name.
+
+    Args:
+        variant (str): The folder name of the model variant
+
+    Returns:
+        str: The name of the algorithm.
+    """
+    return variant.split(VARIANT_SEPARATOR, 1)[0]
+
+
+def get_lock_folder():
+    """Returns the storage-wide folder holding the lock files of coalesced computations.
+
+    Returns:
+        str: The path of the lock folder.
+    """
+    return os.path.join(current_app.config["STORAGE_FOLDER"], LOCK_FOLDER)
+
+
 def replace_or_create_folder(folder_path):
     """Replace or create a folder at the given path.
 
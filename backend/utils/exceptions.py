@@ -59,6 +59,13 @@ class DirectoryException(CustomException):
         super().__init__(message, error_code)
 
 
+class JobException(CustomException):
+    """Exception raised for background job errors"""
+
+    def __init__(self, message="Job operation error", error_code=500):
+        super().__init__(message, error_code)
+
+
 # Add more custom exceptions as needed
 
 
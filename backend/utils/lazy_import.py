@@ -0,0 +1,52 @@
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported the first time one of its attributes is used
+
+    Heavy scientific libraries are bound through this class, so that starting the application
+    only pays for the libraries of the endpoints that are actually called.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        """Import the module, once
+
+        Returns:
+            module: The imported module
+        """
+        module = self.__dict__["_module"]
+        if module is None:
+            # the import system serialises concurrent imports of the same module
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """Bind a module without importing it
+
+    Args:
+        name (str): The dotted name of the module, e.g. "matplotlib.pyplot"
+    Returns:
+        LazyModule: The module itself if it is already imported, else a lazy stand-in
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)